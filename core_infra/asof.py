@@ -0,0 +1,74 @@
+"""As-of lookups over time-sorted rows, for the sim replay loops.
+
+An ``AsOfCursor`` answers "the latest row at or before ``ts``" against an
+ascending timestamp list. The replay loops query in time order, so the
+cursor only moves forward. Each step is a ``bisect`` that starts at the
+previous position, so a full replay costs O(queries * log n) in the worst
+case and close to O(n + queries) in practice. A rescan from the start per
+query costs O(queries * n).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Any, Mapping, Optional, Sequence
+
+
+def row_timestamps(rows: Sequence[Any]) -> list[int]:
+    """``int(row["ts"] or 0)`` per row, read straight from the ts column for market-store rows."""
+    column = getattr(rows, "column", None)
+    if column is not None:
+        return [int(ts) for ts in column("ts").tolist()]
+    return [int(row.get("ts", 0) or 0) for row in rows]
+
+
+class AsOfCursor:
+    """Latest value whose timestamp is at or before a query time.
+
+    ``timestamps`` must be ascending. With equal timestamps the last one
+    wins, matching a forward scan that stops at the first later row. A query
+    earlier than the previous one re-seeks from the start, so out-of-order
+    queries are still correct, just not amortised.
+    """
+
+    __slots__ = ("timestamps", "values", "default", "_idx", "_last_ts")
+
+    def __init__(self, timestamps: Sequence[int], values: Optional[Sequence[Any]] = None, default: Any = None):
+        self.timestamps = list(timestamps)
+        self.values = self.timestamps if values is None else values
+        if len(self.values) != len(self.timestamps):
+            raise ValueError("timestamps and values must have the same length")
+        self.default = default
+        self._idx = -1
+        self._last_ts: Optional[int] = None
+
+    @classmethod
+    def over_rows(cls, rows: Sequence[Any], default: Any = None) -> "AsOfCursor":
+        """Cursor over row dicts (or market-store rows) sorted by ``ts``."""
+        return cls(row_timestamps(rows), rows, default)
+
+    @classmethod
+    def over_mapping(cls, mapping: Mapping[int, Any], default: Any = None) -> "AsOfCursor":
+        """Cursor over a ``{ts: value}`` lookup such as one symbol of ``build_htf_regime``."""
+        keys = sorted(mapping)
+        return cls(keys, [mapping[key] for key in keys], default)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def index(self, ts: int) -> int:
+        """Position of the latest timestamp at or before ``ts``, or -1."""
+        ts = int(ts)
+        timestamps = self.timestamps
+        idx = self._idx
+        if self._last_ts is None or ts < self._last_ts:
+            idx = bisect_right(timestamps, ts) - 1
+        elif idx + 1 < len(timestamps) and timestamps[idx + 1] <= ts:
+            idx = bisect_right(timestamps, ts, idx + 1) - 1
+        self._idx = idx
+        self._last_ts = ts
+        return idx
+
+    def at(self, ts: int) -> Any:
+        idx = self.index(ts)
+        return self.values[idx] if idx >= 0 else self.default
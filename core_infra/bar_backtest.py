@@ -0,0 +1,113 @@
+"""Array helpers for the vectorized bar backtest in ``sim_runner`` (``--engine vector``).
+
+The regime-gated strategies (SIM_A, SIM_B) only trade when their SMA
+crossover, HTF confirmation and sentiment-tilt signals say so. Those
+signals depend only on the bar arrays, so they are computed here one pass
+per signal. The replay then visits only the bars where something can
+happen: a possible entry, a possible exit after the minimum hold, or a
+kill-switch check that could fire.
+
+The SMAs are summed over each window left to right (see
+``running_mean``), like ``sim_runner.sma`` and ``SymbolIndicators``, so
+the arrays make the same decisions down to the last bit.
+
+numpy is optional. Without it ``available()`` is False and ``sim_runner``
+keeps the per-bar loop.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+DAY_MS = 86_400_000
+HOUR_MS = 3_600_000
+
+
+def available() -> bool:
+    return np is not None
+
+
+def column(rows: Sequence[Any], name: str, dtype) -> "np.ndarray":
+    """One field of every row as an array; market-store rows hand over their column directly."""
+    getter = getattr(rows, "column", None)
+    if getter is not None:
+        return np.asarray(getter(name), dtype=dtype)
+    return np.fromiter((row[name] for row in rows), dtype=dtype, count=len(rows))
+
+
+def running_mean(values: "np.ndarray", period: int) -> "np.ndarray":
+    """``sum(values[i - period + 1:i + 1]) / period`` at every ``i``; NaN while short.
+
+    Each window is summed left to right, one offset at a time across all
+    positions, so every entry is the float the batch ``sma`` returns for
+    that bar. The cost is O(n * period), and periods here are at most 26.
+    """
+    period = int(period)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if period <= 0 or len(values) < period:
+        return out
+    count = len(values) - period + 1
+    acc = values[:count].copy()
+    for offset in range(1, period):
+        acc += values[offset:offset + count]
+    out[period - 1:] = acc / float(period)
+    return out
+
+
+class ReplayIndicators:
+    """Stand-in for ``SymbolIndicators`` over a whole close array; set ``index`` to the current bar.
+
+    ``sma`` returns what a ``SymbolIndicators(history)`` updated through
+    ``closes[index]`` would return. ``series`` stays None for a period until
+    the replay first queries it, as a ``SymbolIndicators`` tracker is only
+    created on first query.
+    """
+
+    def __init__(self, closes: "np.ndarray", history: int):
+        self.closes = closes
+        self.history = max(1, int(history))
+        self.index = 0
+        self._series: dict = {}
+
+    def series(self, period: int):
+        """The per-bar SMA array once ``sma(period)`` has been queried, else None."""
+        return self._series.get(int(period))
+
+    def sma(self, period: int) -> Optional[float]:
+        period = int(period)
+        if period <= 0 or period > self.history:
+            return None
+        values = self._series.get(period)
+        if values is None:
+            values = self._series[period] = running_mean(self.closes, period)
+        value = values[self.index]
+        return None if np.isnan(value) else float(value)
+
+
+def htf_flags(ts: "np.ndarray", regime: Mapping[int, bool]) -> "np.ndarray":
+    """Per bar: 1/0 for the HTF regime (exact hour first, else latest at or before), -1 for no data."""
+    out = np.full(len(ts), -1, dtype=np.int8)
+    if not regime or not len(ts):
+        return out
+    keys = np.array(sorted(regime), dtype=np.int64)
+    values = np.array([1 if regime[key] else 0 for key in keys.tolist()], dtype=np.int8)
+    hour_ts = (ts // HOUR_MS) * HOUR_MS
+    exact = np.searchsorted(keys, hour_ts)
+    hit = exact < len(keys)
+    hit[hit] = keys[exact[hit]] == hour_ts[hit]
+    asof = np.searchsorted(keys, ts, side="right") - 1
+    pick = np.where(hit, exact, asof)
+    found = pick >= 0
+    out[found] = values[pick[found]]
+    return out
+
+
+def running_peak(marks: "np.ndarray", peak: float) -> "np.ndarray":
+    """Peak equity after each mark, starting from ``peak`` (``Sim._check_halt`` updates it per bar)."""
+    return np.maximum.accumulate(np.maximum(marks, float(peak)))
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .regime_detector import detect_regime
+from .rolling_indicators import SymbolIndicators
 from .strategy_blender import blend_signals
 from .volatility_metrics import compute_volatility
 
@@ -185,6 +186,7 @@ def _build_candidate_items(
     tick_snapshot: Optional[Dict[str, Any]],
     symbol_state: Dict[str, Any],
     params: Optional[Dict[str, Any]] = None,
+    indicators: Optional[SymbolIndicators] = None,
 ) -> Dict[str, Any]:
     cfg = dict(_DEFAULTS)
     if params:
@@ -200,16 +202,27 @@ def _build_candidate_items(
             "risk_signal": 0.0,
         }
 
-    regime = detect_regime(prices, cfg.get("regime_params"))
-    volatility = compute_volatility(candles=candles, prices=prices, params=cfg.get("volatility_params"))
+    breakout_lb = int(cfg["breakout_lookback"])
+    # A SymbolIndicators fed the same bars answers in O(1); ``candles`` is then unused.
+    if indicators is not None:
+        regime = indicators.regime(cfg.get("regime_params"))
+        volatility = indicators.volatility(cfg.get("volatility_params"))
+        sma = indicators.sma
+        extremes = indicators.prior_extremes(breakout_lb)
+    else:
+        regime = detect_regime(prices, cfg.get("regime_params"))
+        volatility = compute_volatility(candles=candles, prices=prices, params=cfg.get("volatility_params"))
+        sma = lambda period: _sma(prices, period)  # noqa: E731
+        hist = prices[-(breakout_lb + 1):-1] if len(prices) > breakout_lb else []
+        extremes = (max(hist), min(hist)) if hist else None
     close = prices[-1]
 
     items: List[Dict[str, Any]] = []
 
     trend_fast = int(cfg["trend_fast"])
     trend_slow = int(cfg["trend_slow"])
-    fast = _sma(prices, trend_fast)
-    slow = _sma(prices, trend_slow)
+    fast = sma(trend_fast)
+    slow = sma(trend_slow)
     if fast is not None and slow not in (None, 0):
         edge = (fast - slow) / slow
         items.append(
@@ -222,32 +235,28 @@ def _build_candidate_items(
             }
         )
 
-    breakout_lb = int(cfg["breakout_lookback"])
-    if len(prices) > breakout_lb:
-        hist = prices[-(breakout_lb + 1):-1]
-        if hist:
-            prior_high = max(hist)
-            prior_low = min(hist)
-            if prior_high > 0 and prior_low > 0:
-                up_edge = (close - prior_high) / prior_high
-                down_edge = (close - prior_low) / prior_low
-                breakout_signal = 0.0
-                if up_edge > 0:
-                    breakout_signal = _clip(up_edge / 0.01)
-                elif down_edge < 0:
-                    breakout_signal = _clip(down_edge / 0.01)
-                items.append(
-                    {
-                        "source": "breakout_confirmation",
-                        "signal": breakout_signal,
-                        "confidence": min(1.0, abs(breakout_signal)),
-                        "weight": 1.0,
-                        "base_weight": 1.0,
-                    }
-                )
+    if extremes is not None:
+        prior_high, prior_low = extremes
+        if prior_high > 0 and prior_low > 0:
+            up_edge = (close - prior_high) / prior_high
+            down_edge = (close - prior_low) / prior_low
+            breakout_signal = 0.0
+            if up_edge > 0:
+                breakout_signal = _clip(up_edge / 0.01)
+            elif down_edge < 0:
+                breakout_signal = _clip(down_edge / 0.01)
+            items.append(
+                {
+                    "source": "breakout_confirmation",
+                    "signal": breakout_signal,
+                    "confidence": min(1.0, abs(breakout_signal)),
+                    "weight": 1.0,
+                    "base_weight": 1.0,
+                }
+            )
 
     pullback_lb = int(cfg["pullback_lookback"])
-    pullback_anchor = _sma(prices, pullback_lb)
+    pullback_anchor = sma(pullback_lb)
     if pullback_anchor not in (None, 0):
         dist = (close - pullback_anchor) / pullback_anchor
         if regime.get("regime") == "bull":
@@ -376,6 +385,7 @@ def run_competing_models(
     include_sentiment: bool = False,
     tick_snapshot: Optional[Dict[str, Any]] = None,
     params: Optional[Dict[str, Any]] = None,
+    indicators: Optional[SymbolIndicators] = None,
 ) -> Dict[str, Any]:
     cfg = dict(_DEFAULTS)
     if params:
@@ -404,6 +414,7 @@ def run_competing_models(
         tick_snapshot,
         symbol_state,
         cfg,
+        indicators,
     )
     blended = blend_signals(built["items"], cfg.get("strategy_blender"))
     signal = float(blended.get("signal", 0.0))
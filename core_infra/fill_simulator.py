@@ -50,6 +50,50 @@ def market_fill_price(
     }
 
 
+def market_close_costs(
+    *,
+    direction: int,
+    size: float,
+    reference_price,
+    hold_ms,
+    entry_notional_usd: float = 0.0,
+    quoted_price: float | None = None,
+    slippage_bps: float = 0.0,
+    impact_bps_per_10k: float = 0.0,
+    fee_rate: float = 0.0,
+    funding_bps_8h: float = 0.0,
+    borrow_bps_daily: float = 0.0,
+) -> dict:
+    """Closing ``size`` at market after ``hold_ms``: the ``market_fill_price`` taker fill, its fee, and funding/borrow carry.
+
+    ``quoted_price`` is the bid for a long (``direction`` > 0) and the ask for
+    a short. ``reference_price`` and ``hold_ms`` must already be clamped at
+    zero and may be numpy arrays, one entry per mark: only arithmetic touches
+    them, so each entry equals the scalar result.
+    """
+    quoted = _safe_float(quoted_price)
+    base_price = quoted if quoted > 0 else reference_price
+    impact_bps = ((size * reference_price) / 10000.0) * max(0.0, _safe_float(impact_bps_per_10k))
+    total_bps = max(0.0, _safe_float(slippage_bps)) + impact_bps
+    if direction > 0:
+        fill_price = base_price * (1.0 - (total_bps / 10000.0))
+    else:
+        fill_price = base_price * (1.0 + (total_bps / 10000.0))
+    exit_notional = size * fill_price
+    avg_notional = (entry_notional_usd + exit_notional) / 2.0
+    funding_periods = hold_ms / float(8 * 60 * 60 * 1000)
+    borrow_days = hold_ms / float(24 * 60 * 60 * 1000)
+    return {
+        "price": fill_price,
+        "size_usd": exit_notional,
+        "fee_usd": exit_notional * fee_rate,
+        "impact_bps": impact_bps,
+        "slippage_bps": max(0.0, _safe_float(slippage_bps)),
+        "funding_cost": avg_notional * (funding_bps_8h / 10000.0) * funding_periods * direction,
+        "borrow_cost": avg_notional * (borrow_bps_daily / 10000.0) * borrow_days,
+    }
+
+
 def limit_fill_price(
     *,
     side: str,
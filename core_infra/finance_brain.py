@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Any
 from urllib import error, request
 
+from .rolling_indicators import SymbolIndicators
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SIM_ROOT = REPO_ROOT / "sim"
 DEFAULT_ARTIFACT_PATH = REPO_ROOT / "workspace" / "artifacts" / "finance" / "consensus_latest.json"
@@ -288,9 +290,17 @@ def build_retrieval_stats(
     return stats
 
 
-def _technical_agent(closes: list[float], *, fast_period: int, slow_period: int, htf_bullish: bool | None) -> dict[str, Any]:
-    fast = _sma(closes, fast_period)
-    slow = _sma(closes, slow_period)
+def _technical_agent(
+    closes: list[float],
+    *,
+    fast_period: int,
+    slow_period: int,
+    htf_bullish: bool | None,
+    indicators: SymbolIndicators | None = None,
+) -> dict[str, Any]:
+    sma = indicators.sma if indicators is not None else (lambda period: _sma(closes, period))
+    fast = sma(fast_period)
+    slow = sma(slow_period)
     score = 0.0
     rationale: list[str] = []
     if fast is not None and slow not in (None, 0):
@@ -577,6 +587,7 @@ def evaluate_symbol(
     retrieval_stats: dict[str, Any] | None = None,
     params: dict[str, Any] | None = None,
     allow_llm: bool = False,
+    indicators: SymbolIndicators | None = None,
 ) -> dict[str, Any]:
     cfg = dict(DEFAULTS)
     if params:
@@ -588,6 +599,7 @@ def evaluate_symbol(
         fast_period=int(cfg.get("fast_period") or DEFAULTS["fast_period"]),
         slow_period=int(cfg.get("slow_period") or DEFAULTS["slow_period"]),
         htf_bullish=htf_bullish,
+        indicators=indicators,
     )
     microstructure_agent = _microstructure_agent(tick_snapshot, cross_exchange_row)
     risk_agent = _risk_agent(tick_snapshot, funding_row, cross_exchange_row)
@@ -0,0 +1,703 @@
+"""Columnar market data store for the sim runner.
+
+The JSONL market files (``market/candles_15m.jsonl``, ``ticks.jsonl``, ...)
+are mirrored into per-symbol, time-partitioned column files, so a sim run
+can memory-map only the symbols and time range it needs instead of parsing
+every line. Layout under ``root`` (``market/store`` next to the JSONL)::
+
+    <series>/series.json                        source file state for incremental sync
+    <series>/<SYMBOL>/symbol.json               columns, categories, partitions
+    <series>/<SYMBOL>/<part>.g<N>/<col>.<kind>  one raw little-endian column
+
+Each column has a kind:
+
+* ``int``: int64, with ``INT_NULL`` for missing values.
+* ``float``: float64, with NaN for missing values.
+* ``bool``: int8, with -1 for missing values.
+* ``str`` and ``json``: int32 codes into the symbol's category list, with -1
+  for missing values.
+* ``null``: no values seen yet, so there is no file.
+
+Kinds widen as new values arrive. ``int`` becomes ``float``, and any other
+mix becomes ``json``. ``ts`` is always an int64 column and each partition is
+sorted by it. ``_offset`` records where the source line started in the JSONL
+file, so a tail-limited load can match the JSONL loaders exactly.
+
+``symbol.json`` is the commit point. After a crash a column file may hold
+bytes past the manifest's row count. Readers ignore those bytes and the
+next append truncates them. A partition that has to be merged is written to
+a new generation directory, which the manifest then points to.
+
+The store is opt-in. ``scripts/market_store_convert.py`` creates it. After
+that ``sim_runner`` reads from it and the market fetchers keep it in sync.
+numpy is optional. Without it, ``store_for_jsonl`` returns None and callers
+keep reading JSONL.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import urllib.parse
+from collections.abc import Sequence
+from contextlib import contextmanager
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    fcntl = None
+
+FORMAT_VERSION = 1
+STORE_DIRNAME = "store"
+STORE_ENV = "OPENCLAW_MARKET_STORE"
+INT_NULL = -(2**63)
+DEFAULT_CHUNK_ROWS = 250_000
+_INT_MAX = 2**63 - 1
+_ANCHOR_BYTES = 64
+_DTYPES = {"int": "<i8", "float": "<f8", "bool": "i1", "str": "<i4", "json": "<i4"}
+_FIXED = {"ts": "int", "_offset": "int"}
+
+# partition: numpy datetime64 unit used to split a symbol's rows into files.
+# unique_ts: one row per ts (last write wins), as market_stream.merge_rows keeps it.
+SERIES = {
+    "candles_15m": {"file": "candles_15m.jsonl", "partition": "M", "unique_ts": True},
+    "candles_1h": {"file": "candles_1h.jsonl", "partition": "M", "unique_ts": True},
+    "ticks": {"file": "ticks.jsonl", "partition": "D", "unique_ts": False},
+    "venue_quotes": {"file": "venue_quotes.jsonl", "partition": "D", "unique_ts": False},
+    "funding_rates": {"file": "funding_rates.jsonl", "partition": "M", "unique_ts": False},
+}
+
+
+def available() -> bool:
+    return np is not None
+
+
+def series_for_path(path: Path) -> str | None:
+    name = Path(path).name
+    for series, spec in SERIES.items():
+        if spec["file"] == name:
+            return series
+    return None
+
+
+def store_for_jsonl(path: Path) -> tuple["MarketStore", str] | None:
+    """The store next to a market JSONL file and that file's series.
+
+    Returns None when numpy is missing, when ``OPENCLAW_MARKET_STORE=0``, when
+    the file is not a known series, or when the series has not been converted.
+    """
+    if np is None or os.getenv(STORE_ENV, "1").strip() == "0":
+        return None
+    series = series_for_path(path)
+    if series is None:
+        return None
+    store = MarketStore(Path(path).parent / STORE_DIRNAME)
+    if not store.has_series(series):
+        return None
+    return store, series
+
+
+def _infer_kind(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if INT_NULL < value <= _INT_MAX else "json"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "json"
+
+
+def _widen(current: str, new: str) -> str:
+    if new == "null" or new == current:
+        return current
+    if current == "null":
+        return new
+    if {current, new} == {"int", "float"}:
+        return "float"
+    return "json"
+
+
+def _coerce_ts(value: Any) -> int | None:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode(kind: str, values: list, categories: list[str], lookup: dict[str, int]):
+    if kind == "int":
+        return np.array([INT_NULL if v is None else int(v) for v in values], dtype=_DTYPES["int"])
+    if kind == "float":
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=_DTYPES["float"])
+    if kind == "bool":
+        return np.array([-1 if v is None else int(bool(v)) for v in values], dtype=_DTYPES["bool"])
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(-1)
+            continue
+        key = value if kind == "str" else json.dumps(value, ensure_ascii=False)
+        code = lookup.get(key)
+        if code is None:
+            code = lookup[key] = len(categories)
+            categories.append(key)
+        codes.append(code)
+    return np.array(codes, dtype=_DTYPES[kind])
+
+
+def _decode(kind: str, array, categories: list[str], length: int) -> list:
+    if kind == "null":
+        return [None] * length
+    values = array.tolist()
+    if kind == "int":
+        if length and (array == INT_NULL).any():
+            values = [None if v == INT_NULL else v for v in values]
+    elif kind == "float":
+        if length and np.isnan(array).any():
+            values = [None if v != v else v for v in values]
+    elif kind == "bool":
+        values = [None if v < 0 else bool(v) for v in values]
+    elif kind == "str":
+        values = [categories[v] if v >= 0 else None for v in values]
+    else:
+        values = [json.loads(categories[v]) if v >= 0 else None for v in values]
+    return values
+
+
+def _same(a, b) -> bool:
+    if a.dtype.kind == "f":
+        return bool(np.array_equal(a, b, equal_nan=True))
+    return bool(np.array_equal(a, b))
+
+
+def _map(path: Path, dtype: str, rows: int):
+    """Read-only array over the first ``rows`` items of a column file, memory-mapped.
+
+    Lighter than ``np.memmap``, which resolves the path on every call. That
+    adds up over thousands of day partitions.
+    """
+    if rows <= 0:
+        return np.empty(0, dtype=dtype)
+    with open(path, "rb") as handle:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(buffer, dtype=dtype, count=rows)
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _anchor(path: Path, offset: int) -> str:
+    start = max(0, offset - _ANCHOR_BYTES)
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        return handle.read(offset - start).hex()
+
+
+def _source_state(path: Path, st: os.stat_result, offset: int) -> dict:
+    return {
+        "path": str(path),
+        "inode": st.st_ino,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "offset": offset,
+        "anchor": _anchor(path, offset),
+    }
+
+
+def _appended_since(path: Path, state: dict, st: os.stat_result) -> bool:
+    """True if ``path`` only grew since ``state`` was recorded."""
+    if not state or state.get("inode") != st.st_ino or st.st_size < int(state.get("size", 0)):
+        return False
+    if st.st_size == state.get("size") and st.st_mtime_ns != state.get("mtime_ns"):
+        return False  # same-size rewrite
+    offset = int(state.get("offset", 0))
+    return not offset or _anchor(path, offset) == state.get("anchor")
+
+
+def _read_jsonl_chunks(path: Path, start: int, limit: int, chunk_rows: int) -> Iterator[tuple[list, list, int]]:
+    """Yield ``(rows, line_offsets, end_offset)`` for complete lines in ``[start, limit)``."""
+    rows: list[dict] = []
+    offsets: list[int] = []
+    pos = start
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        for raw in handle:
+            if not raw.endswith(b"\n") or pos + len(raw) > limit:
+                break  # a line still being written; the next sync picks it up
+            line_start = pos
+            pos += len(raw)
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(row, dict):
+                rows.append(row)
+                offsets.append(line_start)
+            if len(rows) >= chunk_rows:
+                yield rows, offsets, pos
+                rows, offsets = [], []
+    yield rows, offsets, pos
+
+
+class MarketRows(Sequence):
+    """The rows of one symbol, backed by column arrays.
+
+    Behaves like the list of dicts the JSONL loaders return. Each row has
+    ``symbol`` plus every stored column, with ``None`` where the source row
+    lacked a value. Rows are built on first access and then cached, and
+    slicing returns a plain list. ``column()`` returns the numpy array
+    without building any rows.
+    """
+
+    def __init__(self, symbol: str, columns: dict | None = None, kinds: dict | None = None, categories: dict | None = None):
+        self.symbol = symbol
+        self._columns = columns or {}
+        self._kinds = kinds or {}
+        self._categories = categories or {}
+        ts = self._columns.get("ts")
+        self._length = 0 if ts is None else int(len(ts))
+        self._rows: list[dict] | None = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MarketRows({self.symbol!r}, rows={self._length}, columns={list(self.names)})"
+
+    @property
+    def names(self) -> list[str]:
+        return [name for name in self._kinds if name != "_offset"]
+
+    def column(self, name: str):
+        """Raw column: int64 (``INT_NULL`` for missing), float64 (NaN), or decoded objects."""
+        kind = self._kinds.get(name)
+        if kind is None:
+            raise KeyError(name)
+        if kind in ("int", "float"):
+            return self._columns[name]
+        if kind == "null":
+            return np.full(self._length, np.nan)
+        return np.array(_decode(kind, self._columns[name], self._categories.get(name, []), self._length), dtype=object)
+
+    def _materialize(self) -> list[dict]:
+        if self._rows is None:
+            names = self.names
+            lists = [
+                _decode(self._kinds[name], self._columns.get(name), self._categories.get(name, []), self._length)
+                for name in names
+            ]
+            keys = ("symbol", *names)
+            self._rows = [dict(zip(keys, values)) for values in zip(repeat(self.symbol, self._length), *lists)]
+        return self._rows
+
+
+class MarketStore:
+    def __init__(self, root: Path):
+        if np is None:
+            raise RuntimeError("numpy is required for the market store")
+        self.root = Path(root)
+
+    # -- paths and manifests -------------------------------------------------
+
+    def _series_dir(self, series: str) -> Path:
+        if series not in SERIES:
+            raise ValueError(f"unknown market series {series!r}")
+        return self.root / series
+
+    def _symbol_dir(self, series: str, symbol: str) -> Path:
+        return self._series_dir(series) / urllib.parse.quote(str(symbol), safe="")
+
+    def has_series(self, series: str) -> bool:
+        return (self._series_dir(series) / "series.json").exists()
+
+    def symbols(self, series: str) -> list[str]:
+        base = self._series_dir(series)
+        if not base.is_dir():
+            return []
+        return sorted(urllib.parse.unquote(p.name) for p in base.iterdir() if (p / "symbol.json").exists())
+
+    def source_state(self, series: str) -> dict:
+        return (_read_json(self._series_dir(series) / "series.json") or {}).get("source") or {}
+
+    def _write_series_meta(self, series: str, source: dict | None) -> None:
+        base = self._series_dir(series)
+        base.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(base / "series.json", {"version": FORMAT_VERSION, "series": series, "source": source})
+
+    @contextmanager
+    def _lock(self, series: str):
+        base = self._series_dir(series)
+        base.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(str(base / ".lock"), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _clear_locked(self, series: str) -> None:
+        base = self._series_dir(series)
+        for child in base.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+
+    def reset(self, series: str) -> None:
+        """Drop every symbol of ``series``; the series stays initialised but unsynced."""
+        with self._lock(series):
+            self._clear_locked(series)
+            self._write_series_meta(series, None)
+
+    # -- writing -------------------------------------------------------------
+
+    def append(self, series: str, rows: Iterable[dict], *, offsets: list[int] | None = None) -> int:
+        """Add rows (each with ``symbol`` and ``ts``) and return how many were written.
+
+        For ``unique_ts`` series an incoming row replaces a stored row with the
+        same ts. A partition that comes out unchanged is not rewritten.
+        """
+        with self._lock(series):
+            if not self.has_series(series):
+                self._write_series_meta(series, None)
+            return self._append_locked(series, list(rows), offsets)
+
+    def _append_locked(self, series: str, rows: list[dict], offsets: list[int] | None) -> int:
+        unique = SERIES[series]["unique_ts"]
+        groups: dict[str, tuple[list, list, list]] = {}
+        for i, row in enumerate(rows):
+            symbol = row.get("symbol")
+            if symbol is None or (unique and row.get("ts") is None):
+                continue
+            ts = _coerce_ts(row.get("ts"))
+            if ts is None:
+                continue
+            group = groups.setdefault(str(symbol), ([], [], []))
+            group[0].append(row)
+            group[1].append(ts)
+            group[2].append(offsets[i] if offsets is not None else -1)
+        return sum(self._append_symbol(series, symbol, *group) for symbol, group in groups.items())
+
+    def _append_symbol(self, series: str, symbol: str, rows: list[dict], ts: list[int], offsets: list[int]) -> int:
+        spec = SERIES[series]
+        sdir = self._symbol_dir(series, symbol)
+        manifest = _read_json(sdir / "symbol.json") or {
+            "version": FORMAT_VERSION,
+            "series": series,
+            "symbol": symbol,
+            "generation": 0,
+            "columns": dict(_FIXED),
+            "categories": {},
+            "partitions": [],
+        }
+        columns: dict[str, str] = manifest["columns"]
+        categories: dict[str, list[str]] = manifest["categories"]
+
+        names = list(columns)
+        seen = set(names) | {"symbol"}
+        for row in rows:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    names.append(key)
+        values = {name: [row.get(name) for row in rows] for name in names if name not in _FIXED}
+        kinds = dict(columns)
+        for name, column in values.items():
+            kind = kinds.get(name, "null")
+            for value in column:
+                kind = _widen(kind, _infer_kind(value))
+                if kind == "json":
+                    break
+            kinds[name] = kind
+
+        stale: list[Path] = []
+        changed = [name for name, kind in kinds.items() if columns.get(name) != kind]
+        if changed:
+            stale.extend(self._convert_columns(sdir, manifest, kinds, changed))
+        manifest["columns"] = kinds
+
+        lookups = {name: {key: i for i, key in enumerate(categories.get(name, []))} for name in kinds}
+        arrays = {"ts": np.array(ts, dtype=_DTYPES["int"]), "_offset": np.array(offsets, dtype=_DTYPES["int"])}
+        for name, column in values.items():
+            kind = kinds[name]
+            if kind != "null":
+                arrays[name] = _encode(kind, column, categories.setdefault(name, []) if kind in ("str", "json") else [], lookups[name])
+
+        order = np.argsort(arrays["ts"], kind="stable")
+        arrays = {name: array[order] for name, array in arrays.items()}
+        if spec["unique_ts"]:
+            arrays = self._keep_last(arrays)
+        keys = arrays["ts"].astype("datetime64[ms]").astype(f"datetime64[{spec['partition']}]")
+        bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        starts = [0, *bounds.tolist()]
+        stops = [*bounds.tolist(), len(keys)]
+
+        sdir.mkdir(parents=True, exist_ok=True)
+        parts = {part["key"]: part for part in manifest["partitions"]}
+        written = 0
+        for start, stop in zip(starts, stops):
+            key = str(keys[start])
+            chunk = {name: array[start:stop] for name, array in arrays.items()}
+            written += self._write_partition(sdir, manifest, parts, key, chunk, stale)
+        manifest["partitions"] = [parts[key] for key in sorted(parts)]
+        _write_json_atomic(sdir / "symbol.json", manifest)
+        for path in stale:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        return written
+
+    @staticmethod
+    def _keep_last(arrays: dict) -> dict:
+        ts = arrays["ts"]
+        if len(ts) < 2:
+            return arrays
+        keep = np.ones(len(ts), dtype=bool)
+        keep[:-1] = ts[1:] != ts[:-1]
+        if keep.all():
+            return arrays
+        return {name: array[keep] for name, array in arrays.items()}
+
+    def _convert_columns(self, sdir: Path, manifest: dict, kinds: dict, changed: list[str]) -> list[Path]:
+        """Write ``changed`` columns in their new kind into every partition; return the files they replace."""
+        old_kinds = manifest["columns"]
+        categories = manifest["categories"]
+        stale = []
+        for name in changed:
+            old, new = old_kinds.get(name, "null"), kinds[name]
+            new_categories: list[str] = []
+            lookup: dict[str, int] = {}
+            for part in manifest["partitions"]:
+                pdir = sdir / part["dir"]
+                rows = int(part["rows"])
+                if old == "null":
+                    decoded = [None] * rows
+                else:
+                    decoded = _decode(old, self._load_column(pdir, name, old, rows), categories.get(name, []), rows)
+                    stale.append(pdir / f"{name}.{old}")
+                _encode(new, decoded, new_categories, lookup).tofile(pdir / f"{name}.{new}")
+            if new in ("str", "json"):
+                categories[name] = new_categories
+            else:
+                categories.pop(name, None)
+        return stale
+
+    @staticmethod
+    def _load_column(pdir: Path, name: str, kind: str, rows: int):
+        return np.fromfile(pdir / f"{name}.{kind}", dtype=_DTYPES[kind], count=rows)
+
+    def _write_partition(self, sdir: Path, manifest: dict, parts: dict, key: str, chunk: dict, stale: list[Path]) -> int:
+        kinds = manifest["columns"]
+        unique = SERIES[manifest["series"]]["unique_ts"]
+        count = len(chunk["ts"])
+        part = parts.get(key)
+        if part is None:
+            self._write_new_partition(sdir, manifest, parts, key, chunk)
+            return count
+
+        pdir = sdir / part["dir"]
+        rows = int(part["rows"])
+        first = int(chunk["ts"][0])
+        if first > int(part["max_ts"]) or (not unique and first == int(part["max_ts"])):
+            for name, kind in kinds.items():
+                if kind == "null":
+                    continue
+                path = pdir / f"{name}.{kind}"
+                expected = rows * np.dtype(_DTYPES[kind]).itemsize
+                if path.stat().st_size != expected:
+                    os.truncate(path, expected)  # drop bytes from an append that never committed
+                with open(path, "ab") as handle:
+                    handle.write(np.ascontiguousarray(chunk[name]).tobytes())
+            part.update(rows=rows + count, max_ts=int(chunk["ts"][-1]))
+            return count
+
+        existing = {name: self._load_column(pdir, name, kind, rows) for name, kind in kinds.items() if kind != "null"}
+        merged = {name: np.concatenate([existing[name], chunk[name]]) for name in existing}
+        order = np.argsort(merged["ts"], kind="stable")
+        merged = {name: array[order] for name, array in merged.items()}
+        if unique:
+            merged = self._keep_last(merged)
+            if len(merged["ts"]) == rows and all(
+                _same(merged[name], existing[name]) for name in existing if name != "_offset"
+            ):
+                return 0
+        stale.append(pdir)
+        self._write_new_partition(sdir, manifest, parts, key, merged)
+        return count
+
+    @staticmethod
+    def _write_new_partition(sdir: Path, manifest: dict, parts: dict, key: str, arrays: dict) -> None:
+        manifest["generation"] = int(manifest.get("generation", 0)) + 1
+        name = f"{key}.g{manifest['generation']}"
+        pdir = sdir / name
+        pdir.mkdir(parents=True, exist_ok=True)
+        for column, kind in manifest["columns"].items():
+            if kind != "null":
+                np.ascontiguousarray(arrays[column]).tofile(pdir / f"{column}.{kind}")
+        ts = arrays["ts"]
+        parts[key] = {"key": key, "dir": name, "rows": int(len(ts)), "min_ts": int(ts[0]), "max_ts": int(ts[-1])}
+
+    # -- syncing from JSONL --------------------------------------------------
+
+    def sync_from_jsonl(self, series: str, path: Path, *, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+        """Bring ``series`` up to date with its JSONL file.
+
+        Lines appended since the last sync are parsed and added. Any other
+        change (a new inode, truncation, a same-size rewrite, or a changed
+        anchor before the last offset) rebuilds the series from the start.
+        """
+        path = Path(path)
+        with self._lock(series):
+            state = self.source_state(series)
+            if not path.exists():
+                return {"series": series, "mode": "missing", "rows": 0, "source": state}
+            st = path.stat()
+            if state and state.get("inode") == st.st_ino and state.get("size") == st.st_size and state.get("mtime_ns") == st.st_mtime_ns:
+                return {"series": series, "mode": "noop", "rows": 0, "source": state}
+            if _appended_since(path, state, st):
+                mode, start = "append", int(state.get("offset", 0))
+            else:
+                self._clear_locked(series)
+                mode, start = "rebuild", 0
+            count = 0
+            end = start
+            for rows, offsets, end in _read_jsonl_chunks(path, start, st.st_size, chunk_rows):
+                if rows:
+                    count += self._append_locked(series, rows, offsets)
+            state = _source_state(path, st, end)
+            self._write_series_meta(series, state)
+        return {"series": series, "mode": mode, "rows": count, "source": state}
+
+    def mark_synced(self, series: str, path: Path) -> dict:
+        """Record ``path`` as mirrored, after its rows were written here directly."""
+        path = Path(path)
+        with self._lock(series):
+            st = path.stat()
+            state = _source_state(path, st, st.st_size)
+            self._write_series_meta(series, state)
+        return state
+
+    # -- reading -------------------------------------------------------------
+
+    def load(
+        self,
+        series: str,
+        symbols: Iterable[str],
+        *,
+        start_ts: int | None = None,
+        end_ts: int | None = None,
+        min_offset: int | None = None,
+    ) -> dict[str, MarketRows]:
+        return {
+            symbol: self.read(series, symbol, start_ts=start_ts, end_ts=end_ts, min_offset=min_offset)
+            for symbol in symbols
+        }
+
+    def read(
+        self,
+        series: str,
+        symbol: str,
+        *,
+        start_ts: int | None = None,
+        end_ts: int | None = None,
+        min_offset: int | None = None,
+    ) -> MarketRows:
+        """Rows of ``symbol`` with ``start_ts <= ts <= end_ts``, memory-mapped from disk.
+
+        Only partitions that overlap the range are opened. ``min_offset``
+        keeps rows whose source line starts after that byte. This matches
+        the JSONL loaders' ``tail_bytes`` window.
+        """
+        sdir = self._symbol_dir(series, symbol)
+        manifest = _read_json(sdir / "symbol.json")
+        if manifest is None:
+            return MarketRows(symbol)
+        try:
+            return self._read(sdir, manifest, symbol, start_ts, end_ts, min_offset)
+        except FileNotFoundError:
+            # A writer replaced a partition after we read the manifest.
+            manifest = _read_json(sdir / "symbol.json") or manifest
+            return self._read(sdir, manifest, symbol, start_ts, end_ts, min_offset)
+
+    def _read(self, sdir: Path, manifest: dict, symbol: str, start_ts, end_ts, min_offset) -> MarketRows:
+        kinds = manifest["columns"]
+        pieces: dict[str, list] = {name: [] for name, kind in kinds.items() if kind != "null"}
+        for part in manifest["partitions"]:
+            if start_ts is not None and int(part["max_ts"]) < start_ts:
+                continue
+            if end_ts is not None and int(part["min_ts"]) > end_ts:
+                continue
+            pdir = sdir / part["dir"]
+            rows = int(part["rows"])
+            ts = _map(pdir / "ts.int", _DTYPES["int"], rows)
+            lo = int(np.searchsorted(ts, start_ts, side="left")) if start_ts is not None else 0
+            hi = int(np.searchsorted(ts, end_ts, side="right")) if end_ts is not None else rows
+            if hi <= lo:
+                continue
+            for name in pieces:
+                array = ts if name == "ts" else _map(pdir / f"{name}.{kinds[name]}", _DTYPES[kinds[name]], rows)
+                pieces[name].append(array[lo:hi])
+        columns = {}
+        for name, parts in pieces.items():
+            if not parts:
+                columns[name] = np.empty(0, dtype=_DTYPES[kinds[name]])
+            else:
+                columns[name] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        if min_offset is not None and len(columns["ts"]):
+            keep = columns["_offset"] > int(min_offset)
+            if not keep.all():
+                columns = {name: array[keep] for name, array in columns.items()}
+        return MarketRows(symbol, columns, kinds, manifest["categories"])
+
+    def stats(self, series: str) -> dict:
+        symbols = self.symbols(series)
+        rows = partitions = size = 0
+        for symbol in symbols:
+            sdir = self._symbol_dir(series, symbol)
+            manifest = _read_json(sdir / "symbol.json") or {}
+            for part in manifest.get("partitions", []):
+                partitions += 1
+                rows += int(part["rows"])
+                size += sum(p.stat().st_size for p in (sdir / part["dir"]).iterdir())
+        return {"symbols": len(symbols), "rows": rows, "partitions": partitions, "bytes": size}
@@ -24,37 +24,33 @@ def _clean_prices(prices: List[float]) -> List[float]:
     return out
 
 
-def detect_regime(prices: List[float], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+def regime_config(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     cfg = dict(_DEFAULTS)
     if params:
         cfg.update({k: v for k, v in params.items() if v is not None})
+    return cfg
 
-    p = _clean_prices(prices)
-    if len(p) < 3:
-        return {
-            "regime": "sideways",
-            "confidence": 0.0,
-            "features": {"reason": "insufficient_data", "n": len(p)},
-        }
 
+def regime_lookback(cfg: Dict[str, Any]) -> int:
     lb = int(cfg["lookback"])
-    if lb <= 2:
-        lb = 3
-    window = p[-lb:] if len(p) >= lb else p
+    return 3 if lb <= 2 else lb
+
 
-    first = window[0]
-    last = window[-1]
+def regime_from_window(first: float, last: float, ups: int, downs: int, n: int, cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify a price window from its endpoints and its count of rising/falling returns.
+
+    ``n`` is the window length; the window holds ``n - 1`` returns. Shared by
+    ``detect_regime`` and the rolling tracker in ``rolling_indicators``.
+    """
     denom = max(abs(first), float(cfg["min_price"]))
     norm_slope = (last - first) / denom  # coarse normalized drift
 
     # trend strength proxy: fraction of returns with same sign as overall slope
-    rets = [(window[i] / window[i-1] - 1.0) for i in range(1, len(window)) if window[i-1] > 0]
-    if not rets:
+    if n < 2:
         trend_strength = 0.0
     else:
-        sign = 1 if norm_slope > 0 else (-1 if norm_slope < 0 else 0)
-        aligned = sum(1 for r in rets if (r > 0 and sign > 0) or (r < 0 and sign < 0))
-        trend_strength = aligned / len(rets)
+        aligned = ups if norm_slope > 0 else (downs if norm_slope < 0 else 0)
+        trend_strength = aligned / (n - 1)
 
     sideways_th = float(cfg["sideways_threshold"])
     if abs(norm_slope) < sideways_th:
@@ -70,11 +66,39 @@ def detect_regime(prices: List[float], params: Optional[Dict[str, Any]] = None)
         "regime": regime,
         "confidence": confidence,
         "features": {
-            "n": len(window),
-            "lookback_used": len(window),
+            "n": n,
+            "lookback_used": n,
             "norm_slope": norm_slope,
             "trend_strength": trend_strength,
             "sideways_threshold": sideways_th,
             "conf_scale": conf_scale,
         },
     }
+
+
+def insufficient_regime(n: int) -> Dict[str, Any]:
+    return {
+        "regime": "sideways",
+        "confidence": 0.0,
+        "features": {"reason": "insufficient_data", "n": n},
+    }
+
+
+def detect_regime(prices: List[float], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    cfg = regime_config(params)
+
+    p = _clean_prices(prices)
+    if len(p) < 3:
+        return insufficient_regime(len(p))
+
+    lb = regime_lookback(cfg)
+    window = p[-lb:] if len(p) >= lb else p
+
+    ups = downs = 0
+    for i in range(1, len(window)):
+        r = window[i] / window[i - 1] - 1.0
+        if r > 0:
+            ups += 1
+        elif r < 0:
+            downs += 1
+    return regime_from_window(window[0], window[-1], ups, downs, len(window), cfg)
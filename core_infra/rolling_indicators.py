@@ -0,0 +1,292 @@
+"""Per-symbol rolling indicators for the sim replay, updated once per bar.
+
+The bar loops in ``sim_runner`` used to rebuild every indicator from a
+fresh slice on every bar. That meant SMAs over the trimmed close list,
+``detect_regime`` over the same list, and ``compute_volatility`` over the
+last 128 candles. A ``SymbolIndicators`` keeps those windows and one
+tracker per indicator, so a bar costs a deque append per tracker:
+
+* SMA and ATR: the last ``period`` values (closes, true ranges).
+* Breakout high/low over the prior N closes: monotonic deques.
+* Regime: the window endpoints and counts of rising and falling returns.
+* Rolling vol: the log-return window.
+
+Queries return what the batch functions return for the same windows.
+``sma`` matches ``sim_runner.sma`` and the ``_sma`` helpers over the close
+history. ``regime`` matches ``detect_regime`` over that history.
+``volatility`` matches ``compute_volatility(candles=<candle window>,
+prices=<close history>)``. Trackers are created on first query and seeded
+from the stored windows, so callers can ask for whatever periods their
+config names.
+
+Every value is bit-identical to the batch result. Means are summed left
+to right over their window at query time, like the batch code, because a
+running sum drifts by a few ulps. On tick-rounded, often flat closes that
+drift is enough to flip ``fast > slow`` ties. The windows are short (SMA
+periods up to ``history``, 30 returns for vol), so the sums are cheap.
+Closes are assumed positive, as market_stream writes them. The batch
+functions drop non-positive prices, which the engine does not.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+from .regime_detector import insufficient_regime, regime_config, regime_from_window, regime_lookback
+from .volatility_metrics import _DEFAULTS as _VOL_DEFAULTS
+from .volatility_metrics import _extract_ohlc, volatility_config
+
+
+class RollingMean:
+    """Mean of the last ``period`` values; None until the window is full.
+
+    The window is summed left to right on each query, as the batch SMAs do,
+    so the result is the same float rather than a running sum's drift.
+    """
+
+    __slots__ = ("period", "_window")
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self._window: Deque[float] = deque(maxlen=max(1, self.period))
+
+    def push(self, value: float) -> None:
+        self._window.append(value)
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.period <= 0 or len(self._window) < self.period:
+            return None
+        return sum(self._window) / float(self.period)
+
+
+class RollingExtrema:
+    """Max and min of the ``lookback`` values before the latest one."""
+
+    __slots__ = ("lookback", "_count", "_last", "_highs", "_lows")
+
+    def __init__(self, lookback: int):
+        self.lookback = int(lookback)
+        self._count = 0
+        self._last: Optional[float] = None
+        self._highs: Deque[Tuple[int, float]] = deque()
+        self._lows: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float) -> None:
+        last = self._last
+        if last is not None:
+            idx = self._count - 1
+            highs, lows = self._highs, self._lows
+            while highs and highs[-1][1] <= last:
+                highs.pop()
+            highs.append((idx, last))
+            while lows and lows[-1][1] >= last:
+                lows.pop()
+            lows.append((idx, last))
+            cutoff = idx - self.lookback
+            while highs[0][0] <= cutoff:
+                highs.popleft()
+            while lows[0][0] <= cutoff:
+                lows.popleft()
+        self._last = value
+        self._count += 1
+
+    @property
+    def value(self) -> Optional[Tuple[float, float]]:
+        if self.lookback <= 0 or self._count <= self.lookback:
+            return None
+        return self._highs[0][1], self._lows[0][1]
+
+
+class RollingRegime:
+    """Endpoints and up/down return counts of the last ``size`` prices."""
+
+    __slots__ = ("window", "ups", "downs", "_signs")
+
+    def __init__(self, size: int):
+        self.window: Deque[float] = deque(maxlen=max(1, int(size)))
+        self._signs: Deque[int] = deque()
+        self.ups = 0
+        self.downs = 0
+
+    def _count(self, sign: int, delta: int) -> None:
+        if sign > 0:
+            self.ups += delta
+        elif sign < 0:
+            self.downs += delta
+
+    def push(self, price: float) -> None:
+        window = self.window
+        if window:
+            r = price / window[-1] - 1.0
+            sign = 1 if r > 0 else (-1 if r < 0 else 0)
+            if len(window) == window.maxlen:
+                self._count(self._signs.popleft(), -1)
+            self._signs.append(sign)
+            self._count(sign, 1)
+        window.append(price)
+
+
+class RollingVol:
+    """Population std-dev of the last ``window`` log returns, computed as ``compute_rolling_vol`` does."""
+
+    __slots__ = ("window", "_returns", "_last")
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._returns: Deque[float] = deque(maxlen=max(1, self.window))
+        self._last: Optional[float] = None
+
+    def push(self, price: float) -> None:
+        last, self._last = self._last, price
+        if last is not None:
+            self._returns.append(math.log(price / last))
+
+    @property
+    def value(self) -> Optional[float]:
+        returns = self._returns
+        if len(returns) < self.window:
+            return None
+        mean = sum(returns) / len(returns)
+        return math.sqrt(sum((r - mean) ** 2 for r in returns) / len(returns))
+
+
+class RollingATR:
+    """Mean true range over the last ``period`` valid candles."""
+
+    __slots__ = ("period", "last_close", "_ranges")
+
+    def __init__(self, period: int):
+        self.period = int(period)
+        self.last_close: Optional[float] = None
+        self._ranges = RollingMean(self.period)
+
+    def push(self, ohlc: Tuple[float, float, float, float]) -> None:
+        _, high, low, close = ohlc
+        prev_close = self.last_close
+        if prev_close is not None:
+            self._ranges.push(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+        self.last_close = close
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._ranges.value
+
+
+class SymbolIndicators:
+    """Rolling indicators over one symbol's bars.
+
+    ``history`` is the close window the strategies see (``sim_runner`` keeps
+    ``SLOW_PERIOD + 5``). ``candle_window`` is the candle window used for ATR
+    (0 disables it). Call ``update`` once per bar, then query.
+    """
+
+    def __init__(self, history: int, candle_window: int = 0):
+        self.history = max(1, int(history))
+        self.candle_window = max(0, int(candle_window))
+        self._closes: Deque[float] = deque(maxlen=self.history)
+        self._candles: Optional[Deque[Optional[tuple]]] = deque(maxlen=self.candle_window) if self.candle_window else None
+        self._valid_candles = 0
+        self._trackers: Dict[tuple, Any] = {}
+        self._atr: Dict[int, RollingATR] = {}
+
+    def update(self, bar: Mapping[str, Any]) -> None:
+        close = bar["c"]
+        self._closes.append(close)
+        for tracker in self._trackers.values():
+            tracker.push(close)
+        candles = self._candles
+        if candles is not None:
+            ohlc = _extract_ohlc(bar)
+            if len(candles) == candles.maxlen and candles[0] is not None:
+                self._valid_candles -= 1
+            candles.append(ohlc)
+            if ohlc is not None:
+                self._valid_candles += 1
+                for atr in self._atr.values():
+                    atr.push(ohlc)
+
+    @property
+    def closes(self) -> list:
+        return list(self._closes)
+
+    def _tracker(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            tracker = factory()
+            for close in self._closes:
+                tracker.push(close)
+            self._trackers[key] = tracker
+        return tracker
+
+    def sma(self, period: int) -> Optional[float]:
+        period = int(period)
+        if period <= 0 or period > self.history:
+            return None
+        return self._tracker(("sma", period), lambda: RollingMean(period)).value
+
+    def prior_extremes(self, lookback: int) -> Optional[Tuple[float, float]]:
+        """``(max, min)`` of the ``lookback`` closes before the latest, or None."""
+        lookback = int(lookback)
+        if lookback <= 0 or lookback >= self.history:
+            return None
+        return self._tracker(("extrema", lookback), lambda: RollingExtrema(lookback)).value
+
+    def regime(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        cfg = regime_config(params)
+        size = min(regime_lookback(cfg), self.history)
+        tracker = self._tracker(("regime", size), lambda: RollingRegime(size))
+        window = tracker.window
+        if len(window) < 3:
+            return insufficient_regime(len(window))
+        return regime_from_window(window[0], window[-1], tracker.ups, tracker.downs, len(window), cfg)
+
+    def _atr_tracker(self, period: int) -> RollingATR:
+        tracker = self._atr.get(period)
+        if tracker is None:
+            tracker = self._atr[period] = RollingATR(period)
+            for ohlc in self._candles or ():
+                if ohlc is not None:
+                    tracker.push(ohlc)
+        return tracker
+
+    def volatility(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        cfg = volatility_config(params)
+        if self._candles:
+            period = max(1, int(cfg["atr_period"]))
+            atr = atr_pct = None
+            if self._valid_candles >= period + 1:
+                tracker = self._atr_tracker(period)
+                atr = tracker.value
+                last_close = tracker.last_close
+                atr_pct = (atr / max(abs(last_close), _VOL_DEFAULTS["min_price"])) if last_close else None
+            atr_out = {"atr": atr, "atr_pct": atr_pct, "n": self._valid_candles, "period_used": period}
+        else:
+            atr_out = {"atr": None, "atr_pct": None, "n": 0, "period_used": int(cfg["atr_period"])}
+
+        n_prices = len(self._closes)
+        if n_prices:
+            window = max(2, int(cfg["vol_window"]))
+            vol = None
+            if window + 1 <= n_prices:
+                vol = self._tracker(("vol", window), lambda: RollingVol(window)).value
+            vol_out = {
+                "rolling_vol": vol,
+                "rolling_vol_pct": vol * 100.0 if vol is not None else None,
+                "n": n_prices,
+                "window_used": window,
+            }
+        else:
+            vol_out = {"rolling_vol": None, "rolling_vol_pct": None, "n": 0, "window_used": int(cfg["vol_window"])}
+
+        return {
+            "atr": atr_out["atr"],
+            "atr_pct": atr_out["atr_pct"],
+            "rolling_vol": vol_out["rolling_vol"],
+            "rolling_vol_pct": vol_out["rolling_vol_pct"],
+            "n": max(int(atr_out["n"]), int(vol_out["n"])),
+            "window_used": vol_out["window_used"],
+            "period_used": atr_out["period_used"],
+        }
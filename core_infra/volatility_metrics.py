@@ -31,6 +31,13 @@ def _extract_ohlc(candle: Dict[str, Any]) -> Optional[Tuple[float, float, float,
     return o, h, l, cl
 
 
+def volatility_config(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    cfg = dict(_DEFAULTS)
+    if params:
+        cfg.update({k: v for k, v in params.items() if v is not None})
+    return cfg
+
+
 def compute_atr(candles: List[Dict[str, Any]], period: int = 14) -> Dict[str, Any]:
     period = max(1, int(period))
     ohlc = [x for x in (_extract_ohlc(c) for c in candles) if x is not None]
@@ -74,9 +81,7 @@ def compute_volatility(
     prices: Optional[List[float]] = None,
     params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    cfg = dict(_DEFAULTS)
-    if params:
-        cfg.update({k: v for k, v in params.items() if v is not None})
+    cfg = volatility_config(params)
 
     derived_prices: List[float] = []
     if prices:
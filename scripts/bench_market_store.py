@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Sim startup cost: JSONL loaders vs. the columnar market store.
+
+Writes synthetic ``candles_15m.jsonl`` and ``ticks.jsonl`` files (``--symbols``
+symbols, ``--days`` days of 15m bars, ``--ticks`` trades) into a temp
+market dir. Each loader is timed three ways:
+
+* ``jsonl``: the plain JSONL path.
+* ``store``: a warm store, where the sync is a no-op. Rows stay lazy until
+  touched. ``store_rows_ms`` also builds every row dict, as a full replay would.
+* ``store_window``: the store limited to the last ``--window-days``.
+
+Ticks are loaded without a tail limit, so every path reads the whole
+history. The one-off conversion, the cost of syncing an appended batch of
+ticks, and a check that the store rows match the JSONL rows are reported
+too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra.market_store import STORE_ENV, available  # noqa: E402
+from scripts import market_store_convert, sim_runner  # noqa: E402
+
+BAR_MS = 15 * 60 * 1000
+DAY_MS = 86_400_000
+T0 = 1_767_225_600_000
+
+
+def _write_market(market: Path, symbols: list[str], days: int, ticks: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(market / "candles_15m.jsonl", "w", encoding="utf-8") as handle:
+        for symbol in symbols:
+            price = 100.0
+            for i in range(days * 96):
+                price *= 1.0 + rng.gauss(0, 0.002)
+                row = {"symbol": symbol, "ts": T0 + i * BAR_MS, "o": price, "h": price * 1.001, "l": price * 0.999,
+                       "c": price, "v": rng.uniform(1, 50), "interval": "15m", "source": "binance"}
+                handle.write(json.dumps(row) + "\n")
+    span = days * DAY_MS
+    with open(market / "ticks.jsonl", "w", encoding="utf-8") as handle:
+        for i in range(ticks):
+            ts = T0 + (i * span) // ticks
+            row = {"symbol": rng.choice(symbols), "ts": ts, "price": 100.0 + rng.uniform(-1, 1),
+                   "qty": rng.uniform(0.001, 2.0), "side": rng.choice(["buy", "sell"]), "trade_id": i,
+                   "source": "binance_ws"}
+            handle.write(json.dumps(row) + "\n")
+
+
+def _time(fn, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000.0, result
+
+
+def _bare(rows):
+    return [{k: v for k, v in row.items() if v is not None} for row in rows]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=8)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--window-days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    if not available():
+        print("ERROR: numpy is required for the market store", file=sys.stderr)
+        return 2
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    window_start = T0 + (args.days - args.window_days) * DAY_MS
+    report = {"symbols": args.symbols, "days": args.days, "tick_rows": args.ticks, "window_days": args.window_days}
+    with tempfile.TemporaryDirectory() as tmp:
+        market = Path(tmp)
+        _write_market(market, symbols, args.days, args.ticks, args.seed)
+        candles_path, ticks_path = market / "candles_15m.jsonl", market / "ticks.jsonl"
+        report["jsonl_mb"] = round((candles_path.stat().st_size + ticks_path.stat().st_size) / 1e6, 1)
+
+        loaders = {
+            "candles": lambda **kw: sim_runner.load_candles(symbols, candles_path, **kw),
+            "ticks": lambda **kw: sim_runner.load_ticks(symbols, ticks_path, tail_bytes=None, **kw),
+        }
+        with mock.patch.dict(os.environ, {STORE_ENV: "0"}):
+            jsonl = {name: _time(fn, args.repeat) for name, fn in loaders.items()}
+
+        started = time.perf_counter()
+        market_store_convert.convert(market, ["candles_15m", "ticks"])
+        report["convert_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+
+        store = {name: _time(fn, args.repeat) for name, fn in loaders.items()}
+        rows = {name: _time(lambda fn=fn: {s: list(v) for s, v in fn().items()}, args.repeat) for name, fn in loaders.items()}
+        window = {name: _time(lambda fn=fn: fn(start_ts=window_start), args.repeat) for name, fn in loaders.items()}
+        for name in loaders:
+            report[name] = {
+                "jsonl_ms": round(jsonl[name][0], 1),
+                "store_ms": round(store[name][0], 1),
+                "store_rows_ms": round(rows[name][0], 1),
+                "store_window_ms": round(window[name][0], 1),
+                "speedup": round(jsonl[name][0] / max(store[name][0], 1e-9), 1),
+                "rows_match": all(_bare(store[name][1][s]) == _bare(jsonl[name][1][s]) for s in symbols),
+            }
+
+        first_row = json.loads(ticks_path.open(encoding="utf-8").readline())
+        with open(ticks_path, "a", encoding="utf-8") as handle:
+            for i in range(10_000):
+                handle.write(json.dumps({**first_row, "ts": T0 + args.days * DAY_MS + i, "trade_id": -i}) + "\n")
+        report["append_10k_ticks_then_load_ms"] = round(_time(loaders["ticks"], 1)[0], 1)
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Per-bar indicator cost in the sim replay: batch recomputation vs. ``SymbolIndicators``.
+
+Builds ``--bars`` synthetic 15m candles for one symbol and replays them the
+way ``sim_runner`` does: a close list trimmed to ``SLOW_PERIOD + 5`` and a
+128-candle window. Two parts are timed for each path:
+
+* ``indicators``: the trend SMAs, breakout high/low, ``detect_regime`` and
+  ``compute_volatility`` that the competing models read on every bar.
+  ``batch`` recomputes them from the slices; ``rolling`` updates the engine
+  and queries it.
+* ``competing_models``: the whole ``run_competing_models`` call per bar,
+  without and with ``indicators=``.
+
+Both paths must produce the same regimes and decisions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra.competing_models import _DEFAULTS, _sma, run_competing_models  # noqa: E402
+from core_infra.regime_detector import detect_regime  # noqa: E402
+from core_infra.rolling_indicators import SymbolIndicators  # noqa: E402
+from core_infra.volatility_metrics import compute_volatility  # noqa: E402
+from scripts.sim_runner import COMPETING_CANDLE_WINDOW, SLOW_PERIOD  # noqa: E402
+
+HISTORY = SLOW_PERIOD + 5
+
+
+def _bars(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    price, bars = 100.0, []
+    for idx in range(count):
+        price *= 1.0 + rng.gauss(0.0, 0.003)
+        bars.append({"ts": idx * 900_000, "o": price, "h": price * 1.002, "l": price * 0.998, "c": price, "v": 1.0})
+    return bars
+
+
+def _replay(bars: list[dict], step) -> tuple[float, list]:
+    engine = SymbolIndicators(HISTORY, candle_window=COMPETING_CANDLE_WINDOW)
+    closes, out = [], []
+    started = time.perf_counter()
+    for idx, bar in enumerate(bars):
+        closes.append(bar["c"])
+        if len(closes) > HISTORY:
+            closes = closes[-HISTORY:]
+        out.append(step(idx, bar, closes, engine))
+    return (time.perf_counter() - started) * 1000.0, out
+
+
+def batch_indicators(bars):
+    def step(idx, bar, closes, engine):
+        candles = bars[max(0, idx + 1 - COMPETING_CANDLE_WINDOW):idx + 1]
+        lb = int(_DEFAULTS["breakout_lookback"])
+        hist = closes[-(lb + 1):-1] if len(closes) > lb else []
+        return (
+            _sma(closes, _DEFAULTS["trend_fast"]) is not None,
+            (max(hist), min(hist)) if hist else None,
+            detect_regime(closes, _DEFAULTS["regime_params"])["regime"],
+            compute_volatility(candles=candles, prices=closes, params=_DEFAULTS["volatility_params"])["atr"] is not None,
+            _sma(closes, _DEFAULTS["trend_slow"]) is not None,
+            _sma(closes, _DEFAULTS["pullback_lookback"]) is not None,
+        )
+
+    return _replay(bars, step)
+
+
+def rolling_indicators(bars):
+    def step(idx, bar, closes, engine):
+        engine.update(bar)
+        return (
+            engine.sma(_DEFAULTS["trend_fast"]) is not None,
+            engine.prior_extremes(_DEFAULTS["breakout_lookback"]),
+            engine.regime(_DEFAULTS["regime_params"])["regime"],
+            engine.volatility(_DEFAULTS["volatility_params"])["atr"] is not None,
+            engine.sma(_DEFAULTS["trend_slow"]) is not None,
+            engine.sma(_DEFAULTS["pullback_lookback"]) is not None,
+        )
+
+    return _replay(bars, step)
+
+
+def competing(bars, use_engine: bool):
+    state: dict = {}
+
+    def step(idx, bar, closes, engine):
+        candles = bars[max(0, idx + 1 - COMPETING_CANDLE_WINDOW):idx + 1]
+        if use_engine:
+            engine.update(bar)
+        out = run_competing_models(
+            symbol_state=state,
+            ts=bar["ts"],
+            closes=closes,
+            candles=candles,
+            include_sentiment=True,
+            indicators=engine if use_engine else None,
+        )
+        return out["enter_long"], out["exit_long"], out["top_model"], out["regime"]["regime"]
+
+    return _replay(bars, step)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=35_040, help="15m bars to replay (default: one year)")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args(argv)
+
+    bars = _bars(args.bars, args.seed)
+    report = {"bars": args.bars}
+    for name, batch, rolling in (
+        ("indicators", lambda: batch_indicators(bars), lambda: rolling_indicators(bars)),
+        ("competing_models", lambda: competing(bars, False), lambda: competing(bars, True)),
+    ):
+        batch_ms, batch_out = batch()
+        rolling_ms, rolling_out = rolling()
+        report[name] = {
+            "batch_ms": round(batch_ms, 1),
+            "rolling_ms": round(rolling_ms, 1),
+            "batch_us_per_bar": round(batch_ms * 1000.0 / max(1, args.bars), 2),
+            "rolling_us_per_bar": round(rolling_ms * 1000.0 / max(1, args.bars), 2),
+            "speedup": round(batch_ms / max(rolling_ms, 1e-9), 2),
+            "same_outputs": batch_out == rolling_out,
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Replay time alignment: per-step linear scans vs. as-of cursors in the sim loops.
+
+Builds a synthetic year for one symbol:
+
+* 15m bars, plus 1h bars with ``--htf-gap-pct`` of hours missing.
+* ``--ticks`` trades spread over the year.
+* Funding every 8h.
+* ``--quotes`` venue quotes.
+
+It then runs the alignment part of the two ``sim_runner.run`` loops twice.
+``legacy`` uses the former lookups: ``max([t for t in htf if t <= ts])``, a
+``latest_at_or_before`` scan from the start for funding, and a hand-rolled
+quote pointer. ``asof`` uses ``AsOfCursor``. Strategy code is left out so
+the report isolates the lookup cost. Both paths must pick the same rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra.asof import AsOfCursor  # noqa: E402
+from scripts.sim_runner import build_htf_regime  # noqa: E402
+
+HOUR_MS = 3_600_000
+BAR_MS = 900_000
+YEAR_MS = 365 * 24 * HOUR_MS
+T0 = 1_767_225_600_000
+
+
+def _synthetic(ticks: int, quotes: int, gap_pct: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    price = 100.0
+    bars_15m = []
+    for i in range(YEAR_MS // BAR_MS):
+        price *= 1.0 + rng.gauss(0, 0.002)
+        bars_15m.append({"symbol": "BTCUSDT", "ts": T0 + i * BAR_MS, "c": price})
+    bars_1h = [
+        {"symbol": "BTCUSDT", "ts": bar["ts"], "c": bar["c"]}
+        for bar in bars_15m[::4]
+        if rng.random() >= gap_pct / 100.0
+    ]
+    tick_ts = sorted(T0 + rng.randrange(YEAR_MS) for _ in range(ticks))
+    quote_ts = sorted(T0 + rng.randrange(YEAR_MS) for _ in range(quotes))
+    return {
+        "bars": bars_15m,
+        "htf": build_htf_regime({"BTCUSDT": bars_1h}, ["BTCUSDT"])["BTCUSDT"],
+        "ticks": [{"ts": ts, "price": 100.0} for ts in tick_ts],
+        "funding": [{"ts": T0 + i * 8 * HOUR_MS, "last_funding_rate": 0.0001} for i in range(YEAR_MS // (8 * HOUR_MS))],
+        "quotes": [{"ts": ts, "venue": "binance_spot", "best_bid": 99.9, "best_ask": 100.1} for ts in quote_ts],
+    }
+
+
+def _latest_at_or_before(rows, ts):
+    latest = None
+    for row in rows:
+        if int(row.get("ts", 0) or 0) > int(ts):
+            break
+        latest = row
+    return latest
+
+
+def legacy_ticks(data: dict) -> list:
+    htf_rows, quotes, funding = data["htf"], data["quotes"], data["funding"]
+    quote_idx, current_quote, picked = 0, None, []
+    for tick in data["ticks"]:
+        ts = int(tick["ts"])
+        htf_bull = htf_rows.get((ts // HOUR_MS) * HOUR_MS)
+        if htf_bull is None and htf_rows:
+            earlier = [t for t in htf_rows if t <= ts]
+            if earlier:
+                htf_bull = htf_rows[max(earlier)]
+        while quote_idx < len(quotes) and int(quotes[quote_idx].get("ts", 0) or 0) <= ts:
+            current_quote = quotes[quote_idx]
+            quote_idx += 1
+        picked.append((htf_bull, id(current_quote), id(_latest_at_or_before(funding, ts))))
+    return picked
+
+
+def asof_ticks(data: dict) -> list:
+    htf_rows = data["htf"]
+    htf_asof = AsOfCursor.over_mapping(htf_rows)
+    quote_asof = AsOfCursor.over_rows(data["quotes"])
+    funding_asof = AsOfCursor.over_rows(data["funding"])
+    picked = []
+    for tick in data["ticks"]:
+        ts = int(tick["ts"])
+        htf_bull = htf_rows.get((ts // HOUR_MS) * HOUR_MS)
+        if htf_bull is None:
+            htf_bull = htf_asof.at(ts)
+        picked.append((htf_bull, id(quote_asof.at(ts)), id(funding_asof.at(ts))))
+    return picked
+
+
+def legacy_bars(data: dict) -> list:
+    sym_htf, picked = data["htf"], []
+    for bar in data["bars"]:
+        htf_bull = None
+        if sym_htf:
+            htf_bull = sym_htf.get((bar["ts"] // HOUR_MS) * HOUR_MS)
+            if htf_bull is None:
+                earlier = [t for t in sym_htf if t <= bar["ts"]]
+                if earlier:
+                    htf_bull = sym_htf[max(earlier)]
+        picked.append(htf_bull)
+    return picked
+
+
+def asof_bars(data: dict) -> list:
+    sym_htf, picked = data["htf"], []
+    htf_asof = AsOfCursor.over_mapping(sym_htf)
+    for bar in data["bars"]:
+        htf_bull = sym_htf.get((bar["ts"] // HOUR_MS) * HOUR_MS)
+        if htf_bull is None:
+            htf_bull = htf_asof.at(bar["ts"])
+        picked.append(htf_bull)
+    return picked
+
+
+def _timed(fn, data):
+    started = time.perf_counter()
+    out = fn(data)
+    return (time.perf_counter() - started) * 1000.0, out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=200_000)
+    parser.add_argument("--quotes", type=int, default=50_000)
+    parser.add_argument("--htf-gap-pct", type=float, default=3.0, help="Share of 1h bars missing")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    data = _synthetic(args.ticks, args.quotes, args.htf_gap_pct, args.seed)
+    report = {
+        "bars_15m": len(data["bars"]),
+        "htf_hours": len(data["htf"]),
+        "ticks": len(data["ticks"]),
+        "funding_rows": len(data["funding"]),
+        "quotes": len(data["quotes"]),
+    }
+    for name, legacy, asof in (("bar_loop", legacy_bars, asof_bars), ("tick_loop", legacy_ticks, asof_ticks)):
+        legacy_ms, legacy_out = _timed(legacy, data)
+        asof_ms, asof_out = _timed(asof, data)
+        report[name] = {
+            "legacy_ms": round(legacy_ms, 1),
+            "asof_ms": round(asof_ms, 1),
+            "speedup": round(legacy_ms / max(asof_ms, 1e-9), 1),
+            "same_rows": legacy_out == asof_out,
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Parameter sweep throughput: sequential ``sim_runner.run`` calls vs. ``sim_sweep`` with a process pool.
+
+Writes a synthetic market (``--days`` of 15m and 1h bars for ``--symbols``
+symbols) and a config with a single ``regime_gated_long_flat`` sim into a
+temp dir. It then runs a ``--variants``-point grid over
+``execution.max_notional_pct`` three ways:
+
+* ``rerun``: one ``sim_runner.run`` per variant, the pre-sweep workflow.
+  The market is reloaded every time.
+* ``sweep_serial``: ``sim_sweep.sweep`` with one worker. The market is
+  loaded once.
+* ``sweep_pool``: ``sim_sweep.sweep`` with ``--workers`` forked workers.
+
+The report gives variants/sec for each path and the CPU count. Pool scaling
+is bounded by the cores available.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import sim_runner, sim_sweep  # noqa: E402
+
+BAR_MS = 900_000
+HOUR_MS = 3_600_000
+T0 = 1_767_225_600_000
+
+
+def _write_market(market: Path, symbols: list[str], days: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for name, step, count in (("candles_15m.jsonl", BAR_MS, days * 96), ("candles_1h.jsonl", HOUR_MS, days * 24)):
+        with open(market / name, "w", encoding="utf-8") as handle:
+            for symbol in symbols:
+                price = 100.0
+                for i in range(count):
+                    price *= 1.0 + rng.gauss(0, 0.002) + 0.001 * math.sin(i / 40.0)
+                    row = {"symbol": symbol, "ts": T0 + i * step, "o": price, "h": price * 1.001, "l": price * 0.999, "c": price, "v": 1.0}
+                    handle.write(json.dumps(row) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--variants", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    sizes = [round(0.01 * (i + 1), 4) for i in range(args.variants)]
+    report = {"cpu_count": os.cpu_count(), "workers": args.workers, "symbols": args.symbols, "days": args.days, "variants": args.variants}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        market = root / "market"
+        market.mkdir()
+        _write_market(market, symbols, args.days, args.seed)
+        sim_cfg = {
+            "id": "SIM_A",
+            "strategy": "regime_gated_long_flat",
+            "universe": symbols,
+            "capital": 1000,
+            "dd_kill": 0.9,
+            "daily_loss": 0.9,
+            "max_trades_per_day": 50,
+        }
+        config_path = root / "config.json"
+        config_path.write_text(json.dumps({"sims": [sim_cfg]}), encoding="utf-8")
+        patches = {"BASE_DIR": root, "CANDLES_15M": market / "candles_15m.jsonl", "CANDLES_1H": market / "candles_1h.jsonl"}
+
+        timings, results = {}, {}
+        with mock.patch.multiple(sim_runner, **patches), contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            rerun = []
+            for size in sizes:
+                variant_path = root / f"config_{size}.json"
+                variant_path.write_text(json.dumps({"sims": [dict(sim_cfg, execution={"max_notional_pct": size})]}), encoding="utf-8")
+                sim_runner.run(full=True, config_path=variant_path)
+                rerun.append(json.loads((root / "sim" / "SIM_A" / "performance.json").read_text(encoding="utf-8")))
+            timings["rerun"] = time.perf_counter() - started
+
+            grid = {"execution.max_notional_pct": sizes}
+            for name, workers in (("sweep_serial", 1), ("sweep_pool", args.workers)):
+                started = time.perf_counter()
+                results[name] = sim_sweep.sweep(config_path=config_path, params=grid, workers=workers, out_dir=root / name)
+                timings[name] = time.perf_counter() - started
+
+        for name, seconds in timings.items():
+            report[name] = {"seconds": round(seconds, 2), "variants_per_sec": round(args.variants / max(seconds, 1e-9), 2)}
+        report["pool_vs_serial"] = round(timings["sweep_serial"] / max(timings["sweep_pool"], 1e-9), 2)
+        report["pool_vs_rerun"] = round(timings["rerun"] / max(timings["sweep_pool"], 1e-9), 2)
+        by_size = {row["params"]["execution.max_notional_pct"]: row for row in results["sweep_pool"]}
+        strip = [[{k: v for k, v in row.items() if k != "seconds"} for row in results[name]] for name in results]
+        report["results_match"] = strip[0] == strip[1] and all(
+            {k: by_size[size][k] for k in perf} == perf for size, perf in zip(sizes, rerun)
+        )
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
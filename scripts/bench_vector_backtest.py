@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""SIM_A/SIM_B replay cost: the per-bar event loop vs. ``--engine vector``.
+
+Writes a synthetic market (``--days`` of 15m and 1h bars for ``--symbols``
+symbols) into a temp dir and loads it once. Then it runs ``run_sim(full=True)``
+for a ``regime_gated_long_flat`` and an ``itc_sentiment_tilt_long_flat``
+sim with each engine. Hourly sentiment scores are injected so the SIM_B
+tilt moves.
+
+The report gives seconds and µs per bar for each engine, the speedup, and
+whether trades.jsonl, state and performance.json came out identical.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import sim_runner  # noqa: E402
+
+BAR_MS = 900_000
+HOUR_MS = 3_600_000
+T0 = 1_767_225_600_000
+
+
+def _write_market(market: Path, symbols: list[str], days: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for name, step, count in (("candles_15m.jsonl", BAR_MS, days * 96), ("candles_1h.jsonl", HOUR_MS, days * 24)):
+        with open(market / name, "w", encoding="utf-8") as handle:
+            for symbol in symbols:
+                price = 100.0
+                for i in range(count):
+                    price *= 1.0 + rng.gauss(0, 0.002) + 0.001 * math.sin(i / 40.0)
+                    row = {"symbol": symbol, "ts": T0 + i * step, "o": price, "h": price * 1.001, "l": price * 0.999, "c": price, "v": 1.0}
+                    handle.write(json.dumps(row) + "\n")
+
+
+def _outputs(sim_dir: Path) -> dict:
+    state = json.loads((sim_dir / "state.json").read_text(encoding="utf-8"))
+    state.pop("updated_at", None)
+    return {
+        "trades": (sim_dir / "trades.jsonl").read_text(encoding="utf-8"),
+        "state": state,
+        "performance": (sim_dir / "performance.json").read_text(encoding="utf-8"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    base = {"universe": symbols, "capital": 1000, "dd_kill": 0.9, "daily_loss": 0.9, "max_trades_per_day": 50}
+    sims_cfg = [
+        dict(base, id="SIM_A", strategy="regime_gated_long_flat"),
+        dict(base, id="SIM_B", strategy="itc_sentiment_tilt_long_flat"),
+    ]
+    bars = args.symbols * args.days * 96
+    report = {"symbols": args.symbols, "days": args.days, "bars": bars}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        market = root / "market"
+        market.mkdir()
+        _write_market(market, symbols, args.days, args.seed)
+        patches = {"BASE_DIR": root, "REPO_ROOT": root, "CANDLES_15M": market / "candles_15m.jsonl", "CANDLES_1H": market / "candles_1h.jsonl"}
+        rng = random.Random(args.seed)
+        sentiment = {T0 + h * HOUR_MS: rng.uniform(-1.0, 1.0) for h in range(args.days * 24)}
+        with mock.patch.multiple(sim_runner, **patches), mock.patch.object(sim_runner, "get_itc_signal", None), contextlib.redirect_stdout(io.StringIO()):
+            ctx = dict(sim_runner.load_market_context({"sims": sims_cfg}, sims_cfg), f_log=False, sentiment=sentiment)
+            for cfg in sims_cfg:
+                timings, outputs = {}, {}
+                for engine in sim_runner.ENGINES:
+                    started = time.perf_counter()
+                    outcome = sim_runner.run_sim(cfg, ctx, full=True, sim_root=root / engine, engine=engine)
+                    timings[engine] = time.perf_counter() - started
+                    outputs[engine] = _outputs(Path(outcome["sim_dir"]))
+                report[cfg["id"]] = {
+                    **{f"{engine}_seconds": round(seconds, 3) for engine, seconds in timings.items()},
+                    **{f"{engine}_us_per_bar": round(seconds * 1e6 / max(1, bars), 2) for engine, seconds in timings.items()},
+                    "speedup": round(timings["event"] / max(timings["vector"], 1e-9), 2),
+                    "trades": outputs["event"]["trades"].count("\n"),
+                    "same_outputs": outputs["event"] == outputs["vector"],
+                }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
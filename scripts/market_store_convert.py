@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Convert market JSONL files into the columnar store read by sim_runner.
+
+The first run parses each file once into market/store. Later runs, like
+sim_runner itself, parse only the lines appended since the last sync, or
+rebuild a series whose file was rewritten. Prints a JSON summary.
+
+Usage:
+  python scripts/market_store_convert.py
+  python scripts/market_store_convert.py --series ticks --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra.market_store import SERIES, STORE_DIRNAME, MarketStore, available  # noqa: E402
+
+DEFAULT_MARKET_DIR = REPO_ROOT / "market"
+
+
+def convert(market_dir: Path, series_names, *, rebuild: bool = False) -> list[dict]:
+    store = MarketStore(market_dir / STORE_DIRNAME)
+    report = []
+    for series in series_names:
+        source = market_dir / SERIES[series]["file"]
+        if not source.exists():
+            report.append({"series": series, "mode": "missing", "path": str(source)})
+            continue
+        if rebuild:
+            store.reset(series)
+        started = time.perf_counter()
+        result = store.sync_from_jsonl(series, source)
+        report.append(
+            {
+                "series": series,
+                "mode": result["mode"],
+                "rows_added": result["rows"],
+                "seconds": round(time.perf_counter() - started, 3),
+                "source_bytes": source.stat().st_size,
+                **store.stats(series),
+            }
+        )
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--market-dir", type=str, default=str(DEFAULT_MARKET_DIR))
+    parser.add_argument("--series", action="append", choices=sorted(SERIES), help="Series to convert (default: all)")
+    parser.add_argument("--rebuild", action="store_true", help="Drop and reconvert instead of syncing appends")
+    args = parser.parse_args(argv)
+    if not available():
+        print("ERROR: numpy is required for the market store", file=sys.stderr)
+        return 2
+    market_dir = Path(args.market_dir)
+    report = convert(market_dir, args.series or list(SERIES), rebuild=args.rebuild)
+    print(json.dumps({"store": str(market_dir / STORE_DIRNAME), "series": report}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,9 @@ Fetches public OHLCV candles for the configured trading universe and writes:
   - market/candles_15m.jsonl
   - market/candles_1h.jsonl
 
-The output format matches what scripts/sim_runner.py already expects.
+The output format matches what scripts/sim_runner.py already expects. If the
+columnar store has been created (scripts/market_store_convert.py), it is
+updated in place after each write.
 """
 
 from __future__ import annotations
@@ -28,6 +30,11 @@ except ImportError:
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra.market_store import store_for_jsonl
+
 DEFAULT_CONFIG_PATH = REPO_ROOT / "pipelines" / "system1_trading.yaml"
 CONFIG_ENV = "OPENCLAW_CONFIG_PATH"
 DEFAULT_BINANCE_BASE_URL = "https://api.binance.com"
@@ -482,6 +489,27 @@ def write_jsonl(path: Path, rows):
             handle.write(json.dumps(row, ensure_ascii=False) + "\n")
 
 
+def sync_store(path: Path, rows, *, replace: bool = False):
+    """Mirror rows just written to ``path`` into the columnar store, if one was created.
+
+    ``rows`` must cover everything in the file that may have changed. With
+    ``replace`` the store's copy of the series is dropped first.
+    """
+    found = store_for_jsonl(path)
+    if found is None:
+        return None
+    store, series = found
+    try:
+        if replace:
+            store.reset(series)
+        written = store.append(series, rows)
+        store.mark_synced(series, path)
+    except OSError as exc:
+        print(f"WARN: market store sync failed for {series}: {exc}", file=sys.stderr)
+        return None
+    return {"series": series, "written": written}
+
+
 def sync_interval(
     symbols,
     interval: str,
@@ -507,6 +535,7 @@ def sync_interval(
         new_rows.extend(rows)
     merged = merge_rows(existing, new_rows)
     write_jsonl(target_path, merged)
+    sync_store(target_path, merged, replace=full)
     return {
         "path": target_path,
         "symbols": len(symbols),
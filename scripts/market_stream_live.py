@@ -381,6 +381,7 @@ def _flush_state(market_dir: Path, state_by_interval):
         target = market_dir / market_stream.INTERVALS[interval]["file"]
         rows = sorted(state.values(), key=lambda item: (item["symbol"], int(item["ts"])))
         market_stream.write_jsonl(target, rows)
+        market_stream.sync_store(target, rows)
 
 
 def _refresh_tick_features(
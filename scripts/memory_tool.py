@@ -65,7 +65,7 @@ def _save_dynamics_pipeline(pipeline: TactiDynamicsPipeline) -> None:
 
 def cmd_query(args: argparse.Namespace) -> int:
     store = HiveMindStore()
-    rows = store.search(agent_scope=args.agent, query=args.q, limit=args.limit)
+    rows = store.search(agent_scope=args.agent, query=args.q, limit=args.limit, semantic=args.semantic)
     store.log_event("query", agent=args.agent, query=args.q, limit=args.limit)
 
     dynamics_report = None
@@ -80,8 +80,9 @@ def cmd_query(args: argparse.Namespace) -> int:
         )
         consult_order = plan.get("consult_order", [])
         rank = {agent: idx for idx, agent in enumerate(consult_order)}
-        rows.sort(key=lambda row: (rank.get(str(row.get("agent_scope", "")), 999), -int(row.get("score", 0))))
-        reward = float(rows[0].get("score", 0)) / 5.0 if rows else -0.2
+        # Stable sort: the store's relevance order is kept within each agent.
+        rows.sort(key=lambda row: rank.get(str(row.get("agent_scope", "")), 999))
+        reward = min(1.0, int(rows[0].get("score", 0)) / 5.0) if rows else -0.2
         top_path = plan.get("paths", [[args.agent]])[0]
         pipeline.observe_outcome(
             source_agent=args.agent,
@@ -110,6 +111,7 @@ def cmd_query(args: argparse.Namespace) -> int:
                 "source": row.get("source"),
                 "agent_scope": row.get("agent_scope"),
                 "score": row.get("score", 0),
+                "rank_score": row.get("rank_score", 0.0),
                 "created_at": row.get("created_at"),
                 "content": redact_for_embedding(str(row.get("content", ""))),
                 "metadata": row.get("metadata", {}),
@@ -196,6 +198,7 @@ def build_parser() -> argparse.ArgumentParser:
     q.add_argument("--agent", required=True)
     q.add_argument("--q", required=True)
     q.add_argument("--limit", type=int, default=5)
+    q.add_argument("--semantic", action="store_true", help="rank by Ollama embedding similarity when available")
     q.add_argument("--json", action="store_true", help="emit JSON output")
     q.set_defaults(func=cmd_query)
 
@@ -25,6 +25,11 @@ Usage:
   python scripts/sim_runner.py              # run all sims on new candles
   python scripts/sim_runner.py --full       # reprocess all candles from scratch
   python scripts/sim_runner.py --sim SIM_A  # run only one sim
+  python scripts/sim_runner.py --start 2026-01-01 --end 2026-02-01  # only load this window
+  python scripts/sim_runner.py --full --engine vector  # array backtest for SIM_A/SIM_B (needs numpy)
+
+Market data is read from the columnar store in market/store when it exists
+(see scripts/market_store_convert.py), otherwise from the JSONL files.
 """
 
 import json
@@ -44,7 +49,10 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from core_infra import bar_backtest
+from core_infra.asof import AsOfCursor
 from core_infra.regime_detector import detect_regime
+from core_infra.rolling_indicators import SymbolIndicators
 from core_infra.volatility_metrics import compute_volatility
 from core_infra.channel_scoring import load_channel_scores
 from core_infra.competing_models import (
@@ -58,7 +66,8 @@ from core_infra.competing_models import (
 from core_infra.finance_brain import build_live_snapshot, build_retrieval_stats, evaluate_symbol, load_external_inputs
 from core_infra.strategy_blender import blend_signals
 from core_infra.econ_log import append_jsonl
-from core_infra.fill_simulator import estimate_liquidation_price, limit_fill_price, market_fill_price
+from core_infra.market_store import store_for_jsonl
+from core_infra.fill_simulator import estimate_liquidation_price, limit_fill_price, market_close_costs, market_fill_price
 from core_infra.tick_microstructure import load_tick_feature_snapshot, prune_trade_window, summarize_trade_window
 try:
     from workspace.itc.api import get_itc_signal
@@ -81,6 +90,14 @@ TAGGED_FILE = BASE_DIR / "itc" / "tagged" / "messages.jsonl"
 DEFAULT_TICK_TAIL_BYTES = 32 * 1024 * 1024
 DEFAULT_VENUE_QUOTE_TAIL_BYTES = 8 * 1024 * 1024
 DEFAULT_FUNDING_TAIL_BYTES = 2 * 1024 * 1024
+TICK_STRATEGIES = frozenset({"tick_crypto_scalping", "tick_grid_reversion", "perp_funding_carry"})
+QUOTE_STRATEGIES = frozenset({"cross_exchange_spread_arbitrage"})
+# Trailing 15m candles the competing models see (ATR window)
+COMPETING_CANDLE_WINDOW = 128
+# Bar strategies whose decisions depend only on SMAs, HTF regime and sentiment,
+# so ``--engine vector`` can replay them from arrays (see VectorBarReplay).
+VECTOR_STRATEGIES = frozenset({"regime_gated_long_flat", "itc_sentiment_tilt_long_flat"})
+ENGINES = ("event", "vector")
 
 # ── Strategy parameters ─────────────────────────────────────────
 # SMA crossover for regime detection (15m timeframe)
@@ -320,11 +337,40 @@ def _econ_log(enabled, path, obj):
     append_jsonl(path, obj)
 
 
-def load_candles(symbols, candle_file):
+def _in_range(ts, start_ts, end_ts):
+    return (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts)
+
+
+def load_from_store(symbols, path, *, tail_bytes=None, start_ts=None, end_ts=None):
+    """Rows per symbol from the columnar store next to ``path``, or None to read the JSONL.
+
+    The store is first synced with ``path`` (only new lines are parsed). A
+    ``tail_bytes`` window keeps the rows whose source line the JSONL tail
+    reader would have read.
+    """
+    found = store_for_jsonl(Path(path))
+    if found is None:
+        return None
+    store, series = found
+    try:
+        source = store.sync_from_jsonl(series, Path(path))["source"] or {}
+        min_offset = None
+        if tail_bytes is not None and tail_bytes > 0 and int(source.get("size", 0)) > tail_bytes:
+            min_offset = int(source["size"]) - tail_bytes
+        return store.load(series, symbols, start_ts=start_ts, end_ts=end_ts, min_offset=min_offset)
+    except OSError as exc:
+        print(f"WARN: market store unavailable for {series}, reading JSONL: {exc}")
+        return None
+
+
+def load_candles(symbols, candle_file, *, start_ts=None, end_ts=None):
     """Load candles from JSONL, grouped by symbol, sorted by timestamp."""
     by_symbol = {s: [] for s in symbols}
     if not candle_file.exists():
         return by_symbol
+    stored = load_from_store(symbols, candle_file, start_ts=start_ts, end_ts=end_ts)
+    if stored is not None:
+        return stored
     with open(candle_file, "r", encoding="utf-8") as f:
         for line in f:
             try:
@@ -332,7 +378,7 @@ def load_candles(symbols, candle_file):
             except json.JSONDecodeError:
                 continue
             sym = c.get("symbol")
-            if sym in by_symbol:
+            if sym in by_symbol and _in_range(c.get("ts"), start_ts, end_ts):
                 by_symbol[sym].append(c)
     for sym in by_symbol:
         by_symbol[sym].sort(key=lambda x: x["ts"])
@@ -358,51 +404,60 @@ def _iter_jsonl_tail(path: Path, *, tail_bytes: int | None = None):
                 yield raw.decode("utf-8", errors="ignore")
 
 
-def load_ticks(symbols, ticks_file, *, tail_bytes: int | None = DEFAULT_TICK_TAIL_BYTES):
+def load_ticks(symbols, ticks_file, *, tail_bytes: int | None = DEFAULT_TICK_TAIL_BYTES, start_ts=None, end_ts=None):
     by_symbol = {s: [] for s in symbols}
     if not ticks_file.exists():
         return by_symbol
+    stored = load_from_store(symbols, ticks_file, tail_bytes=tail_bytes, start_ts=start_ts, end_ts=end_ts)
+    if stored is not None:
+        return stored
     for line in _iter_jsonl_tail(Path(ticks_file), tail_bytes=tail_bytes):
             try:
                 row = json.loads(line)
             except json.JSONDecodeError:
                 continue
             symbol = row.get("symbol")
-            if symbol in by_symbol:
+            if symbol in by_symbol and _in_range(int(row.get("ts", 0) or 0), start_ts, end_ts):
                 by_symbol[symbol].append(row)
     for symbol in by_symbol:
         by_symbol[symbol].sort(key=lambda item: int(item.get("ts", 0) or 0))
     return by_symbol
 
 
-def load_venue_quotes(symbols, quotes_file, *, tail_bytes: int | None = DEFAULT_VENUE_QUOTE_TAIL_BYTES):
+def load_venue_quotes(symbols, quotes_file, *, tail_bytes: int | None = DEFAULT_VENUE_QUOTE_TAIL_BYTES, start_ts=None, end_ts=None):
     by_symbol = {s: [] for s in symbols}
     if not quotes_file.exists():
         return by_symbol
+    stored = load_from_store(symbols, quotes_file, tail_bytes=tail_bytes, start_ts=start_ts, end_ts=end_ts)
+    if stored is not None:
+        return stored
     for line in _iter_jsonl_tail(Path(quotes_file), tail_bytes=tail_bytes):
             try:
                 row = json.loads(line)
             except json.JSONDecodeError:
                 continue
             symbol = row.get("symbol")
-            if symbol in by_symbol:
+            if symbol in by_symbol and _in_range(int(row.get("ts", 0) or 0), start_ts, end_ts):
                 by_symbol[symbol].append(row)
     for symbol in by_symbol:
         by_symbol[symbol].sort(key=lambda item: int(item.get("ts", 0) or 0))
     return by_symbol
 
 
-def load_funding_history(symbols, funding_file, *, tail_bytes: int | None = DEFAULT_FUNDING_TAIL_BYTES):
+def load_funding_history(symbols, funding_file, *, tail_bytes: int | None = DEFAULT_FUNDING_TAIL_BYTES, start_ts=None, end_ts=None):
     by_symbol = {s: [] for s in symbols}
     if not funding_file.exists():
         return by_symbol
+    stored = load_from_store(symbols, funding_file, tail_bytes=tail_bytes, start_ts=start_ts, end_ts=end_ts)
+    if stored is not None:
+        return stored
     for line in _iter_jsonl_tail(Path(funding_file), tail_bytes=tail_bytes):
             try:
                 row = json.loads(line)
             except json.JSONDecodeError:
                 continue
             symbol = row.get("symbol")
-            if symbol in by_symbol:
+            if symbol in by_symbol and _in_range(int(row.get("ts", 0) or 0), start_ts, end_ts):
                 by_symbol[symbol].append(row)
     for symbol in by_symbol:
         by_symbol[symbol].sort(key=lambda item: int(item.get("ts", 0) or 0))
@@ -418,16 +473,6 @@ def load_snapshot_file(path):
         return {}
 
 
-def latest_at_or_before(rows, ts):
-    latest = None
-    for row in rows:
-        row_ts = int(row.get("ts", 0) or 0)
-        if row_ts > int(ts):
-            break
-        latest = row
-    return latest
-
-
 def build_cross_exchange_events(quotes):
     by_symbol = {}
     for symbol, rows in quotes.items():
@@ -467,13 +512,11 @@ def build_htf_regime(candles_1h, symbols):
     for sym in symbols:
         bars = candles_1h.get(sym, [])
         regime[sym] = {}
-        closes = []
+        indicators = SymbolIndicators(HTF_SLOW + 5)
         for bar in bars:
-            closes.append(bar["c"])
-            if len(closes) > HTF_SLOW + 5:
-                closes = closes[-(HTF_SLOW + 5):]
-            fast = sma(closes, HTF_FAST) if len(closes) >= HTF_FAST else None
-            slow = sma(closes, HTF_SLOW) if len(closes) >= HTF_SLOW else None
+            indicators.update(bar)
+            fast = indicators.sma(HTF_FAST)
+            slow = indicators.sma(HTF_SLOW)
             if fast is not None and slow is not None:
                 regime[sym][bar["ts"]] = fast > slow
     return regime
@@ -509,6 +552,10 @@ def ms_to_utc_iso(ts_ms):
     return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def utc_day(ts_ms):
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
 def compute_sim_b_tilt(sentiment_score, scale=0.005, max_abs_tilt=0.02):
     """Bounded sentiment tilt for SIM_B sizing/risk threshold adjustment."""
     raw = float(sentiment_score) * float(scale)
@@ -613,7 +660,7 @@ def sma(prices, period):
 
 
 class Sim:
-    def __init__(self, cfg):
+    def __init__(self, cfg, sim_root=None):
         self.id = cfg["id"]
         self.strategy_profile = str(cfg["strategy"])
         self.runtime_strategy = resolve_runtime_strategy(cfg)
@@ -623,7 +670,7 @@ class Sim:
         self.dd_kill = cfg["dd_kill"]
         self.daily_loss = cfg["daily_loss"]
         self.max_trades_per_day = cfg["max_trades_per_day"]
-        self.sim_dir = BASE_DIR / "sim" / self.id
+        self.sim_dir = Path(sim_root or BASE_DIR / "sim") / self.id
         self.model_state_path = self.sim_dir / "model_state.json"
         self.metrics_path = self.sim_dir / "metrics.json"
         self.performance_path = self.sim_dir / "performance.json"
@@ -662,53 +709,61 @@ class Sim:
 
     def _new_day(self, ts):
         """Reset daily counters if we've crossed into a new UTC day."""
-        day = datetime.fromtimestamp(ts / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        day = utc_day(ts)
         if day != self.current_day:
             self.current_day = day
             self.day_start_equity = self.equity
             self.trades_today = 0
 
-    def _estimate_close_components(self, position, price, ts):
+    def _close_costs(self, position, price, hold_ms):
         direction = int(position.get("direction", 1) or 1)
-        side = "sell" if direction > 0 else "buy"
-        exit_notional_pre = float(position.get("size", 0.0)) * float(price)
-        fill = market_fill_price(
-            side=side,
-            reference_price=float(price),
-            best_bid=position.get("best_bid"),
-            best_ask=position.get("best_ask"),
+        borrow_daily = float(self.execution.get("borrow_bps_daily", 0.0)) if direction > 0 else float(self.execution.get("short_borrow_bps_daily", self.execution.get("borrow_bps_daily", 0.0)))
+        return market_close_costs(
+            direction=direction,
+            size=float(position.get("size", 0.0)),
+            reference_price=price,
+            hold_ms=hold_ms,
+            entry_notional_usd=float(position.get("entry_notional_usd", 0.0)),
+            quoted_price=position.get("best_bid") if direction > 0 else position.get("best_ask"),
             slippage_bps=float(self.execution.get("slippage_bps", SLIPPAGE_BPS)),
-            spread_bps=float(self.execution.get("spread_bps", 0.0)),
             impact_bps_per_10k=float(self.execution.get("market_impact_bps_per_10k", 0.0)),
-            notional_usd=exit_notional_pre,
+            fee_rate=float(self.execution.get("taker_fee_rate", self.execution.get("fee_rate", FEE_RATE))),
+            funding_bps_8h=float(self.execution.get("funding_bps_8h", 0.0)),
+            borrow_bps_daily=borrow_daily,
         )
-        execution_price = float(fill["price"])
-        exit_notional = float(position.get("size", 0.0)) * execution_price
-        fee_rate = float(self.execution.get("taker_fee_rate", self.execution.get("fee_rate", FEE_RATE)))
-        exit_fee = exit_notional * fee_rate
+
+    def _estimate_close_components(self, position, price, ts):
         hold_ms = max(0, int(ts) - int(position.get("open_ts", ts)))
-        avg_notional = (float(position.get("entry_notional_usd", 0.0)) + exit_notional) / 2.0
-        funding_periods = hold_ms / float(8 * 60 * 60 * 1000)
-        borrow_days = hold_ms / float(24 * 60 * 60 * 1000)
-        funding_cost = avg_notional * (float(self.execution.get("funding_bps_8h", 0.0)) / 10000.0) * funding_periods * direction
-        borrow_daily = float(self.execution.get("borrow_bps_daily", 0.0)) if direction > 0 else float(self.execution.get("short_borrow_bps_daily", self.execution.get("borrow_bps_daily", 0.0)))
-        borrow_cost = avg_notional * (borrow_daily / 10000.0) * borrow_days
+        costs = self._close_costs(position, max(0.0, float(price)), hold_ms)
         cost_components = {
-            "fee_usd": exit_fee,
-            "slippage_bps": float(fill["slippage_bps"]),
-            "spread_bps": float(fill["spread_bps"]),
-            "impact_bps": float(fill["impact_bps"]),
+            "fee_usd": costs["fee_usd"],
+            "slippage_bps": float(costs["slippage_bps"]),
+            "spread_bps": max(0.0, float(self.execution.get("spread_bps", 0.0))),
+            "impact_bps": float(costs["impact_bps"]),
             "fill_role": "taker",
         }
         return {
-            "price": execution_price,
-            "size_usd": exit_notional,
-            "cost": exit_fee,
+            "price": float(costs["price"]),
+            "size_usd": costs["size_usd"],
+            "cost": costs["fee_usd"],
             "cost_components": cost_components,
-            "funding_cost": funding_cost,
-            "borrow_cost": borrow_cost,
+            "funding_cost": costs["funding_cost"],
+            "borrow_cost": costs["borrow_cost"],
         }
 
+    def _unrealized_marks(self, position, prices, mark_ts):
+        """Unrealized P&L of ``position`` as ``_mark_to_market_equity`` counts it, over arrays of prices and mark times."""
+        np = bar_backtest.np
+        prices = np.maximum(0.0, np.asarray(prices, dtype=np.float64))
+        mark_ts = np.asarray(mark_ts, dtype=np.int64)
+        if "open_ts" in position:
+            hold_ms = np.maximum(0, mark_ts - int(position["open_ts"]))
+        else:
+            hold_ms = np.zeros_like(mark_ts)
+        costs = self._close_costs(position, prices, hold_ms)
+        direction = int(position.get("direction", 1) or 1)
+        return direction * (costs["price"] - float(position["entry"])) * float(position["size"]) - costs["fee_usd"] - costs["funding_cost"] - costs["borrow_cost"]
+
     def _margin_in_use(self):
         total = 0.0
         for position in self.position.values():
@@ -764,6 +819,17 @@ class Sim:
         bars = self.bars_since_entry.get(symbol, 0)
         return bars >= MIN_HOLD_BARS
 
+    def _tilt_settings(self):
+        """SIM_B tilt scale/cap and entry/exit gap thresholds from the execution model."""
+        entry_gap = float(self.execution.get("entry_gap_pct", -0.001) or -0.001)
+        return {
+            "scale": float(self.execution.get("tilt_scale", 0.005) or 0.005),
+            "cap": float(self.execution.get("tilt_cap_pct", 0.02) or 0.02),
+            "entry_gap": entry_gap,
+            "exit_gap": float(self.execution.get("exit_gap_pct", entry_gap - 0.0005) or (entry_gap - 0.0005)),
+            "exit_tilt_weight": float(self.execution.get("exit_tilt_weight", 0.5) or 0.5),
+        }
+
     def _execute(self, symbol, side, price, ts, reason, *, quote=None, order_type="market", limit_price=None, leverage=None, metadata=None):
         """Paper-execute a trade. Returns trade record or None."""
         quote = quote or {}
@@ -938,9 +1004,10 @@ class Sim:
         with open(self.prediction_events_path, "a", encoding="utf-8") as handle:
             handle.write(json.dumps(event, ensure_ascii=False) + "\n")
 
-    def run_bar(self, symbol, bar, closes, sentiment_score, htf_bullish=None):
+    def run_bar(self, symbol, bar, closes, sentiment_score, htf_bullish=None, indicators=None):
         """Process one 15m candle bar. Returns list of trade records.
-        htf_bullish: True/False/None from 1h regime lookup. None = no data (ignored)."""
+        htf_bullish: True/False/None from 1h regime lookup. None = no data (ignored).
+        indicators: optional SymbolIndicators already updated with this bar; SMAs come from it."""
         trades = []
         ts = bar["ts"]
         close = bar["c"]
@@ -959,8 +1026,12 @@ class Sim:
                     trades.append(t)
             return trades
 
-        fast = sma(closes, FAST_PERIOD)
-        slow = sma(closes, SLOW_PERIOD)
+        if indicators is not None:
+            fast = indicators.sma(FAST_PERIOD)
+            slow = indicators.sma(SLOW_PERIOD)
+        else:
+            fast = sma(closes, FAST_PERIOD)
+            slow = sma(closes, SLOW_PERIOD)
 
         if fast is None or slow is None:
             return trades
@@ -983,21 +1054,11 @@ class Sim:
                     trades.append(t)
 
         elif self.strategy == "itc_sentiment_tilt_long_flat":
-            tilt = compute_sim_b_tilt(
-                sentiment_score,
-                scale=float(self.execution.get("tilt_scale", 0.005) or 0.005),
-                max_abs_tilt=float(self.execution.get("tilt_cap_pct", 0.02) or 0.02),
-            )
+            settings = self._tilt_settings()
+            tilt = compute_sim_b_tilt(sentiment_score, scale=settings["scale"], max_abs_tilt=settings["cap"])
             signal_gap = (fast - slow) / slow if slow > 0 else 0.0
-            entry_threshold = float(self.execution.get("entry_gap_pct", -0.001) or -0.001) - tilt
-            exit_tilt_weight = float(self.execution.get("exit_tilt_weight", 0.5) or 0.5)
-            exit_threshold = float(
-                self.execution.get(
-                    "exit_gap_pct",
-                    float(self.execution.get("entry_gap_pct", -0.001) or -0.001) - 0.0005,
-                )
-                or (float(self.execution.get("entry_gap_pct", -0.001) or -0.001) - 0.0005)
-            ) - (tilt * exit_tilt_weight)
+            entry_threshold = settings["entry_gap"] - tilt
+            exit_threshold = settings["exit_gap"] - (tilt * settings["exit_tilt_weight"])
             enter_bullish = signal_gap > entry_threshold if slow > 0 else False
             hold_bullish = signal_gap > exit_threshold if slow > 0 else False
             confirmed_bull = enter_bullish and htf_confirms
@@ -1015,7 +1076,7 @@ class Sim:
 
         return trades
 
-    def run_bar_with_competing_models(self, symbol, bar, closes, sentiment_score, candles_window, htf_bullish=None, tick_snapshot=None, params=None):
+    def run_bar_with_competing_models(self, symbol, bar, closes, sentiment_score, candles_window, htf_bullish=None, tick_snapshot=None, params=None, indicators=None):
         """Process one 15m candle using adaptive competing models."""
         trades = []
         ts = bar["ts"]
@@ -1055,6 +1116,7 @@ class Sim:
             include_sentiment=True,
             tick_snapshot=tick_snapshot,
             params=params,
+            indicators=indicators,
         )
         issued = issue_predictions(
             symbol_state,
@@ -1105,6 +1167,7 @@ class Sim:
         retrieval_stats=None,
         params=None,
         allow_llm=False,
+        indicators=None,
     ):
         trades = []
         ts = bar["ts"]
@@ -1136,6 +1199,7 @@ class Sim:
             retrieval_stats=retrieval_stats,
             params=params,
             allow_llm=allow_llm,
+            indicators=indicators,
         )
 
         bias = float(decision["decision"]["bias"])
@@ -1456,6 +1520,196 @@ class Sim:
         self.performance_path.write_text(json.dumps(performance, indent=2) + "\n", encoding="utf-8")
 
 
+class VectorBarReplay:
+    """Array-driven replay of one symbol's 15m bars for a SIM_A/SIM_B sim (``--engine vector``).
+
+    Entry and exit signals come from ``core_infra.bar_backtest`` arrays.
+    Mark-to-market equity, drawdown and daily loss are computed per
+    stretch of bars as arrays. ``Sim.run_bar`` only runs on bars where it
+    can act:
+
+    * flat: the next bar with an entry signal;
+    * in a position: the first bar where a kill switch fires, or where the
+      exit signal holds once ``MIN_HOLD_BARS`` have passed.
+
+    In between, the side effects ``run_bar`` has without trading are
+    applied in bulk: last marks, bars since entry, the day rollover, peak
+    equity and the drawdown halt. Trades, daily caps and state therefore
+    come from the same code as the event loop.
+    """
+
+    # Bars marked per step while looking for the end of a holding period; doubles up to the max.
+    HELD_CHUNK = 32
+    HELD_CHUNK_MAX = 4096
+
+    def __init__(self, sim, symbol, bars, htf_rows):
+        np = bar_backtest.np
+        self.sim = sim
+        self.symbol = symbol
+        self.bars = bars
+        self.ts = bar_backtest.column(bars, "ts", np.int64)
+        self.closes = bar_backtest.column(bars, "c", np.float64)
+        self.ordered = bool(np.all(self.ts[1:] > self.ts[:-1]))
+        days = self.ts // bar_backtest.DAY_MS
+        self.day_starts = np.flatnonzero(days[1:] != days[:-1]) + 1
+        self.htf = bar_backtest.htf_flags(self.ts, htf_rows)
+        self.indicators = bar_backtest.ReplayIndicators(self.closes, SLOW_PERIOD + 5)
+        self.entries = None
+        self.exits = None
+
+    def first_after(self, ts):
+        """Index of the first bar after ``ts`` (the incremental-run cut-off)."""
+        return int(bar_backtest.np.searchsorted(self.ts, int(ts), side="right"))
+
+    def _htf_at(self, idx):
+        flag = int(self.htf[idx])
+        return None if flag < 0 else bool(flag)
+
+    def _build_signals(self, sentiments):
+        np = bar_backtest.np
+        fast = self.indicators.series(FAST_PERIOD)
+        slow = self.indicators.series(SLOW_PERIOD)
+        ready = ~(np.isnan(fast) | np.isnan(slow))
+        htf_ok = self.htf != 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if self.sim.strategy == "regime_gated_long_flat":
+                confirmed = (fast > slow) & htf_ok
+                enter, leave = confirmed, ~confirmed
+            else:
+                settings = self.sim._tilt_settings()
+                raw = sentiments * settings["scale"]
+                cap = abs(settings["cap"])
+                tilt = np.where(raw > cap, cap, np.where(raw < -cap, -cap, raw))
+                positive = slow > 0
+                gap = np.where(positive, (fast - slow) / slow, 0.0)
+                enter = positive & (gap > settings["entry_gap"] - tilt) & htf_ok
+                hold = positive & (gap > settings["exit_gap"] - (tilt * settings["exit_tilt_weight"]))
+                leave = ~hold | ~htf_ok
+        self.entries = np.flatnonzero(ready & enter)
+        self.exits = ready & leave
+
+    def _marks(self, start, stop):
+        """Mark-to-market equity at each bar in [start, stop), as ``run_bar`` computes it."""
+        np = bar_backtest.np
+        sim = self.sim
+        marks = np.full(stop - start, float(sim.equity))
+        ts = self.ts[start:stop]
+        for symbol, position in sim.position.items():
+            if symbol == self.symbol:
+                price = self.closes[start:stop]
+            else:
+                price = (sim.last_marks.get(symbol) or {}).get("price")
+                if price in (None, 0):
+                    continue
+            mark_ts = np.where(ts != 0, ts, int(position.get("open_ts", 0)))
+            marks = marks + sim._unrealized_marks(position, price, mark_ts)
+        return marks
+
+    def _day_rollover(self, start):
+        """First bar at or after ``start`` where ``_new_day`` resets the daily counters."""
+        if utc_day(int(self.ts[start])) != self.sim.current_day:
+            return start
+        idx = int(bar_backtest.np.searchsorted(self.day_starts, start, side="right"))
+        return int(self.day_starts[idx]) if idx < len(self.day_starts) else len(self.bars)
+
+    def _skip(self, start, stop, marks, held):
+        """Apply ``run_bar``'s non-trading side effects for bars [start, stop)."""
+        if stop <= start:
+            return
+        np = bar_backtest.np
+        sim = self.sim
+        if self._day_rollover(start) < stop:
+            sim.current_day = utc_day(int(self.ts[stop - 1]))
+            sim.day_start_equity = sim.equity
+            sim.trades_today = 0
+        last = self.bars[stop - 1]
+        sim.last_marks[self.symbol] = {"price": last["c"], "ts": last["ts"]}
+        if held:
+            sim.bars_since_entry[self.symbol] = sim.bars_since_entry.get(self.symbol, 0) + (stop - start)
+        peaks = bar_backtest.running_peak(marks, sim.peak_equity)
+        if peaks[-1] > sim.peak_equity:
+            sim.peak_equity = float(peaks[-1])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dd = np.where(peaks > 0, (peaks - marks) / peaks, 0.0)
+        if bool(np.any(dd >= sim.dd_kill)):
+            sim.halted = True
+
+    def _next_flat_event(self, start):
+        n = len(self.bars)
+        if self.sim.halted:
+            stop = n  # no entries while halted; the remaining bars only mark
+        else:
+            idx = int(bar_backtest.np.searchsorted(self.entries, start))
+            stop = int(self.entries[idx]) if idx < len(self.entries) else n
+        self._skip(start, stop, self._marks(start, stop), held=False)
+        return stop
+
+    def _next_held_event(self, start):
+        np = bar_backtest.np
+        sim = self.sim
+        n = len(self.bars)
+        held_for = sim.bars_since_entry.get(self.symbol, 0)
+        rollover = self._day_rollover(start)
+        peak = sim.peak_equity
+        skipped = []
+        lo, chunk, stop = start, self.HELD_CHUNK, n
+        while lo < n:
+            hi = min(n, lo + chunk)
+            marks = self._marks(lo, hi)
+            peaks = bar_backtest.running_peak(marks, peak)
+            idx = np.arange(lo, hi)
+            day_start = np.where(idx < rollover, sim.day_start_equity, sim.equity)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                dd = np.where(peaks > 0, (peaks - marks) / peaks, 0.0)
+                daily = np.where(day_start > 0, (marks - day_start) / day_start, 0.0)
+            can_exit = (held_for + (idx - start + 1)) >= MIN_HOLD_BARS
+            hits = np.flatnonzero((dd >= sim.dd_kill) | (daily <= -sim.daily_loss) | (self.exits[lo:hi] & can_exit))
+            if len(hits):
+                stop = lo + int(hits[0])
+                skipped.append(marks[:hits[0]])
+                break
+            skipped.append(marks)
+            peak = float(peaks[-1])
+            lo, chunk = hi, min(chunk * 2, self.HELD_CHUNK_MAX)
+        self._skip(start, stop, np.concatenate(skipped) if skipped else marks[:0], held=True)
+        return stop
+
+    def run(self, start, sentiments):
+        """Replay ``bars[start:]``; ``sentiments`` holds the score for each of those bars. Returns the trades."""
+        np = bar_backtest.np
+        sim = self.sim
+        n = len(self.bars)
+        history = SLOW_PERIOD + 5
+        scores = np.zeros(n)
+        scores[start:] = np.asarray(sentiments, dtype=np.float64)
+        trades = []
+        idx = start
+        while idx < n:
+            if self.exits is None:
+                # SMAs start on the first bar run_bar queries them; until then go bar by bar.
+                event = idx
+            elif self.symbol in sim.position:
+                event = self._next_held_event(idx)
+            else:
+                event = self._next_flat_event(idx)
+            if event >= n:
+                break
+            self.indicators.index = event
+            closes = [self.bars[k]["c"] for k in range(max(0, event + 1 - history), event + 1)]
+            trades += sim.run_bar(
+                self.symbol,
+                self.bars[event],
+                closes,
+                sentiments[event - start],
+                htf_bullish=self._htf_at(event),
+                indicators=self.indicators,
+            )
+            if self.exits is None and self.indicators.series(SLOW_PERIOD) is not None:
+                self._build_signals(scores)
+            idx = event + 1
+        return trades
+
+
 def resolve_path(cli_value, env_var, default_path):
     if cli_value:
         return Path(cli_value)
@@ -1465,7 +1719,31 @@ def resolve_path(cli_value, env_var, default_path):
     return Path(default_path)
 
 
-def run(sim_filter=None, full=False, config_path=None, features_path=None):
+def parse_time_arg(value):
+    """Epoch milliseconds from a CLI value: digits are taken as ms, anything else as ISO-8601 (UTC if naive)."""
+    if value is None or str(value).strip() == "":
+        return None
+    raw = str(value).strip()
+    if raw.lstrip("-").isdigit():
+        return int(raw)
+    parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def select_sims(config, sim_filter=None):
+    sims_cfg = config["sims"]
+    if sim_filter:
+        sims_cfg = [s for s in sims_cfg if s["id"] == sim_filter]
+        if not sims_cfg:
+            print(f"No sim found with id={sim_filter}")
+    else:
+        sims_cfg = [s for s in sims_cfg if bool(s.get("enabled", True))]
+    return sims_cfg
+
+
+def run(sim_filter=None, full=False, config_path=None, features_path=None, start_ts=None, end_ts=None, engine="event"):
     if config_path is None:
         config_path = DEFAULT_CONFIG_PATH
     if not Path(config_path).exists():
@@ -1473,6 +1751,22 @@ def run(sim_filter=None, full=False, config_path=None, features_path=None):
         return
 
     config = load_config(config_path, features_path)
+    sims_cfg = select_sims(config, sim_filter)
+    if not sims_cfg:
+        return
+    ctx = load_market_context(config, sims_cfg, start_ts=start_ts, end_ts=end_ts)
+    if ctx is None:
+        return
+    for cfg in sims_cfg:
+        run_sim(cfg, ctx, full=full, engine=engine)
+
+
+def load_market_context(config, sims_cfg, *, start_ts=None, end_ts=None):
+    """Load everything the sims in ``sims_cfg`` read: market data, sentiment, feature flags and snapshots.
+
+    Returns None when there are no 15m candles. The result is read-only
+    for ``run_sim``, so one context can serve many sims (see scripts/sim_sweep.py).
+    """
     feature_params = get_feature_params(config)
     f_regime = get_feature(config, "regime_detector")
     f_vol = get_feature(config, "volatility_metrics")
@@ -1495,36 +1789,26 @@ def run(sim_filter=None, full=False, config_path=None, features_path=None):
     execution_params = feature_params.get("execution_model", {})
     finance_params = feature_params.get("finance_brain", {})
 
-    sims_cfg = config["sims"]
-    if sim_filter:
-        sims_cfg = [s for s in sims_cfg if s["id"] == sim_filter]
-        if not sims_cfg:
-            print(f"No sim found with id={sim_filter}")
-            return
-    else:
-        sims_cfg = [s for s in sims_cfg if bool(s.get("enabled", True))]
-
     all_symbols = set()
     for s in sims_cfg:
         all_symbols.update(s["universe"])
 
-    tick_strategies = {"tick_crypto_scalping", "tick_grid_reversion", "perp_funding_carry"}
-    quote_strategies = {"cross_exchange_spread_arbitrage"}
     active_strategies = {resolve_runtime_strategy(cfg) for cfg in sims_cfg}
-    need_ticks = bool(active_strategies.intersection(tick_strategies))
-    need_quote_events = bool(active_strategies.intersection(quote_strategies))
+    need_ticks = bool(active_strategies.intersection(TICK_STRATEGIES))
+    need_quote_events = bool(active_strategies.intersection(QUOTE_STRATEGIES))
     # Only the tick scalper currently consumes historical venue quotes for best bid/ask.
     need_tick_quotes = "tick_crypto_scalping" in active_strategies
     need_venue_quotes = need_quote_events or need_tick_quotes
     need_funding_history = "perp_funding_carry" in active_strategies
 
     # Primary signal: 15m candles
-    candles_15m = load_candles(list(all_symbols), CANDLES_15M)
+    window = {"start_ts": start_ts, "end_ts": end_ts}
+    candles_15m = load_candles(list(all_symbols), CANDLES_15M, **window)
     # HTF confirmation: 1h candles
-    candles_1h = load_candles(list(all_symbols), CANDLES_1H)
-    ticks = load_ticks(list(all_symbols), TICKS_FILE) if need_ticks else {s: [] for s in all_symbols}
-    venue_quotes = load_venue_quotes(list(all_symbols), VENUE_QUOTES_FILE) if need_venue_quotes else {s: [] for s in all_symbols}
-    funding_history = load_funding_history(list(all_symbols), FUNDING_HISTORY_FILE) if need_funding_history else {s: [] for s in all_symbols}
+    candles_1h = load_candles(list(all_symbols), CANDLES_1H, **window)
+    ticks = load_ticks(list(all_symbols), TICKS_FILE, **window) if need_ticks else {s: [] for s in all_symbols}
+    venue_quotes = load_venue_quotes(list(all_symbols), VENUE_QUOTES_FILE, **window) if need_venue_quotes else {s: [] for s in all_symbols}
+    funding_history = load_funding_history(list(all_symbols), FUNDING_HISTORY_FILE, **window) if need_funding_history else {s: [] for s in all_symbols}
     tick_features = load_tick_feature_snapshot(TICK_FEATURES)
     cross_exchange_snapshot = load_snapshot_file(CROSS_EXCHANGE_FILE)
     funding_snapshot = load_snapshot_file(FUNDING_SNAPSHOT_FILE)
@@ -1538,7 +1822,7 @@ def run(sim_filter=None, full=False, config_path=None, features_path=None):
     htf_count = sum(len(v) for v in candles_1h.values())
     if total_15m == 0:
         print("No 15m candle data. Run: python scripts/market_stream.py first")
-        return
+        return None
 
     print(f"Loaded {total_15m} candles (15m) + {htf_count} (1h) across {len(all_symbols)} symbols")
     print(f"Loaded {len(sentiment)} sentiment buckets from ITC")
@@ -1592,288 +1876,400 @@ def run(sim_filter=None, full=False, config_path=None, features_path=None):
             print(f"Built finance brain snapshot for {len(finance_live.get('symbols', {}))} symbols")
         except Exception as exc:
             print(f"WARN: finance brain snapshot failed: {exc}")
+    return {
+        "feature_params": feature_params,
+        "f_regime": f_regime,
+        "f_vol": f_vol,
+        "f_chan": f_chan,
+        "f_blend": f_blend,
+        "f_competing": f_competing,
+        "f_finance": f_finance,
+        "f_log": f_log,
+        "econ_path": econ_path,
+        "meta_features": meta_features,
+        "competing_params": competing_params,
+        "execution_params": execution_params,
+        "finance_params": finance_params,
+        "all_symbols": all_symbols,
+        "candles_15m": candles_15m,
+        "candles_1h": candles_1h,
+        "ticks": ticks,
+        "venue_quotes": venue_quotes,
+        "funding_history": funding_history,
+        "tick_features": tick_features,
+        "cross_exchange_snapshot": cross_exchange_snapshot,
+        "funding_snapshot": funding_snapshot,
+        "sentiment": sentiment,
+        "itc_artifact_root": itc_artifact_root,
+        "itc_lookback": itc_lookback,
+        "htf_regime": htf_regime,
+        "finance_external_inputs": finance_external_inputs,
+        "finance_retrieval": finance_retrieval,
+    }
 
-    for cfg in sims_cfg:
-        sim_cfg = deep_merge({"execution": execution_params}, dict(cfg))
-        sim = Sim(sim_cfg)
-        if full:
-            sim.equity = float(sim_cfg["capital"])
-            sim.peak_equity = sim.equity
-            sim.last_ts = 0
-            sim.total_trades = 0
-            sim.halted = False
-            sim.model_state = {"version": 1, "symbols": {}}
-            sim.position = {}
-            sim.synthetic_pairs = {}
-            sim.bars_since_entry = {}
-            sim.last_tick_ts = {}
-            sim.last_marks = {}
-            if sim.prediction_events_path.exists():
-                sim.prediction_events_path.unlink()
-
-        trades_out = sim.sim_dir / "trades.jsonl"
-        sim.sim_dir.mkdir(parents=True, exist_ok=True)
-
-        mode = "w" if full else "a"
-        trade_count = 0
-        with open(trades_out, mode, encoding="utf-8") as fout:
-            if sim.strategy in tick_strategies:
-                for symbol in sim.universe:
-                    symbol_ticks = ticks.get(symbol, [])
-                    htf_rows = htf_regime.get(symbol, {})
-                    funding_rows = funding_history.get(symbol, [])
-                    symbol_quotes = (
-                        [row for row in venue_quotes.get(symbol, []) if str(row.get("venue") or "") == "binance_spot"]
-                        if sim.strategy == "tick_crypto_scalping"
-                        else []
-                    )
-                    if not symbol_ticks:
-                        continue
-                    window_trades = []
-                    quote_idx = 0
-                    current_quote = None
-                    for tick in symbol_ticks:
-                        if not full and int(tick["ts"]) <= int(sim.last_ts):
-                            continue
-                        ts = int(tick["ts"])
-                        hour_ts = (ts // 3_600_000) * 3_600_000
-                        sent = sentiment.get(hour_ts, 0.0)
-                        htf_bull = htf_rows.get(hour_ts)
-                        if htf_bull is None and htf_rows:
-                            earlier = [t for t in htf_rows if t <= ts]
-                            if earlier:
-                                htf_bull = htf_rows[max(earlier)]
-                        while quote_idx < len(symbol_quotes) and int(symbol_quotes[quote_idx].get("ts", 0) or 0) <= ts:
-                            current_quote = symbol_quotes[quote_idx]
-                            quote_idx += 1
-                        window_trades.append(tick)
-                        prune_trade_window(window_trades, now_ts=ts, lookback_ms=300000)
-                        latest_snapshot = summarize_trade_window(
-                            symbol,
-                            window_trades,
-                            best_bid=(current_quote or {}).get("best_bid", (tick_features.get(symbol) or {}).get("best_bid")),
-                            best_ask=(current_quote or {}).get("best_ask", (tick_features.get(symbol) or {}).get("best_ask")),
-                            lookback_ms=300000,
-                        )
-                        funding_row = latest_at_or_before(funding_rows, ts)
-                        if sim.strategy == "tick_crypto_scalping":
-                            bar_trades = sim.run_tick_scalper(symbol, tick, tick_snapshot=latest_snapshot, sentiment_score=sent, htf_bullish=htf_bull)
-                        elif sim.strategy == "tick_grid_reversion":
-                            bar_trades = sim.run_tick_grid(symbol, tick, tick_snapshot=latest_snapshot)
-                        else:
-                            bar_trades = sim.run_tick_funding_carry(symbol, tick, tick_snapshot=latest_snapshot, funding_row=funding_row)
-                        for t in bar_trades:
-                            fout.write(json.dumps(t, ensure_ascii=False) + "\n")
-                            trade_count += 1
-                        sim.last_ts = max(sim.last_ts, ts)
-            elif sim.strategy in quote_strategies:
-                quote_events = build_cross_exchange_events(venue_quotes)
-                for symbol in sim.universe:
-                    events = quote_events.get(symbol, [])
-                    for event in events:
-                        if not full and int(event["ts"]) <= int(sim.last_ts):
-                            continue
-                        bar_trades = sim.run_quote_arb(symbol, event)
-                        for t in bar_trades:
-                            fout.write(json.dumps(t, ensure_ascii=False) + "\n")
-                            trade_count += 1
-                        sim.last_ts = max(sim.last_ts, int(event["ts"]))
-            for symbol in ([] if sim.strategy in tick_strategies.union(quote_strategies) else sim.universe):
-                closes = []
-                bars = candles_15m.get(symbol, [])
-
-                for bar_idx, bar in enumerate(bars):
-                    if not full and bar["ts"] <= sim.last_ts:
-                        closes.append(bar["c"])
-                        if len(closes) > SLOW_PERIOD + 5:
-                            closes = closes[-(SLOW_PERIOD + 5):]
-                        continue
 
-                    closes.append(bar["c"])
-                    if len(closes) > SLOW_PERIOD + 5:
-                        closes = closes[-(SLOW_PERIOD + 5):]
+def _bar_sentiment(sim, ts, sentiment, itc_artifact_root, itc_lookback):
+    """Sentiment for a bar: ``(score, source, reason)``, from the ITC contract for SIM_B/SIM_C when available."""
+    hour_ts = (ts // 3_600_000) * 3_600_000
+    sent = sentiment.get(hour_ts, 0.0)
+    sentiment_source = "legacy_tagged"
+    sentiment_reason = "ok_legacy"
+    if sim.strategy in {"itc_sentiment_tilt_long_flat", "ensemble_competing_models_long_flat"} and get_itc_signal is not None:
+        selected = get_itc_signal(
+            ts_utc=ms_to_utc_iso(ts),
+            lookback=itc_lookback,
+            policy={
+                "artifacts_root": str(itc_artifact_root),
+                "run_id": f"sim_{sim.id}",
+            },
+        )
+        if selected.get("reason") == "ok" and selected.get("signal"):
+            metrics = selected["signal"].get("metrics", {})
+            sent = float(metrics.get("sentiment", 0.0))
+            sentiment_source = str(selected["signal"].get("source", "contract"))
+            sentiment_reason = "ok"
+        else:
+            sentiment_reason = str(selected.get("reason", "missing"))
+    return sent, sentiment_source, sentiment_reason
+
 
-                    # Get sentiment for this hour
-                    hour_ts = (bar["ts"] // 3_600_000) * 3_600_000
+def _log_sim_b_tilt(sim, f_log, econ_path, meta_features, symbol, ts, sent, sentiment_source, sentiment_reason):
+    if not f_log:
+        return
+    settings = sim._tilt_settings()
+    _econ_log(f_log, econ_path, {
+        "ts": ms_to_utc_iso(ts),
+        "sim": sim.id,
+        "symbol": symbol,
+        "type": "sim_b_tilt_applied",
+        "payload": {
+            "sentiment": float(sent),
+            "tilt": compute_sim_b_tilt(sent, scale=settings["scale"], max_abs_tilt=settings["cap"]),
+            "reason": sentiment_reason,
+            "source": sentiment_source,
+        },
+        "meta": {"features": meta_features},
+    })
+
+
+def run_sim(cfg, ctx, *, full=False, sim_root=None, feature_overrides=None, engine="event"):
+    """Replay one sim over a context from ``load_market_context`` and persist its state.
+
+    ``sim_root`` puts the sim's directory somewhere other than ``BASE_DIR/sim``.
+    ``feature_overrides`` is merged over ``features_params`` for this sim
+    only, e.g. ``{"competing_models": {...}}``. ``engine="vector"`` replays
+    SIM_A/SIM_B bars with ``VectorBarReplay``. It writes the same trades and
+    state as the per-bar loop, which other strategies (or a missing numpy)
+    keep using.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {ENGINES}")
+    feature_params = ctx["feature_params"]
+    competing_params = ctx["competing_params"]
+    execution_params = ctx["execution_params"]
+    finance_params = ctx["finance_params"]
+    if feature_overrides:
+        feature_params = deep_merge(feature_params, feature_overrides)
+        competing_params = deep_merge(competing_params, feature_overrides.get("competing_models"))
+        execution_params = deep_merge(execution_params, feature_overrides.get("execution_model"))
+        finance_params = deep_merge(finance_params, feature_overrides.get("finance_brain"))
+    f_regime = ctx["f_regime"]
+    f_vol = ctx["f_vol"]
+    f_chan = ctx["f_chan"]
+    f_blend = ctx["f_blend"]
+    f_competing = ctx["f_competing"]
+    f_finance = ctx["f_finance"]
+    f_log = ctx["f_log"]
+    econ_path = ctx["econ_path"]
+    meta_features = ctx["meta_features"]
+    tick_strategies = TICK_STRATEGIES
+    quote_strategies = QUOTE_STRATEGIES
+    candles_15m = ctx["candles_15m"]
+    ticks = ctx["ticks"]
+    venue_quotes = ctx["venue_quotes"]
+    funding_history = ctx["funding_history"]
+    tick_features = ctx["tick_features"]
+    cross_exchange_snapshot = ctx["cross_exchange_snapshot"]
+    funding_snapshot = ctx["funding_snapshot"]
+    sentiment = ctx["sentiment"]
+    itc_artifact_root = ctx["itc_artifact_root"]
+    itc_lookback = ctx["itc_lookback"]
+    htf_regime = ctx["htf_regime"]
+    finance_external_inputs = ctx["finance_external_inputs"]
+    finance_retrieval = ctx["finance_retrieval"]
+
+    sim_cfg = deep_merge({"execution": execution_params}, dict(cfg))
+    sim = Sim(sim_cfg, sim_root=sim_root)
+    if full:
+        sim.equity = float(sim_cfg["capital"])
+        sim.peak_equity = sim.equity
+        sim.last_ts = 0
+        sim.total_trades = 0
+        sim.halted = False
+        sim.model_state = {"version": 1, "symbols": {}}
+        sim.position = {}
+        sim.synthetic_pairs = {}
+        sim.bars_since_entry = {}
+        sim.last_tick_ts = {}
+        sim.last_marks = {}
+        if sim.prediction_events_path.exists():
+            sim.prediction_events_path.unlink()
+
+    use_vector = engine == "vector" and sim.strategy in VECTOR_STRATEGIES
+    if use_vector and not bar_backtest.available():
+        print(f"  [{sim.id}] numpy not installed; using the event loop")
+        use_vector = False
+
+    trades_out = sim.sim_dir / "trades.jsonl"
+    sim.sim_dir.mkdir(parents=True, exist_ok=True)
+
+    mode = "w" if full else "a"
+    trade_count = 0
+    with open(trades_out, mode, encoding="utf-8") as fout:
+        if sim.strategy in tick_strategies:
+            for symbol in sim.universe:
+                symbol_ticks = ticks.get(symbol, [])
+                htf_rows = htf_regime.get(symbol, {})
+                funding_rows = funding_history.get(symbol, [])
+                symbol_quotes = (
+                    [row for row in venue_quotes.get(symbol, []) if str(row.get("venue") or "") == "binance_spot"]
+                    if sim.strategy == "tick_crypto_scalping"
+                    else []
+                )
+                if not symbol_ticks:
+                    continue
+                window_trades = []
+                htf_asof = AsOfCursor.over_mapping(htf_rows)
+                quote_asof = AsOfCursor.over_rows(symbol_quotes)
+                funding_asof = AsOfCursor.over_rows(funding_rows)
+                for tick in symbol_ticks:
+                    if not full and int(tick["ts"]) <= int(sim.last_ts):
+                        continue
+                    ts = int(tick["ts"])
+                    hour_ts = (ts // 3_600_000) * 3_600_000
                     sent = sentiment.get(hour_ts, 0.0)
-                    sentiment_source = "legacy_tagged"
-                    sentiment_reason = "ok_legacy"
-                    if sim.strategy in {"itc_sentiment_tilt_long_flat", "ensemble_competing_models_long_flat"} and get_itc_signal is not None:
-                        selected = get_itc_signal(
-                            ts_utc=ms_to_utc_iso(bar["ts"]),
-                            lookback=itc_lookback,
-                            policy={
-                                "artifacts_root": str(itc_artifact_root),
-                                "run_id": f"sim_{sim.id}",
-                            },
-                        )
-                        if selected.get("reason") == "ok" and selected.get("signal"):
-                            metrics = selected["signal"].get("metrics", {})
-                            sent = float(metrics.get("sentiment", 0.0))
-                            sentiment_source = str(selected["signal"].get("source", "contract"))
-                            sentiment_reason = "ok"
-                        else:
-                            sentiment_reason = str(selected.get("reason", "missing"))
-
-                    # Get HTF regime: find the most recent 1h bar at or before this 15m bar
-                    htf_bull = None
-                    sym_htf = htf_regime.get(symbol, {})
-                    if sym_htf:
-                        htf_bull = sym_htf.get(hour_ts)
-                        if htf_bull is None:
-                            earlier = [t for t in sym_htf if t <= bar["ts"]]
-                            if earlier:
-                                htf_bull = sym_htf[max(earlier)]
-
-                    model_decision = None
-                    finance_decision = None
-                    if sim.strategy == "ensemble_competing_models_long_flat" and f_competing:
-                        candles_window = bars[max(0, (bar_idx + 1) - 128):bar_idx + 1]
-                        tick_snapshot = tick_features.get(symbol)
-                        bar_trades, model_decision = sim.run_bar_with_competing_models(
-                            symbol,
-                            bar,
-                            closes,
-                            sent,
-                            candles_window,
-                            htf_bullish=htf_bull,
-                            tick_snapshot=tick_snapshot,
-                            params=competing_params,
-                        )
-                    elif sim.strategy == "latency_consensus_long_flat" and f_finance:
-                        cross_symbols = cross_exchange_snapshot.get("symbols") if isinstance(cross_exchange_snapshot, dict) else {}
-                        funding_symbols = funding_snapshot.get("symbols") if isinstance(funding_snapshot, dict) else {}
-                        allow_live_llm = (not full) and (bar_idx >= (len(bars) - 1))
-                        bar_trades, finance_decision = sim.run_bar_with_finance_brain(
-                            symbol,
-                            bar,
-                            closes,
-                            sent,
-                            htf_bullish=htf_bull,
-                            tick_snapshot=tick_features.get(symbol),
-                            cross_exchange_row=(cross_symbols or {}).get(symbol) if isinstance(cross_symbols, dict) else None,
-                            funding_row=(funding_symbols or {}).get(symbol) if isinstance(funding_symbols, dict) else None,
-                            external_inputs=finance_external_inputs,
-                            retrieval_stats=finance_retrieval.get(symbol),
-                            params=finance_params,
-                            allow_llm=allow_live_llm,
-                        )
+                    htf_bull = htf_rows.get(hour_ts)
+                    if htf_bull is None:
+                        htf_bull = htf_asof.at(ts)
+                    current_quote = quote_asof.at(ts)
+                    window_trades.append(tick)
+                    prune_trade_window(window_trades, now_ts=ts, lookback_ms=300000)
+                    latest_snapshot = summarize_trade_window(
+                        symbol,
+                        window_trades,
+                        best_bid=(current_quote or {}).get("best_bid", (tick_features.get(symbol) or {}).get("best_bid")),
+                        best_ask=(current_quote or {}).get("best_ask", (tick_features.get(symbol) or {}).get("best_ask")),
+                        lookback_ms=300000,
+                    )
+                    funding_row = funding_asof.at(ts)
+                    if sim.strategy == "tick_crypto_scalping":
+                        bar_trades = sim.run_tick_scalper(symbol, tick, tick_snapshot=latest_snapshot, sentiment_score=sent, htf_bullish=htf_bull)
+                    elif sim.strategy == "tick_grid_reversion":
+                        bar_trades = sim.run_tick_grid(symbol, tick, tick_snapshot=latest_snapshot)
                     else:
-                        bar_trades = sim.run_bar(symbol, bar, closes, sent, htf_bullish=htf_bull)
-                    if sim.strategy == "itc_sentiment_tilt_long_flat":
-                        applied_tilt = compute_sim_b_tilt(
-                            sent,
-                            scale=float(sim.execution.get("tilt_scale", 0.005) or 0.005),
-                            max_abs_tilt=float(sim.execution.get("tilt_cap_pct", 0.02) or 0.02),
-                        )
-                        _econ_log(f_log, econ_path, {
-                            "ts": ms_to_utc_iso(bar["ts"]),
-                            "sim": sim.id,
-                            "symbol": symbol,
-                            "type": "sim_b_tilt_applied",
-                            "payload": {
-                                "sentiment": float(sent),
-                                "tilt": applied_tilt,
-                                "reason": sentiment_reason,
-                                "source": sentiment_source,
-                            },
-                            "meta": {"features": meta_features},
-                        })
-                    if sim.strategy == "ensemble_competing_models_long_flat" and model_decision is not None:
-                        _econ_log(f_log, econ_path, {
-                            "ts": ms_to_utc_iso(bar["ts"]),
-                            "sim": sim.id,
-                            "symbol": symbol,
-                            "type": "sim_c_ensemble_signal",
-                            "payload": {
-                                "signal": float(model_decision["signal"]),
-                                "confidence": float(model_decision["confidence"]),
-                                "risk_state": str(model_decision["risk_state"]),
-                                "risk_signal": float(model_decision["risk_signal"]),
-                                "walk_forward": dict(model_decision["walk_forward"]),
-                                "leaderboard": list(model_decision.get("leaderboard", []))[:5],
-                                "tick_snapshot": dict(tick_features.get(symbol, {})) if tick_features.get(symbol) else None,
-                            },
-                            "meta": {"features": meta_features},
-                        })
-                    if sim.strategy == "latency_consensus_long_flat" and finance_decision is not None:
-                        _econ_log(f_log, econ_path, {
-                            "ts": ms_to_utc_iso(bar["ts"]),
-                            "sim": sim.id,
-                            "symbol": symbol,
-                            "type": "finance_brain_signal",
-                            "payload": {
-                                "decision": dict(finance_decision.get("decision") or {}),
-                                "agents": dict(finance_decision.get("agents") or {}),
-                                "incoming_source_scores": dict(finance_decision.get("incoming_source_scores") or {}),
-                                "learned_weights": dict(finance_decision.get("learned_weights") or {}),
-                                "llm_manager": dict(finance_decision.get("llm_manager") or {}),
-                            },
-                            "meta": {"features": meta_features},
-                        })
+                        bar_trades = sim.run_tick_funding_carry(symbol, tick, tick_snapshot=latest_snapshot, funding_row=funding_row)
                     for t in bar_trades:
                         fout.write(json.dumps(t, ensure_ascii=False) + "\n")
                         trade_count += 1
-
-                    sim.last_ts = max(sim.last_ts, bar["ts"])
-
-        sim.save()
-
-        if f_regime or f_vol or f_chan or f_blend:
-            ts_iso = datetime.now(timezone.utc).isoformat()
-
-            if f_chan:
-                score_path = os.path.join("itc", "channel_scores.json")
-                scores = load_channel_scores(score_path, defaults=None)
-                _econ_log(f_log, econ_path, {
-                    "ts": ts_iso,
-                    "sim": sim.id,
-                    "type": "channel_scores",
-                    "payload": {
-                        "channels": list(scores.keys()),
-                        "weights": scores,
-                    },
-                    "meta": {"features": meta_features},
-                })
-
+                    sim.last_ts = max(sim.last_ts, ts)
+        elif sim.strategy in quote_strategies:
+            quote_events = build_cross_exchange_events(venue_quotes)
             for symbol in sim.universe:
-                bars = candles_15m.get(symbol, [])
-
-                if f_regime:
-                    prices = [b.get("c") for b in bars]
-                    regime_out = detect_regime(prices, feature_params.get("regime_detector", {}))
+                events = quote_events.get(symbol, [])
+                for event in events:
+                    if not full and int(event["ts"]) <= int(sim.last_ts):
+                        continue
+                    bar_trades = sim.run_quote_arb(symbol, event)
+                    for t in bar_trades:
+                        fout.write(json.dumps(t, ensure_ascii=False) + "\n")
+                        trade_count += 1
+                    sim.last_ts = max(sim.last_ts, int(event["ts"]))
+        for symbol in ([] if sim.strategy in tick_strategies.union(quote_strategies) else sim.universe):
+            closes = []
+            bars = candles_15m.get(symbol, [])
+            sym_htf = htf_regime.get(symbol, {})
+            if use_vector and bars:
+                replay = VectorBarReplay(sim, symbol, bars, sym_htf)
+                if replay.ordered:
+                    start = 0 if full else replay.first_after(sim.last_ts)
+                    sentiments = []
+                    for bar_ts in replay.ts[start:].tolist():
+                        sent, sentiment_source, sentiment_reason = _bar_sentiment(sim, bar_ts, sentiment, itc_artifact_root, itc_lookback)
+                        sentiments.append(sent)
+                        if sim.strategy == "itc_sentiment_tilt_long_flat":
+                            _log_sim_b_tilt(sim, f_log, econ_path, meta_features, symbol, bar_ts, sent, sentiment_source, sentiment_reason)
+                    for t in replay.run(start, sentiments):
+                        fout.write(json.dumps(t, ensure_ascii=False) + "\n")
+                        trade_count += 1
+                    if start < len(bars):
+                        sim.last_ts = max(sim.last_ts, bars[-1]["ts"])
+                    continue
+            htf_asof = AsOfCursor.over_mapping(sym_htf)
+            use_competing = sim.strategy == "ensemble_competing_models_long_flat" and f_competing
+            indicators = SymbolIndicators(SLOW_PERIOD + 5, candle_window=COMPETING_CANDLE_WINDOW if use_competing else 0)
+
+            for bar_idx, bar in enumerate(bars):
+                closes.append(bar["c"])
+                if len(closes) > SLOW_PERIOD + 5:
+                    closes = closes[-(SLOW_PERIOD + 5):]
+                indicators.update(bar)
+                if not full and bar["ts"] <= sim.last_ts:
+                    continue
+
+                # Get sentiment for this hour
+                hour_ts = (bar["ts"] // 3_600_000) * 3_600_000
+                sent, sentiment_source, sentiment_reason = _bar_sentiment(sim, bar["ts"], sentiment, itc_artifact_root, itc_lookback)
+
+                # Get HTF regime: find the most recent 1h bar at or before this 15m bar
+                htf_bull = sym_htf.get(hour_ts)
+                if htf_bull is None:
+                    htf_bull = htf_asof.at(bar["ts"])
+
+                model_decision = None
+                finance_decision = None
+                if use_competing:
+                    candles_window = bars[max(0, (bar_idx + 1) - COMPETING_CANDLE_WINDOW):bar_idx + 1]
+                    tick_snapshot = tick_features.get(symbol)
+                    bar_trades, model_decision = sim.run_bar_with_competing_models(
+                        symbol,
+                        bar,
+                        closes,
+                        sent,
+                        candles_window,
+                        htf_bullish=htf_bull,
+                        tick_snapshot=tick_snapshot,
+                        params=competing_params,
+                        indicators=indicators,
+                    )
+                elif sim.strategy == "latency_consensus_long_flat" and f_finance:
+                    cross_symbols = cross_exchange_snapshot.get("symbols") if isinstance(cross_exchange_snapshot, dict) else {}
+                    funding_symbols = funding_snapshot.get("symbols") if isinstance(funding_snapshot, dict) else {}
+                    allow_live_llm = (not full) and (bar_idx >= (len(bars) - 1))
+                    bar_trades, finance_decision = sim.run_bar_with_finance_brain(
+                        symbol,
+                        bar,
+                        closes,
+                        sent,
+                        htf_bullish=htf_bull,
+                        tick_snapshot=tick_features.get(symbol),
+                        cross_exchange_row=(cross_symbols or {}).get(symbol) if isinstance(cross_symbols, dict) else None,
+                        funding_row=(funding_symbols or {}).get(symbol) if isinstance(funding_symbols, dict) else None,
+                        external_inputs=finance_external_inputs,
+                        retrieval_stats=finance_retrieval.get(symbol),
+                        params=finance_params,
+                        allow_llm=allow_live_llm,
+                        indicators=indicators,
+                    )
+                else:
+                    bar_trades = sim.run_bar(symbol, bar, closes, sent, htf_bullish=htf_bull, indicators=indicators)
+                if sim.strategy == "itc_sentiment_tilt_long_flat":
+                    _log_sim_b_tilt(sim, f_log, econ_path, meta_features, symbol, bar["ts"], sent, sentiment_source, sentiment_reason)
+                if sim.strategy == "ensemble_competing_models_long_flat" and model_decision is not None:
                     _econ_log(f_log, econ_path, {
-                        "ts": ts_iso,
+                        "ts": ms_to_utc_iso(bar["ts"]),
                         "sim": sim.id,
                         "symbol": symbol,
-                        "type": "regime",
-                        "payload": regime_out,
+                        "type": "sim_c_ensemble_signal",
+                        "payload": {
+                            "signal": float(model_decision["signal"]),
+                            "confidence": float(model_decision["confidence"]),
+                            "risk_state": str(model_decision["risk_state"]),
+                            "risk_signal": float(model_decision["risk_signal"]),
+                            "walk_forward": dict(model_decision["walk_forward"]),
+                            "leaderboard": list(model_decision.get("leaderboard", []))[:5],
+                            "tick_snapshot": dict(tick_features.get(symbol, {})) if tick_features.get(symbol) else None,
+                        },
                         "meta": {"features": meta_features},
                     })
-
-                if f_vol:
-                    vol_out = compute_volatility(
-                        candles=bars,
-                        prices=None,
-                        params=feature_params.get("volatility_metrics", {}),
-                    )
+                if sim.strategy == "latency_consensus_long_flat" and finance_decision is not None:
                     _econ_log(f_log, econ_path, {
-                        "ts": ts_iso,
+                        "ts": ms_to_utc_iso(bar["ts"]),
                         "sim": sim.id,
                         "symbol": symbol,
-                        "type": "volatility",
-                        "payload": vol_out,
+                        "type": "finance_brain_signal",
+                        "payload": {
+                            "decision": dict(finance_decision.get("decision") or {}),
+                            "agents": dict(finance_decision.get("agents") or {}),
+                            "incoming_source_scores": dict(finance_decision.get("incoming_source_scores") or {}),
+                            "learned_weights": dict(finance_decision.get("learned_weights") or {}),
+                            "llm_manager": dict(finance_decision.get("llm_manager") or {}),
+                        },
                         "meta": {"features": meta_features},
                     })
+                for t in bar_trades:
+                    fout.write(json.dumps(t, ensure_ascii=False) + "\n")
+                    trade_count += 1
+
+                sim.last_ts = max(sim.last_ts, bar["ts"])
+
+    sim.save()
+
+    if f_regime or f_vol or f_chan or f_blend:
+        ts_iso = datetime.now(timezone.utc).isoformat()
+
+        if f_chan:
+            score_path = os.path.join("itc", "channel_scores.json")
+            scores = load_channel_scores(score_path, defaults=None)
+            _econ_log(f_log, econ_path, {
+                "ts": ts_iso,
+                "sim": sim.id,
+                "type": "channel_scores",
+                "payload": {
+                    "channels": list(scores.keys()),
+                    "weights": scores,
+                },
+                "meta": {"features": meta_features},
+            })
+
+        for symbol in sim.universe:
+            bars = candles_15m.get(symbol, [])
+
+            if f_regime:
+                prices = [b.get("c") for b in bars]
+                regime_out = detect_regime(prices, feature_params.get("regime_detector", {}))
+                _econ_log(f_log, econ_path, {
+                    "ts": ts_iso,
+                    "sim": sim.id,
+                    "symbol": symbol,
+                    "type": "regime",
+                    "payload": regime_out,
+                    "meta": {"features": meta_features},
+                })
 
-            # Blender demo intentionally skipped unless a clean signal list exists.
-
-        pnl = sim.equity - sim.initial_capital
-        pnl_pct = (pnl / sim.initial_capital) * 100
-        dd = ((sim.peak_equity - sim.equity) / sim.peak_equity * 100) if sim.peak_equity > 0 else 0
+            if f_vol:
+                vol_out = compute_volatility(
+                    candles=bars,
+                    prices=None,
+                    params=feature_params.get("volatility_metrics", {}),
+                )
+                _econ_log(f_log, econ_path, {
+                    "ts": ts_iso,
+                    "sim": sim.id,
+                    "symbol": symbol,
+                    "type": "volatility",
+                    "payload": vol_out,
+                    "meta": {"features": meta_features},
+                })
 
-        status = "HALTED" if sim.halted else "ACTIVE"
-        print(f"  [{sim.id}] {status} | equity=${sim.equity:.2f} | pnl={pnl_pct:+.2f}% | dd={dd:.2f}% | trades={trade_count} new, {sim.total_trades} total")
+        # Blender demo intentionally skipped unless a clean signal list exists.
+
+    pnl = sim.equity - sim.initial_capital
+    pnl_pct = (pnl / sim.initial_capital) * 100
+    dd = ((sim.peak_equity - sim.equity) / sim.peak_equity * 100) if sim.peak_equity > 0 else 0
+
+    status = "HALTED" if sim.halted else "ACTIVE"
+    print(f"  [{sim.id}] {status} | equity=${sim.equity:.2f} | pnl={pnl_pct:+.2f}% | dd={dd:.2f}% | trades={trade_count} new, {sim.total_trades} total")
+    return {
+        "id": sim.id,
+        "strategy": sim.strategy_profile,
+        "status": status,
+        "equity": sim.equity,
+        "pnl_pct": pnl_pct,
+        "drawdown_pct": dd,
+        "new_trades": trade_count,
+        "total_trades": sim.total_trades,
+        "sim_dir": str(sim.sim_dir),
+    }
 
 
 if __name__ == "__main__":
@@ -1882,7 +2278,18 @@ if __name__ == "__main__":
     parser.add_argument("--sim", type=str, default=None, help="Run only this sim ID")
     parser.add_argument("--config", type=str, default=None, help="Override base config path")
     parser.add_argument("--features-config", type=str, default=None, help="Override features overlay path")
+    parser.add_argument("--start", type=str, default=None, help="Only load market data at or after this time (epoch ms or ISO-8601)")
+    parser.add_argument("--end", type=str, default=None, help="Only load market data at or before this time (epoch ms or ISO-8601)")
+    parser.add_argument("--engine", choices=ENGINES, default="event", help="Bar replay: per-bar loop, or numpy arrays for SIM_A/SIM_B")
     args = parser.parse_args()
     cfg_path = resolve_path(args.config, CONFIG_ENV, DEFAULT_CONFIG_PATH)
     feat_path = resolve_path(args.features_config, FEATURES_ENV, DEFAULT_FEATURES_CONFIG_PATH)
-    run(sim_filter=args.sim, full=args.full, config_path=cfg_path, features_path=feat_path)
+    run(
+        sim_filter=args.sim,
+        full=args.full,
+        config_path=cfg_path,
+        features_path=feat_path,
+        start_ts=parse_time_arg(args.start),
+        end_ts=parse_time_arg(args.end),
+        engine=args.engine,
+    )
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep and batch runner for the trading sims.
+
+Loads the market data once, replays every (sim, parameter combination) in a
+process pool, and prints one comparison table built from each variant's
+summarize_trade_log() performance.
+
+Grid file (YAML or JSON):
+  sims: [SIM_A, SIM_B]                      # optional; default: enabled sims
+  params:
+    execution.tilt_scale: [0.003, 0.005, 0.008]
+    execution.entry_gap_pct: [0.0008, 0.0012]
+    features.competing_models.trend_fast: [6, 8]
+
+Keys are dotted paths into a sim's config. A "features." prefix sets
+features_params (competing models, finance brain, execution_model defaults)
+for that variant only. Every variant replays from scratch into its own
+directory under --out, so the live sims' state is never touched.
+
+Workers are forked after the data is loaded. They share it copy-on-write,
+and market-store columns are shared through the page cache. On platforms
+without fork, each worker loads the data itself.
+
+Usage:
+  python scripts/sim_sweep.py --grid sweep.yaml --workers 8
+  python scripts/sim_sweep.py --sim SIM_B --param execution.tilt_scale=0.003,0.005 --param execution.entry_gap_pct=0.0008,0.0012
+  python scripts/sim_sweep.py --sim SIM_A --param execution.max_notional_pct=0.02,0.05 --engine vector
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import sim_runner  # noqa: E402
+
+FEATURES_PREFIX = "features."
+TABLE_COLUMNS = (
+    ("id", "{}"),
+    ("status", "{}"),
+    ("net_return_pct", "{:+.2f}"),
+    ("realized_pnl", "{:+.2f}"),
+    ("round_trips", "{}"),
+    ("win_rate", "{:.2f}"),
+    ("total_fees_usd", "{:.2f}"),
+    ("drawdown_pct", "{:.2f}"),
+)
+
+_CONTEXT = None
+
+
+def parse_param(spec):
+    """``path=v1,v2`` -> (path, [v1, v2]); values are parsed as JSON where possible."""
+    path, sep, raw = str(spec).partition("=")
+    if not sep or not path.strip():
+        raise ValueError(f"expected path=v1,v2,..., got {spec!r}")
+    values = []
+    for item in raw.split(","):
+        item = item.strip()
+        try:
+            values.append(json.loads(item))
+        except json.JSONDecodeError:
+            values.append(item)
+    return path.strip(), values
+
+
+def load_grid(path):
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() == ".json":
+        grid = json.loads(text)
+    else:
+        if sim_runner.yaml is None:
+            raise RuntimeError("pyyaml is required for YAML grids; install with: pip install pyyaml")
+        grid = sim_runner.yaml.safe_load(text) or {}
+    params = grid.get("params") or {}
+    if not isinstance(params, dict):
+        raise ValueError("grid 'params' must map dotted paths to value lists")
+    return list(grid.get("sims") or []), {key: list(values) if isinstance(values, list) else [values] for key, values in params.items()}
+
+
+def _nested(path, value):
+    out = value
+    for part in reversed(path.split(".")):
+        out = {part: out}
+    return out
+
+
+def build_variants(sims_cfg, params):
+    """One task per (sim, combination), in a stable order."""
+    keys = list(params)
+    combos = list(itertools.product(*(params[key] for key in keys))) if keys else [()]
+    variants = []
+    for cfg in sims_cfg:
+        for n, combo in enumerate(combos):
+            sim_overlay, feature_overrides = {}, {}
+            for key, value in zip(keys, combo):
+                if key.startswith(FEATURES_PREFIX):
+                    feature_overrides = sim_runner.deep_merge(feature_overrides, _nested(key[len(FEATURES_PREFIX):], value))
+                else:
+                    sim_overlay = sim_runner.deep_merge(sim_overlay, _nested(key, value))
+            variant = sim_runner.deep_merge(dict(cfg), sim_overlay)
+            variant["id"] = f"{cfg['id']}.sw{n:03d}" if keys else str(cfg["id"])
+            variants.append(
+                {
+                    "base": str(cfg["id"]),
+                    "cfg": variant,
+                    "feature_overrides": feature_overrides or None,
+                    "params": dict(zip(keys, combo)),
+                }
+            )
+    return variants
+
+
+def _init_worker(config_path, features_path, sims_cfg, start_ts, end_ts):
+    global _CONTEXT
+    if _CONTEXT is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            config = sim_runner.load_config(config_path, features_path)
+            _CONTEXT = sim_runner.load_market_context(config, sims_cfg, start_ts=start_ts, end_ts=end_ts)
+
+
+def run_variant(variant, sim_root, engine="event"):
+    """Replay one variant against the loaded context; return its comparison row."""
+    ctx = dict(_CONTEXT, f_log=False)  # economics/observe.jsonl is for live runs, not sweeps
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        outcome = sim_runner.run_sim(
+            variant["cfg"],
+            ctx,
+            full=True,
+            sim_root=Path(sim_root),
+            feature_overrides=variant["feature_overrides"],
+            engine=engine,
+        )
+    performance = json.loads((Path(outcome["sim_dir"]) / "performance.json").read_text(encoding="utf-8"))
+    return {
+        "id": outcome["id"],
+        "base": variant["base"],
+        "params": variant["params"],
+        "status": outcome["status"],
+        "drawdown_pct": outcome["drawdown_pct"],
+        "total_trades": outcome["total_trades"],
+        "seconds": round(time.perf_counter() - started, 3),
+        **performance,
+    }
+
+
+def sweep(
+    *,
+    config_path,
+    features_path=None,
+    sim_filter=None,
+    sim_ids=None,
+    params=None,
+    workers=None,
+    out_dir=None,
+    start_ts=None,
+    end_ts=None,
+    engine="event",
+):
+    """Run every variant and return the result rows, best net return first."""
+    global _CONTEXT
+    config = sim_runner.load_config(config_path, features_path)
+    sims_cfg = sim_runner.select_sims(config, sim_filter)
+    if sim_ids:
+        wanted = set(sim_ids)
+        sims_cfg = [cfg for cfg in config["sims"] if cfg["id"] in wanted]
+    if not sims_cfg:
+        return []
+    variants = build_variants(sims_cfg, params or {})
+    out_dir = Path(out_dir or sim_runner.BASE_DIR / "sim_sweeps" / time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()))
+    sim_root = out_dir / "sim"
+    sim_root.mkdir(parents=True, exist_ok=True)
+
+    _CONTEXT = sim_runner.load_market_context(config, sims_cfg, start_ts=start_ts, end_ts=end_ts)
+    if _CONTEXT is None:
+        return []
+    workers = max(1, min(int(workers or os.cpu_count() or 1), len(variants)))
+    try:
+        if workers == 1:
+            rows = [run_variant(variant, sim_root, engine) for variant in variants]
+        else:
+            methods = multiprocessing.get_all_start_methods()
+            mp_context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            init_args = (config_path, features_path, sims_cfg, start_ts, end_ts)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker, initargs=init_args) as pool:
+                rows = list(pool.map(run_variant, variants, itertools.repeat(sim_root), itertools.repeat(engine)))
+    finally:
+        _CONTEXT = None
+
+    rows.sort(key=lambda row: (-float(row.get("net_return_pct", 0.0)), row["id"]))
+    (out_dir / "sweep_results.json").write_text(
+        json.dumps({"workers": workers, "params": params or {}, "results": rows}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    return rows
+
+
+def format_table(rows):
+    param_keys = sorted({key for row in rows for key in row.get("params", {})})
+    header = [name for name, _ in TABLE_COLUMNS] + param_keys
+    body = [
+        [fmt.format(row.get(name, "")) for name, fmt in TABLE_COLUMNS] + [json.dumps(row["params"].get(key)) for key in param_keys]
+        for row in rows
+    ]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *body)]
+    lines = ["  ".join(str(cell).ljust(width) for cell, width in zip(line, widths)) for line in [header, *body]]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trading sim parameter sweep")
+    parser.add_argument("--config", type=str, default=None, help="Override base config path")
+    parser.add_argument("--features-config", type=str, default=None, help="Override features overlay path")
+    parser.add_argument("--grid", type=str, default=None, help="YAML/JSON grid file (sims + params)")
+    parser.add_argument("--param", action="append", default=[], help="Sweep a dotted path: path=v1,v2 (repeatable)")
+    parser.add_argument("--sim", type=str, default=None, help="Sweep only this sim ID")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", type=str, default=None, help="Output directory (default: sim_sweeps/<utc stamp>)")
+    parser.add_argument("--start", type=str, default=None, help="Only load market data at or after this time")
+    parser.add_argument("--end", type=str, default=None, help="Only load market data at or before this time")
+    parser.add_argument("--engine", choices=sim_runner.ENGINES, default="event", help="Bar replay engine (see sim_runner --engine)")
+    args = parser.parse_args(argv)
+
+    sim_ids, params = load_grid(args.grid) if args.grid else ([], {})
+    for spec in args.param:
+        key, values = parse_param(spec)
+        params[key] = values
+    config_path = sim_runner.resolve_path(args.config, sim_runner.CONFIG_ENV, sim_runner.DEFAULT_CONFIG_PATH)
+    if not config_path.exists():
+        print(f"ERROR: config not found at {config_path}. Use --config to override.")
+        return 1
+    features_path = sim_runner.resolve_path(args.features_config, sim_runner.FEATURES_ENV, sim_runner.DEFAULT_FEATURES_CONFIG_PATH)
+    started = time.perf_counter()
+    rows = sweep(
+        config_path=config_path,
+        features_path=features_path,
+        sim_filter=args.sim,
+        sim_ids=sim_ids,
+        params=params,
+        workers=args.workers,
+        out_dir=args.out,
+        start_ts=sim_runner.parse_time_arg(args.start),
+        end_ts=sim_runner.parse_time_arg(args.end),
+        engine=args.engine,
+    )
+    if not rows:
+        print("No variants ran.")
+        return 1
+    print(format_table(rows))
+    print(f"{len(rows)} variants in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HIVEMIND_ROOT = REPO_ROOT / "workspace" / "hivemind"
+if str(HIVEMIND_ROOT) not in sys.path:
+    sys.path.insert(0, str(HIVEMIND_ROOT))
+
+from hivemind.models import KnowledgeUnit
+from hivemind.store import HiveMindStore
+
+
+def _vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.calls.append((self.path, payload))
+            fail = server.failures > 0
+            server.failures -= int(fail)
+        if fail:
+            return self._reply(503, {"error": "busy"})
+        if self.path == "/api/embed" and server.batch:
+            return self._reply(200, {"embeddings": [_vector(text) for text in payload["input"]]})
+        if self.path == "/api/embeddings":
+            return self._reply(200, {"embedding": _vector(payload["prompt"])})
+        return self._reply(404, {"error": "not found"})
+
+    def _reply(self, status, body):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+class TestHiveMindPutMany(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = HiveMindStore(Path(self._tmp.name) / "hivemind")
+
+    def _serve(self, batch=True, failures=0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+        server.lock = threading.Lock()
+        server.calls = []
+        server.batch = batch
+        server.failures = failures
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        env = {
+            "HIVEMIND_ENABLE_OLLAMA_EMBEDDINGS": "1",
+            "HIVEMIND_OLLAMA_EMBED_URL": f"http://127.0.0.1:{server.server_address[1]}/api/embeddings",
+            "HIVEMIND_EMBED_BATCH_SIZE": "4",
+        }
+        patcher = patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return server
+
+    @staticmethod
+    def _items(contents):
+        return [(KnowledgeUnit(kind="fact", source="test", agent_scope="shared"), text) for text in contents]
+
+    def test_matches_put_and_dedups_before_writing_once(self):
+        self.store.put(KnowledgeUnit(kind="fact", source="test", agent_scope="shared"), "already stored")
+        results = self.store.put_many(self._items(["a fact", "already stored", "b fact", "a fact"]))
+        self.assertEqual([r["stored"] for r in results], [True, False, True, False])
+        self.assertEqual([r.get("reason") for r in results[1::2]], ["dedup", "dedup"])
+        self.assertEqual(results[3]["content_hash"], results[0]["content_hash"])
+
+        contents = [u["content"] for u in self.store.all_units()]
+        self.assertEqual(contents, ["already stored", "a fact", "b fact"])
+        events = [json.loads(line)["event"] for line in self.store.log_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(events, ["ingest_store", "ingest_store", "ingest_skip_dedup", "ingest_store", "ingest_skip_dedup"])
+        again = self.store.put_many(self._items(["b fact"]))
+        self.assertEqual(again[0]["reason"], "dedup")
+        self.assertEqual(self.store.put_many([]), [])
+
+    def test_embeds_in_batches_over_one_client(self):
+        server = self._serve()
+        texts = [f"unit number {i}" for i in range(10)]
+        results = self.store.put_many(self._items(texts))
+        self.assertTrue(all(r["stored"] for r in results))
+        self.assertEqual([r["record"]["embedding"] for r in results], [_vector(t) for t in texts])
+        self.assertEqual(sorted(len(p["input"]) for _, p in server.calls), [2, 4, 4])
+        self.assertEqual({path for path, _ in server.calls}, {"/api/embed"})
+        stored = {u["content"]: u for u in self.store.all_units()}
+        self.assertEqual(stored["unit number 3"]["embedding_model"], "nomic-embed-text")
+
+    def test_falls_back_to_single_prompts_and_retries_transient_errors(self):
+        server = self._serve(batch=False, failures=1)
+        texts = ["first", "second", "third"]
+        with patch("hivemind.ollama_embed._RETRY_BACKOFF_S", 0.0):
+            results = self.store.put_many(self._items(texts))
+        self.assertEqual([r["record"]["embedding"] for r in results], [_vector(t) for t in texts])
+        paths = [path for path, _ in server.calls]
+        self.assertEqual(paths.count("/api/embed"), 2)  # 503, retried, then 404
+        self.assertEqual(paths.count("/api/embeddings"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import argparse
+import importlib.util
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HIVEMIND_ROOT = REPO_ROOT / "workspace" / "hivemind"
+if str(HIVEMIND_ROOT) not in sys.path:
+    sys.path.insert(0, str(HIVEMIND_ROOT))
+
+from hivemind import index as hivemind_index
+from hivemind.models import KnowledgeUnit
+from hivemind.store import HiveMindStore
+
+
+def _legacy_tokenize(text):
+    buf, acc = [], []
+    for ch in (text or "").lower():
+        if ch.isalnum() or ch in ("_", "-"):
+            acc.append(ch)
+        else:
+            if acc:
+                buf.append("".join(acc))
+                acc = []
+    if acc:
+        buf.append("".join(acc))
+    return buf
+
+
+class TestHiveMindSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.base = Path(self._tmp.name) / "hivemind"
+        self.store = HiveMindStore(self.base)
+
+    def _put(self, content, scope="shared", store=None, **kwargs):
+        return (store or self.store).put(KnowledgeUnit(kind="fact", source="test", agent_scope=scope, **kwargs), content)
+
+    def test_tokenizer_matches_character_loop(self):
+        text = "Ünïcode_tokens, ffmpeg-x264 42nd  café!? ½ tabs\tand—dashes"
+        self.assertEqual(hivemind_index.tokenize(text), _legacy_tokenize(text))
+
+    def test_bm25_ranking_scope_expiry_and_append_only_access(self):
+        self._put("gateway restart gateway")
+        self._put("gateway notes among a long list of other words")
+        self._put("unrelated cooking recipe")
+        self._put("main only gateway secret", scope="main")
+        self._put("expired gateway fact", ttl_days=-1)
+        before = self.store.units_path.read_bytes()
+
+        hits = self.store.search(agent_scope="claude-code", query="gateway", limit=10)
+        self.assertEqual(
+            [h["content"] for h in hits],
+            ["gateway restart gateway", "gateway notes among a long list of other words"],
+        )
+        self.assertGreater(hits[0]["rank_score"], hits[1]["rank_score"])
+        # ``score`` stays the legacy overlap: one query token, plus 3 for the whole query.
+        self.assertEqual([h["score"] for h in hits], [4, 4])
+        main_hits = self.store.search(agent_scope="main", query="gateway secret", limit=1)
+        self.assertEqual([h["content"] for h in main_hits], ["main only gateway secret"])
+
+        self.assertEqual(self.store.units_path.read_bytes(), before)
+        counts = {u["content"]: u.get("access_count", 0) for u in self.store.all_units()}
+        self.assertEqual(counts["gateway notes among a long list of other words"], 1)
+        self.assertEqual(counts["main only gateway secret"], 1)
+        self.assertEqual(counts["unrelated cooking recipe"], 0)
+
+    def test_access_log_is_compacted_into_counts_file(self):
+        self._put("gateway restart notes")
+        self._put("cooking recipe")
+        with patch("hivemind.store.ACCESS_COMPACT_EVERY", 4):
+            for _ in range(5):
+                self.store.search(agent_scope="main", query="gateway", limit=1)
+            self.store.search(agent_scope="main", query="cooking", limit=1)
+        self.assertEqual(len(self.store.access_log_path.read_text(encoding="utf-8").splitlines()), 2)
+        folded = json.loads(self.store.access_counts_path.read_text(encoding="utf-8"))
+        self.assertEqual(folded["counts"], {HiveMindStore.content_hash("gateway restart notes"): 4})
+
+        counts = {u["content"]: u.get("access_count", 0) for u in HiveMindStore(self.base).all_units()}
+        self.assertEqual(counts, {"gateway restart notes": 5, "cooking recipe": 1})
+        self.assertEqual(self.store.compact_access_log()["folded"], 2)
+        self.assertFalse(self.store.access_log_path.exists())
+        units = self.store.all_units()
+        self.assertEqual({u["content"]: u["access_count"] for u in units}, counts)
+
+        self.store.write_units(units)
+        self.assertFalse(self.store.access_counts_path.exists())
+        self.assertEqual({u["content"]: u["access_count"] for u in self.store.all_units()}, counts)
+
+    def test_snapshot_reload_tails_appends_and_rebuilds_after_rewrite(self):
+        for i in range(5):
+            self._put(f"routing note {i} about fallback providers")
+        self.store.search(agent_scope="main", query="fallback", limit=3)
+        self.store.save_index()
+
+        other = HiveMindStore(self.base)
+        self._put("fresh fallback insight from another process", store=HiveMindStore(self.base))
+        hits = other.search(agent_scope="main", query="fresh fallback", limit=1)
+        self.assertEqual(hits[0]["content"], "fresh fallback insight from another process")
+
+        self.store.search_index_path.unlink()
+        rebuilt = HiveMindStore(self.base).search(agent_scope="main", query="routing fallback", limit=6)
+        reloaded = other.search(agent_scope="main", query="routing fallback", limit=6)
+        self.assertEqual([(h["content"], h["rank_score"]) for h in rebuilt], [(h["content"], h["rank_score"]) for h in reloaded])
+
+        units = self.store.all_units()
+        self.store.write_units([u for u in units if "fresh" not in u["content"]])
+        self.assertEqual(self.store.search(agent_scope="main", query="fresh", limit=5), [])
+        self.assertEqual(HiveMindStore(self.base).search(agent_scope="main", query="fresh", limit=5), [])
+
+    def test_dedup_uses_append_only_hash_set_and_legacy_list(self):
+        legacy = HiveMindStore.content_hash("already known")
+        self.store.hash_index_path.write_text(json.dumps([legacy]), encoding="utf-8")
+        store = HiveMindStore(self.base)
+        self.assertEqual(self._put("already known", store=store)["reason"], "dedup")
+        self.assertTrue(self._put("brand new", store=store)["stored"])
+        self.assertEqual(self._put("brand new", store=HiveMindStore(self.base))["reason"], "dedup")
+        self.assertEqual(
+            store.hash_set_path.read_text(encoding="utf-8").split(), [HiveMindStore.content_hash("brand new")]
+        )
+
+    @unittest.skipIf(hivemind_index.np is None, "numpy unavailable")
+    def test_semantic_search_ranks_by_stored_embedding(self):
+        vectors = {"alpha": [1.0, 0.0, 0.0], "beta": [0.0, 1.0, 0.0], "gamma": [0.7, 0.7, 0.0]}
+        with patch.object(HiveMindStore, "_embed_redacted_text", side_effect=lambda text: vectors.get(text.split()[0])):
+            for name in ("alpha", "beta", "gamma"):
+                self._put(f"{name} unit")
+            self._put("beta private", scope="main")
+            hits = self.store.search(agent_scope="claude-code", query="beta", limit=2, semantic=True)
+            self.assertEqual([h["content"] for h in hits], ["beta unit", "gamma unit"])
+            self.assertAlmostEqual(hits[0]["rank_score"], 1.0, places=4)
+            self.assertEqual(hits[0]["score"], 4)
+        with patch.object(HiveMindStore, "_embed_redacted_text", return_value=None):
+            fallback = self.store.search(agent_scope="claude-code", query="gamma", limit=2, semantic=True)
+        self.assertEqual([h["content"] for h in fallback], ["gamma unit"])
+
+    def test_memory_tool_reward_stays_in_range(self):
+        spec = importlib.util.spec_from_file_location("memory_tool", REPO_ROOT / "scripts" / "memory_tool.py")
+        memory_tool = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(memory_tool)
+        self._put("gateway restart runbook: drain, restart the gateway, verify health " * 4)
+        self._put("gateway notes")
+
+        rewards = []
+        pipeline = MagicMock(agent_ids=["main"])
+        pipeline.plan_consult_order.return_value = {"consult_order": [], "paths": [["main"]]}
+        pipeline.observe_outcome.side_effect = lambda **kwargs: rewards.append(kwargs["reward"])
+        with patch.object(memory_tool, "HiveMindStore", lambda: HiveMindStore(self.base)), patch.object(
+            memory_tool, "_any_dynamics_enabled", return_value=True
+        ), patch.object(memory_tool, "_load_dynamics_pipeline", return_value=pipeline), patch.object(
+            memory_tool, "_save_dynamics_pipeline"
+        ), redirect_stdout(io.StringIO()):
+            for query in ("gateway restart runbook drain verify health", "gateway", "nothing matches this"):
+                args = argparse.Namespace(agent="main", q=query, limit=5, semantic=False, json=True)
+                self.assertEqual(memory_tool.cmd_query(args), 0)
+        # BM25 is unbounded; the reward comes from the legacy overlap score, capped at 1.
+        self.assertEqual(rewards, [1.0, 0.8, -0.2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra.asof import AsOfCursor, row_timestamps  # noqa: E402
+
+
+def _scan(rows, ts):
+    latest = None
+    for row in rows:
+        if int(row.get("ts", 0) or 0) > int(ts):
+            break
+        latest = row
+    return latest
+
+
+class AsOfCursorTests(unittest.TestCase):
+    def test_matches_forward_scan_for_monotone_and_backward_queries(self):
+        rng = random.Random(3)
+        rows = sorted(({"ts": rng.randrange(0, 500), "i": i} for i in range(200)), key=lambda row: row["ts"])
+        rows.insert(0, {"ts": None, "i": -1})  # missing ts sorts as 0, as the loaders do
+        queries = sorted(rng.randrange(-10, 520) for _ in range(300))
+        cursor = AsOfCursor.over_rows(rows)
+        self.assertEqual([cursor.at(ts) for ts in queries], [_scan(rows, ts) for ts in queries])
+        shuffled = list(queries)
+        rng.shuffle(shuffled)
+        self.assertEqual([cursor.at(ts) for ts in shuffled], [_scan(rows, ts) for ts in shuffled])
+
+    def test_mapping_lookup_matches_latest_earlier_key(self):
+        regime = {3_600_000 * h: h % 3 == 0 for h in (5, 1, 2, 9, 7)}
+        cursor = AsOfCursor.over_mapping(regime)
+        for ts in range(0, 3_600_000 * 11, 900_000):
+            earlier = [t for t in regime if t <= ts]
+            self.assertEqual(cursor.at(ts), regime[max(earlier)] if earlier else None)
+        self.assertEqual(AsOfCursor.over_mapping({}, default=0.0).at(10), 0.0)
+        self.assertEqual(row_timestamps([{"ts": "7"}, {}]), [7, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -66,6 +66,46 @@ class TestEmbeddingsContract(unittest.TestCase):
         self.assertGreater(modern["rows"], 0)
         self.assertGreater(minilm["rows"], 0)
 
+    def test_index_reports_stages_and_rewrites_only_changed_docs(self):
+        stages = self.index_summary["stages"]
+        self.assertEqual(stages["read_chunk"]["docs"], 4)
+        self.assertEqual(stages["embed:rag_minilm"]["chunks"], self.index_summary["minilm_chunks"])
+        self.assertEqual(stages["write:rag_modernbert"]["rows"], self.index_summary["modernbert_chunks"])
+
+        env = dict(self.env, OPENCLAW_KB_INDEX_WORKERS="2", OPENCLAW_KB_EMBED_BATCH_SIZE="1")
+        with patch.dict(os.environ, env, clear=False):
+            rerun = run_index()
+            store = LanceVectorStore(str(self.db_dir))
+            minilm_rows = store.stats(MINILM_TABLE)["rows"]
+        self.assertEqual(rerun["docs_indexed"], 0)
+        self.assertEqual(rerun["docs_skipped"], 4)
+        self.assertEqual(minilm_rows, self.index_summary["minilm_chunks"])
+
+    def test_reindex_after_small_edit_embeds_only_changed_chunks(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            doc = root / "workspace" / "knowledge_base" / "data" / "sections.md"
+            sections = [f"# Section {i}\n\nParagraph {i} about retrieval topic {i}." for i in range(6)]
+            _write(doc, "\n\n".join(sections))
+            env = {
+                "OPENCLAW_KB_REPO_ROOT": str(root),
+                "OPENCLAW_KB_VECTOR_DB_DIR": str(root / "vectors.lance"),
+                "OPENCLAW_KB_EMBED_META_PATH": str(root / "embeddings.meta.json"),
+                "OPENCLAW_KB_EMBEDDINGS_BACKEND": "mock",
+            }
+            with patch.dict(os.environ, env, clear=False):
+                first = run_index()
+                sections[2] = "# Section 2\n\nParagraph 2 was edited."
+                _write(doc, "\n\n".join(sections))
+                second = run_index()
+
+        self.assertEqual(first["stages"]["embed:rag_minilm"]["chunks"], 6)
+        self.assertEqual(second["docs_indexed"], 1)
+        for table in ("rag_minilm", "rag_modernbert"):
+            self.assertEqual(second["stages"][f"embed:{table}"]["chunks"], 1)
+            self.assertEqual(second["stages"][f"embed:{table}"]["cache_hits"], 5)
+            self.assertEqual(second[f"{table.split('_')[1]}_stats"]["rows"], 6)
+
     def test_hybrid_is_authoritative_with_contexts(self):
         with patch.dict(os.environ, self.env, clear=False):
             payload = retrieve("authoritative retrieval model", mode="HYBRID", k=4)
@@ -0,0 +1,82 @@
+import gzip
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = REPO_ROOT / "workspace" / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import event_sink  # noqa: E402
+import policy_router  # noqa: E402
+
+
+def _rows(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+class TestJsonlEventSink(unittest.TestCase):
+    def test_sync_mode_keeps_handle_open_and_writes_immediately(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "logs" / "events.jsonl"
+            sink = event_sink.JsonlEventSink(path, mode="sync")
+            self.assertTrue(sink.write({"event": "a"}))
+            handle = sink._handle
+            self.assertTrue(sink.write({"event": "b"}))
+            self.assertIs(sink._handle, handle)
+            self.assertEqual([r["event"] for r in _rows(path)], ["a", "b"])
+
+            path.unlink()
+            sink.write({"event": "c"})
+            self.assertEqual([r["event"] for r in _rows(path)], ["c"])
+            sink.close()
+
+    def test_buffered_mode_batches_and_counts_drops(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            sink = event_sink.JsonlEventSink(path, mode="buffered", queue_size=4, flush_interval_sec=0.01)
+            for i in range(3):
+                self.assertTrue(sink.write({"i": i}))
+            sink.flush()
+            self.assertEqual([r["i"] for r in _rows(path)], [0, 1, 2])
+
+            with sink._lock:
+                results = [sink.write({"i": i}) for i in range(3, 20)]
+            sink.flush()
+            stats = sink.stats()
+            self.assertGreater(stats["dropped"], 0)
+            self.assertEqual(stats["dropped"], results.count(False))
+            self.assertEqual(len(_rows(path)), 3 + results.count(True))
+            sink.close()
+
+    def test_size_rotation_gzips_closed_segments_and_prunes(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "events.jsonl"
+            sink = event_sink.JsonlEventSink(path, mode="sync", max_bytes=200, keep=2)
+            for i in range(40):
+                sink.write({"i": i, "pad": "x" * 40})
+            sink.close()
+
+            segments = sorted(Path(td).glob("events.jsonl.*.gz"))
+            self.assertEqual(len(segments), 2)
+            self.assertGreater(sink.stats()["rotations"], 2)
+            with gzip.open(segments[-1], "rt", encoding="utf-8") as handle:
+                archived = [json.loads(line) for line in handle if line.strip()]
+            self.assertTrue(archived)
+            newest = _rows(path) if path.exists() and path.stat().st_size else archived
+            self.assertEqual(newest[-1]["i"], 39)
+
+    def test_policy_router_log_event_goes_through_shared_sink(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "router.jsonl"
+            policy_router.log_event("router_skip", {"provider": "x"}, path)
+            policy_router.log_event("router_success", {"provider": "x"}, path)
+            self.assertEqual(event_sink.get_sink(path).stats()["written"], 2)
+            self.assertEqual([r["event"] for r in _rows(path)], ["router_skip", "router_success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
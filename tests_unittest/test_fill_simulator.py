@@ -1,6 +1,6 @@
 import unittest
 
-from core_infra.fill_simulator import estimate_liquidation_price, limit_fill_price, market_fill_price
+from core_infra.fill_simulator import estimate_liquidation_price, limit_fill_price, market_close_costs, market_fill_price
 
 
 class FillSimulatorTests(unittest.TestCase):
@@ -17,6 +17,36 @@ class FillSimulatorTests(unittest.TestCase):
         self.assertGreater(out["price"], 100.1)
         self.assertEqual(out["role"], "taker")
 
+    def test_market_close_costs_matches_market_fill_and_carries(self):
+        for direction, side, quote in ((1, "sell", {"best_bid": 99.9}), (-1, "buy", {"best_ask": 100.1}), (1, "sell", {})):
+            fill = market_fill_price(
+                side=side,
+                reference_price=100.0,
+                slippage_bps=2.0,
+                impact_bps_per_10k=1.0,
+                notional_usd=5000.0,
+                **quote,
+            )
+            out = market_close_costs(
+                direction=direction,
+                size=50.0,
+                reference_price=100.0,
+                hold_ms=2 * 86_400_000,
+                entry_notional_usd=5000.0,
+                quoted_price=next(iter(quote.values()), None),
+                slippage_bps=2.0,
+                impact_bps_per_10k=1.0,
+                fee_rate=0.001,
+                funding_bps_8h=1.0,
+                borrow_bps_daily=4.0,
+            )
+            self.assertEqual(out["price"], fill["price"])
+            self.assertEqual(out["impact_bps"], fill["impact_bps"])
+            self.assertAlmostEqual(out["fee_usd"], out["size_usd"] * 0.001)
+            avg_notional = (5000.0 + out["size_usd"]) / 2.0
+            self.assertAlmostEqual(out["funding_cost"], avg_notional * 1e-4 * 6 * direction)
+            self.assertAlmostEqual(out["borrow_cost"], avg_notional * 4e-4 * 2)
+
     def test_limit_fill_requires_touch(self):
         self.assertIsNone(limit_fill_price(side="buy", limit_price=100.0, trade_price=100.5))
         out = limit_fill_price(side="buy", limit_price=100.0, trade_price=99.9)
@@ -1,8 +1,11 @@
+import hashlib
+import math
 import sys
 import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -10,9 +13,33 @@ HIVEMIND_ROOT = REPO_ROOT / "workspace" / "hivemind"
 if str(HIVEMIND_ROOT) not in sys.path:
     sys.path.insert(0, str(HIVEMIND_ROOT))
 
+from hivemind import trails as trails_module  # noqa: E402
 from hivemind.trails import TrailStore  # noqa: E402
 
 
+def _legacy_embed(text, dim=24):
+    vec = [0.0] * dim
+    for token in str(text).lower().split():
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        vec[int(digest[:8], 16) % dim] += 1.0 if int(digest[8:10], 16) % 2 == 0 else -1.0
+    return vec
+
+
+def _legacy_query(rows, query, k, now, half_life_hours):
+    scored = []
+    for row in rows:
+        if not isinstance(row.get("embedding"), list):
+            continue
+        emb = [float(x) for x in row["embedding"]]
+        similarity = max(0.0, trails_module._cosine(query, emb))
+        updated = trails_module._parse_ts(row.get("updated_at") or row.get("created_at"))
+        age_hours = max(0.0, (now - updated).total_seconds() / 3600.0)
+        effective = float(row.get("strength", 0.0)) * math.exp(-math.log(2.0) * age_hours / half_life_hours) * similarity
+        scored.append((-effective, str(row.get("trail_id", "")), similarity))
+    scored.sort()
+    return [(tid, -neg, sim) for neg, tid, sim in scored[:k]]
+
+
 class TestTrailStore(unittest.TestCase):
     def test_decay_reduces_effective_strength(self):
         with tempfile.TemporaryDirectory() as td:
@@ -38,6 +65,105 @@ class TestTrailStore(unittest.TestCase):
             self.assertEqual(after[0], t2)
 
 
+    def test_embed_text_matches_hex_digest_buckets(self):
+        text = "Route cache MISS on the local gateway route"
+        self.assertEqual(trails_module._embed_text(text), _legacy_embed(text))
+
+    def test_query_matches_full_scan(self):
+        now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        with tempfile.TemporaryDirectory() as td:
+            store = TrailStore(path=Path(td) / "trails.jsonl", half_life_hours=6.0)
+            words = ["route", "cache", "memory", "gateway", "local", "fallback", "model", "python"]
+            for i in range(60):
+                text = " ".join(words[(i * j) % len(words)] for j in range(1, 2 + i % 5))
+                store.add(
+                    {
+                        "trail_id": f"t{i:02d}",
+                        "text": text,
+                        "strength": 0.5 + (i % 7) * 0.25,
+                        "updated_at": (now - timedelta(hours=i % 11)).isoformat(),
+                    }
+                )
+            store.add({"trail_id": "odd", "text": "odd", "embedding": [1.0, 0.0, 1.0], "strength": 9.0})
+            store.add({"trail_id": "zero", "text": "", "strength": 5.0, "updated_at": "not a timestamp"})
+            rows = store._read_all()
+            for query in ("route cache", "memory gateway fallback", "python", "unseen words"):
+                for k in (1, 5, 70):
+                    got = [(x["trail_id"], x["effective_strength"], x["similarity"]) for x in store.query(query, k=k, now=now)]
+                    want = _legacy_query(rows, _legacy_embed(query), k, now, 6.0)
+                    self.assertEqual(len(got), len(want))
+                    for g, w in zip(got, want):
+                        self.assertAlmostEqual(g[1], w[1], places=9)
+                        if g[0] != w[0]:
+                            # Only rows with mathematically equal scores may swap on rounding.
+                            self.assertAlmostEqual(g[1], dict((x[0], x[1]) for x in want).get(g[0], -1.0), places=9)
+                        else:
+                            self.assertAlmostEqual(g[2], w[2], places=9)
+            odd = store.query([1.0, 0.0, 1.0], k=1, now=now)[0]
+            self.assertEqual(odd["trail_id"], "odd")
+            self.assertAlmostEqual(odd["similarity"], 1.0)
+
+    def test_decay_is_lazy_and_reinforce_appends_deltas_until_compaction(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "trails.jsonl"
+            store = TrailStore(path=path, half_life_hours=1.0)
+            t1 = store.add({"text": "gateway fallback", "strength": 1.0})
+            t2 = store.add({"text": "gateway retry", "strength": 1.0})
+            before = path.read_bytes()
+            self.assertEqual(store.decay(now=datetime.now(timezone.utc) + timedelta(hours=3))["changed"], 0)
+            self.assertEqual(path.read_bytes(), before)
+
+            self.assertTrue(store.reinforce(t2, 2.0))
+            self.assertFalse(store.reinforce("missing", 1.0))
+            self.assertEqual(path.read_bytes(), before)
+            self.assertEqual(len(store.deltas_path.read_text(encoding="utf-8").splitlines()), 1)
+            other = TrailStore(path=path, half_life_hours=1.0)
+            self.assertEqual(other.query("gateway", k=1)[0]["trail_id"], t2)
+            self.assertAlmostEqual(other.query("gateway", k=1)[0]["strength"], 3.0, places=3)
+
+            with patch.object(trails_module, "COMPACT_EVERY", 3):
+                store.reinforce(t1, 0.5)
+                store.reinforce(t1, 0.5)
+            self.assertFalse(store.deltas_path.exists())
+            strengths = {r["trail_id"]: r["strength"] for r in TrailStore(path=path)._read_all()}
+            self.assertAlmostEqual(strengths[t1], 2.0, places=3)
+            self.assertAlmostEqual(strengths[t2], 3.0, places=3)
+            self.assertAlmostEqual({r["trail_id"]: r["strength"] for r in other._read_all()}[t1], 2.0, places=3)
+            t3 = other.add({"text": "gateway newcomer", "strength": 0.1})
+            self.assertEqual(store.snapshot()["count"], 3)
+            self.assertIn(t3, [x["trail_id"] for x in store.query("gateway newcomer", k=3)])
+
+    def test_status_view_applies_deltas_and_decay(self):
+        source_ui = REPO_ROOT / "workspace" / "source-ui"
+        if str(source_ui) not in sys.path:
+            sys.path.insert(0, str(source_ui))
+        from api import tacti_cr  # noqa: E402
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "trails.jsonl"
+            day_old = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+            store = TrailStore(path=path)
+            stale = store.add({"text": "stale route", "tags": ["routing"], "strength": 2.0, "updated_at": day_old})
+            fresh = store.add({"text": "fresh route", "tags": ["routing"], "strength": 1.0})
+            self.assertTrue(store.reinforce(fresh, 2.0))
+
+            recent = store.recent(5)
+            self.assertEqual([row["trail_id"] for row in recent], [stale, fresh])
+            self.assertAlmostEqual(recent[0]["effective_strength"], 1.0, places=3)
+            self.assertAlmostEqual(recent[1]["effective_strength"], 3.0, places=3)
+            self.assertEqual([row["trail_id"] for row in store.recent(1)], [fresh])
+
+            with patch.object(trails_module, "DEFAULT_TRAILS_PATH", path):
+                status = tacti_cr.get_trails_status(limit=5)
+        strengths = {row["trail_id"]: row["strength"] for row in status["recent_trails"]}
+        self.assertAlmostEqual(strengths[stale], 1.0, places=3)
+        self.assertAlmostEqual(strengths[fresh], 3.0, places=3)
+        summary = status["memory_heatmap_summary"]
+        self.assertEqual(summary["trail_count"], 2)
+        self.assertAlmostEqual(summary["strength_summary"]["max"], 3.0, places=3)
+        self.assertEqual(summary["top_tags"], [{"tag": "routing", "count": 2}])
+
+
 if __name__ == "__main__":
     unittest.main()
 
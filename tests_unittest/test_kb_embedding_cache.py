@@ -0,0 +1,79 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+try:
+    import numpy as np
+    from embeddings.cache import EmbeddingCache
+    from embeddings.driver_mlx import ACCEL_MODEL_ID
+except Exception:  # pragma: no cover - numpy is optional in CI
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy unavailable")
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        env = patch.dict(os.environ, {"OPENCLAW_KB_EMBEDDINGS_BACKEND": "mock"}, clear=False)
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _vec(self, seed):
+        return np.full(384, float(seed), dtype=np.float32)
+
+    def test_vectors_persist_across_reopen(self):
+        cache = EmbeddingCache(self.root, ACCEL_MODEL_ID)
+        self.assertEqual(cache.put_many(["a", "b", "a"], np.stack([self._vec(1), self._vec(2), self._vec(9)])), 2)
+        cache.save()
+
+        reopened = EmbeddingCache(self.root, ACCEL_MODEL_ID)
+        hits = reopened.get_many(["a", "b", "c"])
+        self.assertEqual(sorted(hits), ["a", "b"])
+        np.testing.assert_array_equal(hits["a"], self._vec(1))
+        np.testing.assert_array_equal(hits["b"], self._vec(2))
+        self.assertEqual(reopened.stats()["misses"], 1)
+
+    def test_interrupted_append_is_ignored(self):
+        cache = EmbeddingCache(self.root, ACCEL_MODEL_ID)
+        cache.put_many(["a"], self._vec(1)[None, :])
+        cache.save()
+        with open(cache.vectors_path, "ab") as fh:
+            fh.write(self._vec(2).tobytes()[:100])
+
+        reopened = EmbeddingCache(self.root, ACCEL_MODEL_ID)
+        reopened.put_many(["b"], self._vec(2)[None, :])
+        np.testing.assert_array_equal(reopened.get_many(["b"])["b"], self._vec(2))
+        np.testing.assert_array_equal(reopened.get_many(["a"])["a"], self._vec(1))
+
+    def test_compaction_keeps_recently_used_rows(self):
+        cache = EmbeddingCache(self.root, ACCEL_MODEL_ID, max_rows=2)
+        cache.put_many(["old", "kept"], np.stack([self._vec(1), self._vec(2)]))
+        cache.save()
+
+        second = EmbeddingCache(self.root, ACCEL_MODEL_ID, max_rows=2)
+        second.get_many(["kept"])
+        second.put_many(["new"], self._vec(3)[None, :])
+        result = second.save()
+        self.assertEqual(result["evicted"], 1)
+        self.assertEqual(result["compacted_rows"], 1)
+
+        third = EmbeddingCache(self.root, ACCEL_MODEL_ID, max_rows=2)
+        self.assertEqual(third.stats()["rows"], 2)
+        hits = third.get_many(["old", "kept", "new"])
+        self.assertEqual(sorted(hits), ["kept", "new"])
+        np.testing.assert_array_equal(hits["new"], self._vec(3))
+        self.assertEqual([p.name for p in sorted(third.dir.glob("vectors*.f32"))], [third.vectors_path.name])
+
+
+if __name__ == "__main__":
+    unittest.main()
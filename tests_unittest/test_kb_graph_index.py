@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+from graph.index import GraphIndex  # noqa: E402
+from graph.store import KnowledgeGraphStore  # noqa: E402
+
+
+def _entity(entity_id, name, entity_type="fact", content="", created_at="2026-01-01T00:00:00+00:00"):
+    return {
+        "id": entity_id,
+        "name": name,
+        "entity_type": entity_type,
+        "content": content,
+        "source": "test",
+        "metadata": {},
+        "created_at": created_at,
+        "relations": [],
+    }
+
+
+def _append(path: Path, record: dict):
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record) + "\n")
+
+
+class TestKnowledgeGraphIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.data_dir = Path(self._tmp.name)
+        patcher = patch.dict(os.environ, {"OPENCLAW_QUIESCE": "0"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = KnowledgeGraphStore(self.data_dir)
+        for entity in (
+            _entity("a", "OpenClaw gateway", "system", "routes requests", "2026-01-01T00:00:00+00:00"),
+            _entity("b", "Qwen model", "model", "local OpenClaw model", "2026-01-03T00:00:00+00:00"),
+            _entity("c", "Ollama runtime", "system", "serves qwen", "2026-01-02T00:00:00+00:00"),
+            _entity("d", "GPU lease", "procedure", "one holder at a time", "2026-01-04T00:00:00+00:00"),
+        ):
+            _append(self.store.entities_path, entity)
+        self.store.add_relation("a", "b", "uses")
+        self.store.add_relation("b", "c", "runs_on")
+        self.store.add_relation("c", "d", "requires")
+
+    def test_lookups_match_file_scan_semantics(self):
+        self.assertEqual([e["id"] for e in self.store.get_entity("claw")], ["a"])
+        self.assertEqual([e["id"] for e in self.store.get_entity("O")], ["a", "b", "c"])
+        self.assertEqual([e["id"] for e in self.store.all_entities(limit=2)], ["d", "b"])
+        self.assertEqual([e["id"] for e in self.store.search("openclaw")], ["a", "b"])
+        self.assertEqual(
+            self.store.stats(), {"total": 4, "relations": 3, "by_type": {"system": 2, "model": 1, "procedure": 1}}
+        )
+        self.assertEqual([r["relation_type"] for r in self.store.get_relations("b")], ["uses", "runs_on"])
+        related = self.store.find_related("b")
+        self.assertEqual([(r["entity"]["id"], r["relation"]) for r in related], [("a", "uses"), ("c", "runs_on")])
+        self.assertEqual(self.store.find_related("b", relation_type="runs_on")[0]["entity"]["id"], "c")
+        self.assertEqual(self.store.get_entity("OpenClaw")[0]["relations"], [{"to": "b", "type": "uses"}])
+
+    def test_add_relation_appends_without_rewriting_entities(self):
+        before = self.store.entities_path.read_bytes()
+        self.store.add_relation("a", "d", "monitors")
+        self.assertEqual(self.store.entities_path.read_bytes(), before)
+        self.assertIn({"to": "d", "type": "monitors"}, self.store.get_entity("gateway")[0]["relations"])
+
+    def test_traverse_reports_shortest_paths_up_to_depth(self):
+        hops = self.store.traverse("a", max_depth=2)
+        self.assertEqual([(h["entity"]["id"], h["depth"]) for h in hops], [("b", 1), ("c", 2)])
+        self.assertEqual([step["type"] for step in hops[1]["path"]], ["uses", "runs_on"])
+        self.assertEqual([h["entity"]["id"] for h in self.store.traverse("a", max_depth=5)], ["b", "c", "d"])
+        self.assertEqual([h["entity"]["id"] for h in self.store.traverse("d", max_depth=5, direction="out")], [])
+        self.assertEqual([h["entity"]["id"] for h in self.store.traverse("d", max_depth=5, direction="in")], ["c", "b", "a"])
+
+    def test_tails_appends_and_reloads_rewritten_files(self):
+        index = GraphIndex(self.store.entities_path, self.store.relations_path)
+        index.refresh()
+        self.assertEqual(index.counts()["total"], 4)
+
+        # Another process appends, including a partial trailing line.
+        _append(self.store.entities_path, _entity("e", "Telegram bridge"))
+        with open(self.store.entities_path, "a", encoding="utf-8") as handle:
+            handle.write('{"id": "f", "name": "half')
+        index.refresh()
+        self.assertTrue(index.has_entity("e"))
+        self.assertFalse(index.has_entity("f"))
+        with open(self.store.entities_path, "a", encoding="utf-8") as handle:
+            handle.write(' written"}\n')
+        index.refresh()
+        self.assertEqual(index.entity("f")["name"], "half written")
+
+        # A rewrite that keeps the size but changes earlier bytes forces a reload.
+        text = self.store.entities_path.read_text(encoding="utf-8").replace("OpenClaw gateway", "OpenClaw Gateway")
+        self.store.entities_path.write_text(text, encoding="utf-8")
+        index.refresh()
+        self.assertEqual(index.counts()["total"], 6)
+        self.assertEqual(index.find_by_name("claw g")[0]["name"], "OpenClaw Gateway")
+
+        self.store.relations_path.write_text("", encoding="utf-8")
+        index.refresh()
+        self.assertEqual(index.counts()["relations"], 0)
+        self.assertEqual(index.relations_of("b"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+try:
+    import numpy as np
+    from embeddings import driver_mlx
+except Exception:  # pragma: no cover - numpy is optional in CI
+    np = None
+
+
+def _reference_mock_embed(text, dim):
+    vec = np.zeros(dim, dtype=np.float32)
+    tokens = [tok for tok in str(text or "").lower().split() if tok]
+    if not tokens:
+        return vec.tolist()
+    for token in tokens:
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        for i in range(dim):
+            vec[i] += (digest[i % len(digest)] / 255.0) - 0.5
+    vec /= float(len(tokens))
+    return vec.tolist()
+
+
+@unittest.skipIf(np is None, "numpy unavailable")
+class TestMockEmbedder(unittest.TestCase):
+    TEXTS = [
+        "",
+        "   ",
+        "ModernBERT is the authoritative retrieval model",
+        "Hybrid retrieval reranks with ModernBERT. " * 40,
+        "Ünïcode tokens, punctuation!? and 42 numbers",
+        "single",
+    ]
+
+    def test_batch_matches_per_token_reference_bit_for_bit(self):
+        for dim in (768, 384, 50):
+            matrix = driver_mlx._mock_embed_batch(self.TEXTS, dim)
+            self.assertEqual(matrix.shape, (len(self.TEXTS), dim))
+            self.assertEqual(matrix.dtype, np.float32)
+            for text, row in zip(self.TEXTS, matrix):
+                self.assertEqual(row.tolist(), _reference_mock_embed(text, dim))
+            self.assertEqual(driver_mlx._mock_embed(self.TEXTS[2], dim), _reference_mock_embed(self.TEXTS[2], dim))
+
+    def test_embedder_batches_are_independent_of_batch_size(self):
+        with patch.dict(os.environ, {"OPENCLAW_KB_EMBEDDINGS_BACKEND": "mock", "OPENCLAW_KB_EMBED_BATCH_SIZE": "2"}):
+            small = driver_mlx.MlxEmbedder(driver_mlx.ACCEL_MODEL_ID).embed_texts(self.TEXTS)
+        with patch.dict(os.environ, {"OPENCLAW_KB_EMBEDDINGS_BACKEND": "mock", "OPENCLAW_KB_EMBED_BATCH_SIZE": "64"}):
+            large = driver_mlx.MlxEmbedder(driver_mlx.ACCEL_MODEL_ID).embed_texts(self.TEXTS)
+        self.assertEqual(small, large)
+
+    def test_onnx_backend_reports_missing_export(self):
+        with patch.dict(os.environ, {"OPENCLAW_KB_EMBEDDINGS_BACKEND": "onnx", "OPENCLAW_KB_ONNX_DIR": "/nonexistent"}):
+            with self.assertRaisesRegex(RuntimeError, "ONNX"):
+                driver_mlx.MlxEmbedder(driver_mlx.ACCEL_MODEL_ID)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+try:
+    import numpy as np  # noqa: F401
+    from novelty import NoveltyDetector, _jaccard, _words
+except Exception:  # pragma: no cover - numpy is optional in CI
+    NoveltyDetector = None
+
+VOCAB = [f"w{i}" for i in range(400)]
+
+
+def _write_entities(path: Path, texts):
+    with open(path, "a", encoding="utf-8") as handle:
+        for i, text in enumerate(texts):
+            handle.write(json.dumps({"id": f"e{i}", "name": text[:20], "content": text}) + "\n")
+
+
+@unittest.skipIf(NoveltyDetector is None, "numpy unavailable")
+class TestNoveltyDetector(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "entities.jsonl"
+        rng = random.Random(3)
+        self.corpus = [" ".join(rng.sample(VOCAB, 30)) for _ in range(300)]
+        _write_entities(self.path, self.corpus)
+
+    def _exact(self, text):
+        words = _words(text)
+        return 1.0 - max(_jaccard(words, _words(existing)) for existing in self.corpus)
+
+    def test_near_duplicates_get_exact_novelty(self):
+        detector = NoveltyDetector(str(self.path))
+        self.assertEqual(detector.compute_novelty(self.corpus[17]), 0.0)
+        edited = " ".join(self.corpus[42].split()[:27] + ["fresh", "tokens", "here"])
+        self.assertAlmostEqual(detector.compute_novelty(edited), self._exact(edited))
+        self.assertEqual(detector.compute_novelty("entirely unseen vocabulary"), 1.0)
+        self.assertEqual(detector.compute_novelty(""), 1.0)
+
+    def test_rank_matches_exact_scores_for_similar_chunks(self):
+        detector = NoveltyDetector(str(self.path))
+        rng = random.Random(5)
+        chunks = []
+        for base in self.corpus[:40]:
+            words = base.split()
+            keep = rng.randint(22, 30)
+            chunks.append({"text": " ".join(words[:keep] + rng.sample(VOCAB, 30 - keep))})
+        ranked = detector.rank_by_novelty([dict(chunk) for chunk in chunks])
+        for chunk in ranked:
+            self.assertAlmostEqual(chunk["novelty"], self._exact(chunk["text"]))
+        self.assertEqual([c["novelty"] for c in ranked], sorted((c["novelty"] for c in ranked), reverse=True))
+
+    def test_pairs_near_the_is_novel_threshold_are_found(self):
+        detector = NoveltyDetector(str(self.path))
+        for n, base in enumerate(self.corpus[:40]):
+            # 16 shared words out of 44: Jaccard ~0.36, novelty just under the 0.7 default.
+            text = " ".join(base.split()[:16] + [f"new{n}_{i}" for i in range(14)])
+            self.assertLess(self._exact(text), 0.7)
+            self.assertAlmostEqual(detector.compute_novelty(text), self._exact(text))
+            self.assertFalse(detector.is_novel(text))
+
+    def test_appended_entities_are_picked_up_incrementally(self):
+        detector = NoveltyDetector(str(self.path))
+        text = "a brand new observation about gpu leases"
+        self.assertEqual(detector.compute_novelty(text), 1.0)
+        _write_entities(self.path, [text])
+        self.assertEqual(NoveltyDetector(str(self.path)).compute_novelty(text), 0.0)
+        self.assertEqual(detector.compute_novelty(text), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
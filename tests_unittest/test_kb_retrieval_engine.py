@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+try:
+    import retrieval
+    from embeddings.driver_mlx import MlxEmbedder
+    from indexer import run_index
+    from retrieval_server import make_server
+    from vector_store_lancedb import LanceVectorStore
+except Exception:  # pragma: no cover - lancedb/numpy are optional in CI
+    retrieval = None
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@unittest.skipIf(retrieval is None, "lancedb unavailable")
+class TestRetrievalEngine(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        _write(self.root / "MEMORY.md", "# Canonical\n\nModernBERT grounds synthesis for retrieval.\n")
+        self.env = {
+            "OPENCLAW_KB_REPO_ROOT": str(self.root),
+            "OPENCLAW_KB_VECTOR_DB_DIR": str(self.root / "vectors.lance"),
+            "OPENCLAW_KB_EMBED_META_PATH": str(self.root / "embeddings.meta.json"),
+            "OPENCLAW_KB_EMBEDDINGS_BACKEND": "mock",
+            "OPENCLAW_KB_RETRIEVAL_URL": "",
+        }
+        patcher = patch.dict(os.environ, self.env, clear=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        run_index()
+
+    def test_repeated_query_reuses_stats_tables_and_query_vectors(self):
+        engine = retrieval.RetrievalEngine(self.root / "vectors.lance")
+        first = engine.retrieve("grounds synthesis", mode="HYBRID", k=3)
+        with patch.object(LanceVectorStore, "stats", side_effect=AssertionError("stats reloaded")), patch.object(
+            MlxEmbedder, "embed_texts", side_effect=AssertionError("query re-embedded")
+        ):
+            second = engine.retrieve("grounds synthesis", mode="HYBRID", k=3)
+        self.assertEqual(first, second)
+        self.assertGreater(len(second["contexts"]), 0)
+        self.assertEqual(engine.stats()["refreshes"], 1)
+        self.assertEqual(engine.stats()["vector_hits"], 2)
+
+    def test_index_run_invalidates_cached_stats(self):
+        engine = retrieval.RetrievalEngine(self.root / "vectors.lance")
+        before = engine.table_stats("rag_minilm")["rows"]
+        _write(self.root / "memory" / "2026-03-03.md", "# Daily\n\nA new note about accelerators.\n")
+        run_index()
+        self.assertEqual(engine.table_stats("rag_minilm")["rows"], before + 1)
+        self.assertEqual(engine.stats()["refreshes"], 2)
+
+    def test_server_mode_matches_local_and_keeps_fail_closed_errors(self):
+        engine = retrieval.RetrievalEngine(self.root / "vectors.lance")
+        server = make_server("127.0.0.1", 0, engine=engine)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        local = retrieval.get_engine().retrieve("grounds synthesis", mode="PRECISE", k=2)
+        with patch.dict(os.environ, {"OPENCLAW_KB_RETRIEVAL_URL": url}):
+            remote = retrieval.retrieve("grounds synthesis", mode="PRECISE", k=2)
+            with self.assertRaises(ValueError):
+                retrieval.retrieve("x", mode="BOGUS")
+        self.assertEqual([c["chunk_id"] for c in remote["contexts"]], [c["chunk_id"] for c in local["contexts"]])
+        self.assertEqual(engine.stats()["queries"], 1)
+
+        empty = retrieval.RetrievalEngine(self.root / "empty.lance")
+        empty_server = make_server("127.0.0.1", 0, engine=empty)
+        threading.Thread(target=empty_server.serve_forever, daemon=True).start()
+        self.addCleanup(empty_server.server_close)
+        self.addCleanup(empty_server.shutdown)
+        with patch.dict(os.environ, {"OPENCLAW_KB_RETRIEVAL_URL": f"http://127.0.0.1:{empty_server.server_address[1]}"}):
+            with self.assertRaisesRegex(RuntimeError, "rag_modernbert table is missing"):
+                retrieval.retrieve("x", mode="PRECISE")
+
+    def test_unreachable_server_falls_back_to_local_engine(self):
+        with patch.dict(os.environ, {"OPENCLAW_KB_RETRIEVAL_URL": "http://127.0.0.1:9"}):
+            payload = retrieval.retrieve("grounds synthesis", mode="FAST", k=2)
+        self.assertEqual(payload["mode"], "FAST")
+        self.assertGreater(len(payload["contexts"]), 0)
+
+    def test_concurrent_query_misses_embed_one_at_a_time(self):
+        engine = retrieval.RetrievalEngine(self.root / "vectors.lance")
+        state = {"active": 0, "peak": 0}
+        guard = threading.Lock()
+        original = MlxEmbedder.embed_texts
+
+        def _tracking_embed(embedder, texts):
+            with guard:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            try:
+                threading.Event().wait(0.02)
+                return original(embedder, texts)
+            finally:
+                with guard:
+                    state["active"] -= 1
+
+        with patch.object(MlxEmbedder, "embed_texts", _tracking_embed):
+            threads = [
+                threading.Thread(target=engine.query_vector, args=(retrieval.CANONICAL_MODEL_ID, f"query {i}"))
+                for i in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(state["peak"], 1)
+        self.assertEqual(engine.stats()["vector_misses"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+try:
+    from vector_store_lancedb import LanceVectorStore
+except Exception:  # pragma: no cover - lancedb is optional in CI
+    LanceVectorStore = None
+
+DIM = 16
+
+
+def _rows(start: int, count: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": f"row-{i}",
+            "doc_id": f"doc-{i % 40}",
+            "source": "test",
+            "path": f"doc-{i % 40}.md",
+            "section": "",
+            "chunk_id": str(i),
+            "text": f"chunk {i}",
+            "tokens": 2,
+            "embedding": [rng.uniform(-1.0, 1.0) for _ in range(DIM)],
+            "model_id": "test",
+            "updated_at": "2026-01-01T00:00:00Z",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@unittest.skipIf(LanceVectorStore is None, "lancedb unavailable")
+class TestVectorIndexes(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = LanceVectorStore(str(Path(self._tmp.name) / "vectors.lance"))
+        self.rng = random.Random(7)
+        patcher = patch.dict(
+            os.environ,
+            {"OPENCLAW_KB_ANN_MIN_ROWS": "600", "OPENCLAW_KB_SCALAR_INDEX_MIN_ROWS": "200"},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_indexes_follow_row_thresholds_and_absorb_upserts(self):
+        self.store.upsert("t", _rows(0, 300, self.rng))
+        self.assertEqual(self.store.stats("t")["indexes"], ["doc_id"])
+
+        self.store.upsert("t", _rows(300, 400, self.rng))
+        self.assertEqual(self.store.stats("t")["indexes"], ["doc_id", "embedding"])
+
+        small = self.store.ensure_indexes("t")
+        self.assertFalse(small["optimized"])
+        self.assertEqual(small["created"], [])
+
+        self.store.upsert("t", _rows(700, 200, self.rng))
+        table = self.store.db.open_table("t")
+        for index in table.list_indices():
+            self.assertEqual(table.index_stats(index.name).num_unindexed_rows, 0)
+
+    def test_indexed_search_prefilters_and_returns_plain_rows(self):
+        rows = _rows(0, 800, self.rng)
+        self.store.upsert("t", rows)
+        target = rows[123]
+
+        hits = self.store.query("t", target["embedding"], k=3, columns=["id", "doc_id"])
+        self.assertEqual(hits[0]["id"], target["id"])
+        self.assertAlmostEqual(hits[0]["distance"], 0.0, places=4)
+        self.assertNotIn("embedding", hits[0])
+        self.assertIsInstance(hits[0]["score"], float)
+
+        where = "doc_id IN ('doc-1', 'doc-2')"
+        filtered = self.store.query("t", target["embedding"], k=15, where=where)
+        self.assertEqual(len(filtered), 15)
+        self.assertEqual({hit["doc_id"] for hit in filtered}, {"doc-1", "doc-2"})
+        self.assertIsInstance(filtered[0]["embedding"], list)
+
+
+if __name__ == "__main__":
+    unittest.main()
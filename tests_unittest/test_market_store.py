@@ -0,0 +1,154 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core_infra import market_store  # noqa: E402
+from core_infra.market_store import STORE_ENV, MarketStore  # noqa: E402
+from scripts import market_store_convert, market_stream, sim_runner  # noqa: E402
+
+DAY_MS = 86_400_000
+T0 = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+def _write(path, rows, mode="w"):
+    with open(path, mode, encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row) + "\n")
+
+
+def _ticks(count, seed, start=T0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        row = {
+            "symbol": rng.choice(["BTCUSDT", "ETHUSDT", "BTC/USD"]),
+            "ts": start + rng.randrange(0, 3 * DAY_MS),
+            "price": rng.choice([100, 100.5, 101.25]),
+            "qty": round(rng.uniform(0.01, 2.0), 6),
+            "side": rng.choice(["buy", "sell", None]),
+            "trade_id": i,
+            "source": "binance",
+        }
+        if i % 7 == 0:
+            row["maker"] = bool(i % 2)
+        if i % 11 == 0:
+            row["meta"] = {"venue": "x", "n": i}
+        rows.append(row)
+    return rows
+
+
+def _bare(rows):
+    return [{k: v for k, v in row.items() if v is not None} for row in rows]
+
+
+@unittest.skipIf(not market_store.available(), "numpy unavailable")
+class MarketStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.market = Path(self._tmp.name)
+        self.symbols = ["BTCUSDT", "ETHUSDT", "BTC/USD", "MISSING"]
+
+    def _jsonl_only(self, loader, path, **kwargs):
+        with mock.patch.dict(os.environ, {STORE_ENV: "0"}):
+            return loader(self.symbols, path, **kwargs)
+
+    def test_store_matches_jsonl_loaders_including_tail_window_and_appends(self):
+        ticks = self.market / "ticks.jsonl"
+        _write(ticks, _ticks(600, seed=1))
+        self.assertIsNone(market_store.store_for_jsonl(ticks))
+        report = market_store_convert.convert(self.market, ["ticks", "funding_rates"])
+        self.assertEqual([r["mode"] for r in report], ["rebuild", "missing"])
+        self.assertEqual(report[0]["rows"], 600)
+
+        for tail in (None, 4096, 20_000):
+            stored = sim_runner.load_ticks(self.symbols, ticks, tail_bytes=tail)
+            plain = self._jsonl_only(sim_runner.load_ticks, ticks, tail_bytes=tail)
+            self.assertIsInstance(stored["BTCUSDT"], market_store.MarketRows)
+            for symbol in self.symbols:
+                self.assertEqual(_bare(stored[symbol]), _bare(plain[symbol]), (tail, symbol))
+
+        # Appends are parsed incrementally; mixed kinds widen the stored columns.
+        extra = _ticks(50, seed=2, start=T0 + 2 * DAY_MS)
+        extra[0]["price"] = "n/a"
+        extra[1]["fresh"] = 1.5
+        _write(ticks, extra, mode="a")
+        store, series = market_store.store_for_jsonl(ticks)
+        self.assertEqual(store.sync_from_jsonl(series, ticks)["mode"], "append")
+        self.assertEqual(store.sync_from_jsonl(series, ticks)["mode"], "noop")
+        stored = sim_runner.load_ticks(self.symbols, ticks, tail_bytes=None)
+        plain = self._jsonl_only(sim_runner.load_ticks, ticks, tail_bytes=None)
+        for symbol in self.symbols:
+            self.assertEqual(_bare(stored[symbol]), _bare(plain[symbol]))
+
+        # A rewrite (not an append) rebuilds the series.
+        _write(ticks, _ticks(40, seed=3))
+        self.assertEqual(store.sync_from_jsonl(series, ticks)["mode"], "rebuild")
+        self.assertEqual(sum(len(v) for v in store.load(series, self.symbols).values()), 40)
+
+    def test_time_range_reads_only_overlapping_partitions(self):
+        ticks = self.market / "ticks.jsonl"
+        _write(ticks, _ticks(300, seed=4))
+        market_store_convert.convert(self.market, ["ticks"])
+        start, end = T0 + DAY_MS // 2, T0 + DAY_MS + 1000
+        stored = sim_runner.load_ticks(self.symbols, ticks, tail_bytes=None, start_ts=start, end_ts=end)
+        plain = self._jsonl_only(sim_runner.load_ticks, ticks, tail_bytes=None, start_ts=start, end_ts=end)
+        for symbol in self.symbols:
+            self.assertEqual(_bare(stored[symbol]), _bare(plain[symbol]))
+        rows = stored["BTCUSDT"]
+        self.assertTrue(all(start <= ts <= end for ts in rows.column("ts").tolist()))
+
+        store = MarketStore(self.market / "store")
+        opened = []
+        real_map = market_store._map
+
+        def spy(path, *args):
+            opened.append(Path(path).parent.name)
+            return real_map(path, *args)
+
+        with mock.patch.object(market_store, "_map", side_effect=spy):
+            store.read("ticks", "BTCUSDT", start_ts=T0 + 2 * DAY_MS)
+        self.assertEqual({name.split(".")[0] for name in opened}, {"2026-01-03"})
+
+    def test_market_stream_keeps_candle_store_in_sync(self):
+        candles = self.market / "candles_15m.jsonl"
+        base = [
+            {"symbol": sym, "ts": T0 + i * 900_000, "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.0 + i, "v": 3.0, "interval": "15m"}
+            for sym in ("BTCUSDT", "ETHUSDT")
+            for i in range(8)
+        ]
+        _write(candles, base)
+        report = market_store_convert.convert(self.market, ["candles_15m"])
+        self.assertEqual(report[0]["rows"], 16)
+
+        def fetcher(symbol, interval, limit):
+            return [
+                {"symbol": symbol, "ts": T0 + 7 * 900_000, "o": 1.0, "h": 2.0, "l": 0.5, "c": 99.0, "v": 4.0, "interval": "15m"},
+                {"symbol": symbol, "ts": T0 + 8 * 900_000, "o": 1.0, "h": 2.0, "l": 0.5, "c": 100.0, "v": 4.0, "interval": "15m"},
+            ]
+
+        market_stream.sync_interval(["BTCUSDT"], "15m", limit=2, full=False, market_dir=self.market, fetcher=fetcher)
+        store, series = market_store.store_for_jsonl(candles)
+        self.assertEqual(store.sync_from_jsonl(series, candles)["mode"], "noop")
+        stored = sim_runner.load_candles(self.symbols, candles)
+        plain = self._jsonl_only(sim_runner.load_candles, candles)
+        for symbol in self.symbols:
+            self.assertEqual(_bare(stored[symbol]), _bare(plain[symbol]))
+        self.assertEqual([bar["c"] for bar in stored["BTCUSDT"][-2:]], [99.0, 100.0])
+
+        market_stream.sync_interval(["ETHUSDT"], "15m", limit=2, full=True, market_dir=self.market, fetcher=fetcher)
+        stored = sim_runner.load_candles(self.symbols, candles)
+        self.assertEqual([len(stored[s]) for s in ("BTCUSDT", "ETHUSDT")], [0, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
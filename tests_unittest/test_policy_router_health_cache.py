@@ -0,0 +1,219 @@
+import asyncio
+import importlib.util
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+def _load_policy_router_module():
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / "workspace" / "scripts" / "policy_router.py"
+    spec = importlib.util.spec_from_file_location("policy_router", str(mod_path))
+    assert spec and spec.loader, f"Failed to load module spec for {mod_path}"
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _policy():
+    return {
+        "version": 2,
+        "defaults": {
+            "allowPaid": True,
+            "circuitBreaker": {"failureThreshold": 3, "cooldownSec": 60, "windowSec": 60, "failOn": []},
+        },
+        "budgets": {
+            "intents": {"conversation": {"dailyTokenBudget": 999999, "dailyCallBudget": 999, "maxCallsPerRun": 20}},
+            "tiers": {"free": {"dailyTokenBudget": 999999, "dailyCallBudget": 999}},
+        },
+        "providers": {
+            "local_vllm_assistant": {
+                "enabled": True,
+                "paid": False,
+                "tier": "free",
+                "type": "openai_compatible",
+                "provider_id": "local_vllm",
+                "baseUrl": "http://127.0.0.1:8001/v1",
+                "models": [{"id": "local-assistant"}],
+            },
+            "fallback": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m"}]},
+        },
+        "routing": {
+            "free_order": ["local_vllm_assistant", "fallback"],
+            "intents": {"conversation": {"order": ["local_vllm_assistant", "fallback"], "allowPaid": True}},
+            "capability_router": {"enabled": False},
+        },
+    }
+
+
+class TestProviderHealthCache(unittest.TestCase):
+    def test_probe_is_cached_until_ttl_expires(self):
+        policy_router = _load_policy_router_module()
+        calls = []
+
+        def _probe(base_url):
+            calls.append(base_url)
+            return False
+
+        policy_router._openai_compatible_reachable = _probe
+        cache = policy_router.ProviderHealthCache(ttl_sec=60)
+
+        # Unseen target: optimistic answer, probe runs in the background.
+        self.assertTrue(cache.reachable("openai_compatible", "http://x/v1"))
+        self.assertTrue(cache.wait_for_probes(timeout=2.0))
+        self.assertFalse(cache.reachable("openai_compatible", "http://x/v1"))
+        self.assertFalse(cache.reachable("openai_compatible", "http://x/v1"))
+        self.assertEqual(len(calls), 1)
+
+        cache._entries[("openai_compatible", "http://x/v1")]["checked_at"] -= 120
+        self.assertTrue(cache.snapshot("openai_compatible", "http://x/v1")["stale"])
+        self.assertFalse(cache.reachable("openai_compatible", "http://x/v1"))  # last known value
+        self.assertTrue(cache.wait_for_probes(timeout=2.0))
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(cache.snapshot("openai_compatible", "http://x/v1")["stale"])
+
+    def test_slow_probe_never_blocks_the_caller_and_is_single_flight(self):
+        policy_router = _load_policy_router_module()
+        release = threading.Event()
+        calls = []
+
+        def _probe(base_url):
+            calls.append(base_url)
+            release.wait(5.0)
+            return False
+
+        policy_router._openai_compatible_reachable = _probe
+        cache = policy_router.ProviderHealthCache(ttl_sec=60)
+        started = time.perf_counter()
+        answers = [cache.reachable("openai_compatible", "http://slow/v1") for _ in range(20)]
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(answers, [True] * 20)
+        release.set()
+        self.assertTrue(cache.wait_for_probes(timeout=2.0))
+        self.assertEqual(calls, ["http://slow/v1"])
+        self.assertFalse(cache.reachable("openai_compatible", "http://slow/v1"))
+
+        cache.mark("openai_compatible", "http://slow/v1", True)  # passive success from a dispatch
+        self.assertTrue(cache.reachable("openai_compatible", "http://slow/v1"))
+
+    def test_background_prober_refreshes_and_hot_path_does_not_probe(self):
+        policy_router = _load_policy_router_module()
+        state = {"up": False, "calls": 0}
+
+        def _probe(_base_url):
+            state["calls"] += 1
+            return state["up"]
+
+        policy_router._openai_compatible_reachable = _probe
+        cache = policy_router.ProviderHealthCache(ttl_sec=0.01, interval_sec=60)
+        cache.register("openai_compatible", "http://x/v1")
+        state["up"] = True
+        cache.start()
+        try:
+            deadline = time.time() + 2.0
+            while time.time() < deadline and cache.snapshot("openai_compatible", "http://x/v1")["reachable"] is None:
+                time.sleep(0.01)
+            self.assertTrue(cache.prober_running())
+            self.assertEqual(state["calls"], 1)
+
+            time.sleep(0.05)
+            state["up"] = False
+            self.assertTrue(cache.snapshot("openai_compatible", "http://x/v1")["stale"])
+            self.assertTrue(cache.reachable("openai_compatible", "http://x/v1"))
+            self.assertEqual(state["calls"], 1)
+
+            cache.refresh_all()
+            self.assertFalse(cache.reachable("openai_compatible", "http://x/v1"))
+        finally:
+            cache.stop()
+        self.assertFalse(cache.prober_running())
+
+    def test_explain_route_reports_cached_health(self):
+        policy_router = _load_policy_router_module()
+        policy_router._openai_compatible_reachable = lambda _base_url: False
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            policy_path = tmp / "policy.json"
+            policy_path.write_text(json.dumps(_policy()), encoding="utf-8")
+            router = policy_router.PolicyRouter(
+                policy_path=policy_path,
+                budget_path=tmp / "budget.json",
+                circuit_path=tmp / "circuit.json",
+                event_log=tmp / "events.jsonl",
+                handlers={"fallback": lambda payload, model_id, context: {"ok": True, "text": "fb"}},
+                health=policy_router.ProviderHealthCache(ttl_sec=60),
+            )
+            router.explain_route("conversation", {"input_text": "hello"})
+            self.assertTrue(router.health.wait_for_probes(timeout=2.0))
+            explain = router.explain_route("conversation", {"input_text": "hello"})
+            self.assertEqual(explain["chosen"]["provider"], "fallback")
+            self.assertEqual(explain["unavailable"]["local_vllm_assistant"], "local_vllm_unreachable")
+            health = explain["provider_health"]["local_vllm_assistant"]
+            self.assertFalse(health["reachable"])
+            self.assertFalse(health["stale"])
+            self.assertEqual(health["source"], "probe")
+            self.assertFalse(explain["health_prober_running"])
+            self.assertNotIn("fallback", explain["provider_health"])
+
+    def test_slow_probe_does_not_block_the_async_escalation_loop(self):
+        policy_router = _load_policy_router_module()
+        release = threading.Event()
+
+        def _probe(_base_url):
+            release.wait(5.0)
+            return True
+
+        policy_router._openai_compatible_reachable = _probe
+
+        async def local(payload, model_id, context):
+            del model_id, context
+            await asyncio.sleep(0.01)
+            return {"ok": True, "text": f"local:{payload['prompt']}"}
+
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            policy_path = tmp / "policy.json"
+            policy_path.write_text(json.dumps(_policy()), encoding="utf-8")
+            router = policy_router.PolicyRouter(
+                policy_path=policy_path,
+                budget_path=tmp / "budget.json",
+                circuit_path=tmp / "circuit.json",
+                event_log=tmp / "events.jsonl",
+                handlers={"local_vllm_assistant": local, "fallback": lambda payload, model_id, context: {"ok": True, "text": "fb"}},
+                health=policy_router.ProviderHealthCache(ttl_sec=60),
+            )
+
+            async def _run():
+                ticks = []
+
+                async def _heartbeat():
+                    for _ in range(10):
+                        before = time.perf_counter()
+                        await asyncio.sleep(0.01)
+                        ticks.append(time.perf_counter() - before)
+
+                started = time.perf_counter()
+                results = await asyncio.gather(
+                    router.execute_with_escalation_async("conversation", {"prompt": "a"}),
+                    router.execute_with_escalation_async("conversation", {"prompt": "b"}),
+                    _heartbeat(),
+                )
+                return results[:2], ticks, time.perf_counter() - started
+
+            try:
+                results, ticks, elapsed = asyncio.run(_run())
+            finally:
+                release.set()
+                self.assertTrue(router.health.wait_for_probes(timeout=2.0))
+            # The probe is still blocked while both requests finish and the loop keeps ticking.
+            self.assertLess(elapsed, 1.0)
+            self.assertLess(max(ticks), 0.2)
+            self.assertEqual([r["provider"] for r in results], ["local_vllm_assistant"] * 2)
+            self.assertEqual(results[1]["text"], "local:b")
+
+
+if __name__ == "__main__":
+    unittest.main()
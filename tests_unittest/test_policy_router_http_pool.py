@@ -0,0 +1,201 @@
+import asyncio
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+def _load_policy_router_module():
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / "workspace" / "scripts" / "policy_router.py"
+    spec = importlib.util.spec_from_file_location("policy_router", str(mod_path))
+    assert spec and spec.loader, f"Failed to load module spec for {mod_path}"
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class _DummyResponse:
+    status_code = 200
+
+    def json(self):
+        return {"choices": [{"message": {"content": "pooled"}}]}
+
+
+class _FakeAdapter:
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+
+class _FakeSession:
+    created = 0
+
+    def __init__(self):
+        type(self).created += 1
+        self.mounts = {}
+        self.posts = []
+        self.closed = False
+
+    def mount(self, prefix, adapter):
+        self.mounts[prefix] = adapter
+
+    def post(self, url, json=None, headers=None, timeout=None):  # noqa: A002
+        del headers, timeout
+        self.posts.append((url, dict(json or {})))
+        return _DummyResponse()
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeRequests:
+    Session = _FakeSession
+
+    class adapters:
+        HTTPAdapter = _FakeAdapter
+
+    class exceptions:
+        class Timeout(Exception):
+            pass
+
+        class ConnectionError(Exception):
+            pass
+
+
+class _StubRequests:
+    calls = 0
+
+    class exceptions:
+        class Timeout(Exception):
+            pass
+
+        class ConnectionError(Exception):
+            pass
+
+    @classmethod
+    def post(cls, _url, json=None, headers=None, timeout=None):  # noqa: A002
+        del json, headers, timeout
+        cls.calls += 1
+        return _DummyResponse()
+
+
+def _policy():
+    return {
+        "version": 2,
+        "defaults": {
+            "allowPaid": True,
+            "circuitBreaker": {"failureThreshold": 3, "cooldownSec": 60, "windowSec": 60, "failOn": []},
+        },
+        "budgets": {
+            "intents": {"conversation": {"dailyTokenBudget": 999999, "dailyCallBudget": 999, "maxCallsPerRun": 50}},
+            "tiers": {"free": {"dailyTokenBudget": 999999, "dailyCallBudget": 999}},
+        },
+        "providers": {
+            "flaky": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m1"}]},
+            "steady": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m2"}]},
+        },
+        "routing": {
+            "free_order": ["flaky", "steady"],
+            "intents": {"conversation": {"order": ["flaky", "steady"], "allowPaid": True}},
+            "capability_router": {"enabled": False},
+        },
+    }
+
+
+class TestPolicyRouterHttpPool(unittest.TestCase):
+    def test_http_client_reuses_one_session_per_origin(self):
+        policy_router = _load_policy_router_module()
+        policy_router.requests = _FakeRequests
+        _FakeSession.created = 0
+
+        with patch.dict(os.environ, {"OPENCLAW_ROUTER_HTTP_POOL_SIZE": "4"}, clear=False):
+            first = policy_router._http_client("http://127.0.0.1:8001/v1")
+            second = policy_router._http_client("http://127.0.0.1:8001/v1/")
+            other = policy_router._http_client("https://api.example.com/v1")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(_FakeSession.created, 2)
+        self.assertEqual(first.mounts["http://"].pool_maxsize, 4)
+
+        for _ in range(3):
+            result = policy_router._call_openai_compatible("http://127.0.0.1:8001/v1", "", "m", {"messages": []})
+            self.assertEqual(result.get("text"), "pooled")
+        self.assertEqual(len(first.posts), 3)
+        self.assertEqual(_FakeSession.created, 2)
+
+        policy_router.close_http_sessions()
+        self.assertTrue(first.closed)
+        self.assertTrue(other.closed)
+
+    def test_http_client_falls_back_to_module_without_sessions(self):
+        policy_router = _load_policy_router_module()
+        policy_router.requests = _StubRequests
+        _StubRequests.calls = 0
+
+        self.assertIs(policy_router._http_client("http://localhost:11434"), _StubRequests)
+        result = policy_router._call_ollama("http://localhost:11434", "m", {"prompt": "hi"})
+        self.assertTrue(result.get("ok"), result)
+        self.assertEqual(_StubRequests.calls, 1)
+
+
+class TestPolicyRouterAsyncEscalation(unittest.TestCase):
+    def _router(self, policy_router, tmp: Path, handlers):
+        policy_path = tmp / "policy.json"
+        policy_path.write_text(json.dumps(_policy()), encoding="utf-8")
+        return policy_router.PolicyRouter(
+            policy_path=policy_path,
+            budget_path=tmp / "budget.json",
+            circuit_path=tmp / "circuit.json",
+            event_log=tmp / "events.jsonl",
+            handlers=handlers,
+        )
+
+    def test_async_escalation_matches_sync_and_runs_concurrently(self):
+        policy_router = _load_policy_router_module()
+
+        async def flaky(payload, model_id, context):
+            del payload, model_id, context
+            await asyncio.sleep(0.01)
+            return {"ok": False, "reason_code": "request_timeout"}
+
+        def steady(payload, model_id, context):
+            del model_id, context
+            return {"ok": True, "text": f"echo:{payload['prompt']}"}
+
+        with tempfile.TemporaryDirectory() as td:
+            router = self._router(policy_router, Path(td), {"flaky": flaky, "steady": steady})
+
+            async def _run_many():
+                return await asyncio.gather(
+                    *[
+                        router.execute_with_escalation_async("conversation", {"prompt": f"hello {i}"})
+                        for i in range(5)
+                    ]
+                )
+
+            results = asyncio.run(_run_many())
+            self.assertEqual([r["provider"] for r in results], ["steady"] * 5)
+            self.assertEqual([r["attempts"] for r in results], [2] * 5)
+            self.assertEqual(results[3]["text"], "echo:hello 3")
+
+            sync_router = self._router(policy_router, Path(td), {"flaky": lambda *_: {"ok": False}, "steady": steady})
+            sync_out = sync_router.execute_with_escalation("conversation", {"prompt": "hello 3"})
+            self.assertEqual(sync_out["provider"], results[3]["provider"])
+            self.assertEqual(sync_out["text"], results[3]["text"])
+
+            events = [
+                json.loads(line)["event"]
+                for line in (Path(td) / "events.jsonl").read_text(encoding="utf-8").splitlines()
+            ]
+            self.assertIn("router_escalate", events)
+            self.assertIn("router_success", events)
+
+
+if __name__ == "__main__":
+    unittest.main()
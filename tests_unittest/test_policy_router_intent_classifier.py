@@ -0,0 +1,63 @@
+import re
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = REPO_ROOT / "workspace" / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import bench_intent_classifier as bench  # noqa: E402
+import policy_router as pr  # noqa: E402
+
+EXTRA_CASES = [
+    "",
+    "   \n\t ",
+    "Explain the error code and then fix the function in utils.py",
+    "postal code lookup",
+    "What is the implementation plan? Also run the test suite.",
+    "Describe   the\npatch",
+    "The module function needs a refactor",
+]
+
+
+def _legacy_planning_signal(text):
+    normalized = re.sub(r"\s+", " ", str(text or "")).strip()
+    if not normalized:
+        return False
+    if any(rx.search(normalized) for rx in pr._INTENT_PLANNING_CUES):
+        return True
+    has_action_word = pr._INTENT_ACTION_WORD.search(normalized) is not None
+    return any(rx.search(normalized) for rx in pr._INTENT_NEGATIVE_GUARDS) and not has_action_word
+
+
+class TestCompiledIntentClassifier(unittest.TestCase):
+    def setUp(self):
+        pr._TEXT_FEATURE_CACHE.clear()
+        self.corpus = bench.load_corpus(bench.DEFAULT_CORPUS) + EXTRA_CASES
+
+    def test_labels_match_legacy_tiered_scan(self):
+        for text in self.corpus:
+            with self.subTest(text=text[:60]):
+                self.assertEqual(pr.classify_intent(text), bench.legacy_classify_intent(text))
+                self.assertEqual(pr._has_strong_planning_signal(text), _legacy_planning_signal(text))
+
+    def test_memoized_results_skip_regex_scans(self):
+        text = "Refactor the load_tasks function in task_store.py"
+        self.assertEqual(pr.classify_intent(text), "mechanical_execution")
+        with patch.object(pr, "_INTENT_MECHANICAL_RX") as rx:
+            self.assertEqual(pr.classify_intent("Refactor the  load_tasks function in task_store.py "), "mechanical_execution")
+            self.assertEqual(pr.classify_task_class(text), "mechanical_execution")
+            rx.search.assert_not_called()
+
+    def test_cache_is_lru_bounded(self):
+        with patch.object(pr, "_TEXT_FEATURE_CACHE_SIZE", 3):
+            for i in range(10):
+                pr.classify_intent(f"run the tests number {i}")
+            self.assertEqual(len(pr._TEXT_FEATURE_CACHE), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
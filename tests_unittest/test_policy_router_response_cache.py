@@ -0,0 +1,153 @@
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = REPO_ROOT / "workspace" / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import policy_router as pr  # noqa: E402
+
+
+def _policy():
+    return {
+        "version": 2,
+        "defaults": {"allowPaid": True},
+        "budgets": {
+            "intents": {"conversation": {"dailyTokenBudget": 999999, "dailyCallBudget": 999, "maxCallsPerRun": 50}},
+            "tiers": {"free": {"dailyTokenBudget": 999999, "dailyCallBudget": 999}},
+        },
+        "providers": {
+            "mock": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m1"}]},
+        },
+        "routing": {
+            "free_order": ["mock"],
+            "intents": {"conversation": {"order": ["mock"], "allowPaid": True}},
+            "capability_router": {"enabled": False},
+        },
+    }
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._td = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._td.name)
+        self.policy_path = self.tmp / "policy.json"
+        self.policy_path.write_text(json.dumps(_policy()), encoding="utf-8")
+        self.calls = []
+
+    def tearDown(self):
+        self._td.cleanup()
+
+    def _router(self, handler, cache):
+        return pr.PolicyRouter(
+            policy_path=self.policy_path,
+            budget_path=self.tmp / "budget.json",
+            circuit_path=self.tmp / "circuit.json",
+            event_log=self.tmp / "events.jsonl",
+            handlers={"mock": handler},
+            response_cache=cache,
+        )
+
+    def _events(self):
+        path = self.tmp / "events.jsonl"
+        return [json.loads(line)["event"] for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    def test_key_normalises_payload_and_separates_temperature(self):
+        a = pr.response_cache_key("conversation", "mock", "m1", {"prompt": "hi", "temperature": 0.2, "max_tokens": 5})
+        b = pr.response_cache_key("conversation", "mock", "m1", {"max_tokens": 5, "temperature": 0.2, "prompt": "hi"})
+        c = pr.response_cache_key("conversation", "mock", "m1", {"prompt": "hi", "temperature": 0.7, "max_tokens": 5})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertEqual(a[-1], 0.2)
+
+    def test_hit_skips_provider_and_budget(self):
+        def handler(payload, model_id, context):
+            self.calls.append(payload["prompt"])
+            return {"ok": True, "text": f"answer:{payload['prompt']}"}
+
+        router = self._router(handler, pr.ResponseCache(ttl_sec=60))
+        first = router.execute_with_escalation("conversation", {"prompt": "same"})
+        tokens_after_first = router.budget_state["intents"]["conversation"]["tokens"]
+        second = router.execute_with_escalation("conversation", {"prompt": "same"})
+
+        self.assertEqual(self.calls, ["same"])
+        self.assertNotIn("cached", first)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["text"], "answer:same")
+        self.assertEqual(router.budget_state["intents"]["conversation"]["calls"], 1)
+        self.assertEqual(router.budget_state["intents"]["conversation"]["tokens"], tokens_after_first)
+        self.assertIn("router_cache_hit", self._events())
+
+        router.execute_with_escalation("conversation", {"prompt": "same"}, context_metadata={"cache": False})
+        self.assertEqual(len(self.calls), 2)
+
+    def test_ttl_and_lru_bounds(self):
+        cache = pr.ResponseCache(ttl_sec=60, max_entries=2)
+        for i in range(3):
+            cache.begin(("k", i))
+            cache.complete(("k", i), {"text": str(i)})
+        self.assertIsNone(cache.get(("k", 0)))
+        self.assertEqual(cache.get(("k", 2))["result"]["text"], "2")
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache._entries[("k", 2)]["stored_at"] -= 120
+        self.assertIsNone(cache.get(("k", 2)))
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        release = threading.Event()
+
+        def handler(payload, model_id, context):
+            self.calls.append(payload["prompt"])
+            release.wait(5)
+            return {"ok": True, "text": "shared"}
+
+        cache = pr.ResponseCache(ttl_sec=60)
+        router = self._router(handler, cache)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(router.execute_with_escalation("conversation", {"prompt": "burst"})))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 5
+        while cache.stats()["coalesced"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        self.assertEqual(self.calls, ["burst"])
+        self.assertEqual([r["text"] for r in results], ["shared"] * 4)
+        self.assertEqual(sum(1 for r in results if r.get("cached")), 3)
+        self.assertEqual(cache.stats()["inflight"], 0)
+
+    def test_failed_leader_releases_followers_without_caching(self):
+        async def handler(payload, model_id, context):
+            self.calls.append(payload["prompt"])
+            await asyncio.sleep(0.02)
+            return {"ok": False, "reason_code": "request_timeout"}
+
+        cache = pr.ResponseCache(ttl_sec=60)
+        router = self._router(handler, cache)
+
+        async def burst():
+            return await asyncio.gather(
+                *[router.execute_with_escalation_async("conversation", {"prompt": "boom"}) for _ in range(3)]
+            )
+
+        results = asyncio.run(burst())
+        self.assertTrue(all(not r["ok"] for r in results))
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.stats()["inflight"], 0)
+        self.assertEqual(len(self.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import importlib.util
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+def _load_policy_router_module():
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / "workspace" / "scripts" / "policy_router.py"
+    spec = importlib.util.spec_from_file_location("policy_router", str(mod_path))
+    assert spec and spec.loader, f"Failed to load module spec for {mod_path}"
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _policy():
+    return {
+        "version": 2,
+        "defaults": {
+            "allowPaid": True,
+            "circuitBreaker": {"failureThreshold": 2, "cooldownSec": 60, "windowSec": 60, "failOn": ["request_timeout"]},
+        },
+        "budgets": {
+            "intents": {"conversation": {"dailyTokenBudget": 999999, "dailyCallBudget": 999, "maxCallsPerRun": 50}},
+            "tiers": {"free": {"dailyTokenBudget": 999999, "dailyCallBudget": 999}},
+        },
+        "providers": {
+            "flaky": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m1"}]},
+            "steady": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m2"}]},
+        },
+        "routing": {
+            "free_order": ["flaky", "steady"],
+            "intents": {"conversation": {"order": ["flaky", "steady"], "allowPaid": True}},
+            "capability_router": {"enabled": False},
+        },
+    }
+
+
+class TestRouterStateStore(unittest.TestCase):
+    def test_usage_is_coalesced_into_one_write(self):
+        policy_router = _load_policy_router_module()
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "budget.json"
+            store = policy_router.RouterStateStore(path, "budget", flush_interval_sec=60)
+            writes = []
+            original = policy_router._write_json_atomic
+
+            def _counting_write(p, state, fsync=False):
+                writes.append(fsync)
+                return original(p, state, fsync=fsync)
+
+            with patch.object(policy_router, "_write_json_atomic", _counting_write):
+                for _ in range(25):
+                    store.add_usage("conversation", "free", 10)
+                self.assertFalse(path.exists())
+                self.assertEqual(store.current_state()["intents"]["conversation"], {"calls": 25, "tokens": 250})
+                self.assertTrue(store.flush(fsync=True))
+                self.assertFalse(store.flush())
+
+            self.assertEqual(writes, [True])
+            on_disk = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(on_disk["tiers"]["free"], {"calls": 25, "tokens": 250})
+
+    def test_flush_merges_counters_from_other_processes(self):
+        policy_router = _load_policy_router_module()
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "budget.json"
+            first = policy_router.RouterStateStore(path, "budget", flush_interval_sec=60)
+            second = policy_router.RouterStateStore(path, "budget", flush_interval_sec=60)
+            for _ in range(3):
+                first.add_usage("conversation", "free", 5)
+            for _ in range(4):
+                second.add_usage("conversation", "free", 7)
+            first.flush()
+            second.flush()
+
+            on_disk = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(on_disk["intents"]["conversation"], {"calls": 7, "tokens": 43})
+            self.assertEqual(second.current_state()["intents"]["conversation"]["calls"], 7)
+            self.assertTrue(first.refresh_if_changed())
+            self.assertEqual(first.current_state()["intents"]["conversation"]["calls"], 7)
+
+    def test_budget_rolls_over_on_new_day(self):
+        policy_router = _load_policy_router_module()
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "budget.json"
+            with patch.object(policy_router, "_today_key", return_value="2000-01-01"):
+                other = policy_router.RouterStateStore(path, "budget", flush_interval_sec=60)
+                other.add_usage("conversation", "free", 3)
+                other.flush()
+                store = policy_router.RouterStateStore(path, "budget", flush_interval_sec=60)
+                store.add_usage("conversation", "free", 5)
+
+            # Usage still pending at midnight is flushed into the old day's file, not dropped.
+            self.assertEqual(store.current_state().get("intents"), {})
+            on_disk = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(on_disk["date"], "2000-01-01")
+            self.assertEqual(on_disk["intents"]["conversation"], {"calls": 2, "tokens": 8})
+
+            store.add_usage("conversation", "free", 7)
+            self.assertTrue(store.flush())
+            on_disk = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(on_disk["date"], policy_router._today_key())
+            self.assertEqual(on_disk["intents"]["conversation"], {"calls": 1, "tokens": 7})
+
+    def test_flush_recreates_a_removed_state_directory(self):
+        policy_router = _load_policy_router_module()
+        with tempfile.TemporaryDirectory() as td:
+            state_dir = Path(td) / "state"
+            state_dir.mkdir()
+            store = policy_router.RouterStateStore(state_dir / "budget.json", "budget", flush_interval_sec=60)
+            store.add_usage("conversation", "free", 5)
+            state_dir.rmdir()
+            self.assertTrue(store.flush())
+            on_disk = json.loads((state_dir / "budget.json").read_text(encoding="utf-8"))
+            self.assertEqual(on_disk["intents"]["conversation"], {"calls": 1, "tokens": 5})
+
+    def test_background_flusher_persists_circuit_state(self):
+        policy_router = _load_policy_router_module()
+        # Keep the exit-time flush away from the removed temp directory.
+        self.addCleanup(policy_router._STATE_STORES.clear)
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            policy_path = tmp / "policy.json"
+            policy_path.write_text(json.dumps(_policy()), encoding="utf-8")
+            with patch.dict("os.environ", {"OPENCLAW_ROUTER_STATE_FLUSH_MS": "20"}, clear=False):
+                router = policy_router.PolicyRouter(
+                    policy_path=policy_path,
+                    budget_path=tmp / "budget.json",
+                    circuit_path=tmp / "circuit.json",
+                    event_log=tmp / "events.jsonl",
+                    handlers={
+                        "flaky": lambda payload, model_id, context: {"ok": False, "reason_code": "request_timeout"},
+                        "steady": lambda payload, model_id, context: {"ok": True, "text": "ok"},
+                    },
+                )
+                for _ in range(2):
+                    out = router.execute_with_escalation("conversation", {"prompt": "hello"})
+                    self.assertEqual(out["provider"], "steady")
+                self.assertGreater(router.circuit_state["providers"]["flaky:m1"]["openUntil"], int(time.time()))
+
+                deadline = time.time() + 2.0
+                while time.time() < deadline and not (tmp / "circuit.json").exists():
+                    time.sleep(0.01)
+                router.flush_state()
+
+            circuit = json.loads((tmp / "circuit.json").read_text(encoding="utf-8"))
+            self.assertEqual(circuit["providers"]["flaky:m1"]["failures"], 2)
+            self.assertNotIn("steady:m2", circuit["providers"])
+            budget = json.loads((tmp / "budget.json").read_text(encoding="utf-8"))
+            self.assertEqual(budget["intents"]["conversation"]["calls"], 4)
+
+            again = policy_router.PolicyRouter(
+                policy_path=policy_path,
+                budget_path=tmp / "budget.json",
+                circuit_path=tmp / "circuit.json",
+                event_log=tmp / "events.jsonl",
+            )
+            self.assertIs(again._budget_store, router._budget_store)
+
+
+if __name__ == "__main__":
+    unittest.main()
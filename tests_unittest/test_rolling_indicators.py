@@ -0,0 +1,178 @@
+import contextlib
+import io
+import json
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from core_infra.competing_models import _sma, run_competing_models
+from core_infra.finance_brain import evaluate_symbol
+from core_infra.regime_detector import detect_regime
+from core_infra.rolling_indicators import SymbolIndicators
+from core_infra.volatility_metrics import compute_volatility
+from scripts import sim_runner
+
+HISTORY = sim_runner.SLOW_PERIOD + 5
+
+
+def _bars(count, seed):
+    rng = random.Random(seed)
+    price, bars = 100.0, []
+    for idx in range(count):
+        # Runs of flat closes exercise the zero-return and tie paths.
+        if rng.random() > 0.1:
+            price *= 1.0 + rng.gauss(0.0, 0.004)
+        bar = {"ts": idx * 900_000, "o": price, "h": price * (1 + rng.random() * 0.003), "l": price * (1 - rng.random() * 0.003), "c": price}
+        if idx % 37 == 5:
+            del bar["h"]  # not a usable candle for ATR
+        bars.append(bar)
+    return bars
+
+
+def _tick_bars(count, seed, step_ms=900_000):
+    """Closes on a 0.01 tick around 100.00 that are mostly flat: SMA ties are common."""
+    rng = random.Random(seed)
+    cents, bars = 10_000, []
+    for idx in range(count):
+        cents += rng.choice((-1, 0, 0, 0, 1)) + (1 if idx % 400 < 200 and rng.random() < 0.05 else 0)
+        price = cents / 100.0
+        bars.append({"symbol": "BTCUSDT", "ts": T0 + idx * step_ms, "o": price, "h": (cents + 1) / 100.0, "l": (cents - 1) / 100.0, "c": price, "v": 1.0})
+    return bars
+
+
+T0 = 1_767_225_600_000
+
+
+class _BatchIndicators(SymbolIndicators):
+    """SMAs straight from ``sim_runner.sma`` over the stored closes."""
+
+    def sma(self, period):
+        return sim_runner.sma(self.closes, int(period)) if 0 < int(period) <= self.history else None
+
+
+class RollingIndicatorsTests(unittest.TestCase):
+    def test_matches_batch_functions_bar_by_bar(self):
+        for bars in (_bars(700, seed=3), _tick_bars(1500, seed=4)):
+            self._check_against_batch(bars)
+
+    def _check_against_batch(self, bars):
+        engine = SymbolIndicators(HISTORY, candle_window=128)
+        closes = []
+        regime_params = [None, {"lookback": 12}, {"lookback": 2, "sideways_threshold": 0.0}, {"lookback": 26, "conf_scale": 0.002}]
+        vol_params = [None, {"vol_window": 5, "atr_period": 1}, {"vol_window": 25, "atr_period": 60}, {"atr_period": 200}]
+        for idx, bar in enumerate(bars):
+            closes.append(bar["c"])
+            closes = closes[-HISTORY:]
+            engine.update(bar)
+            candles = bars[max(0, idx + 1 - 128):idx + 1]
+            # Later trackers are seeded from the stored windows on first use.
+            if idx < 40 and idx % 3:
+                continue
+            for period in (1, 8, 12, 21, HISTORY, HISTORY + 1):
+                self.assertEqual(engine.sma(period), _sma(closes, period), (idx, period))
+            self.assertEqual(engine.sma(sim_runner.FAST_PERIOD), sim_runner.sma(closes, sim_runner.FAST_PERIOD))
+            self.assertEqual(engine.sma(sim_runner.SLOW_PERIOD), sim_runner.sma(closes, sim_runner.SLOW_PERIOD))
+            for lookback in (1, 5, 20, HISTORY - 1, HISTORY):
+                hist = closes[-(lookback + 1):-1] if len(closes) > lookback else []
+                self.assertEqual(engine.prior_extremes(lookback), (max(hist), min(hist)) if hist else None, (idx, lookback))
+            for params in regime_params:
+                self.assertEqual(engine.regime(params), detect_regime(closes, params), (idx, params))
+            for params in vol_params:
+                want = compute_volatility(candles=candles, prices=closes, params=params)
+                self.assertEqual(engine.volatility(params), want, (idx, params))
+
+    def test_strategies_decide_the_same_with_the_engine(self):
+        bars = _bars(400, seed=8)
+        engine = SymbolIndicators(HISTORY, candle_window=128)
+        closes, batch_state, rolling_state = [], {}, {}
+        finance_params = {"fast_period": 5, "slow_period": 13}
+        for idx, bar in enumerate(bars):
+            closes.append(bar["c"])
+            closes = closes[-HISTORY:]
+            engine.update(bar)
+            window = bars[max(0, idx + 1 - 128):idx + 1]
+            kwargs = {"ts": bar["ts"], "closes": closes, "candles": window, "sentiment_score": 0.1, "include_sentiment": True}
+            batch = run_competing_models(symbol_state=batch_state, **kwargs)
+            rolling = run_competing_models(symbol_state=rolling_state, indicators=engine, **kwargs)
+            for key in ("enter_long", "exit_long", "risk_state", "top_model"):
+                self.assertEqual(rolling[key], batch[key], (idx, key))
+            self.assertEqual(rolling["signal"], batch["signal"], idx)
+            self.assertEqual(rolling["regime"], batch["regime"])
+            self.assertEqual(rolling["volatility"], batch["volatility"], idx)
+
+            finance = [
+                evaluate_symbol(symbol="BTCUSDT", ts=bar["ts"], closes=closes, params=finance_params, **extra)["agents"]["technical"]
+                for extra in ({}, {"indicators": engine})
+            ]
+            self.assertEqual(finance[1], finance[0], idx)
+
+    def test_sim_run_bar_trades_match_close_list_path(self):
+        cfg = {
+            "id": "SIM_A",
+            "strategy": "regime_gated_long_flat",
+            "universe": ["BTCUSDT"],
+            "capital": 1000.0,
+            "dd_kill": 0.9,
+            "daily_loss": 0.9,
+            "max_trades_per_day": 50,
+        }
+        bars = _bars(1500, seed=21)
+        trades = {}
+        with tempfile.TemporaryDirectory() as td:
+            for mode in ("closes", "engine"):
+                with patch.object(sim_runner, "BASE_DIR", Path(td) / mode):
+                    sim = sim_runner.Sim(cfg)
+                    engine = SymbolIndicators(HISTORY)
+                    closes, out = [], []
+                    for bar in bars:
+                        closes.append(bar["c"])
+                        closes = closes[-HISTORY:]
+                        engine.update(bar)
+                        out += sim.run_bar("BTCUSDT", bar, closes, 0.0, indicators=engine if mode == "engine" else None)
+                    trades[mode] = out
+        self.assertGreater(len(trades["closes"]), 10)
+        self.assertEqual(trades["engine"], trades["closes"])
+
+    def test_sim_run_trades_match_batch_smas_on_tick_rounded_bars(self):
+        cfg = {
+            "id": "SIM_A",
+            "strategy": "regime_gated_long_flat",
+            "universe": ["BTCUSDT"],
+            "capital": 1000.0,
+            "dd_kill": 0.9,
+            "daily_loss": 0.9,
+            "max_trades_per_day": 50,
+        }
+        run_bar = sim_runner.Sim.run_bar
+
+        def _without_indicators(sim, *args, indicators=None, **kwargs):
+            return run_bar(sim, *args, indicators=None, **kwargs)
+
+        trades = {}
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            market = root / "market"
+            market.mkdir()
+            for name, step, count in (("candles_15m.jsonl", 900_000, 6000), ("candles_1h.jsonl", 3_600_000, 1500)):
+                with (market / name).open("w", encoding="utf-8") as handle:
+                    for bar in _tick_bars(count, seed=len(name), step_ms=step):
+                        handle.write(json.dumps(bar) + "\n")
+            paths = {"BASE_DIR": root, "REPO_ROOT": root, "CANDLES_15M": market / "candles_15m.jsonl", "CANDLES_1H": market / "candles_1h.jsonl"}
+            for mode in ("batch", "engine"):
+                with patch.multiple(sim_runner, **paths), patch.object(sim_runner, "get_itc_signal", None), redirect_stdout(io.StringIO()):
+                    with contextlib.ExitStack() as stack:
+                        if mode == "batch":
+                            stack.enter_context(patch.object(sim_runner.Sim, "run_bar", _without_indicators))
+                            stack.enter_context(patch.object(sim_runner, "SymbolIndicators", _BatchIndicators))
+                        ctx = dict(sim_runner.load_market_context({"sims": [cfg]}, [cfg]), f_log=False)
+                        outcome = sim_runner.run_sim(cfg, ctx, full=True, sim_root=root / mode)
+                trades[mode] = (Path(outcome["sim_dir"]) / "trades.jsonl").read_text(encoding="utf-8")
+        self.assertGreater(trades["batch"].count("open_long"), 20)
+        self.assertEqual(trades["engine"], trades["batch"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -206,7 +206,7 @@ class SimRunnerSimCTests(unittest.TestCase):
 
             window_observations = []
 
-            def fake_run_bar(self, symbol, bar, closes, sentiment_score, candles_window, htf_bullish=None, tick_snapshot=None, params=None):
+            def fake_run_bar(self, symbol, bar, closes, sentiment_score, candles_window, htf_bullish=None, tick_snapshot=None, params=None, indicators=None):
                 window_observations.append(
                     {
                         "bar_ts": bar["ts"],
@@ -0,0 +1,90 @@
+import json
+import math
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from scripts import sim_runner, sim_sweep
+
+
+def _write_bars(path, count, step_ms, wave):
+    with path.open("w", encoding="utf-8") as handle:
+        for idx in range(count):
+            close = 100.0 + wave * math.sin(idx / 9.0) + idx * 0.01
+            handle.write(
+                json.dumps({"symbol": "BTCUSDT", "ts": idx * step_ms, "o": close, "h": close + 0.2, "l": close - 0.2, "c": close, "v": 1.0})
+                + "\n"
+            )
+
+
+class SimSweepTests(unittest.TestCase):
+    def test_sweep_matches_single_runs_and_is_independent_of_worker_count(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            market = root / "market"
+            market.mkdir()
+            _write_bars(market / "candles_15m.jsonl", 400, 900_000, wave=3.0)
+            _write_bars(market / "candles_1h.jsonl", 100, 3_600_000, wave=6.0)
+            config_path = root / "system1_trading.yaml"
+            config_path.write_text(
+                "sims:\n"
+                "  - id: SIM_A\n"
+                "    strategy: regime_gated_long_flat\n"
+                "    universe: [BTCUSDT]\n"
+                "    capital: 1000\n"
+                "    dd_kill: 0.5\n"
+                "    daily_loss: 0.5\n"
+                "    max_trades_per_day: 20\n"
+                "    execution:\n"
+                "      max_notional_pct: 0.05\n",
+                encoding="utf-8",
+            )
+            paths = {
+                "BASE_DIR": root,
+                "REPO_ROOT": root,
+                "CANDLES_15M": market / "candles_15m.jsonl",
+                "CANDLES_1H": market / "candles_1h.jsonl",
+                "TICK_FEATURES": market / "tick_features.json",
+                "CROSS_EXCHANGE_FILE": market / "cross_exchange_features.json",
+                "FUNDING_SNAPSHOT_FILE": market / "funding_snapshot.json",
+            }
+            params = {"execution.max_notional_pct": [0.05, 0.1], "execution.slippage_bps": [0.0, 5.0]}
+            with patch.multiple(sim_runner, **paths):
+                sim_runner.run(full=True, config_path=config_path)
+                serial = sim_sweep.sweep(config_path=config_path, params=params, workers=1, out_dir=root / "serial")
+                pooled = sim_sweep.sweep(config_path=config_path, params=params, workers=2, out_dir=root / "pooled")
+                (plain,) = sim_sweep.sweep(config_path=config_path, workers=1, out_dir=root / "plain")
+
+            baseline = json.loads((root / "sim" / "SIM_A" / "performance.json").read_text(encoding="utf-8"))
+            self.assertGreater(baseline["round_trips"], 0)
+            self.assertEqual({k: plain[k] for k in baseline}, baseline)
+            self.assertTrue((root / "pooled" / "sweep_results.json").exists())
+
+        self.assertEqual(len(serial), 4)
+        strip = lambda rows: [{k: v for k, v in row.items() if k != "seconds"} for row in rows]  # noqa: E731
+        self.assertEqual(strip(serial), strip(pooled))
+        by_params = {(row["params"]["execution.max_notional_pct"], row["params"]["execution.slippage_bps"]): row for row in serial}
+        self.assertEqual(set(by_params), {(0.05, 0.0), (0.05, 5.0), (0.1, 0.0), (0.1, 5.0)})
+        self.assertTrue(all(row["base"] == "SIM_A" and row["id"].startswith("SIM_A.sw") for row in serial))
+        # Position size leaves the signals alone; extra slippage only costs.
+        self.assertEqual(by_params[(0.05, 0.0)]["round_trips"], by_params[(0.1, 0.0)]["round_trips"])
+        self.assertGreater(by_params[(0.05, 0.0)]["net_return_pct"], by_params[(0.05, 5.0)]["net_return_pct"])
+        self.assertEqual([row["net_return_pct"] for row in serial], sorted((row["net_return_pct"] for row in serial), reverse=True))
+
+    def test_grid_and_param_parsing(self):
+        self.assertEqual(sim_sweep.parse_param("execution.tilt_scale=0.003, 0.005"), ("execution.tilt_scale", [0.003, 0.005]))
+        self.assertEqual(sim_sweep.parse_param("mode=tick,bar"), ("mode", ["tick", "bar"]))
+        with self.assertRaises(ValueError):
+            sim_sweep.parse_param("no_values")
+        variants = sim_sweep.build_variants(
+            [{"id": "SIM_B", "execution": {"tilt_scale": 0.005, "entry_gap_pct": 0.001}}],
+            {"execution.tilt_scale": [0.003, 0.008], "features.competing_models.trend_fast": [6]},
+        )
+        self.assertEqual([v["cfg"]["id"] for v in variants], ["SIM_B.sw000", "SIM_B.sw001"])
+        self.assertEqual(variants[1]["cfg"]["execution"], {"tilt_scale": 0.008, "entry_gap_pct": 0.001})
+        self.assertEqual(variants[0]["feature_overrides"], {"competing_models": {"trend_fast": 6}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import json
+import math
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core_infra import bar_backtest
+from core_infra.rolling_indicators import SymbolIndicators
+from scripts import sim_runner
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+T0 = 1_767_225_600_000
+
+
+def _rows(symbol, count, step_ms, seed, wave):
+    rng = random.Random(seed)
+    price, rows = 100.0, []
+    for idx in range(count):
+        price *= 1.0 + rng.gauss(0.0, 0.002) + 0.0015 * wave * math.sin(idx / 11.0)
+        rows.append({"symbol": symbol, "ts": T0 + idx * step_ms, "o": price, "h": price * 1.001, "l": price * 0.999, "c": price, "v": 1.0})
+    return rows
+
+
+def _tick_rows(symbol, count, step_ms, seed):
+    """Closes on a 0.01 tick that are mostly flat, so fast/slow SMA ties are common."""
+    rng = random.Random(seed)
+    cents, rows = 10_000, []
+    for idx in range(count):
+        cents += rng.choice((-1, 0, 0, 0, 1)) + (1 if idx % 300 < 150 and rng.random() < 0.08 else 0)
+        price = cents / 100.0
+        rows.append({"symbol": symbol, "ts": T0 + idx * step_ms, "o": price, "h": price + 0.01, "l": price - 0.01, "c": price, "v": 1.0})
+    return rows
+
+
+def _write_market(market):
+    for name, step, count, wave in (("candles_15m.jsonl", 900_000, 1200, 1.0), ("candles_1h.jsonl", 3_600_000, 300, 0.5)):
+        with (market / name).open("w", encoding="utf-8") as handle:
+            for n, symbol in enumerate(SYMBOLS):
+                for row in _rows(symbol, count, step, seed=n * 7 + len(name), wave=wave):
+                    handle.write(json.dumps(row) + "\n")
+
+
+def _sim_cfgs():
+    base = {"universe": SYMBOLS, "capital": 1000.0, "dd_kill": 0.5, "daily_loss": 0.5, "max_trades_per_day": 50}
+    return [
+        dict(base, id="SIM_A", strategy="regime_gated_long_flat"),
+        # Few trades per day and a daily-loss switch that closes positions.
+        dict(base, id="SIM_A_CAPPED", strategy="regime_gated_long_flat", max_trades_per_day=3, daily_loss=0.002, execution={"max_notional_pct": 0.3}),
+        # Big positions and a drawdown kill that fires part-way through.
+        dict(base, id="SIM_A_KILL", strategy="regime_gated_long_flat", dd_kill=0.008, execution={"max_notional_pct": 0.4}),
+        dict(base, id="SIM_B", strategy="itc_sentiment_tilt_long_flat", execution={"tilt_scale": 0.004, "entry_gap_pct": 0.0005}),
+    ]
+
+
+def _sentiment():
+    rng = random.Random(4)
+    return {T0 + hour * 3_600_000: rng.uniform(-1.0, 1.0) for hour in range(300)}
+
+
+@unittest.skipIf(not bar_backtest.available(), "numpy not installed")
+class SimVectorBacktestTests(unittest.TestCase):
+    def _context(self, root, cut=None):
+        market = root / "market"
+        paths = {
+            "BASE_DIR": root,
+            "REPO_ROOT": root,
+            "CANDLES_15M": market / "candles_15m.jsonl",
+            "CANDLES_1H": market / "candles_1h.jsonl",
+            "TICK_FEATURES": market / "tick_features.json",
+            "CROSS_EXCHANGE_FILE": market / "cross_exchange_features.json",
+            "FUNDING_SNAPSHOT_FILE": market / "funding_snapshot.json",
+        }
+        with patch.multiple(sim_runner, **paths), patch.object(sim_runner, "get_itc_signal", None):
+            ctx = sim_runner.load_market_context({"sims": _sim_cfgs()}, _sim_cfgs())
+        ctx = dict(ctx, f_log=False, sentiment=_sentiment())
+        if cut is not None:
+            ctx["candles_15m"] = {symbol: list(bars)[:cut] for symbol, bars in ctx["candles_15m"].items()}
+        return ctx
+
+    def _outputs(self, sim_dir):
+        state = json.loads((sim_dir / "state.json").read_text(encoding="utf-8"))
+        state.pop("updated_at")  # wall clock
+        return {
+            "trades.jsonl": (sim_dir / "trades.jsonl").read_text(encoding="utf-8"),
+            "state.json": state,
+            "performance.json": (sim_dir / "performance.json").read_text(encoding="utf-8"),
+        }
+
+    def test_vector_engine_writes_the_same_trades_and_summary(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "market").mkdir()
+            _write_market(root / "market")
+            full_ctx, head_ctx = self._context(root), self._context(root, cut=700)
+            outputs = {}
+            with patch.object(sim_runner, "get_itc_signal", None):
+                for engine in sim_runner.ENGINES:
+                    for cfg in _sim_cfgs():
+                        sim_root = root / engine
+                        # A full replay, then an incremental run over bars that arrived later.
+                        sim_runner.run_sim(cfg, full_ctx, full=True, sim_root=sim_root / "full", engine=engine)
+                        sim_runner.run_sim(cfg, head_ctx, full=True, sim_root=sim_root / "resumed", engine=engine)
+                        sim_runner.run_sim(cfg, full_ctx, full=False, sim_root=sim_root / "resumed", engine=engine)
+                        for mode in ("full", "resumed"):
+                            outputs[(engine, cfg["id"], mode)] = self._outputs(sim_root / mode / cfg["id"])
+
+        for cfg in _sim_cfgs():
+            for mode in ("full", "resumed"):
+                event, vector = outputs[("event", cfg["id"], mode)], outputs[("vector", cfg["id"], mode)]
+                for name in event:
+                    self.assertEqual(vector[name], event[name], (cfg["id"], mode, name))
+        trades = {sim_id: outputs[("event", sim_id, "full")]["trades.jsonl"] for sim_id in ("SIM_A", "SIM_A_CAPPED", "SIM_A_KILL", "SIM_B")}
+        self.assertGreater(trades["SIM_A"].count("close_long"), 20)
+        self.assertGreater(trades["SIM_B"].count("itc_tilt"), 10)
+        self.assertIn("halt_exit", trades["SIM_A_KILL"])
+        self.assertIn("halt_exit", trades["SIM_A_CAPPED"])
+        self.assertTrue(outputs[("event", "SIM_A_KILL", "full")]["state.json"]["halted"])
+        self.assertLess(trades["SIM_A_CAPPED"].count("\n"), trades["SIM_A"].count("\n"))
+
+    def test_running_mean_matches_batch_sma(self):
+        closes = [row["c"] for row in _tick_rows("BTCUSDT", 3000, 900_000, seed=2)]
+        for period in (1, sim_runner.FAST_PERIOD, sim_runner.SLOW_PERIOD, sim_runner.SLOW_PERIOD + 5):
+            series = bar_backtest.running_mean(bar_backtest.np.asarray(closes), period).tolist()
+            expected = [sim_runner.sma(closes[:i + 1], period) for i in range(len(closes))]
+            self.assertEqual([None if math.isnan(v) else v for v in series], expected, period)
+
+    def test_replay_matches_a_run_bar_loop(self):
+        gaussian = {symbol: _rows(symbol, 900, 900_000, seed=n, wave=1.2) for n, symbol in enumerate(SYMBOLS[:2])}
+        ticks = {symbol: _tick_rows(symbol, 2000, 900_000, seed=n) for n, symbol in enumerate(SYMBOLS[:2])}
+        for bars in (gaussian, ticks):
+            self._check_replay(bars)
+
+    def _check_replay(self, bars):
+        htf = {symbol: {row["ts"]: row["c"] > 100.0 for row in _rows(symbol, len(rows) // 4, 3_600_000, seed=9, wave=0.5)} for symbol, rows in bars.items()}
+        sentiment = _sentiment()
+        history = sim_runner.SLOW_PERIOD + 5
+        for cfg in _sim_cfgs():
+            results = {}
+            with tempfile.TemporaryDirectory() as td, patch.object(sim_runner, "BASE_DIR", Path(td)):
+                # "batch" is the close-list path: run_bar's SMAs from sim_runner.sma.
+                for mode in ("batch", "run_bar", "vector"):
+                    sim = sim_runner.Sim(dict(cfg, id=f"{cfg['id']}_{mode}"))
+                    trades = []
+                    for symbol, rows in bars.items():
+                        scores = [sentiment.get((row["ts"] // 3_600_000) * 3_600_000, 0.0) for row in rows]
+                        if mode == "vector":
+                            trades += sim_runner.VectorBarReplay(sim, symbol, rows, htf[symbol]).run(0, scores)
+                            continue
+                        indicators, closes = SymbolIndicators(history), []
+                        asof = sim_runner.AsOfCursor.over_mapping(htf[symbol])
+                        for row, score in zip(rows, scores):
+                            closes = (closes + [row["c"]])[-history:]
+                            indicators.update(row)
+                            trades += sim.run_bar(symbol, row, closes, score, htf_bullish=asof.at(row["ts"]), indicators=indicators if mode == "run_bar" else None)
+                    state = {key: getattr(sim, key) for key in ("equity", "peak_equity", "halted", "position", "bars_since_entry", "last_marks", "current_day", "trades_today", "day_start_equity")}
+                    results[mode] = ([dict(t, sim=cfg["id"]) for t in trades], state)
+            self.assertGreater(len(results["batch"][0]), 4, cfg["id"])
+            self.assertEqual(results["run_bar"], results["batch"], cfg["id"])
+            self.assertEqual(results["vector"], results["batch"], cfg["id"])
+
+    def test_array_marks_match_scalar_marks_with_all_costs(self):
+        execution = {
+            "slippage_bps": 3.0,
+            "spread_bps": 4.0,
+            "market_impact_bps_per_10k": 25.0,
+            "funding_bps_8h": 2.5,
+            "borrow_bps_daily": 6.0,
+            "short_borrow_bps_daily": 11.0,
+        }
+        rng = random.Random(8)
+        prices = [rng.uniform(60.0, 140.0) for _ in range(50)]
+        mark_ts = [T0 + rng.randint(-3_600_000, 30 * 86_400_000) for _ in prices]
+        positions = [
+            {"direction": 1, "size": 40.0, "entry": 101.0, "entry_notional_usd": 4040.0, "open_ts": T0},
+            {"direction": -1, "size": 25.0, "entry": 99.0, "entry_notional_usd": 2475.0, "open_ts": T0, "best_ask": 99.5},
+            {"direction": 1, "size": 10.0, "entry": 100.0, "entry_notional_usd": 1000.0, "best_bid": 98.0},
+        ]
+        with tempfile.TemporaryDirectory() as td, patch.object(sim_runner, "BASE_DIR", Path(td)):
+            sim = sim_runner.Sim(dict(_sim_cfgs()[0], execution=execution))
+            for position in positions:
+                marks = sim._unrealized_marks(position, prices, mark_ts).tolist()
+                expected = []
+                for price, ts in zip(prices, mark_ts):
+                    sim.equity, sim.position = 0.0, {"BTCUSDT": position}
+                    expected.append(sim._mark_to_market_equity(mark_ts=ts, price_overrides={"BTCUSDT": price}))
+                self.assertEqual(marks, expected, position)
+            estimate = sim._estimate_close_components(positions[1], 100.0, T0 + 2 * 86_400_000)
+            self.assertGreater(estimate["cost_components"]["impact_bps"], 0.0)
+            self.assertLess(estimate["funding_cost"], 0.0)  # shorts receive funding
+            self.assertGreater(estimate["borrow_cost"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
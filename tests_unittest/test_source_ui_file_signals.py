@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SOURCE_UI_ROOT = REPO_ROOT / "workspace" / "source-ui"
+if str(SOURCE_UI_ROOT) not in sys.path:
+    sys.path.insert(0, str(SOURCE_UI_ROOT))
+
+from api import file_signals, task_store  # noqa: E402
+
+
+def _bump(path: Path, text: str) -> None:
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class FileSignalCacheTests(unittest.TestCase):
+    def test_text_probe_reads_once_until_file_changes(self):
+        cache = file_signals.FileSignalCache()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "app.py"
+            path.write_text("def promote_research_item():\n", encoding="utf-8")
+            with mock.patch.object(file_signals, "_read_text", wraps=file_signals._read_text) as reader:
+                self.assertIn("promote_research_item", cache.text(path))
+                self.assertNotIn("archive_task", cache.text(path))
+                self.assertIn("promote_research_item", cache.text(path))
+                self.assertEqual(reader.call_count, 1)
+
+                _bump(path, "def archive_task():\n")
+                self.assertIn("archive_task", cache.text(path))
+                self.assertNotIn("promote_research_item", cache.text(path))
+                self.assertEqual(reader.call_count, 2)
+
+            missing = cache.text(Path(tmpdir) / "missing.js")
+            self.assertNotIn("anything", missing)
+
+    def test_derive_recomputes_only_changed_inputs(self):
+        cache = file_signals.FileSignalCache()
+        calls = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            a = Path(tmpdir) / "a.json"
+            b = Path(tmpdir) / "b.json"
+            a.write_text("[1]", encoding="utf-8")
+            b.write_text("[1, 2]", encoding="utf-8")
+
+            def count(path):
+                calls.append(path.name)
+                return len(json.loads(path.read_text(encoding="utf-8")))
+
+            for _ in range(3):
+                self.assertEqual(cache.derive("a", [a], lambda: count(a)), 1)
+                self.assertEqual(cache.derive("b", [b], lambda: count(b)), 2)
+            _bump(a, "[1, 2, 3]")
+            self.assertEqual(cache.derive("a", [a], lambda: count(a)), 3)
+            self.assertEqual(cache.derive("b", [b], lambda: count(b)), 2)
+            self.assertEqual(calls, ["a.json", "b.json", "a.json"])
+
+    def test_source_mission_signals_are_stable_and_skip_reads_when_unchanged(self):
+        file_signals.FILE_SIGNALS.clear()
+        task_store._REVIEW_CHECK_CACHE.clear()
+        with mock.patch.object(task_store, "_source_mission_runtime_claim_signals", return_value={}):
+            first = task_store._source_mission_signals()
+            with mock.patch.object(file_signals, "_read_text") as reader, mock.patch.object(
+                task_store, "_read_jsonl"
+            ) as jsonl_reader:
+                second = task_store._source_mission_signals()
+                reader.assert_not_called()
+                jsonl_reader.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIn("has_portfolio_packet", first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SOURCE_UI_ROOT = REPO_ROOT / "workspace" / "source-ui"
+if str(SOURCE_UI_ROOT) not in sys.path:
+    sys.path.insert(0, str(SOURCE_UI_ROOT))
+
+from api import jsonl_tail  # noqa: E402
+
+
+def _splitlines_rows(text, limit):
+    rows = []
+    for raw in text.splitlines()[-limit:]:
+        try:
+            payload = json.loads(raw)
+        except Exception:
+            continue
+        if isinstance(payload, dict):
+            rows.append(payload)
+    return rows
+
+
+class JsonlTailTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / "events.jsonl"
+        patcher = mock.patch.object(jsonl_tail, "BLOCK_SIZE", 16)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_splitlines_across_block_boundaries(self):
+        lines = []
+        for i in range(60):
+            if i % 7 == 0:
+                lines.append("")
+            elif i % 11 == 0:
+                lines.append("not json é")
+            else:
+                lines.append(json.dumps({"i": i, "text": "é" * (i % 5)}, ensure_ascii=False))
+        text = "\n".join(lines) + "\n"
+        self.path.write_text(text, encoding="utf-8")
+        cache = jsonl_tail.TailCache()
+        for limit in (1, 5, 33, 200):
+            with self.subTest(limit=limit):
+                self.assertEqual(cache.lines(self.path, limit), text.splitlines()[-limit:])
+                self.assertEqual(cache.rows(self.path, limit), _splitlines_rows(text, limit))
+        self.assertEqual(list(jsonl_tail.iter_lines_reversed(self.path)), list(reversed(text.splitlines())))
+        self.assertEqual(cache.lines(self.path.with_name("missing.jsonl"), 5), [])
+
+    def test_repeated_polls_parse_only_appended_lines(self):
+        self.path.write_text("".join(json.dumps({"i": i}) + "\n" for i in range(100)), encoding="utf-8")
+        cache = jsonl_tail.TailCache()
+        self.assertEqual([row["i"] for row in cache.rows(self.path, 3)], [97, 98, 99])
+
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"i": 100}) + "\n" + '{"i": 1')
+        with mock.patch.object(jsonl_tail.json, "loads", wraps=json.loads) as loads:
+            rows = cache.rows(self.path, 3)
+        # One appended row plus the unfinished last line, which is not cached.
+        self.assertEqual(loads.call_count, 2)
+        self.assertEqual([row["i"] for row in rows], [99, 100])
+        self.assertEqual(cache.stats()["rebuilds"], 1)
+
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write("01}\n")
+        self.assertEqual([row["i"] for row in cache.rows(self.path, 3)], [99, 100, 101])
+        self.assertEqual(cache.stats()["rebuilds"], 1)
+
+    def test_rotated_or_rewritten_file_is_reread(self):
+        self.path.write_text('{"v": "old-1"}\n{"v": "old-2"}\n', encoding="utf-8")
+        cache = jsonl_tail.TailCache()
+        self.assertEqual(cache.rows(self.path, 5), [{"v": "old-1"}, {"v": "old-2"}])
+
+        rotated = self.path.with_name("events.1.jsonl")
+        os.replace(self.path, rotated)
+        self.path.write_text('{"v": "new-1"}\n', encoding="utf-8")
+        self.assertEqual(cache.rows(self.path, 5), [{"v": "new-1"}])
+
+        with self.path.open("r+", encoding="utf-8") as fh:
+            fh.write('{"v": "NEW-1"}\n{"v": "new-2"}\n')
+        self.assertEqual(cache.rows(self.path, 5), [{"v": "NEW-1"}, {"v": "new-2"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SOURCE_UI_ROOT = REPO_ROOT / "workspace" / "source-ui"
+if str(SOURCE_UI_ROOT) not in sys.path:
+    sys.path.insert(0, str(SOURCE_UI_ROOT))
+
+from api import task_db, task_store  # noqa: E402
+
+
+def _task(task_id, **fields):
+    row = {"id": task_id, "title": f"task {task_id}", "status": "backlog", "priority": "medium", "origin": "dashboard"}
+    row.update(fields)
+    return row
+
+
+class TaskStoreSqliteTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.tasks_path = self.root / "tasks.json"
+        self.archive_path = self.root / "archived_tasks.json"
+        self.tasks_path.write_text(
+            json.dumps(
+                [
+                    _task(1001, assignee="coder", status="in_progress", project="source-ui"),
+                    _task(1002, assignee="coder", project="source-ui"),
+                    _task(1003, assignee="Writer", project="docs"),
+                    _task(1004, assignee="writer", status="blocked", project="docs"),
+                ]
+            ),
+            encoding="utf-8",
+        )
+        self.archive_path.write_text(json.dumps([_task(1010, status="archived", archived_at="2026-01-01T00:00:00Z")]), encoding="utf-8")
+        patches = [
+            mock.patch.dict(os.environ, {"OPENCLAW_TASK_STORE": "sqlite", "OPENCLAW_TASK_RECONCILE_SEC": "3600"}),
+            mock.patch.object(task_store, "ARCHIVED_TASKS_PATH", self.archive_path),
+            mock.patch.object(task_store, "SOURCE_MISSION_CONFIG_PATH", self.root / "missing-source-mission.json"),
+            mock.patch.object(task_store, "_task_requires_review_gate", return_value=False),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self._close_dbs)
+
+    def _close_dbs(self):
+        for key in list(task_db._DBS):
+            if key.startswith(str(self.root.resolve())):
+                task_db._DBS.pop(key).close()
+        self._tmp.cleanup()
+
+    def test_migrates_json_once_and_matches_json_backend(self):
+        with mock.patch.dict(os.environ, {"OPENCLAW_TASK_STORE": "json"}):
+            expected = task_store.load_tasks(self.tasks_path)
+        rows = task_store.load_tasks(self.tasks_path)
+        self.assertEqual(rows, expected)
+        self.assertTrue(self.tasks_path.with_suffix(".sqlite3").exists())
+        self.assertEqual([t["id"] for t in task_store.load_archived_tasks(tasks_path=self.tasks_path)], [1010])
+
+        self.tasks_path.write_text("[]", encoding="utf-8")
+        self.assertEqual([t["id"] for t in task_store.load_tasks(self.tasks_path)], [1001, 1002, 1003, 1004])
+
+    def test_mutations_write_single_rows_and_use_id_sequence(self):
+        task_store.load_tasks(self.tasks_path)
+        json_before = self.tasks_path.read_text(encoding="utf-8")
+        db = task_store._task_db(self.tasks_path)
+
+        with mock.patch.object(db, "_upsert", wraps=db._upsert) as upsert:
+            created = task_store.create_task({"title": "new", "assignee": "reviewer"}, self.tasks_path)
+        self.assertEqual(created["id"], 1011)
+        self.assertEqual(created["status"], "in_progress")
+        self.assertEqual(upsert.call_count, 1)
+
+        with mock.patch.object(db, "_upsert", wraps=db._upsert) as upsert:
+            updated = task_store.update_task("1001", {"status": "done"}, self.tasks_path)
+        self.assertEqual(updated["status"], "done")
+        # The finished task and the next backlog task for the same assignee.
+        self.assertEqual(upsert.call_count, 2)
+        self.assertEqual(db.get("1002")["status"], "in_progress")
+
+        archived = task_store.archive_task("1001", self.tasks_path)
+        self.assertEqual(archived["status"], "archived")
+        self.assertEqual([t["id"] for t in task_store.load_archived_tasks(tasks_path=self.tasks_path)], [1001, 1010])
+        self.assertTrue(task_store.delete_task("1003", self.tasks_path))
+        self.assertFalse(task_store.delete_task("1003", self.tasks_path))
+        self.assertEqual(task_store.create_task({"title": "again"}, self.tasks_path)["id"], 1012)
+        self.assertEqual(self.tasks_path.read_text(encoding="utf-8"), json_before)
+
+    def test_query_filters_and_paginates_on_both_backends(self):
+        for backend in ("sqlite", "json"):
+            with self.subTest(backend=backend), mock.patch.dict(os.environ, {"OPENCLAW_TASK_STORE": backend}):
+                page = task_store.query_tasks(self.tasks_path, assignee="WRITER", limit=1)
+                self.assertEqual(page["total"], 2)
+                self.assertEqual([t["id"] for t in page["tasks"]], [1003])
+                page = task_store.query_tasks(self.tasks_path, assignee="writer", limit=1, offset=1)
+                self.assertEqual([t["id"] for t in page["tasks"]], [1004])
+                page = task_store.query_tasks(self.tasks_path, project="source-ui", status="in progress")
+                self.assertEqual([t["id"] for t in page["tasks"]], [1001])
+                page = task_store.query_tasks(self.tasks_path, archived=True)
+                self.assertEqual([t["id"] for t in page["tasks"]], [1010])
+
+    def test_partial_sync_reads_rows_inside_its_transaction(self):
+        path = self.root / "shared.sqlite3"
+        first, second = task_db.TaskDB(path), task_db.TaskDB(path)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        first.sync_active([_task(1), _task(2)])
+        begin = first._begin
+
+        def _other_process_appends_first():
+            # Another writer commits between this call starting and its transaction opening.
+            second.sync_active([_task(3)], complete=False)
+            begin()
+
+        with mock.patch.object(first, "_begin", side_effect=_other_process_appends_first):
+            first.sync_active([_task(4)], complete=False)
+        positions = {row["id"]: row["position"] for row in first._conn.execute("SELECT id, position FROM tasks WHERE archived = 0")}
+        self.assertEqual(positions, {"1": 0, "2": 1, "3": 2, "4": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = REPO_ROOT / "workspace" / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import policy_router as pr  # noqa: E402
+import token_counter as tc  # noqa: E402
+
+
+class _WordEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return len(text.split())
+
+
+def _policy():
+    return {
+        "version": 2,
+        "defaults": {"allowPaid": True},
+        "budgets": {
+            "intents": {"conversation": {"dailyTokenBudget": 999999, "dailyCallBudget": 999, "maxCallsPerRun": 50}},
+            "tiers": {"free": {"dailyTokenBudget": 999999, "dailyCallBudget": 999}},
+        },
+        "providers": {
+            "mock": {"enabled": True, "paid": False, "tier": "free", "type": "mock", "models": [{"id": "m1"}]},
+        },
+        "routing": {
+            "free_order": ["mock"],
+            "intents": {"conversation": {"order": ["mock"], "allowPaid": True}},
+            "capability_router": {"enabled": False},
+        },
+    }
+
+
+class TestTokenCounter(unittest.TestCase):
+    def test_heuristic_matches_router_estimate(self):
+        for payload in ({"prompt": "hello world"}, {"messages": [{"content": "a"}, {"content": "bb"}]}, {}, None):
+            text = pr._extract_text_from_payload(payload)
+            self.assertEqual(tc.HEURISTIC.count_payload(payload), pr.estimate_tokens(text))
+
+    def test_growing_conversation_only_encodes_new_turns(self):
+        encoder = _WordEncoder()
+        counter = tc.TokenizerCounter(encoder, name="words")
+        messages = []
+        for turn in ["one two three", "four five", "six"]:
+            messages.append({"role": "user", "content": turn})
+            counter.count_payload({"messages": list(messages)})
+        self.assertEqual(encoder.calls, ["one two three", "four five", "six"])
+        expected = 6 + 3 * tc.MESSAGE_OVERHEAD_TOKENS + tc.REPLY_PRIMER_TOKENS
+        self.assertEqual(counter.count_payload({"messages": messages}), expected)
+        self.assertEqual(counter.count_payload({"prompt": "four five"}), 2)
+
+    def test_tokenizer_resolution_and_fallback(self):
+        with tempfile.TemporaryDirectory() as td:
+            model_dir = Path(td) / "org__model-7b"
+            model_dir.mkdir()
+            (model_dir / "tokenizer.json").write_text("{}", encoding="utf-8")
+            provider = {"models": [{"id": "explicit", "tokenizer": "/tmp/x/tokenizer.json"}]}
+            self.assertEqual(tc.tokenizer_path_for(provider, "explicit"), Path("/tmp/x/tokenizer.json"))
+            with patch.dict(os.environ, {"OPENCLAW_TOKENIZER_DIR": td}):
+                self.assertEqual(tc.tokenizer_path_for({}, "org/model-7b"), model_dir / "tokenizer.json")
+                self.assertIsNone(tc.tokenizer_path_for({}, "other"))
+            self.assertIs(tc.counter_for({"capabilities": {"tokenizer": str(Path(td) / "missing.json")}}, "m"), tc.HEURISTIC)
+
+    def test_router_budgets_use_provider_counter(self):
+        counter = tc.TokenizerCounter(_WordEncoder(), name="words")
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            policy_path = tmp / "policy.json"
+            policy_path.write_text(json.dumps(_policy()), encoding="utf-8")
+            router = pr.PolicyRouter(
+                policy_path=policy_path,
+                budget_path=tmp / "budget.json",
+                circuit_path=tmp / "circuit.json",
+                event_log=tmp / "events.jsonl",
+                handlers={"mock": lambda payload, model_id, context: {"ok": True, "text": "ok"}},
+            )
+            with patch.object(pr, "token_counter_for", lambda provider, model_id: counter):
+                out = router.execute_with_escalation("conversation", {"prompt": "count these five words please"})
+            self.assertTrue(out["ok"])
+            self.assertEqual(router.budget_state["intents"]["conversation"]["tokens"], 5)
+            self.assertIs(router._token_counter("mock", "m1"), counter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Units appended since the last snapshot before the snapshot is rewritten.
+SNAPSHOT_EVERY = 256
+_ANCHOR_BYTES = 64
+# Same token rule as the character loop it replaced: runs of alphanumerics, "_" and "-".
+_TOKEN_RE = re.compile(r"[\w-]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class UnitIndex:
+    """Inverted index over ``knowledge_units.jsonl``, addressed by byte offset.
+
+    Each indexed line becomes a doc with its byte offset, token count, scope,
+    expiry and creation time. Postings map a token to ``[doc, tf]`` pairs for
+    BM25, so a query only touches the postings of its own tokens. Units are
+    read back from disk by offset. Stored ``embedding`` vectors go into a
+    float32 matrix with precomputed norms for cosine search (numpy only).
+
+    The index follows appends to the units file. Any other change to the file
+    (rewrite, truncation, replacement) triggers a full rebuild. State is
+    persisted to ``search_index.json`` (plus ``search_index.npz`` for
+    embeddings) every ``SNAPSHOT_EVERY`` new units and on ``save``.
+    """
+
+    def __init__(self, units_path: Path, snapshot_path: Path):
+        self.units_path = Path(units_path)
+        self.snapshot_path = Path(snapshot_path)
+        self.embeddings_path = self.snapshot_path.with_suffix(".npz")
+        self._lock = threading.RLock()
+        self._clear()
+        self._load_snapshot()
+
+    # -- state ---------------------------------------------------------
+
+    def _clear(self) -> None:
+        self._inode: Optional[int] = None
+        self._mtime_ns: Optional[int] = None
+        self._offset = 0
+        self._anchor = b""
+        self.docs: List[List[Any]] = []  # [byte_offset, length, agent_scope, expires_at, created_at]
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.total_len = 0
+        self._vectors: List[Tuple[int, List[float]]] = []
+        self._matrix = None
+        self._matrix_docs = None
+        self._norms = None
+        self._dirty = 0
+
+    def _load_snapshot(self) -> None:
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return
+        source = data.get("source") or {}
+        self._inode = source.get("inode")
+        self._mtime_ns = source.get("mtime_ns")
+        self._offset = int(source.get("offset", 0))
+        self._anchor = bytes.fromhex(str(source.get("anchor", "")))
+        self.docs = list(data.get("docs") or [])
+        self.postings = dict(data.get("postings") or {})
+        self.total_len = int(data.get("total_len", 0))
+        if np is not None and self.embeddings_path.exists():
+            try:
+                with np.load(self.embeddings_path) as payload:
+                    self._vectors = [
+                        (int(doc), row.tolist()) for doc, row in zip(payload["docs"], payload["matrix"])
+                    ]
+            except Exception:
+                self._vectors = []
+
+    def save(self) -> None:
+        with self._lock:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "version": INDEX_VERSION,
+                "source": {"inode": self._inode, "mtime_ns": self._mtime_ns, "offset": self._offset, "anchor": self._anchor.hex()},
+                "docs": self.docs,
+                "postings": self.postings,
+                "total_len": self.total_len,
+            }
+            tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            if np is not None and self._vectors:
+                matrix, docs = self._vector_arrays()
+                with open(self.embeddings_path.with_name(self.embeddings_path.name + ".tmp"), "wb") as fh:
+                    np.savez(fh, matrix=matrix, docs=docs)
+                os.replace(self.embeddings_path.with_name(self.embeddings_path.name + ".tmp"), self.embeddings_path)
+            elif self.embeddings_path.exists():
+                self.embeddings_path.unlink()
+            # The JSON snapshot is written last; it is the commit point.
+            os.replace(tmp, self.snapshot_path)
+            self._dirty = 0
+
+    # -- incremental build ---------------------------------------------
+
+    def _add(self, offset: int, unit: Dict[str, Any]) -> None:
+        doc = len(self.docs)
+        tokens = tokenize(str(unit.get("content", "")))
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self.postings.setdefault(token, []).append([doc, tf])
+        self.docs.append([
+            offset,
+            len(tokens),
+            str(unit.get("agent_scope", "shared")),
+            unit.get("expires_at"),
+            str(unit.get("created_at", "")),
+        ])
+        self.total_len += len(tokens)
+        vector = unit.get("embedding")
+        if isinstance(vector, list) and vector:
+            self._vectors.append((doc, vector))
+            self._matrix = None
+
+    def refresh(self) -> None:
+        """Index units appended since the last call; rebuild if the file changed otherwise."""
+        with self._lock:
+            try:
+                st = os.stat(self.units_path)
+            except FileNotFoundError:
+                if self.docs or self._inode is not None:
+                    self._clear()
+                return
+            if st.st_ino == self._inode and st.st_size == self._offset and st.st_mtime_ns == self._mtime_ns:
+                return
+            with open(self.units_path, "rb") as fh:
+                if not self._continues(st, fh):
+                    self._clear()
+                fh.seek(self._offset)
+                data = fh.read()
+            end = data.rfind(b"\n") + 1
+            position = self._offset
+            for line in data[:end].splitlines(keepends=True):
+                if line.strip():
+                    try:
+                        unit = json.loads(line)
+                    except ValueError:
+                        unit = None
+                    if isinstance(unit, dict):
+                        self._add(position, unit)
+                        self._dirty += 1
+                position += len(line)
+            self._anchor = (self._anchor + data[:end])[-_ANCHOR_BYTES:]
+            self._offset = position
+            self._inode = st.st_ino
+            self._mtime_ns = st.st_mtime_ns
+            if self._dirty >= SNAPSHOT_EVERY:
+                self.save()
+
+    def _continues(self, st: os.stat_result, fh) -> bool:
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            return False
+        if st.st_size == self._offset:
+            # Modified without growing: rewritten in place.
+            return False
+        if not self._anchor:
+            return self._offset == 0
+        fh.seek(self._offset - len(self._anchor))
+        return fh.read(len(self._anchor)) == self._anchor
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    # -- reads ---------------------------------------------------------
+
+    def read_units(self, docs: List[int]) -> Dict[int, Dict[str, Any]]:
+        out: Dict[int, Dict[str, Any]] = {}
+        with open(self.units_path, "rb") as fh:
+            for doc in sorted(docs):
+                fh.seek(self.docs[doc][0])
+                try:
+                    out[doc] = json.loads(fh.readline())
+                except ValueError:
+                    continue
+        return out
+
+    def bm25(self, query_tokens: List[str], accept: Callable[[List[Any]], bool]) -> Dict[int, float]:
+        """BM25 score of every accepted doc containing at least one query token."""
+        with self._lock:
+            n_docs = len(self.docs)
+            if not n_docs:
+                return {}
+            avg_len = self.total_len / n_docs or 1.0
+            scores: Dict[int, float] = {}
+            rejected: set = set()
+            for token in set(query_tokens):
+                posting = self.postings.get(token)
+                if not posting:
+                    continue
+                idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc, tf in posting:
+                    if doc in rejected:
+                        continue
+                    if doc not in scores and not accept(self.docs[doc]):
+                        rejected.add(doc)
+                        continue
+                    length = self.docs[doc][1]
+                    norm = tf + BM25_K1 * (1.0 - BM25_B + BM25_B * length / avg_len)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1.0) / norm
+            return scores
+
+    def _vector_arrays(self):
+        dim = len(self._vectors[0][1])
+        rows = [(doc, vector) for doc, vector in self._vectors if len(vector) == dim]
+        matrix = np.asarray([vector for _, vector in rows], dtype=np.float32)
+        docs = np.asarray([doc for doc, _ in rows], dtype=np.int64)
+        return matrix, docs
+
+    def cosine(self, vector: List[float], accept: Callable[[List[Any]], bool], limit: int) -> List[Tuple[int, float]]:
+        """Top ``limit`` accepted docs by cosine similarity of their stored embedding."""
+        if np is None:
+            return []
+        with self._lock:
+            if not self._vectors:
+                return []
+            if self._matrix is None:
+                self._matrix, self._matrix_docs = self._vector_arrays()
+                self._norms = np.linalg.norm(self._matrix, axis=1)
+            query = np.asarray(vector, dtype=np.float32)
+            if query.shape != (self._matrix.shape[1],):
+                return []
+            sims = (self._matrix @ query) / np.maximum(self._norms * float(np.linalg.norm(query)), 1e-12)
+            width = min(len(sims), max(4 * limit, 32))
+            while True:
+                top = np.argpartition(-sims, width - 1)[:width] if width < len(sims) else np.arange(len(sims))
+                out: List[Tuple[int, float]] = []
+                for row in top[np.argsort(-sims[top], kind="stable")]:
+                    doc = int(self._matrix_docs[row])
+                    if accept(self.docs[doc]):
+                        out.append((doc, float(sims[row])))
+                        if len(out) >= limit:
+                            return out
+                if width >= len(sims):
+                    return out
+                # Too many of the nearest rows were filtered out; widen the window.
+                width = min(len(sims), width * 4)
+
+
+class HashSet:
+    """Append-only set of content hashes, one per line.
+
+    Entries of the legacy ``hash_index.json`` list are read once as a base.
+    Other processes' appends are picked up on ``refresh``.
+    """
+
+    def __init__(self, path: Path, legacy_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.legacy_path = legacy_path
+        self._hashes: set = set()
+        self._offset = 0
+        self._lock = threading.Lock()
+        if legacy_path is not None and Path(legacy_path).exists():
+            try:
+                data = json.loads(Path(legacy_path).read_text(encoding="utf-8"))
+            except Exception:
+                data = []
+            if isinstance(data, list):
+                self._hashes.update(str(x) for x in data)
+        self.refresh()
+
+    def refresh(self) -> None:
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return
+            if size < self._offset:
+                self._offset = 0
+            if size == self._offset:
+                return
+            with open(self.path, "rb") as fh:
+                fh.seek(self._offset)
+                data = fh.read()
+            end = data.rfind(b"\n") + 1
+            self._hashes.update(line.strip().decode("ascii", "ignore") for line in data[:end].splitlines() if line.strip())
+            self._offset += end
+
+    def __contains__(self, digest: str) -> bool:
+        self.refresh()
+        return digest in self._hashes
+
+    def add(self, digests: List[str]) -> None:
+        fresh = [d for d in digests if d not in self._hashes]
+        if not fresh:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="ascii") as fh:
+            fh.write("".join(f"{d}\n" for d in fresh))
+        self._hashes.update(fresh)
+
+    def __iter__(self):
+        self.refresh()
+        return iter(sorted(self._hashes))
@@ -62,21 +62,21 @@ def ingest_head_commit(repo_root: Optional[Path] = None, store: Optional[HiveMin
     if not blocks:
         blocks = [("summary", show.strip())] if show.strip() else []
 
-    stored = 0
-    skipped = 0
-    for idx, (file_path, snippet) in enumerate(blocks):
-        ku = KnowledgeUnit(
-            kind="code_snippet",
-            source=f"git:{sha}",
-            agent_scope="shared",
-            ttl_days=None,
-            metadata={"file": file_path, "index": idx},
+    items = [
+        (
+            KnowledgeUnit(
+                kind="code_snippet",
+                source=f"git:{sha}",
+                agent_scope="shared",
+                ttl_days=None,
+                metadata={"file": file_path, "index": idx},
+            ),
+            snippet,
         )
-        res = db.put(ku, snippet)
-        if res.get("stored"):
-            stored += 1
-        else:
-            skipped += 1
+        for idx, (file_path, snippet) in enumerate(blocks)
+    ]
+    stored = sum(1 for res in db.put_many(items) if res.get("stored"))
+    skipped = len(items) - stored
 
     return {"processed": len(blocks), "stored": stored, "skipped": skipped}
 
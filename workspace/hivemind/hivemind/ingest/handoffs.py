@@ -38,12 +38,8 @@ def ingest_handoffs(handoffs_dir: Optional[Path] = None, store: Optional[HiveMin
     if not src_dir.exists():
         return {"processed": 0, "stored": 0, "skipped": 0}
 
-    processed = 0
-    stored = 0
-    skipped = 0
-
+    items = []
     for path in sorted(src_dir.glob("*.md")):
-        processed += 1
         text = path.read_text(encoding="utf-8")
         meta = parse_frontmatter(text)
         ku = KnowledgeUnit(
@@ -58,13 +54,11 @@ def ingest_handoffs(handoffs_dir: Optional[Path] = None, store: Optional[HiveMin
                 "date": meta.get("date", ""),
             },
         )
-        res = db.put(ku, text)
-        if res.get("stored"):
-            stored += 1
-        else:
-            skipped += 1
+        items.append((ku, text))
 
-    return {"processed": processed, "stored": stored, "skipped": skipped}
+    stored = sum(1 for res in db.put_many(items) if res.get("stored"))
+    skipped = len(items) - stored
+    return {"processed": len(items), "stored": stored, "skipped": skipped}
 
 
 if __name__ == "__main__":
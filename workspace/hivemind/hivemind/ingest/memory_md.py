@@ -70,21 +70,21 @@ def ingest_memory_md(memory_path: Optional[Path] = None, store: Optional[HiveMin
 
     text = target.read_text(encoding="utf-8")
     chunks = parse_memory_chunks(text)
-    stored = 0
-    skipped = 0
-    for chunk in chunks:
-        ku = KnowledgeUnit(
-            kind=chunk["kind"],
-            source="memory_md",
-            agent_scope="main",
-            ttl_days=None,
-            metadata={"path": str(target)},
+    items = [
+        (
+            KnowledgeUnit(
+                kind=chunk["kind"],
+                source="memory_md",
+                agent_scope="main",
+                ttl_days=None,
+                metadata={"path": str(target)},
+            ),
+            chunk["content"],
         )
-        res = db.put(ku, chunk["content"])
-        if res.get("stored"):
-            stored += 1
-        else:
-            skipped += 1
+        for chunk in chunks
+    ]
+    stored = sum(1 for res in db.put_many(items) if res.get("stored"))
+    skipped = len(items) - stored
     return {"processed": len(chunks), "stored": stored, "skipped": skipped}
 
 
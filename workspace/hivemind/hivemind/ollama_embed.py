@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 2
+DEFAULT_TIMEOUT_S = 5.0
+_RETRY_BACKOFF_S = 0.2
+_LOCAL_HOSTS = {"127.0.0.1", "localhost"}
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.environ.get(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class _TransientError(Exception):
+    pass
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class OllamaBatchEmbedder:
+    """Embeds many texts through a local Ollama server.
+
+    Texts are split into batches of ``batch_size`` and sent from a pool of
+    ``workers`` threads. The pool lives as long as the embedder, and each
+    thread keeps its own keep-alive HTTP connection across calls.
+    Batches go to ``/api/embed`` (list input). If that endpoint is missing
+    (older Ollama), each text is sent to the configured ``/api/embeddings``
+    URL instead. Connection errors, timeouts and 5xx responses are retried
+    ``retries`` times with backoff. Texts that still fail embed as ``None``,
+    the same as the single-text path.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        model: str,
+        *,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        retries: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT_S,
+    ):
+        parsed = urllib.parse.urlparse(url)
+        if parsed.hostname not in _LOCAL_HOSTS:
+            raise ValueError(f"Ollama embeddings must be local, got {parsed.hostname!r}")
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.single_path = parsed.path or "/api/embeddings"
+        self.batch_path = self.single_path[: -len("/api/embeddings")] + "/api/embed" if self.single_path.endswith(
+            "/api/embeddings"
+        ) else self.single_path
+        self.model = model
+        self.batch_size = batch_size or _env_int("HIVEMIND_EMBED_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.workers = workers or _env_int("HIVEMIND_EMBED_WORKERS", DEFAULT_WORKERS)
+        if retries is None:
+            retries = _env_int("HIVEMIND_EMBED_RETRIES", DEFAULT_RETRIES, minimum=0)
+        self.retries = max(0, int(retries))
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._batch_supported = self.batch_path != self.single_path
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8")
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(_RETRY_BACKOFF_S * (2 ** (attempt - 1)))
+            try:
+                conn = self._connection()
+                conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+                resp = conn.getresponse()
+                raw = resp.read()
+                self._count("requests")
+            except (OSError, http.client.HTTPException):
+                self._drop_connection()
+                continue
+            if resp.status == 404:
+                raise _Unsupported(path)
+            if resp.status >= 500:
+                continue
+            if resp.status >= 400:
+                break
+            try:
+                data = json.loads(raw.decode("utf-8"))
+            except Exception:
+                break
+            return data if isinstance(data, dict) else {}
+        raise _TransientError(path)
+
+    @staticmethod
+    def _floats(values: Any) -> Optional[List[float]]:
+        if not isinstance(values, list):
+            return None
+        return [float(item) for item in values if isinstance(item, (int, float))]
+
+    def _embed_one(self, text: str) -> Optional[List[float]]:
+        try:
+            data = self._post(self.single_path, {"model": self.model, "prompt": text})
+        except (_TransientError, _Unsupported):
+            self._count("failed")
+            return None
+        return self._floats(data.get("embedding"))
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        if self._batch_supported:
+            try:
+                data = self._post(self.batch_path, {"model": self.model, "input": texts})
+                vectors = data.get("embeddings")
+                if isinstance(vectors, list) and len(vectors) == len(texts):
+                    return [self._floats(v) for v in vectors]
+            except _Unsupported:
+                self._batch_supported = False
+            except _TransientError:
+                self._count("failed", len(texts))
+                return [None] * len(texts)
+        return [self._embed_one(text) for text in texts]
+
+    def embed_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        if not texts:
+            return []
+        batches: List[Tuple[int, List[str]]] = [
+            (start, texts[start:start + self.batch_size]) for start in range(0, len(texts), self.batch_size)
+        ]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hivemind-embed")
+        futures = [(start, self._pool.submit(self._embed_batch, batch)) for start, batch in batches]
+        out: List[Optional[List[float]]] = [None] * len(texts)
+        for start, future in futures:
+            for offset, vector in enumerate(future.result()):
+                out[start + offset] = vector
+        return out
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
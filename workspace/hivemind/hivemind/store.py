@@ -9,9 +9,11 @@ import urllib.parse
 import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from .index import HashSet, UnitIndex, tokenize
 from .models import KnowledgeUnit
+from .ollama_embed import OllamaBatchEmbedder
 from .redaction import redact_for_embedding
 
 TACTI_WORKSPACE = Path(__file__).resolve().parents[2]
@@ -25,6 +27,8 @@ except Exception:  # pragma: no cover
 DEFAULT_BASE_DIR = Path(__file__).resolve().parents[1]
 DEFAULT_OLLAMA_EMBED_URL = "http://127.0.0.1:11434/api/embeddings"
 DEFAULT_OLLAMA_EMBED_MODEL = "nomic-embed-text"
+# Access events appended before the log is folded into ``access_counts.json``.
+ACCESS_COMPACT_EVERY = 512
 
 
 class HiveMindStore:
@@ -33,8 +37,18 @@ class HiveMindStore:
         self.data_dir = self.base_dir / "data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.units_path = self.data_dir / "knowledge_units.jsonl"
+        # Legacy JSON list of hashes; read once, new hashes go to hash_set_path.
         self.hash_index_path = self.data_dir / "hash_index.json"
+        self.hash_set_path = self.data_dir / "hash_index.txt"
+        self.search_index_path = self.data_dir / "search_index.json"
+        self.access_log_path = self.data_dir / "access_log.jsonl"
+        self.access_counts_path = self.data_dir / "access_counts.json"
         self.log_path = self.base_dir / "ingest.log"
+        self._hashes: Optional[HashSet] = None
+        self._index: Optional[UnitIndex] = None
+        self._embedder: Optional[OllamaBatchEmbedder] = None
+        self._embedder_url: Optional[str] = None
+        self._access_events: Optional[int] = None
 
     @staticmethod
     def content_hash(content: str) -> str:
@@ -43,33 +57,22 @@ class HiveMindStore:
 
     @staticmethod
     def _tokenize(text: str) -> List[str]:
-        buf = []
-        acc = []
-        for ch in (text or "").lower():
-            if ch.isalnum() or ch in ("_", "-"):
-                acc.append(ch)
-            else:
-                if acc:
-                    buf.append("".join(acc))
-                    acc = []
-        if acc:
-            buf.append("".join(acc))
-        return buf
-
-    def _load_hashes(self) -> set[str]:
-        if not self.hash_index_path.exists():
-            return set()
-        try:
-            data = json.loads(self.hash_index_path.read_text(encoding="utf-8"))
-        except Exception:
-            return set()
-        if not isinstance(data, list):
-            return set()
-        return set(str(x) for x in data)
+        return tokenize(text)
+
+    def _hash_set(self) -> HashSet:
+        if self._hashes is None:
+            self._hashes = HashSet(self.hash_set_path, legacy_path=self.hash_index_path)
+        return self._hashes
+
+    def _unit_index(self) -> UnitIndex:
+        if self._index is None:
+            self._index = UnitIndex(self.units_path, self.search_index_path)
+        self._index.refresh()
+        return self._index
 
-    def _save_hashes(self, hashes: Iterable[str]) -> None:
-        payload = sorted(set(hashes))
-        self.hash_index_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    def save_index(self) -> None:
+        """Persist the search index snapshot (it is also saved every few hundred units)."""
+        self._unit_index().save()
 
     def _append_jsonl(self, path: Path, record: Dict[str, Any]) -> None:
         with path.open("a", encoding="utf-8") as fh:
@@ -83,6 +86,7 @@ class HiveMindStore:
         self._append_jsonl(self.log_path, entry)
 
     def all_units(self) -> List[Dict[str, Any]]:
+        """Every stored unit, with access counts from the access log folded in."""
         if not self.units_path.exists():
             return []
         out: List[Dict[str, Any]] = []
@@ -94,13 +98,20 @@ class HiveMindStore:
                 out.append(json.loads(line))
             except Exception:
                 continue
+        self._apply_access_log(out)
         return out
 
     def write_units(self, units: List[Dict[str, Any]]) -> None:
+        """Rewrite the units file; ``units`` must already carry folded access counts."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
         with self.units_path.open("w", encoding="utf-8") as fh:
             for unit in units:
                 fh.write(json.dumps(unit, ensure_ascii=False) + "\n")
+        self.access_log_path.unlink(missing_ok=True)
+        self.access_counts_path.unlink(missing_ok=True)
+        self._access_events = 0
+        if self._index is not None:
+            self._index.reset()
 
     @staticmethod
     def _is_expired(unit: Dict[str, Any]) -> bool:
@@ -133,76 +144,160 @@ class HiveMindStore:
             score += 3
         return score
 
-    def put(self, ku: KnowledgeUnit, content: str) -> Dict[str, Any]:
+    @staticmethod
+    def _ingest_event(event: str, ku: KnowledgeUnit, **detail: Any) -> Dict[str, Any]:
+        return {"event": event, "kind": ku.kind, "source": ku.source, "agent_scope": ku.agent_scope, **detail}
+
+    def _screen(self, ku: KnowledgeUnit, content: str):
+        """Redact ``content`` and run the semantic immune check.
+
+        Returns ``(redacted, None)`` or, for quarantined content,
+        ``(redacted, (log_event, result))``.
+        """
         redacted = redact_for_embedding(content)
         if callable(assess_content):
             immune = assess_content(self.base_dir.parents[1], redacted)
             if immune.get("quarantined"):
-                self._log_ingest(
-                    {
-                        "event": "ingest_quarantine_semantic_immune",
-                        "kind": ku.kind,
-                        "source": ku.source,
-                        "agent_scope": ku.agent_scope,
-                        "content_hash": immune.get("content_hash"),
-                        "score": immune.get("score"),
-                        "threshold": immune.get("threshold"),
-                    }
+                event = self._ingest_event(
+                    "ingest_quarantine_semantic_immune",
+                    ku,
+                    content_hash=immune.get("content_hash"),
+                    score=immune.get("score"),
+                    threshold=immune.get("threshold"),
                 )
-                return {
-                    "stored": False,
-                    "reason": "semantic_quarantine",
-                    "content_hash": immune.get("content_hash"),
-                }
-        digest = self.content_hash(redacted)
-        known = self._load_hashes()
-        if digest in known:
-            self._log_ingest({
-                "event": "ingest_skip_dedup",
-                "kind": ku.kind,
-                "source": ku.source,
-                "agent_scope": ku.agent_scope,
-                "content_hash": digest,
-            })
-            return {"stored": False, "reason": "dedup", "content_hash": digest}
+                return redacted, (
+                    event,
+                    {"stored": False, "reason": "semantic_quarantine", "content_hash": immune.get("content_hash")},
+                )
+        return redacted, None
 
+    @staticmethod
+    def _unit_record(ku: KnowledgeUnit, redacted: str, digest: str, embedding: Optional[List[float]]) -> Dict[str, Any]:
         record = ku.to_record(content=redacted, content_hash=digest)
-        embedding = self._embed_redacted_text(redacted)
         if embedding is not None:
             record["embedding_model"] = DEFAULT_OLLAMA_EMBED_MODEL
             record["embedding"] = embedding
+        return record
+
+    def put(self, ku: KnowledgeUnit, content: str) -> Dict[str, Any]:
+        redacted, quarantined = self._screen(ku, content)
+        if quarantined is not None:
+            self._log_ingest(quarantined[0])
+            return quarantined[1]
+        digest = self.content_hash(redacted)
+        known = self._hash_set()
+        if digest in known:
+            self._log_ingest(self._ingest_event("ingest_skip_dedup", ku, content_hash=digest))
+            return {"stored": False, "reason": "dedup", "content_hash": digest}
+
+        record = self._unit_record(ku, redacted, digest, self._embed_redacted_text(redacted))
         self._append_jsonl(self.units_path, record)
-        known.add(digest)
-        self._save_hashes(known)
-        self._log_ingest({
-            "event": "ingest_store",
-            "kind": ku.kind,
-            "source": ku.source,
-            "agent_scope": ku.agent_scope,
-            "content_hash": digest,
-        })
+        known.add([digest])
+        self._log_ingest(self._ingest_event("ingest_store", ku, content_hash=digest))
         return {"stored": True, "content_hash": digest, "record": record}
 
-    def search(self, *, agent_scope: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        hits: List[Dict[str, Any]] = []
-        touched_hashes: List[str] = []
-        for unit in self.all_units():
-            if self._is_expired(unit):
+    def put_many(self, items: List[Tuple[KnowledgeUnit, str]]) -> List[Dict[str, Any]]:
+        """Bulk ``put``: one result per item, in order, with the same shape.
+
+        Everything is screened and deduplicated (against the store and within
+        ``items``) before anything is embedded. The remaining units are
+        embedded in batches by a worker pool, then written with a single
+        append to the units file, the hash set and the ingest log.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        events: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        pending: List[Tuple[int, KnowledgeUnit, str, str]] = []
+        known = self._hash_set()
+        seen: set = set()
+        for i, (ku, content) in enumerate(items):
+            redacted, quarantined = self._screen(ku, content)
+            if quarantined is not None:
+                events[i] = quarantined[0]
+                results[i] = quarantined[1]
                 continue
-            if not self._can_view(agent_scope, str(unit.get("agent_scope", "shared"))):
+            digest = self.content_hash(redacted)
+            if digest in seen or digest in known:
+                events[i] = self._ingest_event("ingest_skip_dedup", ku, content_hash=digest)
+                results[i] = {"stored": False, "reason": "dedup", "content_hash": digest}
                 continue
-            score = self._score(query, str(unit.get("content", "")))
-            if score <= 0:
+            seen.add(digest)
+            pending.append((i, ku, redacted, digest))
+
+        embeddings = self._embed_redacted_texts([redacted for _, _, redacted, _ in pending])
+        records: List[Dict[str, Any]] = []
+        for (i, ku, redacted, digest), embedding in zip(pending, embeddings):
+            record = self._unit_record(ku, redacted, digest, embedding)
+            records.append(record)
+            events[i] = self._ingest_event("ingest_store", ku, content_hash=digest)
+            results[i] = {"stored": True, "content_hash": digest, "record": record}
+
+        if records:
+            with self.units_path.open("a", encoding="utf-8") as fh:
+                fh.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+            known.add([digest for _, _, _, digest in pending])
+        if items:
+            ts = datetime.now(timezone.utc).isoformat()
+            with self.log_path.open("a", encoding="utf-8") as fh:
+                fh.write("".join(json.dumps({"ts_utc": ts, **event}, ensure_ascii=False) + "\n" for event in events if event))
+        return results  # type: ignore[return-value]
+
+    def search(
+        self,
+        *,
+        agent_scope: str,
+        query: str,
+        limit: int = 5,
+        semantic: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Visible, unexpired units ranked by BM25 (plus 3 when the whole query appears).
+
+        With ``semantic=True`` the query is embedded through Ollama and ranked by
+        cosine similarity against stored unit embeddings; BM25 is the fallback
+        when no query embedding or no stored embeddings are available.
+
+        The ranking value (BM25 or cosine) is returned as ``rank_score``.
+        ``score`` keeps the legacy integer overlap (distinct query tokens
+        found, plus 3 for the whole query) that callers scale rewards by.
+        """
+        limit = max(1, int(limit))
+        index = self._unit_index()
+
+        def accept(doc: List[Any]) -> bool:
+            return self._can_view(agent_scope, doc[2]) and not self._is_expired({"expires_at": doc[3]})
+
+        ranked: List[tuple] = []
+        if semantic:
+            vector = self._embed_redacted_text(redact_for_embedding(query))
+            if vector:
+                ranked = index.cosine(vector, accept, limit)
+        units: Dict[int, Dict[str, Any]] = {}
+        if not ranked:
+            scores = index.bm25(tokenize(query), accept)
+            # Only the best BM25 candidates are read back for the phrase bonus.
+            shortlist = sorted(scores, key=lambda doc: (-scores[doc], index.docs[doc][4]))[: max(4 * limit, 20)]
+            units = index.read_units(shortlist)
+            phrase = query.lower()
+            ranked = [
+                (doc, scores[doc] + (3.0 if phrase in str(units[doc].get("content", "")).lower() else 0.0))
+                for doc in shortlist
+                if doc in units
+            ]
+            ranked.sort(key=lambda item: (-item[1], index.docs[item[0]][4]))
+            ranked = ranked[:limit]
+        else:
+            units = index.read_units([doc for doc, _ in ranked])
+
+        hits: List[Dict[str, Any]] = []
+        for doc, score in ranked:
+            if doc not in units:
                 continue
-            item = dict(unit)
-            item["score"] = score
+            item = dict(units[doc])
+            item["score"] = self._score(query, str(item.get("content", "")))
+            item["rank_score"] = round(float(score), 4)
             item["content"] = redact_for_embedding(str(item.get("content", "")))
             hits.append(item)
-            if item.get("content_hash"):
-                touched_hashes.append(str(item["content_hash"]))
-        hits.sort(key=lambda x: (-int(x.get("score", 0)), str(x.get("created_at", ""))), reverse=False)
-        self._record_access(touched_hashes)
-        return hits[: max(1, int(limit))]
+        self._record_access([str(item["content_hash"]) for item in hits if item.get("content_hash")])
+        return hits
 
     def log_event(self, event: str, **detail: Any) -> None:
         self._log_ingest({"event": event, **detail})
@@ -222,21 +317,94 @@ class HiveMindStore:
         return out
 
     def _record_access(self, hashes: List[str]) -> None:
+        """Append one access event; ``all_units`` folds these into the unit rows.
+
+        Every ``ACCESS_COMPACT_EVERY`` events the log is folded into the
+        counts file, so reads never replay more than that many lines.
+        """
         if not hashes:
             return
-        target = set(hashes)
-        now = datetime.now(timezone.utc).isoformat()
-        changed = False
-        rows = self.all_units()
-        for row in rows:
-            digest = str(row.get("content_hash", ""))
-            if digest not in target:
+        if self._access_events is None:
+            self._access_events = len(self._read_access_log(self.access_log_path))
+        self._append_jsonl(
+            self.access_log_path,
+            {"ts_utc": datetime.now(timezone.utc).isoformat(), "content_hashes": sorted(set(hashes))},
+        )
+        self._access_events += 1
+        if self._access_events >= ACCESS_COMPACT_EVERY:
+            self.compact_access_log()
+
+    @staticmethod
+    def _read_access_log(path: Path) -> List[Dict[str, Any]]:
+        if not path.exists():
+            return []
+        out: List[Dict[str, Any]] = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                out.append(json.loads(line))
+            except Exception:
                 continue
-            row["access_count"] = int(row.get("access_count", 0)) + 1
-            row["last_accessed_at"] = now
-            changed = True
-        if changed:
-            self.write_units(rows)
+        return out
+
+    def _access_counts(self, log_path: Optional[Path] = None) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """Counts and last-access times from the counts file plus the log tail."""
+        counts: Dict[str, int] = {}
+        last: Dict[str, str] = {}
+        if self.access_counts_path.exists():
+            try:
+                payload = json.loads(self.access_counts_path.read_text(encoding="utf-8"))
+                counts = {str(k): int(v) for k, v in (payload.get("counts") or {}).items()}
+                last = {str(k): str(v) for k, v in (payload.get("last_accessed_at") or {}).items()}
+            except Exception:
+                counts, last = {}, {}
+        for event in self._read_access_log(log_path or self.access_log_path):
+            for digest in event.get("content_hashes") or []:
+                counts[digest] = counts.get(digest, 0) + 1
+                last[digest] = str(event.get("ts_utc", ""))
+        return counts, last
+
+    def compact_access_log(self) -> Dict[str, Any]:
+        """Fold the access log into the counts file and remove the log."""
+        pending = self.access_log_path.with_name(self.access_log_path.name + ".compacting")
+        try:
+            # Appends from other processes after the rename start a fresh log.
+            os.replace(self.access_log_path, pending)
+        except FileNotFoundError:
+            self._access_events = 0
+            return {"ok": True, "folded": 0, "path": str(self.access_counts_path)}
+        folded = len(self._read_access_log(pending))
+        counts, last = self._access_counts(pending)
+        tmp = self.access_counts_path.with_name(self.access_counts_path.name + ".tmp")
+        tmp.write_text(json.dumps({"counts": counts, "last_accessed_at": last}, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.access_counts_path)
+        pending.unlink(missing_ok=True)
+        self._access_events = 0
+        return {"ok": True, "folded": folded, "path": str(self.access_counts_path)}
+
+    def _apply_access_log(self, units: List[Dict[str, Any]]) -> None:
+        counts, last = self._access_counts()
+        if not counts:
+            return
+        for row in units:
+            digest = str(row.get("content_hash", ""))
+            if digest in counts:
+                row["access_count"] = int(row.get("access_count", 0)) + counts[digest]
+                row["last_accessed_at"] = last[digest]
+
+    def _embed_redacted_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Batched ``_embed_redacted_text`` through a pooled, keep-alive Ollama client."""
+        if not texts or os.environ.get("HIVEMIND_ENABLE_OLLAMA_EMBEDDINGS", "0") != "1":
+            return [None] * len(texts)
+        url = os.environ.get("HIVEMIND_OLLAMA_EMBED_URL", DEFAULT_OLLAMA_EMBED_URL)
+        if self._embedder is None or self._embedder_url != url:
+            if self._embedder is not None:
+                self._embedder.close()
+            try:
+                self._embedder = OllamaBatchEmbedder(url, DEFAULT_OLLAMA_EMBED_MODEL)
+            except ValueError:
+                return [None] * len(texts)
+            self._embedder_url = url
+        return self._embedder.embed_many(texts)
 
     def _embed_redacted_text(self, text: str) -> Optional[List[float]]:
         if os.environ.get("HIVEMIND_ENABLE_OLLAMA_EMBEDDINGS", "0") != "1":
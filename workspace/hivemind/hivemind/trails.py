@@ -4,16 +4,26 @@ import hashlib
 import json
 import math
 import os
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
 
 DEFAULT_BASE_DIR = Path(__file__).resolve().parents[1]
 DEFAULT_TRAILS_PATH = DEFAULT_BASE_DIR / "data" / "trails.jsonl"
 DEFAULT_HALF_LIFE_HOURS = 24.0
 EMBED_DIM = 24
+# Strength updates kept in the deltas file before they are folded into the trails file.
+COMPACT_EVERY = 512
+_ANCHOR_BYTES = 64
+_LN2 = math.log(2.0)
 
 
 def _utc_now() -> datetime:
@@ -35,6 +45,22 @@ def _parse_ts(value: Any) -> datetime:
     return _utc_now()
 
 
+def _epoch(value: Any) -> Optional[float]:
+    """``_parse_ts(value).timestamp()``, or None where ``_parse_ts`` would fall back to now."""
+    if isinstance(value, datetime):
+        return _parse_ts(value).timestamp()
+    text = str(value or "").strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    if not text:
+        return None
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+
+
 def _dot(a: List[float], b: List[float]) -> float:
     return sum(x * y for x, y in zip(a, b))
 
@@ -51,6 +77,14 @@ def _cosine(a: List[float], b: List[float]) -> float:
     return _dot(a, b) / (na * nb)
 
 
+@lru_cache(maxsize=65536)
+def _token_slot(token: str, dim: int) -> Tuple[int, float]:
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    bucket = int.from_bytes(digest[:4], "big") % dim
+    sign = 1.0 if digest[4] % 2 == 0 else -1.0
+    return bucket, sign
+
+
 def _embed_text(text: str, tags: List[str] | None = None, dim: int = EMBED_DIM) -> List[float]:
     vec = [0.0 for _ in range(dim)]
     chunks = [str(text or "").lower()]
@@ -58,9 +92,7 @@ def _embed_text(text: str, tags: List[str] | None = None, dim: int = EMBED_DIM)
         chunks.append(str(tag).lower())
     for chunk in chunks:
         for token in chunk.split():
-            digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
-            bucket = int(digest[:8], 16) % dim
-            sign = 1.0 if (int(digest[8:10], 16) % 2 == 0) else -1.0
+            bucket, sign = _token_slot(token, dim)
             vec[bucket] += sign
     return vec
 
@@ -105,32 +137,205 @@ def _blend_valence_signature(previous: Any, current: Any, alpha: float = 0.5) ->
     return current
 
 
-class TrailStore:
-    def __init__(self, path: Path | None = None, half_life_hours: float = DEFAULT_HALF_LIFE_HOURS):
-        self.path = Path(path or DEFAULT_TRAILS_PATH)
-        self.half_life_hours = max(0.5, float(half_life_hours))
-        self.path.parent.mkdir(parents=True, exist_ok=True)
+class _JsonlTail:
+    """Reads the lines appended to a JSONL file since the previous ``poll``."""
 
-    def _read_all(self) -> List[Dict[str, Any]]:
-        if not self.path.exists():
-            return []
+    def __init__(self, path: Path):
+        self.path = path
+        self.reset()
+
+    def reset(self) -> None:
+        self._inode: Optional[int] = None
+        self._mtime_ns: Optional[int] = None
+        self._offset = 0
+        self._anchor = b""
+
+    def poll(self) -> Tuple[bool, List[Dict[str, Any]]]:
+        """``(reset, rows)``; ``reset`` means rows returned earlier are no longer in the file."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            reset = self._offset > 0
+            self.reset()
+            return reset, []
+        if st.st_ino == self._inode and st.st_size == self._offset and st.st_mtime_ns == self._mtime_ns:
+            return False, []
+        reset = False
+        with open(self.path, "rb") as fh:
+            if self._offset and not self._continues(st, fh):
+                reset = True
+                self.reset()
+            fh.seek(self._offset)
+            data = fh.read()
+        end = data.rfind(b"\n") + 1
         rows: List[Dict[str, Any]] = []
-        for line in self.path.read_text(encoding="utf-8").splitlines():
-            text = line.strip()
-            if not text:
+        for line in data[:end].splitlines():
+            if not line.strip():
                 continue
             try:
-                item = json.loads(text)
-            except json.JSONDecodeError:
+                item = json.loads(line)
+            except ValueError:
                 continue
             if isinstance(item, dict):
                 rows.append(item)
-        return rows
+        self._anchor = (self._anchor + data[:end])[-_ANCHOR_BYTES:]
+        self._offset += end
+        self._inode = st.st_ino
+        self._mtime_ns = st.st_mtime_ns
+        return reset, rows
+
+    def _continues(self, st: os.stat_result, fh) -> bool:
+        if st.st_ino != self._inode or st.st_size <= self._offset:
+            return False
+        fh.seek(self._offset - len(self._anchor))
+        return fh.read(len(self._anchor)) == self._anchor
+
+
+class TrailStore:
+    """Trails in ``trails.jsonl``, ranked by decayed strength times cosine similarity.
+
+    The trails file keeps one full row per deposit. ``reinforce`` appends
+    the new ``strength``/``updated_at`` of a trail to ``trails.deltas.jsonl``
+    instead of rewriting the file. Every ``COMPACT_EVERY`` deltas (or on
+    ``compact``) the deltas are folded back into the trails file. Half-life
+    decay is applied at read time from ``updated_at``, so ``decay`` writes
+    nothing.
+
+    Both files are tailed into memory, so writes from other processes are
+    picked up. With numpy, embeddings live in a float32 matrix with
+    precomputed norms, and ``query`` is a single matrix-vector product plus
+    ``argpartition``; the shortlist is rescored in float64. Without numpy
+    every row is scored in Python.
+    """
+
+    def __init__(self, path: Path | None = None, half_life_hours: float = DEFAULT_HALF_LIFE_HOURS):
+        self.path = Path(path or DEFAULT_TRAILS_PATH)
+        self.half_life_hours = max(0.5, float(half_life_hours))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.deltas_path = self.path.with_name(f"{self.path.stem}.deltas.jsonl")
+        self._lock = threading.RLock()
+        self._base = _JsonlTail(self.path)
+        self._deltas = _JsonlTail(self.deltas_path)
+        self._clear()
+
+    # -- in-memory state -------------------------------------------------
+
+    def _clear(self) -> None:
+        self._base.reset()
+        self._deltas.reset()
+        self._rows: List[Dict[str, Any]] = []
+        self._ids: Dict[str, int] = {}
+        self._delta_count = 0
+        self._dim: Optional[int] = None
+        self._vectors: List[Optional[List[float]]] = []
+        self._vector_norms: List[float] = []
+        self._odd: List[int] = []  # rows whose embedding width differs from the matrix
+        self._strength: List[float] = []
+        self._updated: List[Optional[float]] = []
+        if np is not None:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._has = np.zeros(0, dtype=bool)
+            self._strength_arr = np.zeros(0, dtype=np.float64)
+            self._updated_arr = np.zeros(0, dtype=np.float64)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._has)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, 256)
+        matrix = np.zeros((capacity, self._dim or 0), dtype=np.float32)
+        matrix[: len(self._matrix)] = self._matrix
+        self._matrix = matrix
+        for name, dtype in (("_norms", np.float32), ("_has", bool), ("_strength_arr", np.float64), ("_updated_arr", np.float64)):
+            grown = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name)
+            grown[: len(old)] = old
+            setattr(self, name, grown)
+
+    def _append_row(self, row: Dict[str, Any]) -> None:
+        idx = len(self._rows)
+        embedding = row.get("embedding")
+        vector = [float(x) for x in embedding] if isinstance(embedding, list) else None
+        if vector is not None and self._dim is None:
+            self._dim = len(vector)
+            if np is not None:
+                self._matrix = np.zeros((len(self._has), self._dim), dtype=np.float32)
+        self._rows.append(row)
+        self._ids.setdefault(str(row.get("trail_id")), idx)
+        self._vectors.append(vector)
+        self._vector_norms.append(_norm(vector) if vector is not None else 0.0)
+        self._strength.append(float(row.get("strength", 0.0)))
+        self._updated.append(_epoch(row.get("updated_at") or row.get("created_at")))
+        in_matrix = vector is not None and len(vector) == self._dim
+        if vector is not None and not in_matrix:
+            self._odd.append(idx)
+        if np is not None:
+            self._grow(idx + 1)
+            self._has[idx] = in_matrix
+            if in_matrix:
+                self._matrix[idx] = vector
+                self._norms[idx] = np.linalg.norm(self._matrix[idx])
+            self._strength_arr[idx] = self._strength[idx]
+            self._updated_arr[idx] = np.nan if self._updated[idx] is None else self._updated[idx]
+
+    def _apply_delta(self, delta: Dict[str, Any]) -> None:
+        idx = self._ids.get(str(delta.get("trail_id")))
+        if idx is None:
+            return
+        row = self._rows[idx]
+        row["strength"] = float(delta.get("strength", row.get("strength", 0.0)))
+        row["updated_at"] = str(delta.get("updated_at") or row.get("updated_at") or "")
+        self._strength[idx] = row["strength"]
+        self._updated[idx] = _epoch(row.get("updated_at") or row.get("created_at"))
+        if np is not None:
+            self._strength_arr[idx] = self._strength[idx]
+            self._updated_arr[idx] = np.nan if self._updated[idx] is None else self._updated[idx]
+
+    def _refresh(self) -> None:
+        with self._lock:
+            reset, rows = self._base.poll()
+            if reset:
+                self._clear()
+                reset, rows = self._base.poll()
+            for row in rows:
+                self._append_row(row)
+            reset, deltas = self._deltas.poll()
+            if reset:
+                # The deltas were folded into a rewritten trails file; start over.
+                self._clear()
+                self._refresh()
+                return
+            for delta in deltas:
+                self._apply_delta(delta)
+            self._delta_count += len(deltas)
+
+    # -- persistence -----------------------------------------------------
+
+    def _read_all(self) -> List[Dict[str, Any]]:
+        """Every trail with its deltas applied."""
+        with self._lock:
+            self._refresh()
+            return [dict(row) for row in self._rows]
 
     def _write_all(self, rows: List[Dict[str, Any]]) -> None:
-        with self.path.open("w", encoding="utf-8") as handle:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
             for row in rows:
                 handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+    def compact(self) -> Dict[str, Any]:
+        """Fold the deltas file into the trails file."""
+        with self._lock:
+            self._refresh()
+            folded = self._delta_count
+            if folded:
+                self._write_all(self._rows)
+                self.deltas_path.unlink(missing_ok=True)
+                self._clear()
+                self._refresh()
+            return {"ok": True, "folded": folded, "path": str(self.path)}
 
     def add(self, trail: Dict[str, Any]) -> str:
         return self.deposit(trail, valence=trail.get("valence_signature"))
@@ -159,7 +364,10 @@ class TrailStore:
             row["valence_signature"] = dampen_valence_signature(valence_raw, hops=hops)
             row["valence_hops"] = hops
             previous = None
-            for prior in reversed(self._read_all()):
+            with self._lock:
+                self._refresh()
+                priors = list(self._rows)
+            for prior in reversed(priors):
                 if str(prior.get("text", "")).strip() == text and prior.get("valence_consensus") is not None:
                     previous = prior.get("valence_consensus")
                     break
@@ -184,11 +392,52 @@ class TrailStore:
         inherited = dampen_valence_signature(source_signature, hops=1)
         return trail, inherited
 
+    def _decay_factor(self, updated: Optional[float], now_s: float) -> float:
+        if updated is None:
+            return 1.0
+        age_hours = max(0.0, (now_s - updated) / 3600.0)
+        return math.exp(-_LN2 * (age_hours / self.half_life_hours))
+
     def _effective_strength(self, row: Dict[str, Any], now: datetime) -> float:
-        updated = _parse_ts(row.get("updated_at") or row.get("created_at"))
-        age_hours = max(0.0, (now - updated).total_seconds() / 3600.0)
-        decay_factor = math.exp(-math.log(2.0) * (age_hours / self.half_life_hours))
-        return float(row.get("strength", 0.0)) * decay_factor
+        updated = _epoch(row.get("updated_at") or row.get("created_at"))
+        return float(row.get("strength", 0.0)) * self._decay_factor(updated, now.timestamp())
+
+    def _scores(self, query_embedding: List[float], now_s: float):
+        """``(rows, similarity, effective_strength)`` for every row with an embedding.
+
+        With numpy the three are arrays (``rows`` indexes the other two);
+        otherwise they are lists.
+        """
+        n = len(self._rows)
+        qnorm = _norm(query_embedding)
+        if np is not None and self._dim is not None and len(query_embedding) == self._dim:
+            query = np.asarray(query_embedding, dtype=np.float32)
+            norms = self._norms[:n]
+            sims = np.zeros(n, dtype=np.float64)
+            if qnorm > 1e-12:
+                dots = self._matrix[:n] @ query
+                np.divide(dots, norms * np.float32(qnorm), out=sims, where=norms > 1e-12)
+                np.maximum(sims, 0.0, out=sims)
+            ages = np.nan_to_num((now_s - self._updated_arr[:n]) / 3600.0, nan=0.0)
+            effective = self._strength_arr[:n] * np.exp(-_LN2 * (np.maximum(ages, 0.0) / self.half_life_hours)) * sims
+            for idx in self._odd:
+                sims[idx], effective[idx] = self._score_row(idx, query_embedding, qnorm, now_s)
+            rows = np.flatnonzero(self._has[:n])
+            if self._odd:
+                rows = np.sort(np.concatenate([rows, np.asarray(self._odd, dtype=rows.dtype)]))
+            return rows, sims, effective
+        sims_list, effective_list = [0.0] * n, [0.0] * n
+        rows_list = [idx for idx, vector in enumerate(self._vectors) if vector is not None]
+        for idx in rows_list:
+            sims_list[idx], effective_list[idx] = self._score_row(idx, query_embedding, qnorm, now_s)
+        return rows_list, sims_list, effective_list
+
+    def _score_row(self, idx: int, query_embedding: List[float], qnorm: float, now_s: float) -> Tuple[float, float]:
+        norm = self._vector_norms[idx]
+        if norm <= 1e-12 or qnorm <= 1e-12:
+            return 0.0, 0.0
+        similarity = max(0.0, _dot(query_embedding, self._vectors[idx]) / (norm * qnorm))
+        return similarity, self._strength[idx] * self._decay_factor(self._updated[idx], now_s) * similarity
 
     def query(self, text_or_embedding: str | List[float], k: int, now: Any = None) -> List[Dict[str, Any]]:
         current = _parse_ts(now) if now is not None else _utc_now()
@@ -196,63 +445,78 @@ class TrailStore:
             query_embedding = [float(x) for x in text_or_embedding]
         else:
             query_embedding = _embed_text(str(text_or_embedding), tags=None)
-
-        scored: List[Dict[str, Any]] = []
-        for row in self._read_all():
-            embedding = row.get("embedding")
-            if not isinstance(embedding, list):
-                continue
-            emb = [float(x) for x in embedding]
-            similarity = max(0.0, _cosine(query_embedding, emb))
-            effective = self._effective_strength(row, current) * similarity
-            item = dict(row)
-            item["similarity"] = similarity
-            item["effective_strength"] = effective
-            scored.append(item)
-        scored.sort(key=lambda item: (-float(item["effective_strength"]), str(item.get("trail_id", ""))))
-        return scored[: max(1, int(k))]
+        limit = max(1, int(k))
+
+        with self._lock:
+            self._refresh()
+            rows, sims, effective = self._scores(query_embedding, current.timestamp())
+            if np is not None and isinstance(rows, np.ndarray):
+                if len(rows) > limit:
+                    values = effective[rows]
+                    kth = values[np.argpartition(-values, limit - 1)[limit - 1]]
+                    # Keep near-ties of the k-th best: the shortlist is rescored in float64 below.
+                    rows = rows[values >= kth - 1e-5 * abs(kth)]
+                rows = rows.tolist()
+                qnorm = _norm(query_embedding)
+                sims, effective = {}, {}
+                for idx in rows:
+                    sims[idx], effective[idx] = self._score_row(idx, query_embedding, qnorm, current.timestamp())
+            rows.sort(key=lambda idx: (-effective[idx], str(self._rows[idx].get("trail_id", ""))))
+            out: List[Dict[str, Any]] = []
+            for idx in rows[:limit]:
+                item = dict(self._rows[idx])
+                item["similarity"] = sims[idx]
+                item["effective_strength"] = effective[idx]
+                out.append(item)
+            return out
+
+    def recent(self, limit: int, now: Any = None) -> List[Dict[str, Any]]:
+        """The last ``limit`` trails deposited, deltas applied, oldest first, with ``effective_strength`` at ``now``."""
+        current = _parse_ts(now) if now is not None else _utc_now()
+        with self._lock:
+            self._refresh()
+            start = max(0, len(self._rows) - max(1, int(limit)))
+            out: List[Dict[str, Any]] = []
+            for idx in range(start, len(self._rows)):
+                item = dict(self._rows[idx])
+                item["effective_strength"] = self._strength[idx] * self._decay_factor(self._updated[idx], current.timestamp())
+                out.append(item)
+            return out
 
     def decay(self, now: Any = None) -> Dict[str, Any]:
-        current = _parse_ts(now) if now is not None else _utc_now()
-        rows = self._read_all()
-        changed = 0
-        for row in rows:
-            prev = float(row.get("strength", 0.0))
-            updated = _parse_ts(row.get("updated_at") or row.get("created_at"))
-            age_hours = max(0.0, (current - updated).total_seconds() / 3600.0)
-            if age_hours <= 0:
-                continue
-            factor = math.exp(-math.log(2.0) * (age_hours / self.half_life_hours))
-            row["strength"] = max(0.001, prev * factor)
-            row["updated_at"] = current.isoformat()
-            changed += 1
-        if changed:
-            self._write_all(rows)
-        return {"ok": True, "changed": changed, "path": str(self.path)}
+        """Decay is applied at read time from ``updated_at``; nothing is rewritten."""
+        return {"ok": True, "changed": 0, "lazy": True, "path": str(self.path)}
 
     def reinforce(self, trail_id: str, delta: float) -> bool:
-        target = str(trail_id)
-        rows = self._read_all()
-        changed = False
-        now = _utc_now().isoformat()
-        for row in rows:
-            if str(row.get("trail_id")) != target:
-                continue
-            row["strength"] = max(0.001, float(row.get("strength", 0.0)) + float(delta))
-            row["updated_at"] = now
-            changed = True
-            break
-        if changed:
-            self._write_all(rows)
-        return changed
+        current = _utc_now()
+        with self._lock:
+            self._refresh()
+            idx = self._ids.get(str(trail_id))
+            if idx is None:
+                return False
+            strength = self._strength[idx] * self._decay_factor(self._updated[idx], current.timestamp())
+            update = {
+                "trail_id": str(trail_id),
+                "strength": max(0.001, strength + float(delta)),
+                "updated_at": current.isoformat(),
+            }
+            with self.deltas_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(update, ensure_ascii=False) + "\n")
+            self._refresh()
+            if self._delta_count >= COMPACT_EVERY:
+                self.compact()
+            return True
 
     def snapshot(self) -> Dict[str, Any]:
-        return {
-            "version": 1,
-            "path": str(self.path),
-            "half_life_hours": self.half_life_hours,
-            "count": len(self._read_all()),
-        }
+        with self._lock:
+            self._refresh()
+            return {
+                "version": 1,
+                "path": str(self.path),
+                "half_life_hours": self.half_life_hours,
+                "count": len(self._rows),
+                "pending_deltas": self._delta_count,
+            }
 
     @classmethod
     def load(cls, payload: Dict[str, Any]) -> "TrailStore":
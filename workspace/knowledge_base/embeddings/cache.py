@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from embeddings.driver_mlx import MODEL_DIMS, _backend_mode
+
+DEFAULT_MAX_ROWS = 200_000
+
+
+def _max_rows() -> int:
+    raw = os.getenv("OPENCLAW_KB_EMBED_CACHE_MAX_ROWS")
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_MAX_ROWS
+    except ValueError:
+        return DEFAULT_MAX_ROWS
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "__", value)
+
+
+def _atomic_write_bytes(path: Path, payload: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(payload)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class EmbeddingCache:
+    """Content-addressed embedding vectors for one model, persisted on disk.
+
+    Vectors live in a row-major float32 matrix file that is read through
+    ``np.memmap``. ``index.json`` names that file and maps each chunk hash to
+    its row and to the generation (one per opened cache) that last used it.
+    ``save()`` evicts the least recently used rows beyond ``max_rows``. When
+    rows were dropped it writes the compacted matrix to a new file, and the
+    atomic index replace switches readers over to it. Entries are namespaced
+    by embedding backend, so mock vectors never stand in for real ones.
+    """
+
+    def __init__(self, root: Path, model_id: str, *, max_rows: int | None = None):
+        if model_id not in MODEL_DIMS:
+            raise ValueError(f"Unsupported model_id: {model_id}")
+        self.model_id = model_id
+        self.dim = MODEL_DIMS[model_id]
+        self.max_rows = int(max_rows) if max_rows is not None else _max_rows()
+        self.dir = Path(root) / _slug(f"{_backend_mode()}:{model_id}")
+        self.index_path = self.dir / "index.json"
+        self.vectors_path = self.dir / "vectors.f32"
+        self._row_bytes = self.dim * 4
+        self._matrix: np.memmap | None = None
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except Exception:
+            index = {}
+        name = str(index.get("vectors") or "")
+        if name and "/" not in name:
+            self.vectors_path = self.dir / name
+        try:
+            size = self.vectors_path.stat().st_size
+        except OSError:
+            size = 0
+        if index.get("dim") != self.dim or index.get("model_id") != self.model_id:
+            index = {}
+            size = 0
+        elif size % self._row_bytes:
+            # A write was interrupted part-way through a row.
+            size -= size % self._row_bytes
+        self._rows = size // self._row_bytes
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size != size:
+            with open(self.vectors_path, "r+b") as fh:
+                fh.truncate(size)
+        self.generation = int(index.get("generation", 0)) + 1
+        self._entries: dict[str, list[int]] = {
+            key: [int(row), int(gen)]
+            for key, (row, gen) in (index.get("entries") or {}).items()
+            if 0 <= int(row) < self._rows
+        }
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _view(self) -> np.ndarray:
+        if self._matrix is None or self._matrix.shape[0] != self._rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dim))
+        return self._matrix
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for ``keys`` (missing keys are absent from the result)."""
+        found = {key: self._entries[key] for key in keys if key in self._entries}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        if not found:
+            return {}
+        view = self._view()
+        out: dict[str, np.ndarray] = {}
+        for key, entry in found.items():
+            out[key] = np.array(view[entry[0]], dtype=np.float32)
+            if entry[1] != self.generation:
+                entry[1] = self.generation
+                self._dirty = True
+        return out
+
+    def put_many(self, keys: list[str], vectors) -> int:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if matrix.shape[0] != len(keys):
+            raise ValueError(f"{len(keys)} keys for {matrix.shape[0]} vectors")
+        fresh: dict[str, int] = {}
+        for position, key in enumerate(keys):
+            if key not in self._entries and key not in fresh:
+                fresh[key] = position
+        if not fresh:
+            return 0
+        self.dir.mkdir(parents=True, exist_ok=True)
+        block = np.ascontiguousarray(matrix[list(fresh.values())])
+        with open(self.vectors_path, "ab") as fh:
+            fh.write(block.tobytes())
+        for offset, key in enumerate(fresh):
+            self._entries[key] = [self._rows + offset, self.generation]
+        self._rows += len(fresh)
+        self._dirty = True
+        return len(fresh)
+
+    def save(self) -> dict[str, int]:
+        """Persist the index, compacting the matrix when entries were evicted."""
+        evicted = 0
+        if len(self._entries) > self.max_rows:
+            ranked = sorted(self._entries.items(), key=lambda item: (item[1][1], item[1][0]), reverse=True)
+            evicted = len(ranked) - self.max_rows
+            self._entries = dict(ranked[: self.max_rows])
+            self._dirty = True
+        compacted = 0
+        replaced: Path | None = None
+        if len(self._entries) < self._rows:
+            compacted = self._rows - len(self._entries)
+            replaced = self._compact()
+        if self._dirty:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "model_id": self.model_id,
+                "dim": self.dim,
+                "generation": self.generation,
+                "vectors": self.vectors_path.name,
+                "entries": self._entries,
+            }
+            _atomic_write_bytes(self.index_path, (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8"))
+            self._dirty = False
+        if replaced is not None and replaced != self.vectors_path:
+            replaced.unlink(missing_ok=True)
+        return {"entries": len(self._entries), "evicted": evicted, "compacted_rows": compacted}
+
+    def _compact(self) -> Path:
+        """Write the live rows to a new matrix file; returns the file it replaces."""
+        order = sorted(self._entries.items(), key=lambda item: item[1][0])
+        rows = [entry[0] for _, entry in order]
+        data = np.ascontiguousarray(self._view()[rows]) if rows else np.zeros((0, self.dim), dtype=np.float32)
+        self._matrix = None
+        previous = self.vectors_path
+        self.vectors_path = self.dir / f"vectors-{self.generation}.f32"
+        _atomic_write_bytes(self.vectors_path, data.tobytes())
+        for new_row, (_, entry) in enumerate(order):
+            entry[0] = new_row
+        self._rows = len(rows)
+        self._dirty = True
+        return previous
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "rows": self._rows, "hits": self.hits, "misses": self.misses}
@@ -4,6 +4,7 @@ import hashlib
 import importlib
 import os
 import threading
+from functools import lru_cache
 from typing import Any
 
 import numpy as np
@@ -30,17 +31,43 @@ def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
     return matrix / norms
 
 
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+@lru_cache(maxsize=65536)
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _mock_embed_batch(texts: list[str], dim: int) -> np.ndarray:
+    """Hash-bag embeddings for ``texts`` as a ``(len(texts), dim)`` float32 matrix.
+
+    Each token adds ``digest[i % 32] / 255 - 0.5`` to dimension ``i``, so the
+    result is a 32-wide pattern tiled across ``dim``. Contributions are summed
+    token by token in float32 (``cumsum``, not a pairwise ``sum``) so vectors
+    are bit-identical to the original per-token, per-dimension loop.
+    """
+    token_lists = [[tok for tok in str(text or "").lower().split() if tok] for text in texts]
+    counts = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+    width = int(counts.max()) if len(counts) else 0
+    patterns = np.zeros((len(token_lists), width, _DIGEST_SIZE), dtype=np.float32)
+    if width:
+        digests = np.frombuffer(
+            b"".join(_token_digest(tok) for tokens in token_lists for tok in tokens), dtype=np.uint8
+        ).reshape(-1, _DIGEST_SIZE)
+        rows = np.repeat(np.arange(len(token_lists)), counts)
+        cols = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        patterns[rows, cols] = ((digests / 255.0) - 0.5).astype(np.float32)
+    # Zero padding after a text's last token leaves its running sum unchanged.
+    sums = np.cumsum(patterns, axis=1, dtype=np.float32)[:, -1, :] if width else patterns.sum(axis=1)
+    nonzero = counts > 0
+    sums[nonzero] /= counts[nonzero, None].astype(np.float32)
+    reps = -(-dim // _DIGEST_SIZE)
+    return np.tile(sums, (1, reps))[:, :dim]
+
+
 def _mock_embed(text: str, dim: int) -> list[float]:
-    vec = np.zeros(dim, dtype=np.float32)
-    tokens = [tok for tok in str(text or "").lower().split() if tok]
-    if not tokens:
-        return vec.tolist()
-    for token in tokens:
-        digest = hashlib.sha256(token.encode("utf-8")).digest()
-        for i in range(dim):
-            vec[i] += (digest[i % len(digest)] / 255.0) - 0.5
-    vec /= float(len(tokens))
-    return vec.tolist()
+    return _mock_embed_batch([text], dim)[0].tolist()
 
 
 def _load_mlx_model(model_id: str) -> Any:
@@ -119,6 +146,10 @@ class MlxEmbedder:
                 return _MODEL_CACHE[key]
             if mode == "mock":
                 _MODEL_CACHE[key] = {"mode": "mock", "dim": MODEL_DIMS[model_id]}
+            elif mode == "onnx":
+                from embeddings.driver_onnx import load_onnx_model
+
+                _MODEL_CACHE[key] = load_onnx_model(model_id)
             else:
                 _MODEL_CACHE[key] = _load_mlx_model(model_id)
             return _MODEL_CACHE[key]
@@ -133,7 +164,7 @@ class MlxEmbedder:
         for idx in range(0, len(texts), self.batch_size):
             batch = [str(t) for t in texts[idx : idx + self.batch_size]]
             if self._mode == "mock":
-                arr = np.asarray([_mock_embed(t, self.dim) for t in batch], dtype=np.float32)
+                arr = _mock_embed_batch(batch, self.dim)
             else:
                 raw = _run_mlx_embed(self._backend, batch)
                 arr = _coerce_matrix(raw, expected_rows=len(batch))
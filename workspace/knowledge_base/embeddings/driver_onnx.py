@@ -0,0 +1,69 @@
+"""ONNX Runtime (CPU) sentence-embedding backend for ``MlxEmbedder``.
+
+Selected with ``OPENCLAW_KB_EMBEDDINGS_BACKEND=onnx``. Each model needs an
+ONNX export and its Hugging Face ``tokenizer.json`` in
+``$OPENCLAW_KB_ONNX_DIR/<model_id with / and : replaced by __>/``
+(``model.onnx``, ``tokenizer.json``). The default directory is
+``workspace/knowledge_base/data/onnx``. Exports of the base models behind the
+MLX ids (ModernBERT-base, all-MiniLM-L6-v2) produce the same dimensions.
+Token states are mean-pooled over the attention mask.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+except Exception:  # pragma: no cover - optional dependency
+    ort = None
+
+try:
+    from tokenizers import Tokenizer
+except Exception:  # pragma: no cover - optional dependency
+    Tokenizer = None
+
+MAX_LENGTH = 512
+
+
+def onnx_model_dir(model_id: str) -> Path:
+    root = os.getenv("OPENCLAW_KB_ONNX_DIR")
+    base = Path(root) if root else Path(__file__).resolve().parents[1] / "data" / "onnx"
+    return base / model_id.replace("/", "__").replace(":", "__")
+
+
+class OnnxEmbeddingModel:
+    def __init__(self, model_path: Path, tokenizer_path: Path, *, max_length: int = MAX_LENGTH):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_path), sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {item.name for item in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch([str(t) for t in texts])
+        ids = np.asarray([enc.ids for enc in encodings], dtype=np.int64)
+        mask = np.asarray([enc.attention_mask for enc in encodings], dtype=np.int64)
+        feeds: dict[str, Any] = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, {name: value for name, value in feeds.items() if name in self.input_names})[0]
+        weights = mask[..., None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1.0, None)
+
+
+def load_onnx_model(model_id: str) -> OnnxEmbeddingModel:
+    if ort is None or Tokenizer is None:
+        raise RuntimeError("ONNX embeddings backend requires the onnxruntime and tokenizers packages")
+    model_dir = onnx_model_dir(model_id)
+    model_path = model_dir / "model.onnx"
+    tokenizer_path = model_dir / "tokenizer.json"
+    if not model_path.exists() or not tokenizer_path.exists():
+        raise RuntimeError(f"ONNX export missing for {model_id}: expected {model_path} and {tokenizer_path}")
+    return OnnxEmbeddingModel(model_path, tokenizer_path)
@@ -0,0 +1,304 @@
+"""
+Knowledge Graph Index
+In-memory id, name and adjacency indexes over the JSONL graph files
+"""
+import heapq
+import json
+import os
+import threading
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+GRAM = 3
+_ANCHOR_BYTES = 64
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class JsonlFollower:
+    """Incremental reader for an append-only JSONL file.
+
+    ``poll`` returns the records appended since the previous call. If the file
+    was replaced, truncated, rewritten at the same size, or its last read bytes
+    changed, it returns ``reset=True`` together with the whole file. A trailing line without a newline is left
+    for the next poll.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._inode: Optional[int] = None
+        self._mtime_ns: Optional[int] = None
+        self._offset = 0
+        self._anchor = b""
+
+    def _anchor_matches(self, handle) -> bool:
+        if not self._anchor:
+            return True
+        handle.seek(self._offset - len(self._anchor))
+        return handle.read(len(self._anchor)) == self._anchor
+
+    def poll(self) -> Tuple[bool, List[Dict[str, Any]]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            reset = self._inode is not None
+            self._inode, self._mtime_ns, self._offset, self._anchor = None, None, 0, b""
+            return reset, []
+
+        same_file = st.st_ino == self._inode and st.st_size >= self._offset
+        if same_file and st.st_size == self._offset:
+            if st.st_mtime_ns == self._mtime_ns:
+                return False, []
+            # Modified without growing: an in-place rewrite, not an append.
+            same_file = False
+
+        with open(self.path, "rb") as handle:
+            reset = not (same_file and self._anchor_matches(handle))
+            if reset:
+                self._offset, self._anchor = 0, b""
+            handle.seek(self._offset)
+            data = handle.read()
+
+        end = data.rfind(b"\n") + 1
+        complete = data[:end]
+        records: List[Dict[str, Any]] = []
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+
+        self._offset += len(complete)
+        self._anchor = (self._anchor + complete)[-_ANCHOR_BYTES:]
+        self._inode = st.st_ino
+        self._mtime_ns = st.st_mtime_ns
+        return reset, records
+
+
+class GraphIndex:
+    """Entities and relations of one graph directory, indexed in memory.
+
+    Entities are keyed by id (a later line with the same id replaces the
+    earlier one), names are indexed by character trigrams for substring
+    lookups, and every relation is listed under both of its endpoints so
+    neighbourhood queries cost O(degree). ``refresh`` tails both files, so
+    appends made by other processes are picked up on the next call.
+    """
+
+    def __init__(self, entities_path: Path, relations_path: Path):
+        self._lock = threading.RLock()
+        self._entity_log = JsonlFollower(entities_path)
+        self._relation_log = JsonlFollower(relations_path)
+        self._clear_entities()
+        self._clear_relations()
+
+    def _clear_entities(self):
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        self._position: Dict[str, int] = {}
+        self._names: Dict[str, str] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._type_counts: Counter = Counter()
+        self._seq = 0
+
+    def _clear_relations(self):
+        self._relations: List[Dict[str, Any]] = []
+        self._incident: Dict[str, List[int]] = {}
+        self._outgoing: Dict[str, List[int]] = {}
+
+    def _add_entity(self, entity: Dict[str, Any]):
+        self._seq += 1
+        entity_id = str(entity.get("id") or f"#{self._seq}")
+        previous = self._entities.get(entity_id)
+        if previous is not None:
+            self._type_counts[previous.get("entity_type", "unknown")] -= 1
+            for gram in _grams(self._names[entity_id]):
+                self._grams[gram].discard(entity_id)
+        else:
+            self._position[entity_id] = self._seq
+        name = str(entity.get("name", "")).lower()
+        self._entities[entity_id] = entity
+        self._names[entity_id] = name
+        self._type_counts[entity.get("entity_type", "unknown")] += 1
+        for gram in _grams(name):
+            self._grams.setdefault(gram, set()).add(entity_id)
+
+    def _add_relation(self, relation: Dict[str, Any]):
+        index = len(self._relations)
+        self._relations.append(relation)
+        from_id = str(relation.get("from_id", ""))
+        to_id = str(relation.get("to_id", ""))
+        self._incident.setdefault(from_id, []).append(index)
+        if to_id != from_id:
+            self._incident.setdefault(to_id, []).append(index)
+        self._outgoing.setdefault(from_id, []).append(index)
+
+    def refresh(self):
+        with self._lock:
+            reset, entities = self._entity_log.poll()
+            if reset:
+                self._clear_entities()
+            for entity in entities:
+                self._add_entity(entity)
+            reset, relations = self._relation_log.poll()
+            if reset:
+                self._clear_relations()
+            for relation in relations:
+                self._add_relation(relation)
+
+    def _view(self, entity_id: str) -> Dict[str, Any]:
+        """Copy of an entity whose ``relations`` lists its outgoing edges."""
+        entity = dict(self._entities[entity_id])
+        outgoing = self._outgoing.get(entity_id)
+        if outgoing:
+            entity["relations"] = [
+                {"to": self._relations[i].get("to_id"), "type": self._relations[i].get("relation_type")}
+                for i in outgoing
+            ]
+        else:
+            entity["relations"] = list(entity.get("relations") or [])
+        return entity
+
+    def entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._view(entity_id) if entity_id in self._entities else None
+
+    def entities(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._view(entity_id) for entity_id in self._entities]
+
+    def _name_candidates(self, needle: str) -> Iterable[str]:
+        if len(needle) < GRAM:
+            return self._entities.keys()
+        postings = sorted((self._grams.get(gram, set()) for gram in _grams(needle)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return sorted(candidates, key=self._position.__getitem__)
+
+    def find_by_name(self, fragment: str) -> List[Dict[str, Any]]:
+        """Entities whose name contains ``fragment`` (case-insensitive), in file order."""
+        needle = fragment.lower()
+        with self._lock:
+            return [
+                self._view(entity_id)
+                for entity_id in self._name_candidates(needle)
+                if needle in self._names[entity_id]
+            ]
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Keyword score: name match 10, content match 5, entity type match 3."""
+        needle = query.lower()
+        with self._lock:
+            name_hits = {entity_id for entity_id in self._name_candidates(needle) if needle in self._names[entity_id]}
+            scored = []
+            for entity_id, entity in self._entities.items():
+                score = 10 if entity_id in name_hits else 0
+                if needle in str(entity.get("content", "")).lower():
+                    score += 5
+                if needle in str(entity.get("entity_type", "")).lower():
+                    score += 3
+                if score > 0:
+                    scored.append((score, entity_id))
+            scored.sort(key=lambda item: item[0], reverse=True)
+            return [self._view(entity_id) for _, entity_id in scored[: max(0, int(limit))]]
+
+    def newest(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = heapq.nlargest(
+                max(0, int(limit)),
+                self._entities,
+                key=lambda entity_id: self._entities[entity_id].get("created_at", ""),
+            )
+            return [self._view(entity_id) for entity_id in ids]
+
+    def relations_of(self, entity_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(self._relations[i]) for i in self._incident.get(entity_id, ())]
+
+    def neighbours(
+        self,
+        entity_id: str,
+        relation_type: Optional[str] = None,
+        direction: str = "both",
+    ) -> List[Tuple[Dict[str, Any], str]]:
+        """(relation, neighbour id) pairs for every edge touching ``entity_id``."""
+        with self._lock:
+            pairs = []
+            for i in self._incident.get(entity_id, ()):
+                relation = self._relations[i]
+                if relation_type is not None and relation.get("relation_type") != relation_type:
+                    continue
+                outgoing = relation.get("from_id") == entity_id
+                if (direction == "out" and not outgoing) or (direction == "in" and outgoing):
+                    continue
+                pairs.append((relation, relation.get("to_id") if outgoing else relation.get("from_id")))
+            return pairs
+
+    def traverse(
+        self,
+        entity_id: str,
+        max_depth: int = 2,
+        relation_type: Optional[str] = None,
+        direction: str = "both",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Breadth-first walk from ``entity_id``, up to ``max_depth`` hops.
+
+        Each reachable entity is reported once, at its shortest depth, with
+        the relations along one shortest path from the start.
+        """
+        with self._lock:
+            results: List[Dict[str, Any]] = []
+            seen = {entity_id}
+            queue = deque([(entity_id, 0, [])])
+            while queue:
+                current, depth, path = queue.popleft()
+                if depth >= max_depth:
+                    continue
+                for relation, neighbour in self.neighbours(current, relation_type, direction):
+                    if neighbour in seen or neighbour not in self._entities:
+                        continue
+                    seen.add(neighbour)
+                    hop = path + [{"from": relation.get("from_id"), "to": relation.get("to_id"),
+                                   "type": relation.get("relation_type")}]
+                    results.append({"entity": self._view(neighbour), "depth": depth + 1, "path": hop})
+                    if limit is not None and len(results) >= limit:
+                        return results
+                    queue.append((neighbour, depth + 1, hop))
+            return results
+
+    def has_entity(self, entity_id: str) -> bool:
+        with self._lock:
+            return entity_id in self._entities
+
+    def counts(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": len(self._entities),
+                "relations": len(self._relations),
+                "by_type": {key: value for key, value in self._type_counts.items() if value > 0},
+            }
+
+
+_INDEXES: Dict[str, GraphIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def graph_index(entities_path: Path, relations_path: Path) -> GraphIndex:
+    """Process-wide index for one pair of graph files."""
+    key = f"{Path(entities_path).resolve()}|{Path(relations_path).resolve()}"
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = GraphIndex(entities_path, relations_path)
+            _INDEXES[key] = index
+    return index
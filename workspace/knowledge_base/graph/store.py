@@ -1,6 +1,6 @@
 """
 Knowledge Graph Store
-Simple entity-relationship store with JSONL backend
+Simple entity-relationship store with append-only JSONL backend
 """
 import json
 import hashlib
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
+from .index import graph_index
+
 QUIESCE_ENV = "OPENCLAW_QUIESCE"
 _PROTECTED_SUFFIXES = (
     "MEMORY.md",
@@ -49,14 +51,12 @@ class KnowledgeGraphStore:
             self.entities_path.touch()
         if not self.relations_path.exists():
             self.relations_path.touch()
+        # Shared by every store on the same files; each call tails new appends.
+        self.index = graph_index(self.entities_path, self.relations_path)
     
-    def _load_entities(self) -> List[Dict]:
-        entities = []
-        with open(self.entities_path) as f:
-            for line in f:
-                if line.strip():
-                    entities.append(json.loads(line))
-        return entities
+    def _graph(self):
+        self.index.refresh()
+        return self.index
     
     def _save_entity(self, entity: Dict):
         if not _allow_write(self.entities_path):
@@ -94,15 +94,11 @@ class KnowledgeGraphStore:
     
     def get_entity(self, name: str) -> List[Dict]:
         """Get entities by name (fuzzy match)."""
-        entities = self._load_entities()
-        name_lower = name.lower()
-        return [e for e in entities if name_lower in e["name"].lower()]
+        return self._graph().find_by_name(name)
     
     def all_entities(self, limit: int = 20) -> List[Dict]:
         """Get all entities, newest first."""
-        entities = self._load_entities()
-        entities.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return entities[:limit]
+        return self._graph().newest(limit)
     
     def add_relation(
         self,
@@ -111,7 +107,11 @@ class KnowledgeGraphStore:
         relation_type: str,
         metadata: Optional[Dict] = None
     ):
-        """Add a relationship between entities."""
+        """Add a relationship between entities.
+
+        Only relations.jsonl is appended; an entity's ``relations`` list is
+        derived from it when the entity is read.
+        """
         relation = {
             "from_id": from_id,
             "to_id": to_id,
@@ -122,96 +122,39 @@ class KnowledgeGraphStore:
         
         with open(self.relations_path, "a") as f:
             f.write(json.dumps(relation, ensure_ascii=False) + "\n")
-        
-        # Update entity with relation
-        entities = self._load_entities()
-        for e in entities:
-            if e["id"] == from_id:
-                e.setdefault("relations", []).append({
-                    "to": to_id,
-                    "type": relation_type
-                })
-        
-        # Rewrite entities
-        if not _allow_write(self.entities_path):
-            return
-        with open(self.entities_path, "w") as f:
-            for e in entities:
-                f.write(json.dumps(e, ensure_ascii=False) + "\n")
     
     def get_relations(self, entity_id: str) -> List[Dict]:
         """Get all relations for an entity."""
-        relations = []
-        with open(self.relations_path) as f:
-            for line in f:
-                if line.strip():
-                    r = json.loads(line)
-                    if r["from_id"] == entity_id or r["to_id"] == entity_id:
-                        relations.append(r)
-        return relations
+        return self._graph().relations_of(entity_id)
     
     def find_related(self, entity_id: str, relation_type: Optional[str] = None) -> List[Dict]:
         """Find related entities."""
-        relations = self.get_relations(entity_id)
-        
-        entities = {e["id"]: e for e in self._load_entities()}
-        
+        graph = self._graph()
         results = []
-        for r in relations:
-            if r["from_id"] == entity_id:
-                target_id = r["to_id"]
-            else:
-                target_id = r["from_id"]
-            
-            if target_id in entities:
-                entity = entities[target_id]
-                if relation_type is None or r["relation_type"] == relation_type:
-                    results.append({
-                        "entity": entity,
-                        "relation": r["relation_type"]
-                    })
-        
+        for relation, target_id in graph.neighbours(entity_id, relation_type):
+            entity = graph.entity(target_id)
+            if entity is not None:
+                results.append({
+                    "entity": entity,
+                    "relation": relation["relation_type"]
+                })
         return results
     
+    def traverse(
+        self,
+        entity_id: str,
+        max_depth: int = 2,
+        relation_type: Optional[str] = None,
+        direction: str = "both",
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Entities within ``max_depth`` hops, nearest first, with the path to each."""
+        return self._graph().traverse(entity_id, max_depth, relation_type, direction, limit)
+    
     def stats(self) -> Dict:
         """Get statistics."""
-        entities = self._load_entities()
-        
-        relations = []
-        with open(self.relations_path) as f:
-            for line in f:
-                if line.strip():
-                    relations.append(json.loads(line))
-        
-        # Count by type
-        type_counts = {}
-        for e in entities:
-            t = e.get("entity_type", "unknown")
-            type_counts[t] = type_counts.get(t, 0) + 1
-        
-        return {
-            "total": len(entities),
-            "relations": len(relations),
-            "by_type": type_counts
-        }
+        return self._graph().counts()
     
     def search(self, query: str, limit: int = 5) -> List[Dict]:
         """Simple keyword search."""
-        entities = self._load_entities()
-        query_lower = query.lower()
-        
-        results = []
-        for e in entities:
-            score = 0
-            if query_lower in e["name"].lower():
-                score += 10
-            if query_lower in e["content"].lower():
-                score += 5
-            if query_lower in e.get("entity_type", "").lower():
-                score += 3
-            
-            if score > 0:
-                results.append((score, e))
-        
-        results.sort(key=lambda x: x[0], reverse=True)
-        return [r[1] for r in results[:limit]]
+        return self._graph().search(query, limit)
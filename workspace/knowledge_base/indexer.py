@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import hashlib
+import itertools
 import json
 import os
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from chunking import chunk_markdown
+from embeddings.cache import EmbeddingCache
 from embeddings.driver_mlx import ACCEL_MODEL_ID, CANONICAL_MODEL_ID, MlxEmbedder
 from vector_store_lancedb import (
+    MINILM_DIM,
     MINILM_TABLE,
+    MODERNBERT_DIM,
     MODERNBERT_TABLE,
     LanceVectorStore,
     make_row_id,
@@ -43,6 +49,15 @@ def _meta_path(repo_root: Path) -> Path:
     return repo_root / "workspace" / "knowledge_base" / "data" / "embeddings.meta.json"
 
 
+def _embed_cache_dir(repo_root: Path) -> Path | None:
+    if os.getenv("OPENCLAW_KB_EMBED_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    override = os.getenv("OPENCLAW_KB_EMBED_CACHE_DIR")
+    if override:
+        return Path(override).resolve()
+    return repo_root / "workspace" / "knowledge_base" / "data" / "embed_cache"
+
+
 def _load_meta(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {"version": 1, "docs": {}}
@@ -99,6 +114,176 @@ def _collect_sources(repo_root: Path) -> list[Path]:
     return unique
 
 
+MODEL_PLAN = [
+    (CANONICAL_MODEL_ID, MODERNBERT_TABLE, MODERNBERT_DIM),
+    (ACCEL_MODEL_ID, MINILM_TABLE, MINILM_DIM),
+]
+DEFAULT_WRITE_GROUP_ROWS = 2048
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    try:
+        value = int(raw) if raw else int(default)
+    except ValueError:
+        value = int(default)
+    return max(1, value)
+
+
+def _index_workers() -> int:
+    return _env_positive_int("OPENCLAW_KB_INDEX_WORKERS", os.cpu_count() or 1)
+
+
+def _write_group_rows() -> int:
+    return _env_positive_int("OPENCLAW_KB_WRITE_GROUP_ROWS", DEFAULT_WRITE_GROUP_ROWS)
+
+
+def _prepare_doc(job: tuple[str, str, str | None]) -> dict[str, Any]:
+    """Reader/chunker stage: hash one document and chunk it for every model.
+
+    Runs in a worker process. ``indexed_sha`` is the hash of the version that
+    is already fully indexed, so unchanged documents are not chunked again.
+    """
+    path, rel, indexed_sha = job
+    started = time.perf_counter()
+    text = _read_text(Path(path))
+    content_hash = _hash_text(text)
+    skipped = content_hash == indexed_sha
+    chunks = {} if skipped else {model_id: chunk_markdown(text=text, model_id=model_id) for model_id, _, _ in MODEL_PLAN}
+    return {
+        "rel": rel,
+        "sha256": content_hash,
+        "skipped": skipped,
+        "chunks": chunks,
+        "busy_s": time.perf_counter() - started,
+    }
+
+
+def _iter_prepared(jobs: list[tuple[str, str, str | None]], workers: int) -> Iterator[dict[str, Any]]:
+    """Yield ``_prepare_doc`` results in document order, keeping at most ``4 * workers`` in flight."""
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _prepare_doc(job)
+        return
+    try:
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(jobs)))
+    except (OSError, NotImplementedError):
+        # Platforms without working multiprocessing primitives index inline.
+        for job in jobs:
+            yield _prepare_doc(job)
+        return
+    with pool:
+        remaining = iter(jobs)
+        pending = deque(pool.submit(_prepare_doc, job) for job in itertools.islice(remaining, 4 * workers))
+        while pending:
+            result = pending.popleft().result()
+            job = next(remaining, None)
+            if job is not None:
+                pending.append(pool.submit(_prepare_doc, job))
+            yield result
+
+
+class _GroupedWriter:
+    """Writer stage: buffers rows for one table and commits them in large groups.
+
+    Every document passed to ``begin_doc`` has its old rows deleted in the
+    first commit after that call, which comes before any of its new rows
+    are written.
+    """
+
+    def __init__(self, store: LanceVectorStore, table_name: str, dim: int, group_rows: int):
+        self.store = store
+        self.table_name = table_name
+        self.dim = dim
+        self.group_rows = group_rows
+        self._rows: list[dict[str, Any]] = []
+        self._docs: list[str] = []
+        self.rows_written = 0
+        self.commits = 0
+        self.busy_s = 0.0
+
+    def begin_doc(self, doc_id: str):
+        self._docs.append(doc_id)
+
+    def add(self, rows: list[dict[str, Any]]):
+        self._rows.extend(rows)
+        if len(self._rows) >= self.group_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._rows and not self._docs:
+            return
+        started = time.perf_counter()
+        self.rows_written += self.store.replace_docs(self.table_name, self._docs, self._rows, dim=self.dim)
+        self.busy_s += time.perf_counter() - started
+        self.commits += 1
+        self._rows = []
+        self._docs = []
+
+
+class _EmbedBatcher:
+    """Embedding stage: fills ``batch_size`` batches across document boundaries.
+
+    Chunks whose text is already in ``cache`` skip the model and go straight
+    to the writer, so batches hold only new or edited chunks.
+    """
+
+    def __init__(self, embedder: MlxEmbedder, writer: _GroupedWriter, cache: EmbeddingCache | None = None):
+        self.embedder = embedder
+        self.writer = writer
+        self.cache = cache
+        self.batch_size = embedder.batch_size
+        self._pending: list[dict[str, Any]] = []
+        self.chunks = 0
+        self.cached = 0
+        self.batches = 0
+        self.busy_s = 0.0
+
+    def add(self, rows: list[dict[str, Any]]):
+        if self.cache is not None and rows:
+            keys = [_hash_text(row["text"]) for row in rows]
+            hits = self.cache.get_many(keys)
+            if hits:
+                cached_rows = []
+                misses = []
+                for row, key in zip(rows, keys):
+                    vec = hits.get(key)
+                    if vec is None:
+                        misses.append(row)
+                    else:
+                        row["embedding"] = [float(x) for x in vec]
+                        cached_rows.append(row)
+                self.cached += len(cached_rows)
+                self.writer.add(cached_rows)
+                rows = misses
+        self._pending.extend(rows)
+        while len(self._pending) >= self.batch_size:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            self._embed(batch)
+
+    def flush(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self._embed(batch)
+
+    def _embed(self, rows: list[dict[str, Any]]):
+        started = time.perf_counter()
+        vectors = self.embedder.embed_texts([row["text"] for row in rows])
+        for row, vec in zip(rows, vectors):
+            row["embedding"] = [float(x) for x in vec]
+        if self.cache is not None:
+            self.cache.put_many([_hash_text(row["text"]) for row in rows], vectors)
+        self.busy_s += time.perf_counter() - started
+        self.chunks += len(rows)
+        self.batches += 1
+        self.writer.add(rows)
+
+
+def _rate(items: int, busy_s: float) -> float | None:
+    return round(items / busy_s, 1) if busy_s > 0 else None
+
+
 def run_index(evidence_dir: str | None = None) -> dict[str, Any]:
     started = time.time()
     repo_root = _repo_root()
@@ -107,100 +292,128 @@ def run_index(evidence_dir: str | None = None) -> dict[str, Any]:
     now_iso = _utc_now_iso()
 
     store = LanceVectorStore(str(db_dir))
-    store.ensure_table(MODERNBERT_TABLE, dim=768)
-    store.ensure_table(MINILM_TABLE, dim=384)
+    for _, table_name, dim in MODEL_PLAN:
+        store.ensure_table(table_name, dim=dim)
 
     docs = _collect_sources(repo_root)
     meta = _load_meta(meta_path)
     meta_docs = meta.setdefault("docs", {})
 
-    embedders = {
-        CANONICAL_MODEL_ID: MlxEmbedder(model_id=CANONICAL_MODEL_ID, normalize=True),
-        ACCEL_MODEL_ID: MlxEmbedder(model_id=ACCEL_MODEL_ID, normalize=True),
-    }
-
-    indexed_docs = 0
-    skipped_docs = 0
-    modernbert_chunks = 0
-    minilm_chunks = 0
+    workers = _index_workers()
+    group_rows = _write_group_rows()
+    cache_dir = _embed_cache_dir(repo_root)
+    writers: dict[str, _GroupedWriter] = {}
+    batchers: dict[str, _EmbedBatcher] = {}
+    for model_id, table_name, dim in MODEL_PLAN:
+        writers[model_id] = _GroupedWriter(store, table_name, dim, group_rows)
+        batchers[model_id] = _EmbedBatcher(
+            MlxEmbedder(model_id=model_id, normalize=True),
+            writers[model_id],
+            EmbeddingCache(cache_dir, model_id) if cache_dir is not None else None,
+        )
 
+    jobs: list[tuple[str, str, str | None]] = []
     for path in docs:
         rel = _relative_doc_id(path, repo_root)
-        text = _read_text(path)
-        content_hash = _hash_text(text)
-
         old = meta_docs.get(rel, {})
         old_models = old.get("models", {})
-        unchanged = (
-            old.get("sha256") == content_hash
-            and old_models.get(CANONICAL_MODEL_ID, {}).get("status") == "indexed"
-            and old_models.get(ACCEL_MODEL_ID, {}).get("status") == "indexed"
-        )
+        fully_indexed = all(old_models.get(model_id, {}).get("status") == "indexed" for model_id, _, _ in MODEL_PLAN)
+        jobs.append((str(path), rel, old.get("sha256") if fully_indexed else None))
+
+    indexed_docs = 0
+    skipped_docs = 0
+    chunk_counts = {model_id: 0 for model_id, _, _ in MODEL_PLAN}
+    read_busy_s = 0.0
+    read_chunks = 0
 
-        if unchanged:
+    for prepared in _iter_prepared(jobs, workers):
+        read_busy_s += float(prepared["busy_s"])
+        if prepared["skipped"]:
             skipped_docs += 1
             continue
 
+        rel = prepared["rel"]
         indexed_docs += 1
         model_entries: dict[str, Any] = {}
-
-        model_plan = [
-            (CANONICAL_MODEL_ID, MODERNBERT_TABLE),
-            (ACCEL_MODEL_ID, MINILM_TABLE),
-        ]
-
-        for model_id, table_name in model_plan:
-            chunks = chunk_markdown(text=text, model_id=model_id)
-            store.delete_by_doc(table_name, rel)
-
-            if not chunks:
-                model_entries[model_id] = {
-                    "status": "indexed",
-                    "chunks": 0,
-                    "updated_at": now_iso,
-                }
-                continue
-
-            vectors = embedders[model_id].embed_texts([c["text"] for c in chunks])
-            rows = []
-            for chunk, vec in zip(chunks, vectors):
-                row = {
-                    "id": make_row_id(rel, chunk["chunk_id"], model_id),
-                    "doc_id": rel,
-                    "source": "knowledge_base",
-                    "path": rel,
-                    "section": chunk.get("section", ""),
-                    "chunk_id": chunk["chunk_id"],
-                    "text": chunk["text"],
-                    "tokens": int(chunk.get("tokens", 0)),
-                    "embedding": [float(x) for x in vec],
-                    "model_id": model_id,
-                    "updated_at": now_iso,
-                }
-                rows.append(row)
-
-            store.upsert(table_name, rows)
-
+        for model_id, _, _ in MODEL_PLAN:
+            chunks = prepared["chunks"][model_id]
+            read_chunks += len(chunks)
+            writers[model_id].begin_doc(rel)
+            batchers[model_id].add(
+                [
+                    {
+                        "id": make_row_id(rel, chunk["chunk_id"], model_id),
+                        "doc_id": rel,
+                        "source": "knowledge_base",
+                        "path": rel,
+                        "section": chunk.get("section", ""),
+                        "chunk_id": chunk["chunk_id"],
+                        "text": chunk["text"],
+                        "tokens": int(chunk.get("tokens", 0)),
+                        "model_id": model_id,
+                        "updated_at": now_iso,
+                    }
+                    for chunk in chunks
+                ]
+            )
             model_entries[model_id] = {
                 "status": "indexed",
-                "chunks": len(rows),
+                "chunks": len(chunks),
                 "updated_at": now_iso,
             }
-            if model_id == CANONICAL_MODEL_ID:
-                modernbert_chunks += len(rows)
-            else:
-                minilm_chunks += len(rows)
+            chunk_counts[model_id] += len(chunks)
 
         meta_docs[rel] = {
             "path": rel,
-            "sha256": content_hash,
+            "sha256": prepared["sha256"],
             "last_indexed_at": now_iso,
             "models": model_entries,
         }
 
+    cache_stats: dict[str, Any] = {}
+    index_stats: dict[str, Any] = {}
+    for model_id, table_name, _ in MODEL_PLAN:
+        batchers[model_id].flush()
+        writers[model_id].flush()
+        if batchers[model_id].cache is not None:
+            cache_stats[table_name] = batchers[model_id].cache.save()
+        # Grouped writes skip per-commit index upkeep; bring the ANN and
+        # doc_id indexes up to date once the run's rows are in.
+        if writers[model_id].commits:
+            index_stats[table_name] = store.ensure_indexes(table_name)
+
+    # Only record the run once every grouped write has committed, so an
+    # interrupted run re-indexes the documents it did not finish.
     meta["last_run_at"] = now_iso
     _save_meta(meta_path, meta)
 
+    stages: dict[str, Any] = {
+        "read_chunk": {
+            "workers": workers,
+            "docs": len(jobs),
+            "chunks": read_chunks,
+            "busy_s": round(read_busy_s, 3),
+            "docs_per_s": _rate(len(jobs), read_busy_s),
+        },
+    }
+    for model_id, table_name, _ in MODEL_PLAN:
+        batcher = batchers[model_id]
+        writer = writers[model_id]
+        stages[f"embed:{table_name}"] = {
+            "batch_size": batcher.batch_size,
+            "batches": batcher.batches,
+            "chunks": batcher.chunks,
+            "cache_hits": batcher.cached,
+            "busy_s": round(batcher.busy_s, 3),
+            "chunks_per_s": _rate(batcher.chunks, batcher.busy_s),
+        }
+        stages[f"write:{table_name}"] = {
+            "commits": writer.commits,
+            "rows": writer.rows_written,
+            "busy_s": round(writer.busy_s, 3),
+            "rows_per_s": _rate(writer.rows_written, writer.busy_s),
+        }
+
     elapsed_s = round(time.time() - started, 3)
     summary = {
         "repo_root": str(repo_root),
@@ -209,9 +422,12 @@ def run_index(evidence_dir: str | None = None) -> dict[str, Any]:
         "docs_total": len(docs),
         "docs_indexed": indexed_docs,
         "docs_skipped": skipped_docs,
-        "modernbert_chunks": modernbert_chunks,
-        "minilm_chunks": minilm_chunks,
+        "modernbert_chunks": chunk_counts[CANONICAL_MODEL_ID],
+        "minilm_chunks": chunk_counts[ACCEL_MODEL_ID],
         "elapsed_s": elapsed_s,
+        "stages": stages,
+        "embed_cache": cache_stats,
+        "indexes": index_stats,
         "modernbert_stats": store.stats(MODERNBERT_TABLE),
         "minilm_stats": store.stats(MINILM_TABLE),
     }
@@ -221,6 +437,9 @@ def run_index(evidence_dir: str | None = None) -> dict[str, Any]:
         "modernbert_chunks={modernbert_chunks} minilm_chunks={minilm_chunks} "
         "elapsed_s={elapsed_s}".format(**summary)
     )
+    for name, stage in stages.items():
+        detail = " ".join(f"{key}={value}" for key, value in stage.items())
+        print(f"  stage {name}: {detail}")
 
     report_root = evidence_dir or os.getenv("OPENCLAW_KB_EVIDENCE_DIR")
     if report_root:
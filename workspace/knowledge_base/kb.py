@@ -78,6 +78,8 @@ DATA_DIR.mkdir(exist_ok=True)
 def cmd_query(args: argparse.Namespace) -> int:
     """Agentic RAG query - the main entry point."""
     query = args.query
+    if getattr(args, "server", None):
+        os.environ["OPENCLAW_KB_RETRIEVAL_URL"] = args.server
 
     _prefetch_with_cache(
         query,
@@ -133,6 +135,13 @@ def cmd_index(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Serve warm vector retrieval over local HTTP for repeated queries."""
+    from retrieval_server import serve
+
+    return serve(host=args.host, port=args.port)
+
+
 def cmd_add(args: argparse.Namespace) -> int:
     """Add content to knowledge base."""
     content = args.content
@@ -171,6 +180,10 @@ def cmd_graph(args: argparse.Namespace) -> int:
                 print(f"   {r['content']}")
                 if r.get('relations'):
                     print(f"   Relations: {r['relations']}")
+                if args.depth:
+                    for hop in store.traverse(r['id'], max_depth=args.depth, limit=args.limit or 20):
+                        route = " -> ".join(step["type"] for step in hop["path"])
+                        print(f"   {'  ' * hop['depth']}↳ {hop['entity']['name'][:40]} [{route}]")
         else:
             print(f"No entity found: {args.entity}")
     else:
@@ -343,6 +356,11 @@ def build_parser() -> argparse.ArgumentParser:
     q = sub.add_parser("query", help="Ask a question (Agentic RAG)")
     q.add_argument("query", help="Question to answer")
     q.add_argument("--agent", default="main", help="Agent scope")
+    q.add_argument(
+        "--server",
+        default=os.getenv("OPENCLAW_KB_RETRIEVAL_URL"),
+        help="URL of a running `kb.py serve` (falls back to in-process retrieval)",
+    )
     q.set_defaults(func=cmd_query)
     
     # add
@@ -356,6 +374,7 @@ def build_parser() -> argparse.ArgumentParser:
     g = sub.add_parser("graph", help="Query knowledge graph")
     g.add_argument("--entity", help="Specific entity to look up")
     g.add_argument("--limit", type=int, default=20, help="Limit results")
+    g.add_argument("--depth", type=int, default=0, help="Show entities up to N relation hops from --entity")
     g.set_defaults(func=cmd_graph)
     
     # stats
@@ -370,6 +389,12 @@ def build_parser() -> argparse.ArgumentParser:
     i = sub.add_parser("index", help="Build embeddings indexes (ModernBERT canonical + MiniLM accelerator)")
     i.add_argument("--evidence-dir", help="Optional directory for index summary report")
     i.set_defaults(func=cmd_index)
+
+    # serve
+    v = sub.add_parser("serve", help="Keep a warm retrieval engine behind a local HTTP endpoint")
+    v.add_argument("--host", default="127.0.0.1", help="Bind address")
+    v.add_argument("--port", type=int, default=8765, help="Port")
+    v.set_defaults(func=cmd_serve)
     
     return parser
 
@@ -1,81 +1,232 @@
 #!/usr/bin/env python3
 """
 Novelty Detection Module
-Compares new content against existing embeddings to detect novelty.
+Compares new content against existing entities to detect novelty.
+
+Word-set Jaccard similarity is estimated with MinHash signatures, and
+candidates are found by LSH banding instead of a scan over every entity.
+The signature store is built once per entities file, tails it for appends,
+and re-checks the best candidates with exact Jaccard.
 """
-import json
-import numpy as np
+import hashlib
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from graph.index import JsonlFollower
+
+NUM_PERM = 128
+BANDS = 64
+RECHECK = 8
+_SIGNATURE_BATCH = 1024
+_EMPTY = np.uint32(0xFFFFFFFF)
+
+
+def _words(text: str) -> set:
+    return set(str(text or "").lower().split())
+
+
+def _entity_text(entity: Dict) -> str:
+    # Chunks carry ``text``; graph entities keep theirs in ``content``.
+    return str(entity.get("text") or entity.get("content") or "")
+
+
+def _jaccard(a: set, b: set) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+@lru_cache(maxsize=262144)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class MinHashLSH:
+    """MinHash signatures of word sets with banded LSH buckets.
+
+    ``num_perm`` multiply-shift hashes give each set a signature. The
+    signature is split into ``bands`` bands; two sets become candidates when
+    any band matches exactly. With the defaults (64 bands of 2 rows) the
+    S-curve knee is near Jaccard 0.125: a pair at 0.3, where
+    ``is_novel``'s default threshold of 0.7 novelty decides, collides with
+    probability ~0.998 and a pair at 0.1 with ~0.47.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._mix = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._size = 0
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self.words: List[set] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def signatures(self, word_sets: List[set]) -> np.ndarray:
+        """Signature matrix (len(word_sets), num_perm); empty sets get all-max rows."""
+        out = np.full((len(word_sets), self.num_perm), _EMPTY, dtype=np.uint32)
+        for start in range(0, len(word_sets), _SIGNATURE_BATCH):
+            batch = word_sets[start:start + _SIGNATURE_BATCH]
+            rows = [i for i, words in enumerate(batch) if words]
+            if not rows:
+                continue
+            hashes = np.fromiter(
+                (_token_hash(token) for i in rows for token in batch[i]), dtype=np.uint64
+            )
+            lengths = np.array([len(batch[i]) for i in rows])
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            # Multiply-shift hashing; uint64 products wrap, which is intended.
+            permuted = ((hashes[:, None] * self._a + self._b) >> np.uint64(32)).astype(np.uint32)
+            out[start + np.array(rows)] = np.minimum.reduceat(permuted, offsets, axis=0)
+        return out
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One uint64 key per (row, band): a random linear mix of the band's values."""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        return (bands * self._mix).sum(axis=2, dtype=np.uint64)
+
+    def add_many(self, word_sets: List[set]) -> None:
+        signatures = self.signatures(word_sets)
+        needed = self._size + len(word_sets)
+        if needed > len(self._signatures):
+            grown = np.empty((max(needed, 2 * len(self._signatures), 1024), self.num_perm), dtype=np.uint32)
+            grown[:self._size] = self._signatures[:self._size]
+            self._signatures = grown
+        self._signatures[self._size:needed] = signatures
+        self.words.extend(word_sets)
+        rows = [i for i, words in enumerate(word_sets) if words]
+        if rows:
+            keys = self._band_keys(signatures[rows])
+            ids = [self._size + i for i in rows]
+            for band, band_keys in zip(self._buckets, keys.T.tolist()):
+                for key, row_id in zip(band_keys, ids):
+                    band.setdefault(key, []).append(row_id)
+        self._size = needed
+
+    def candidates(self, signature: np.ndarray) -> np.ndarray:
+        found: set = set()
+        for band, key in zip(self._buckets, self._band_keys(signature[None, :])[0].tolist()):
+            found.update(band.get(key, ()))
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def max_similarity(self, words: set, signature: np.ndarray, recheck: int = RECHECK) -> float:
+        """Approximate max Jaccard of ``words`` against the stored sets.
+
+        LSH candidates are ordered by estimated similarity, and the top
+        ``recheck`` get an exact Jaccard. Sets that collide in no band are
+        treated as dissimilar.
+        """
+        if not words or not self._size:
+            return 0.0
+        candidates = self.candidates(signature)
+        if not len(candidates):
+            return 0.0
+        if len(candidates) > recheck:
+            estimates = (self._signatures[candidates] == signature).mean(axis=1)
+            candidates = candidates[np.argpartition(-estimates, recheck - 1)[:recheck]]
+        return max(_jaccard(words, self.words[int(i)]) for i in candidates)
+
+
+class _EntitySignatures:
+    """MinHash store for one entities file, kept current by tailing it."""
+
+    def __init__(self, entities_path: Path, num_perm: int, bands: int):
+        self._lock = threading.Lock()
+        self._log = JsonlFollower(entities_path)
+        self._num_perm = num_perm
+        self._bands = bands
+        self.lsh = MinHashLSH(num_perm, bands)
+
+    def refresh(self) -> MinHashLSH:
+        with self._lock:
+            reset, entities = self._log.poll()
+            if reset:
+                self.lsh = MinHashLSH(self._num_perm, self._bands)
+            if entities:
+                self.lsh.add_many([_words(_entity_text(entity)) for entity in entities])
+            return self.lsh
+
+
+_STORES: Dict[Tuple[str, int, int], _EntitySignatures] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _entity_signatures(entities_path: Path, num_perm: int, bands: int) -> _EntitySignatures:
+    key = (str(Path(entities_path).resolve()), num_perm, bands)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _EntitySignatures(entities_path, num_perm, bands)
+            _STORES[key] = store
+    return store
+
 
 class NoveltyDetector:
-    def __init__(self, entities_path: str = None):
+    def __init__(
+        self,
+        entities_path: str = None,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS,
+        recheck: int = RECHECK,
+    ):
         self.entities_path = entities_path or Path(__file__).parent / "data" / "entities.jsonl"
-        self.existing_chunks = []
-        self._load_existing()
-    
-    def _load_existing(self):
-        """Load existing entities/chunks from KB."""
-        if not Path(self.entities_path).exists():
-            return
-        with open(self.entities_path) as f:
-            for line in f:
-                try:
-                    self.existing_chunks.append(json.loads(line))
-                except:
-                    pass
-    
+        self.recheck = recheck
+        self._store = _entity_signatures(Path(self.entities_path), num_perm, bands)
+        self._store.refresh()
+
     def compute_novelty(self, text: str, embedding: np.ndarray = None) -> float:
         """
         Compute novelty score (0-1) for new text.
         0 = identical to existing
         1 = completely novel
         """
-        if not self.existing_chunks:
-            return 1.0  # No existing content, everything is novel
-        
-        # Simple heuristic: check text similarity via common words
-        new_words = set(text.lower().split())
-        
-        max_similarity = 0.0
-        for chunk in self.existing_chunks:
-            existing_text = chunk.get('text', '').lower()
-            existing_words = set(existing_text.split())
-            
-            if not existing_words:
-                continue
-            
-            # Jaccard similarity
-            intersection = len(new_words & existing_words)
-            union = len(new_words | existing_words)
-            similarity = intersection / union if union > 0 else 0
-            
-            max_similarity = max(max_similarity, similarity)
-        
+        return self._novelty_many([text])[0]
+
+    def _novelty_many(self, texts: List[str]) -> List[float]:
+        lsh = self._store.refresh()
+        if not len(lsh):
+            return [1.0] * len(texts)  # No existing content, everything is novel
+        word_sets = [_words(text) for text in texts]
+        signatures = lsh.signatures(word_sets)
         # Novelty is inverse of similarity
-        return 1.0 - max_similarity
-    
+        return [
+            1.0 - lsh.max_similarity(words, signature, self.recheck)
+            for words, signature in zip(word_sets, signatures)
+        ]
+
     def is_novel(self, text: str, threshold: float = 0.7) -> bool:
         """Check if text is novel enough (above threshold)."""
         return self.compute_novelty(text) >= threshold
-    
+
     def rank_by_novelty(self, chunks: List[Dict]) -> List[Dict]:
         """Rank chunks by novelty score."""
-        for chunk in chunks:
-            chunk['novelty'] = self.compute_novelty(chunk.get('text', ''))
+        scores = self._novelty_many([chunk.get('text', '') for chunk in chunks])
+        for chunk, novelty in zip(chunks, scores):
+            chunk['novelty'] = novelty
         return sorted(chunks, key=lambda x: x.get('novelty', 0), reverse=True)
 
 
 if __name__ == "__main__":
     detector = NoveltyDetector()
-    
+
     # Test
     test_texts = [
         "TACTI is a framework for agent architecture",
         "The weather is sunny today",
         "Agentic Design Patterns from arXiv 2026"
     ]
-    
+
     for text in test_texts:
         novelty = detector.compute_novelty(text)
         print(f"Novelty: {novelty:.2f} - {text[:50]}...")
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import json
 import os
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
-from embeddings.driver_mlx import ACCEL_MODEL_ID, CANONICAL_MODEL_ID, MlxEmbedder
+from embeddings.driver_mlx import ACCEL_MODEL_ID, CANONICAL_MODEL_ID, MlxEmbedder, _backend_mode
 from vector_store_lancedb import (
     MINILM_DIM,
     MINILM_TABLE,
@@ -36,6 +41,10 @@ def _doc_filter(doc_ids: list[str]) -> str | None:
     return f"doc_id IN ({joined})"
 
 
+# Fields read by ``_rows_to_contexts``; searches skip the embedding column.
+CONTEXT_COLUMNS = ["text", "path", "doc_id", "chunk_id", "section", "model_id"]
+
+
 def _rows_to_contexts(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
     contexts: list[dict[str, Any]] = []
     for row in rows:
@@ -54,9 +63,7 @@ def _rows_to_contexts(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return contexts
 
 
-def _ensure_modernbert_available(store: LanceVectorStore):
-    store.assert_table_dim(MODERNBERT_TABLE, expected_dim=MODERNBERT_DIM, require_exists=False)
-    stats = store.stats(MODERNBERT_TABLE)
+def _ensure_modernbert_available(stats: dict[str, Any]):
     if not stats.get("exists"):
         raise RuntimeError("ModernBERT index unavailable: rag_modernbert table is missing")
     if int(stats.get("rows", 0)) <= 0:
@@ -70,75 +77,244 @@ def _assert_known_dims(store: LanceVectorStore):
     store.assert_table_dim(MINILM_TABLE, expected_dim=MINILM_DIM, require_exists=False)
 
 
-def retrieve(query: str, mode: str = "HYBRID", k: int = 12) -> dict:
-    selected_mode = str(mode or "HYBRID").upper()
-    if selected_mode not in {"FAST", "PRECISE", "HYBRID"}:
-        raise ValueError(f"Unsupported retrieval mode: {mode}")
-
-    store = LanceVectorStore(str(_default_db_dir()))
-    _assert_known_dims(store)
-    k = max(1, int(k))
-
-    if selected_mode == "FAST":
-        minilm_stats = store.stats(MINILM_TABLE)
-        if not minilm_stats.get("exists") or int(minilm_stats.get("rows", 0)) <= 0:
-            contexts: list[dict[str, Any]] = []
-            candidates: list[dict[str, Any]] = []
-        else:
-            qvec = MlxEmbedder(model_id=ACCEL_MODEL_ID, normalize=True).embed_texts([query])[0]
-            rows = store.query(MINILM_TABLE, qvec, k=k)
+DEFAULT_QUERY_CACHE_SIZE = 256
+_TABLES = (MODERNBERT_TABLE, MINILM_TABLE)
+
+
+def _query_cache_size() -> int:
+    raw = os.getenv("OPENCLAW_KB_QUERY_CACHE_SIZE")
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_QUERY_CACHE_SIZE
+    except ValueError:
+        return DEFAULT_QUERY_CACHE_SIZE
+
+
+class RetrievalEngine:
+    """Long-lived retrieval state for one vector DB directory.
+
+    Table handles, table stats and the dimension checks are reused until a
+    table commits a new version, which is how index runs from any process
+    are detected, or until ``invalidate()`` is called. Query embeddings are
+    memoized in an LRU (``OPENCLAW_KB_QUERY_CACHE_SIZE``, default 256), so a
+    repeated query pays only for the vector search. Embedders are not
+    thread-safe, so cache misses embed one at a time; the threaded
+    retrieval server shares one engine across requests.
+    """
+
+    def __init__(self, db_dir: Path | str, *, query_cache_size: int | None = None):
+        self.db_dir = Path(db_dir)
+        self.store = LanceVectorStore(str(self.db_dir))
+        self.query_cache_size = _query_cache_size() if query_cache_size is None else max(0, int(query_cache_size))
+        self._lock = threading.RLock()
+        self._embed_lock = threading.Lock()
+        self._marker: tuple | None = None
+        self._tables: dict[str, Any] = {}
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._embedders: dict[str, MlxEmbedder] = {}
+        self._vectors: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self.queries = 0
+        self.refreshes = 0
+        self.vector_hits = 0
+        self.vector_misses = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._marker = None
+            self._tables.clear()
+            self._stats.clear()
+
+    def _refresh(self):
+        marker = tuple(self.store.table_version_marker(name) for name in _TABLES)
+        with self._lock:
+            if self._marker is not None and marker == self._marker:
+                return
+            self._tables.clear()
+            self._stats.clear()
+            _assert_known_dims(self.store)
+            for name in _TABLES:
+                self._stats[name] = self.store.stats(name)
+            self._marker = marker
+            self.refreshes += 1
+
+    def table_stats(self, name: str) -> dict[str, Any]:
+        self._refresh()
+        with self._lock:
+            return dict(self._stats[name])
+
+    def _table(self, name: str):
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                table = self.store.db.open_table(name)
+                self._tables[name] = table
+            return table
+
+    def _search(self, name: str, vector: list[float], k: int, where: str | None = None) -> list[dict]:
+        return self.store.search_table(self._table(name), vector, k, where=where, columns=CONTEXT_COLUMNS)
+
+    def query_vector(self, model_id: str, query: str) -> list[float]:
+        key = (model_id, query)
+        with self._lock:
+            cached = self._vectors.get(key)
+            if cached is not None:
+                self._vectors.move_to_end(key)
+                self.vector_hits += 1
+                return cached
+            embedder = self._embedders.get(model_id)
+            if embedder is None:
+                embedder = MlxEmbedder(model_id=model_id, normalize=True)
+                self._embedders[model_id] = embedder
+        with self._embed_lock:
+            vector = embedder.embed_texts([query])[0]
+        with self._lock:
+            self.vector_misses += 1
+            if self.query_cache_size > 0:
+                self._vectors[key] = vector
+                while len(self._vectors) > self.query_cache_size:
+                    self._vectors.popitem(last=False)
+        return vector
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "db_dir": str(self.db_dir),
+                "queries": self.queries,
+                "refreshes": self.refreshes,
+                "query_vectors": len(self._vectors),
+                "vector_hits": self.vector_hits,
+                "vector_misses": self.vector_misses,
+                "tables": {name: dict(stats) for name, stats in self._stats.items()},
+            }
+
+    def retrieve(self, query: str, mode: str = "HYBRID", k: int = 12) -> dict:
+        selected_mode = str(mode or "HYBRID").upper()
+        if selected_mode not in {"FAST", "PRECISE", "HYBRID"}:
+            raise ValueError(f"Unsupported retrieval mode: {mode}")
+
+        self._refresh()
+        with self._lock:
+            self.queries += 1
+            modern_stats = dict(self._stats[MODERNBERT_TABLE])
+            minilm_stats = dict(self._stats[MINILM_TABLE])
+        k = max(1, int(k))
+
+        if selected_mode == "FAST":
+            if not minilm_stats.get("exists") or int(minilm_stats.get("rows", 0)) <= 0:
+                contexts: list[dict[str, Any]] = []
+                candidates: list[dict[str, Any]] = []
+            else:
+                qvec = self.query_vector(ACCEL_MODEL_ID, query)
+                rows = self._search(MINILM_TABLE, qvec, k=k)
+                contexts = _rows_to_contexts(rows)
+                candidates = contexts
+
+            return {
+                "authoritative": False,
+                "synthesis_safe": False,
+                "mode": "FAST",
+                "contexts": contexts,
+                "candidates": candidates,
+                "notes": ["FAST mode is candidate-only and must not be used for final synthesis grounding."],
+            }
+
+        if selected_mode == "PRECISE":
+            _ensure_modernbert_available(modern_stats)
+            qvec = self.query_vector(CANONICAL_MODEL_ID, query)
+            rows = self._search(MODERNBERT_TABLE, qvec, k=k)
             contexts = _rows_to_contexts(rows)
-            candidates = contexts
+            return {
+                "authoritative": True,
+                "synthesis_safe": True,
+                "mode": "PRECISE",
+                "contexts": contexts,
+                "candidates": [],
+            }
 
-        return {
-            "authoritative": False,
-            "synthesis_safe": False,
-            "mode": "FAST",
-            "contexts": contexts,
-            "candidates": candidates,
-            "notes": ["FAST mode is candidate-only and must not be used for final synthesis grounding."],
-        }
+        _ensure_modernbert_available(modern_stats)
+
+        minilm_candidates: list[dict[str, Any]] = []
+        candidate_doc_ids: list[str] = []
+        if minilm_stats.get("exists") and int(minilm_stats.get("rows", 0)) > 0:
+            minilm_qvec = self.query_vector(ACCEL_MODEL_ID, query)
+            candidate_rows = self._search(MINILM_TABLE, minilm_qvec, k=120)
+            minilm_candidates = _rows_to_contexts(candidate_rows)
+            seen: set[str] = set()
+            for row in minilm_candidates:
+                doc_id = str(row.get("doc_id", ""))
+                if not doc_id or doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                candidate_doc_ids.append(doc_id)
+
+        modern_qvec = self.query_vector(CANONICAL_MODEL_ID, query)
+        where = _doc_filter(candidate_doc_ids)
+        rows = self._search(MODERNBERT_TABLE, modern_qvec, k=k, where=where)
+        if where and not rows:
+            rows = self._search(MODERNBERT_TABLE, modern_qvec, k=k)
 
-    if selected_mode == "PRECISE":
-        _ensure_modernbert_available(store)
-        qvec = MlxEmbedder(model_id=CANONICAL_MODEL_ID, normalize=True).embed_texts([query])[0]
-        rows = store.query(MODERNBERT_TABLE, qvec, k=k)
-        contexts = _rows_to_contexts(rows)
         return {
             "authoritative": True,
             "synthesis_safe": True,
-            "mode": "PRECISE",
-            "contexts": contexts,
-            "candidates": [],
+            "mode": "HYBRID",
+            "contexts": _rows_to_contexts(rows),
+            "candidates": minilm_candidates,
         }
 
-    _ensure_modernbert_available(store)
-
-    minilm_candidates: list[dict[str, Any]] = []
-    candidate_doc_ids: list[str] = []
-    minilm_stats = store.stats(MINILM_TABLE)
-    if minilm_stats.get("exists") and int(minilm_stats.get("rows", 0)) > 0:
-        minilm_qvec = MlxEmbedder(model_id=ACCEL_MODEL_ID, normalize=True).embed_texts([query])[0]
-        candidate_rows = store.query(MINILM_TABLE, minilm_qvec, k=120)
-        minilm_candidates = _rows_to_contexts(candidate_rows)
-        seen: set[str] = set()
-        for row in minilm_candidates:
-            doc_id = str(row.get("doc_id", ""))
-            if not doc_id or doc_id in seen:
-                continue
-            seen.add(doc_id)
-            candidate_doc_ids.append(doc_id)
-
-    modern_qvec = MlxEmbedder(model_id=CANONICAL_MODEL_ID, normalize=True).embed_texts([query])[0]
-    where = _doc_filter(candidate_doc_ids)
-    rows = store.query(MODERNBERT_TABLE, modern_qvec, k=k, where=where)
-    if where and not rows:
-        rows = store.query(MODERNBERT_TABLE, modern_qvec, k=k)
-
-    return {
-        "authoritative": True,
-        "synthesis_safe": True,
-        "mode": "HYBRID",
-        "contexts": _rows_to_contexts(rows),
-        "candidates": minilm_candidates,
-    }
+
+_ENGINES: dict[tuple[str, str], RetrievalEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(db_dir: Path | str | None = None) -> RetrievalEngine:
+    """Shared engine per (vector DB directory, embeddings backend)."""
+    resolved = Path(db_dir).resolve() if db_dir is not None else _default_db_dir()
+    key = (str(resolved), _backend_mode())
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = RetrievalEngine(resolved)
+            _ENGINES[key] = engine
+    return engine
+
+
+def invalidate_engines():
+    with _ENGINES_LOCK:
+        engines = list(_ENGINES.values())
+    for engine in engines:
+        engine.invalidate()
+
+
+_REMOTE_ERRORS = {"ValueError": ValueError, "RuntimeError": RuntimeError}
+
+
+def _remote_retrieve(url: str, query: str, mode: str, k: int) -> dict | None:
+    """Ask a ``kb.py serve`` process; None when it cannot be reached."""
+    body = json.dumps({"query": query, "mode": mode, "k": k}).encode("utf-8")
+    request = urllib.request.Request(
+        url.rstrip("/") + "/retrieve",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    timeout = float(os.getenv("OPENCLAW_KB_RETRIEVAL_TIMEOUT_SEC", "30") or 30)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as exc:
+        try:
+            payload = json.loads(exc.read().decode("utf-8"))
+        except Exception:
+            payload = {}
+        error_cls = _REMOTE_ERRORS.get(str(payload.get("error_type") or ""), RuntimeError)
+        raise error_cls(str(payload.get("error") or f"retrieval server returned HTTP {exc.code}")) from None
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+def retrieve(query: str, mode: str = "HYBRID", k: int = 12) -> dict:
+    url = os.getenv("OPENCLAW_KB_RETRIEVAL_URL", "").strip()
+    if url:
+        payload = _remote_retrieve(url, query, mode, k)
+        if payload is not None:
+            return payload
+    return get_engine().retrieve(query, mode=mode, k=k)
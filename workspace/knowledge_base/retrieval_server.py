@@ -0,0 +1,88 @@
+"""Local HTTP front end for a warm ``RetrievalEngine``.
+
+``kb.py serve`` keeps one engine (open tables, cached stats, query-vector
+LRU) alive across queries. Clients point ``OPENCLAW_KB_RETRIEVAL_URL`` (or
+``kb.py query --server``) at it; ``retrieval.retrieve`` falls back to an
+in-process engine when the server cannot be reached.
+
+Endpoints: ``POST /retrieve`` ``{"query", "mode", "k"}``, ``POST /invalidate``,
+``GET /stats`` and ``GET /health``.
+"""
+
+from __future__ import annotations
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from retrieval import RetrievalEngine, get_engine
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _handler_for(engine: RetrievalEngine):
+    class RetrievalHandler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any):  # noqa: A002 - BaseHTTPRequestHandler signature
+            return
+
+        def _send(self, status: int, payload: dict[str, Any]):
+            body = json.dumps(payload, ensure_ascii=True, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"ok": True})
+            elif self.path == "/stats":
+                self._send(200, engine.stats())
+            else:
+                self._send(404, {"error": f"unknown path {self.path}", "error_type": "ValueError"})
+
+        def do_POST(self):
+            if self.path == "/invalidate":
+                engine.invalidate()
+                self._send(200, {"ok": True})
+                return
+            if self.path != "/retrieve":
+                self._send(404, {"error": f"unknown path {self.path}", "error_type": "ValueError"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+                payload = engine.retrieve(
+                    str(request.get("query") or ""),
+                    mode=str(request.get("mode") or "HYBRID"),
+                    k=int(request.get("k") or 12),
+                )
+            except (ValueError, TypeError) as exc:
+                self._send(400, {"error": str(exc), "error_type": "ValueError"})
+                return
+            except RuntimeError as exc:
+                # Fail-closed errors (missing/empty/mismatched index) keep their message.
+                self._send(409, {"error": str(exc), "error_type": "RuntimeError"})
+                return
+            self._send(200, payload)
+
+    return RetrievalHandler
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, engine: RetrievalEngine | None = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, int(port)), _handler_for(engine or get_engine()))
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+    server = make_server(host, port)
+    print(f"KB retrieval server on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import hashlib
+import os
 from pathlib import Path
 from typing import Any
 
 import lancedb
 import pyarrow as pa
+from lancedb.index import BTree, HnswSq, IvfPq
 
 MODERNBERT_TABLE = "rag_modernbert"
 MINILM_TABLE = "rag_minilm"
 MODERNBERT_DIM = 768
 MINILM_DIM = 384
 
+# ANN index management. Tables below the row thresholds are searched exactly;
+# above them an ``embedding`` vector index and a ``doc_id`` scalar index are
+# built once and then kept current by ``ensure_indexes``.
+ANN_INDEX_CONFIGS = {"IVF_PQ": IvfPq, "IVF_HNSW_SQ": HnswSq}
+DEFAULT_ANN_INDEX_TYPE = "IVF_HNSW_SQ"
+DEFAULT_ANN_MIN_ROWS = 20000
+DEFAULT_SCALAR_INDEX_MIN_ROWS = 1000
+DEFAULT_ANN_NPROBES = 20
+DEFAULT_ANN_REFINE_FACTOR = 10
+# Rows added since the last index update are scanned exactly next to the
+# index; once they pass this share of the table they are folded in.
+UNINDEXED_REFRESH_FRACTION = 0.1
+
 
 def make_row_id(doc_id: str, chunk_id: str, model_id: str) -> str:
     payload = f"{doc_id}:{chunk_id}:{model_id}".encode("utf-8")
@@ -22,6 +37,21 @@ def _escape_sql(value: str) -> str:
     return str(value).replace("'", "''")
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return default
+
+
+def _ann_index_type() -> str:
+    value = str(os.getenv("OPENCLAW_KB_ANN_INDEX_TYPE") or DEFAULT_ANN_INDEX_TYPE).strip().upper()
+    return value if value in ANN_INDEX_CONFIGS else DEFAULT_ANN_INDEX_TYPE
+
+
 def _schema(dim: int) -> pa.Schema:
     return pa.schema(
         [
@@ -107,26 +137,97 @@ class LanceVectorStore:
             table.delete(f"id IN ({joined})")
 
         table.add(rows)
+        self.ensure_indexes(name, table=table)
         return len(rows)
 
+    def ensure_indexes(self, name: str, table=None) -> dict[str, Any]:
+        """Build or refresh the ``doc_id`` and ``embedding`` indexes of ``name``.
+
+        Each index is created once the table reaches its row threshold
+        (``OPENCLAW_KB_SCALAR_INDEX_MIN_ROWS``, ``OPENCLAW_KB_ANN_MIN_ROWS``).
+        Existing indexes are updated incrementally with ``optimize()``, which
+        adds new rows to them without retraining.
+        """
+        if table is None:
+            if not self.table_exists(name):
+                return {"name": name, "rows": 0, "created": [], "optimized": False}
+            table = self.db.open_table(name)
+        rows = int(table.count_rows())
+        existing = {tuple(index.columns): index.name for index in table.list_indices()}
+        created: list[str] = []
+        if ("doc_id",) not in existing and rows >= _env_int(
+            "OPENCLAW_KB_SCALAR_INDEX_MIN_ROWS", DEFAULT_SCALAR_INDEX_MIN_ROWS
+        ):
+            table.create_index("doc_id", config=BTree())
+            created.append("doc_id")
+        if ("embedding",) not in existing and rows >= _env_int("OPENCLAW_KB_ANN_MIN_ROWS", DEFAULT_ANN_MIN_ROWS):
+            index_type = _ann_index_type()
+            table.create_index("embedding", config=ANN_INDEX_CONFIGS[index_type](distance_type="l2"))
+            created.append(f"embedding:{index_type}")
+
+        unindexed = 0
+        for index_name in existing.values():
+            stats = table.index_stats(index_name)
+            unindexed = max(unindexed, int(getattr(stats, "num_unindexed_rows", 0) or 0))
+        optimized = unindexed > 0 and unindexed >= rows * UNINDEXED_REFRESH_FRACTION
+        if optimized:
+            table.optimize()
+        return {
+            "name": name,
+            "rows": rows,
+            "indexes": sorted(column for columns in existing for column in columns) + created,
+            "created": created,
+            "unindexed_rows": 0 if optimized else unindexed,
+            "optimized": optimized,
+        }
+
     def query(
         self,
         name: str,
         vector: list[float],
         k: int,
         where: str | None = None,
+        columns: list[str] | None = None,
     ) -> list[dict]:
         expected_dim = len(vector)
         self.assert_table_dim(name, expected_dim=expected_dim, require_exists=True)
-        table = self.db.open_table(name)
+        return self.search_table(self.db.open_table(name), vector, k, where=where, columns=columns)
+
+    def table_version_marker(self, name: str) -> int | None:
+        """mtime_ns of the table's version directory; changes whenever a version is committed."""
+        try:
+            return (self.db_dir / f"{name}.lance" / "_versions").stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def search_table(
+        table,
+        vector: list[float],
+        k: int,
+        where: str | None = None,
+        columns: list[str] | None = None,
+    ) -> list[dict]:
+        """Nearest rows of an already opened table (no existence/dim checks).
+
+        ``where`` is applied before the vector search, so filtered queries still
+        return up to ``k`` rows when an ANN index is present. ``columns``
+        restricts the returned fields (``_distance`` is always included).
+        """
         search = table.search(vector, vector_column_name="embedding")
         if where:
-            search = search.where(where)
-        df = search.limit(int(k)).to_pandas()
+            search = search.where(where, prefilter=True)
+        if columns:
+            search = search.select(list(columns))
+        # Probe/refine settings only affect tables with an ANN index; refinement
+        # re-ranks the candidates with exact distances so scores stay comparable.
+        search = search.nprobes(max(1, _env_int("OPENCLAW_KB_ANN_NPROBES", DEFAULT_ANN_NPROBES)))
+        refine = _env_int("OPENCLAW_KB_ANN_REFINE_FACTOR", DEFAULT_ANN_REFINE_FACTOR)
+        if refine > 0:
+            search = search.refine_factor(refine)
 
-        rows = df.to_dict(orient="records")
         out: list[dict[str, Any]] = []
-        for row in rows:
+        for row in search.limit(int(k)).to_arrow().to_pylist():
             distance = row.get("_distance")
             if distance is not None:
                 try:
@@ -141,6 +242,17 @@ class LanceVectorStore:
             out.append(row)
         return out
 
+    def replace_docs(self, name: str, doc_ids: list[str], rows: list[dict], dim: int) -> int:
+        """Delete every row of ``doc_ids`` and add ``rows`` in one grouped commit."""
+        table = self.ensure_table(name, dim=dim)
+        unique = sorted({str(doc_id) for doc_id in doc_ids if str(doc_id)})
+        if unique:
+            joined = ", ".join(f"'{_escape_sql(doc_id)}'" for doc_id in unique)
+            table.delete(f"doc_id IN ({joined})")
+        if rows:
+            table.add(rows)
+        return len(rows)
+
     def delete_by_doc(self, name: str, doc_id: str):
         if not self.table_exists(name):
             return 0
@@ -155,5 +267,6 @@ class LanceVectorStore:
         table = self.db.open_table(name)
         rows = int(table.count_rows())
         dim = self._table_embedding_dim(table)
+        indexes = sorted(column for index in table.list_indices() for column in index.columns)
 
-        return {"name": name, "exists": True, "rows": rows, "dim": dim}
+        return {"name": name, "exists": True, "rows": rows, "dim": dim, "indexes": indexes}
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""HiveMind ingest throughput: per-unit ``put`` vs. batched ``put_many``, with embeddings on.
+
+Both paths embed through an Ollama-compatible endpoint. By default that is
+a local stand-in server that answers ``/api/embeddings`` (one prompt) and
+``/api/embed`` (a list) after ``--latency-ms`` plus ``--per-item-ms`` for each
+text, which roughly models a GPU-backed Ollama. Pass ``--url`` to measure a
+real local Ollama instead. Each path ingests the same ``--units`` distinct
+units into a fresh store. The report gives units/sec and the HTTP request
+count for each path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HIVEMIND_ROOT = REPO_ROOT / "workspace" / "hivemind"
+if str(HIVEMIND_ROOT) not in sys.path:
+    sys.path.insert(0, str(HIVEMIND_ROOT))
+
+from hivemind.models import KnowledgeUnit  # noqa: E402
+from hivemind.store import HiveMindStore  # noqa: E402
+
+DIM = 768
+
+
+def _fake_server(latency_s: float, per_item_s: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with self.server.lock:
+                self.server.requests += 1
+            if self.path == "/api/embed":
+                texts = payload["input"]
+                body = {"embeddings": [[float(len(t) % 7)] * DIM for t in texts]}
+            else:
+                texts = [payload["prompt"]]
+                body = {"embedding": [float(len(texts[0]) % 7)] * DIM}
+            time.sleep(latency_s + per_item_s * len(texts))
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _items(count: int, seed: int):
+    return [
+        (
+            KnowledgeUnit(kind="fact", source="bench", agent_scope="shared"),
+            f"bench unit {seed}-{i}: gateway fallback note about provider routing and retries #{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def _run(path: str, units: int, server) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HiveMindStore(Path(tmp) / "hivemind")
+        items = _items(units, seed=len(path))
+        before = server.requests if server else 0
+        started = time.perf_counter()
+        if path == "put":
+            results = [store.put(ku, content) for ku, content in items]
+        else:
+            results = store.put_many(items)
+        elapsed = time.perf_counter() - started
+        embedded = sum(1 for r in results if r.get("stored") and "embedding" in r["record"])
+    return {
+        "seconds": round(elapsed, 3),
+        "units_per_s": round(units / elapsed, 1),
+        "embedded": embedded,
+        "requests": (server.requests - before) if server else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=2000)
+    parser.add_argument("--url", default="", help="Real Ollama /api/embeddings URL (default: local stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="Stand-in per-request latency")
+    parser.add_argument("--per-item-ms", type=float, default=1.0, help="Stand-in per-text latency")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if not url:
+        server = _fake_server(args.latency_ms / 1000.0, args.per_item_ms / 1000.0)
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/embeddings"
+    os.environ.update(
+        {
+            "HIVEMIND_ENABLE_OLLAMA_EMBEDDINGS": "1",
+            "HIVEMIND_OLLAMA_EMBED_URL": url,
+            "HIVEMIND_EMBED_BATCH_SIZE": str(args.batch_size),
+            "HIVEMIND_EMBED_WORKERS": str(args.workers),
+        }
+    )
+    per_unit = _run("put", args.units, server)
+    batched = _run("put_many", args.units, server)
+    report = {
+        "units": args.units,
+        "endpoint": "stand-in" if server else url,
+        "batch_size": args.batch_size,
+        "workers": args.workers,
+        "put": per_unit,
+        "put_many": batched,
+        "speedup": round(batched["units_per_s"] / max(per_unit["units_per_s"], 1e-9), 1),
+    }
+    if server:
+        report["stand_in"] = {"latency_ms": args.latency_ms, "per_item_ms": args.per_item_ms}
+        server.shutdown()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""TrailStore latency: the former read-and-scan query vs. the in-memory matrix, at several sizes.
+
+Each synthetic trail is 6-12 words from a 2000-word vocabulary, with a
+random strength and an ``updated_at`` from the last 48 hours. ``legacy``
+re-implements the former ``query`` (read the whole file, cosine in pure
+Python) and the former ``reinforce`` (rewrite the whole file). ``store`` is
+the current ``TrailStore``. Its cold load is timed separately from warm
+queries, which is what ``_trail_agent_bias`` sees on every consult after
+the first. Top-k agreement with the legacy ranking is also reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HIVEMIND_ROOT = REPO_ROOT / "workspace" / "hivemind"
+if str(HIVEMIND_ROOT) not in sys.path:
+    sys.path.insert(0, str(HIVEMIND_ROOT))
+
+from hivemind import trails as trails_module  # noqa: E402
+from hivemind.trails import TrailStore, _cosine, _embed_text, _parse_ts  # noqa: E402
+
+HALF_LIFE_HOURS = 24.0
+
+
+def _write_trails(path: Path, size: int, seed: int, now: datetime) -> list[str]:
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(2000)]
+    ids = []
+    with path.open("w", encoding="utf-8") as handle:
+        for i in range(size):
+            text = " ".join(rng.choices(vocab, k=rng.randint(6, 12)))
+            stamp = (now - timedelta(hours=rng.uniform(0, 48))).isoformat()
+            row = {
+                "trail_id": f"t{i}",
+                "text": text,
+                "tags": [],
+                "embedding": _embed_text(text),
+                "strength": rng.uniform(0.2, 3.0),
+                "meta": {"agent": f"agent{i % 5}", "reward": rng.uniform(-1, 1)},
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+            handle.write(json.dumps(row) + "\n")
+            ids.append(row["trail_id"])
+    return ids
+
+
+def _legacy_rows(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def _legacy_query(path: Path, text: str, k: int, now: datetime) -> list[str]:
+    query = _embed_text(text)
+    scored = []
+    for row in _legacy_rows(path):
+        similarity = max(0.0, _cosine(query, [float(x) for x in row["embedding"]]))
+        age = max(0.0, (now - _parse_ts(row["updated_at"])).total_seconds() / 3600.0)
+        effective = float(row["strength"]) * math.exp(-math.log(2.0) * age / HALF_LIFE_HOURS) * similarity
+        scored.append((-effective, row["trail_id"]))
+    scored.sort()
+    return [tid for _, tid in scored[:k]]
+
+
+def _legacy_reinforce(path: Path, trail_id: str) -> None:
+    rows = _legacy_rows(path)
+    for row in rows:
+        if row["trail_id"] == trail_id:
+            row["strength"] += 0.1
+            break
+    with path.open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row) + "\n")
+
+
+def run_size(size: int, queries: int, legacy_queries: int, k: int, seed: int) -> dict:
+    now = datetime.now(timezone.utc)
+    rng = random.Random(seed + 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trails.jsonl"
+        ids = _write_trails(path, size, seed, now)
+        probes = [" ".join(f"w{rng.randrange(2000)}" for _ in range(6)) for _ in range(queries)]
+
+        started = time.perf_counter()
+        legacy = [_legacy_query(path, text, k, now) for text in probes[:legacy_queries]]
+        legacy_ms = (time.perf_counter() - started) * 1000.0 / max(len(legacy), 1)
+
+        started = time.perf_counter()
+        store = TrailStore(path=path, half_life_hours=HALF_LIFE_HOURS)
+        store.query(probes[0], k=k, now=now)
+        cold_ms = (time.perf_counter() - started) * 1000.0
+
+        started = time.perf_counter()
+        ranked = [[x["trail_id"] for x in store.query(text, k=k, now=now)] for text in probes]
+        warm_ms = (time.perf_counter() - started) * 1000.0 / len(probes)
+
+        started = time.perf_counter()
+        for trail_id in ids[:20]:
+            store.reinforce(trail_id, 0.1)
+            store.query(probes[0], k=k, now=now)
+        reinforce_ms = (time.perf_counter() - started) * 1000.0 / 20
+
+        started = time.perf_counter()
+        for trail_id in ids[:3]:
+            _legacy_reinforce(path, trail_id)
+        legacy_reinforce_ms = (time.perf_counter() - started) * 1000.0 / 3
+
+    overlap = [len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(legacy, ranked)]
+    return {
+        "trails": size,
+        "k": k,
+        "legacy": {"query_ms": round(legacy_ms, 3), "reinforce_ms": round(legacy_reinforce_ms, 3)},
+        "store": {
+            "cold_load_ms": round(cold_ms, 3),
+            "query_ms": round(warm_ms, 3),
+            "reinforce_then_query_ms": round(reinforce_ms, 3),
+        },
+        "query_speedup": round(legacy_ms / max(warm_ms, 1e-9), 1),
+        "topk_overlap": round(sum(overlap) / max(len(overlap), 1), 4),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="2000,20000,100000", help="Comma list of trail counts")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy-queries", type=int, default=5, help="Queries also run through the legacy scan")
+    parser.add_argument("-k", type=int, default=8, help="Top-k, as used by _trail_agent_bias")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    report = {
+        "numpy": trails_module.np is not None,
+        "sizes": [run_size(size, max(1, args.queries), max(1, args.legacy_queries), args.k, args.seed) for size in sizes],
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: legacy tiered intent scan vs compiled + memoized classifier."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import policy_router as pr  # noqa: E402
+
+DEFAULT_CORPUS = SCRIPTS_DIR.parent / "fixtures" / "router_prompts.jsonl"
+
+
+def legacy_classify_intent(text: str) -> str:
+    normalized = re.sub(r"\s+", " ", str(text or "")).strip()
+    if not normalized:
+        return "planning_synthesis"
+    has_action_word = pr._INTENT_ACTION_WORD.search(normalized) is not None
+    if any(rx.search(normalized) for rx in pr._INTENT_NEGATIVE_GUARDS) and not has_action_word:
+        return "planning_synthesis"
+    if any(rx.search(normalized) for rx in pr._INTENT_MECHANICAL_STRONG):
+        return "mechanical_execution"
+    if any(rx.search(normalized) for rx in pr._INTENT_CONTEXTUAL_MECHANICAL):
+        return "mechanical_execution"
+    if any(rx.search(normalized) for rx in pr._INTENT_PLANNING_CUES):
+        return "planning_synthesis"
+    return "planning_synthesis"
+
+
+def load_corpus(path: Path) -> list[str]:
+    rows = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            rows.append(str(json.loads(line).get("text", "")))
+    return rows
+
+
+def _per_call_us(fn, corpus: list[str], rounds: int, before_each=None) -> float:
+    calls = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            if before_each is not None:
+                before_each()
+            fn(text)
+            calls += 1
+    return (time.perf_counter() - started) * 1e6 / max(1, calls)
+
+
+def run(corpus: list[str], rounds: int) -> dict:
+    mismatches = [t[:80] for t in corpus if legacy_classify_intent(t) != pr.classify_intent(t)]
+    clear = pr._TEXT_FEATURE_CACHE.clear
+    legacy_us = _per_call_us(legacy_classify_intent, corpus, rounds)
+    cold_us = _per_call_us(pr.classify_intent, corpus, rounds, before_each=clear)
+    clear()
+    warm_us = _per_call_us(pr.classify_intent, corpus, rounds)
+    return {
+        "prompts": len(corpus),
+        "rounds": rounds,
+        "mismatches": mismatches,
+        "legacy_us_per_call": round(legacy_us, 2),
+        "compiled_cold_us_per_call": round(cold_us, 2),
+        "compiled_memo_us_per_call": round(warm_us, 2),
+        "speedup_cold": round(legacy_us / cold_us, 2) if cold_us else None,
+        "speedup_memo": round(legacy_us / warm_us, 2) if warm_us else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="JSONL file with a 'text' field per row")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    report = run(load_corpus(Path(args.corpus)), max(1, args.rounds))
+    print(json.dumps(report, indent=2))
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Knowledge-base query latency vs. LanceDB table size, with and without indexes.
+
+For each size a synthetic table is searched exactly: 40 chunks per doc, each
+a unit vector scattered around its doc's random centre, with queries drawn
+the same way. Then ``LanceVectorStore.ensure_indexes`` builds the
+``embedding`` ANN index and ``doc_id`` scalar index and the same queries are
+repeated. Each run reports p50/p95 latency for a plain top-k query and for a
+HYBRID-style query filtered to ``--filter-docs`` doc ids, plus the indexed
+recall@k against the exact results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+import numpy as np  # noqa: E402
+import pyarrow as pa  # noqa: E402
+
+from retrieval import CONTEXT_COLUMNS, _doc_filter  # noqa: E402
+from vector_store_lancedb import ANN_INDEX_CONFIGS, DEFAULT_ANN_INDEX_TYPE, LanceVectorStore, _schema  # noqa: E402
+
+CHUNKS_PER_DOC = 40
+WRITE_BATCH = 100_000
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _doc_centres(docs: np.ndarray, dim: int, seed: int) -> np.ndarray:
+    return np.stack([np.random.default_rng((seed, int(doc))).standard_normal(dim, dtype=np.float32) for doc in docs])
+
+
+def _batch(start: int, count: int, dim: int, seed: int, rng: np.random.Generator) -> pa.Table:
+    doc_numbers = np.arange(start, start + count) // CHUNKS_PER_DOC
+    unique, inverse = np.unique(doc_numbers, return_inverse=True)
+    centres = _doc_centres(unique, dim, seed)[inverse]
+    vectors = _unit(centres + 0.6 * rng.standard_normal((count, dim), dtype=np.float32))
+    ids = [str(i) for i in range(start, start + count)]
+    docs = [f"doc-{i // CHUNKS_PER_DOC}" for i in range(start, start + count)]
+    columns = {
+        "id": ids,
+        "doc_id": docs,
+        "source": ["bench"] * count,
+        "path": [f"{doc}.md" for doc in docs],
+        "section": [""] * count,
+        "chunk_id": ids,
+        "text": [f"chunk {i}" for i in ids],
+        "tokens": np.full(count, 64, dtype=np.int32),
+        "embedding": pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), dim),
+        "model_id": ["bench"] * count,
+        "updated_at": ["2026-01-01T00:00:00Z"] * count,
+    }
+    return pa.table(columns, schema=_schema(dim))
+
+
+def _build(store: LanceVectorStore, name: str, rows: int, dim: int, seed: int):
+    rng = np.random.default_rng(seed)
+    table = store.ensure_table(name, dim=dim)
+    for start in range(0, rows, WRITE_BATCH):
+        table.add(_batch(start, min(WRITE_BATCH, rows - start), dim, seed, rng))
+    return store.db.open_table(name)
+
+
+def _measure(table, queries: np.ndarray, k: int, where: str | None) -> tuple[dict, list[list[str]]]:
+    latencies: list[float] = []
+    results: list[list[str]] = []
+    for vector in queries:
+        started = time.perf_counter()
+        rows = LanceVectorStore.search_table(table, vector.tolist(), k, where=where, columns=CONTEXT_COLUMNS)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        results.append([row["chunk_id"] for row in rows])
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+    }, results
+
+
+def _recall(exact: list[list[str]], approx: list[list[str]]) -> float:
+    hits = sum(len(set(a) & set(e)) for e, a in zip(exact, approx))
+    total = sum(len(e) for e in exact)
+    return round(hits / max(total, 1), 4)
+
+
+def run_size(root: Path, rows: int, dim: int, queries: int, k: int, filter_docs: int, seed: int) -> dict:
+    store = LanceVectorStore(str(root / f"bench_{rows}.lance"))
+    started = time.perf_counter()
+    table = _build(store, "bench", rows, dim, seed)
+    build_s = time.perf_counter() - started
+
+    rng = np.random.default_rng(seed + 1)
+    doc_count = max(1, rows // CHUNKS_PER_DOC)
+    centres = _doc_centres(rng.integers(0, doc_count, size=queries), dim, seed)
+    probes = _unit(centres + 0.8 * rng.standard_normal((queries, dim), dtype=np.float32))
+    docs = rng.choice(doc_count, size=min(filter_docs, doc_count), replace=False)
+    where = _doc_filter([f"doc-{int(doc)}" for doc in docs])
+
+    report: dict = {"rows": rows, "dim": dim, "build_s": round(build_s, 3)}
+    exact_plain, exact_plain_ids = _measure(table, probes, k, None)
+    exact_filtered, exact_filtered_ids = _measure(table, probes, k, where)
+    report["exact"] = {"topk": exact_plain, "filtered": exact_filtered}
+
+    previous = {key: os.environ.get(key) for key in ("OPENCLAW_KB_ANN_MIN_ROWS", "OPENCLAW_KB_SCALAR_INDEX_MIN_ROWS")}
+    os.environ["OPENCLAW_KB_ANN_MIN_ROWS"] = "0"
+    os.environ["OPENCLAW_KB_SCALAR_INDEX_MIN_ROWS"] = "0"
+    try:
+        started = time.perf_counter()
+        index_report = store.ensure_indexes("bench")
+        index_s = time.perf_counter() - started
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    table = store.db.open_table("bench")
+    indexed_plain, indexed_plain_ids = _measure(table, probes, k, None)
+    indexed_filtered, indexed_filtered_ids = _measure(table, probes, k, where)
+    report["indexed"] = {
+        "created": index_report["created"],
+        "index_s": round(index_s, 3),
+        "topk": dict(indexed_plain, recall=_recall(exact_plain_ids, indexed_plain_ids)),
+        "filtered": dict(indexed_filtered, recall=_recall(exact_filtered_ids, indexed_filtered_ids)),
+    }
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma list of row counts, e.g. 10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=12)
+    parser.add_argument("--filter-docs", type=int, default=60, help="Doc ids in the filtered (HYBRID-style) query")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--index-type", choices=sorted(ANN_INDEX_CONFIGS), default=DEFAULT_ANN_INDEX_TYPE)
+    args = parser.parse_args(argv)
+    os.environ["OPENCLAW_KB_ANN_INDEX_TYPE"] = args.index_type
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+
+    root = Path(tempfile.mkdtemp(prefix="kb_ann_bench_"))
+    try:
+        report = {
+            "index_type": args.index_type,
+            "sizes": [
+                run_size(root, rows, args.dim, max(1, args.queries), args.k, args.filter_docs, args.seed)
+                for rows in sizes
+            ]
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Embedding throughput (texts/sec) for each knowledge-base backend.
+
+The corpus is the MiniLM-sized chunks of the knowledge-base markdown files.
+``mock-legacy`` is the per-token, per-dimension loop that the vectorized
+``mock`` backend replaced; it is timed on a subset and checked for identical
+output. ``onnx`` and ``mlx`` are reported when their models load, and as an
+``error`` entry otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+import numpy as np  # noqa: E402
+
+from chunking import chunk_markdown  # noqa: E402
+from embeddings import driver_mlx  # noqa: E402
+from embeddings.driver_mlx import ACCEL_MODEL_ID, CANONICAL_MODEL_ID, MODEL_DIMS, MlxEmbedder  # noqa: E402
+
+BACKENDS = ("mock-legacy", "mock", "onnx", "mlx")
+
+
+def load_corpus(limit: int) -> list[str]:
+    texts: list[str] = []
+    for path in sorted(KB_ROOT.glob("*.md")):
+        for chunk in chunk_markdown(path.read_text(encoding="utf-8", errors="ignore"), ACCEL_MODEL_ID):
+            texts.append(chunk["text"])
+            if len(texts) >= limit:
+                return texts
+    return texts
+
+
+def _legacy_mock_embed(text: str, dim: int) -> list[float]:
+    vec = np.zeros(dim, dtype=np.float32)
+    tokens = [tok for tok in str(text or "").lower().split() if tok]
+    if not tokens:
+        return vec.tolist()
+    for token in tokens:
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        for i in range(dim):
+            vec[i] += (digest[i % len(digest)] / 255.0) - 0.5
+    vec /= float(len(tokens))
+    return vec.tolist()
+
+
+def _throughput(fn, texts: list[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(texts)
+    return round(len(texts) * rounds / max(time.perf_counter() - started, 1e-9), 1)
+
+
+def _embedder(backend: str, model_id: str) -> MlxEmbedder:
+    previous = os.environ.get("OPENCLAW_KB_EMBEDDINGS_BACKEND")
+    os.environ["OPENCLAW_KB_EMBEDDINGS_BACKEND"] = backend
+    try:
+        return MlxEmbedder(model_id=model_id, normalize=True)
+    finally:
+        if previous is None:
+            os.environ.pop("OPENCLAW_KB_EMBEDDINGS_BACKEND", None)
+        else:
+            os.environ["OPENCLAW_KB_EMBEDDINGS_BACKEND"] = previous
+
+
+def run(texts: list[str], rounds: int, backends: list[str], legacy_limit: int) -> dict:
+    report: dict = {"texts": len(texts), "rounds": rounds, "backends": {}}
+    for model_id in (ACCEL_MODEL_ID, CANONICAL_MODEL_ID):
+        dim = MODEL_DIMS[model_id]
+        per_model: dict = {}
+        for backend in backends:
+            if backend == "mock-legacy":
+                subset = texts[:legacy_limit]
+                per_model[backend] = {
+                    "texts_per_s": _throughput(lambda batch: [_legacy_mock_embed(t, dim) for t in batch], subset, 1),
+                    "texts": len(subset),
+                    "identical_to_mock": all(
+                        row.tolist() == _legacy_mock_embed(text, dim)
+                        for text, row in zip(subset, driver_mlx._mock_embed_batch(subset, dim))
+                    ),
+                }
+                continue
+            try:
+                embedder = _embedder(backend, model_id)
+                embedder.embed_texts(texts[:1])
+            except Exception as exc:
+                per_model[backend] = {"error": f"{type(exc).__name__}: {exc}"}
+                continue
+            per_model[backend] = {
+                "texts_per_s": _throughput(embedder.embed_texts, texts, rounds),
+                "batch_size": embedder.batch_size,
+            }
+        report["backends"][model_id] = per_model
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=512, help="Number of chunks to embed")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--legacy-limit", type=int, default=32, help="Chunks timed with the legacy mock loop")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help=f"Comma list of {', '.join(BACKENDS)}")
+    args = parser.parse_args(argv)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip() in BACKENDS]
+    report = run(load_corpus(max(1, args.limit)), max(1, args.rounds), backends, max(1, args.legacy_limit))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
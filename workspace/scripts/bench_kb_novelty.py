@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Novelty scoring latency: full Jaccard scan vs. MinHash/LSH, at several corpus sizes.
+
+Each synthetic entity is 40 words drawn from a Zipf-like vocabulary. Half
+of the queries are edited copies of existing entities (60-95% of their
+words kept); the rest are fresh draws. ``scan`` is the per-entity word-set
+loop that ``NoveltyDetector`` used to run. It is timed on ``--scan-queries``
+queries and also gives the exact scores. Agreement is reported as the mean
+absolute error of the LSH score and the share of identical ``is_novel``
+decisions at the default 0.7 threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+KB_ROOT = REPO_ROOT / "workspace" / "knowledge_base"
+if str(KB_ROOT) not in sys.path:
+    sys.path.insert(0, str(KB_ROOT))
+
+from novelty import BANDS, NUM_PERM, NoveltyDetector  # noqa: E402
+
+VOCAB_SIZE = 20000
+WORDS_PER_ENTITY = 40
+THRESHOLD = 0.7
+
+
+def _vocab_sampler(rng: random.Random):
+    vocab = [f"tok{i}" for i in range(VOCAB_SIZE)]
+    weights = [1.0 / (rank + 1) for rank in range(VOCAB_SIZE)]
+    return lambda n: rng.choices(vocab, weights=weights, k=n)
+
+
+def _corpus(size: int, seed: int) -> list[str]:
+    draw = _vocab_sampler(random.Random(seed))
+    return [" ".join(draw(WORDS_PER_ENTITY)) for _ in range(size)]
+
+
+def _queries(corpus: list[str], count: int, seed: int) -> list[str]:
+    rng = random.Random(seed + 1)
+    draw = _vocab_sampler(rng)
+    queries = []
+    for i in range(count):
+        if i % 2:
+            queries.append(" ".join(draw(WORDS_PER_ENTITY)))
+            continue
+        words = rng.choice(corpus).split()
+        keep = int(len(words) * rng.uniform(0.6, 0.95))
+        queries.append(" ".join(words[:keep] + draw(len(words) - keep)))
+    return queries
+
+
+def _scan_novelty(existing: list[set], text: str) -> float:
+    new_words = set(text.lower().split())
+    max_similarity = 0.0
+    for words in existing:
+        if not words:
+            continue
+        union = len(new_words | words)
+        max_similarity = max(max_similarity, len(new_words & words) / union if union else 0.0)
+    return 1.0 - max_similarity
+
+
+def run_size(size: int, queries: int, scan_queries: int, num_perm: int, bands: int, seed: int) -> dict:
+    corpus = _corpus(size, seed)
+    probes = _queries(corpus, queries, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "entities.jsonl"
+        with open(path, "w", encoding="utf-8") as handle:
+            for i, text in enumerate(corpus):
+                handle.write(json.dumps({"id": f"e{i}", "name": text[:30], "content": text}) + "\n")
+
+        started = time.perf_counter()
+        detector = NoveltyDetector(str(path), num_perm=num_perm, bands=bands)
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        lsh_scores = [detector.compute_novelty(text) for text in probes]
+        lsh_ms = (time.perf_counter() - started) * 1000.0 / len(probes)
+
+        started = time.perf_counter()
+        ranked = detector.rank_by_novelty([{"text": text} for text in probes])
+        rank_s = time.perf_counter() - started
+
+    existing = [set(text.lower().split()) for text in corpus]
+    scanned = probes[:scan_queries]
+    started = time.perf_counter()
+    exact = [_scan_novelty(existing, text) for text in scanned]
+    scan_ms = (time.perf_counter() - started) * 1000.0 / max(len(scanned), 1)
+
+    errors = [abs(a - b) for a, b in zip(lsh_scores, exact)]
+    return {
+        "entities": size,
+        "queries": len(probes),
+        "build_s": round(build_s, 3),
+        "lsh": {"ms_per_query": round(lsh_ms, 3), "rank_s": round(rank_s, 3), "ranked": len(ranked)},
+        "scan": {"ms_per_query": round(scan_ms, 3), "queries": len(scanned)},
+        "speedup": round(scan_ms / max(lsh_ms, 1e-9), 1),
+        "agreement": {
+            "mean_abs_error": round(sum(errors) / max(len(errors), 1), 4),
+            "exact_matches": sum(1 for err in errors if err < 1e-9),
+            "is_novel_agree": round(
+                sum((a >= THRESHOLD) == (b >= THRESHOLD) for a, b in zip(lsh_scores, exact)) / max(len(exact), 1), 4
+            ),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma list of existing-entity counts")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--scan-queries", type=int, default=50, help="Queries also scored by the full scan")
+    parser.add_argument("--num-perm", type=int, default=NUM_PERM)
+    parser.add_argument("--bands", type=int, default=BANDS)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+    sizes = [int(item) for item in args.sizes.split(",") if item.strip()]
+    report = {
+        "num_perm": args.num_perm,
+        "bands": args.bands,
+        "sizes": [
+            run_size(size, max(1, args.queries), max(1, args.scan_queries), args.num_perm, args.bands, args.seed)
+            for size in sizes
+        ],
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Accuracy and cost of the heuristic token estimate vs an exact tokenizer.
+
+Needs ``tokenizers`` and a ``tokenizer.json`` (``--tokenizer``) for the exact
+side; without them only the heuristic cost is reported.  The multi-turn
+section replays the corpus as one growing chat and recounts the whole payload
+after every turn, which is what the router does on each escalation step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import token_counter as tc  # noqa: E402
+from bench_intent_classifier import DEFAULT_CORPUS, load_corpus  # noqa: E402
+
+
+def _timed_us(fn, items, rounds: int) -> float:
+    calls = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            fn(item)
+            calls += 1
+    return (time.perf_counter() - started) * 1e6 / max(1, calls)
+
+
+def _conversation_payloads(corpus: list[str]) -> list[dict]:
+    messages = []
+    payloads = []
+    for i, text in enumerate(corpus):
+        messages.append({"role": "user" if i % 2 == 0 else "assistant", "content": text})
+        payloads.append({"messages": list(messages)})
+    return payloads
+
+
+def run(corpus: list[str], rounds: int, tokenizer_path: str | None) -> dict:
+    heuristic = tc.HEURISTIC
+    payloads = _conversation_payloads(corpus)
+    report = {
+        "prompts": len(corpus),
+        "rounds": rounds,
+        "heuristic_us_per_prompt": round(_timed_us(heuristic.count_text, corpus, rounds), 2),
+        "heuristic_us_per_turn": round(_timed_us(heuristic.count_payload, payloads, rounds), 2),
+        "tokenizer": None,
+    }
+    exact = tc.load_tokenizer_counter(tokenizer_path) if tokenizer_path else None
+    if exact is None:
+        if tokenizer_path:
+            report["tokenizer_error"] = "tokenizers package or tokenizer file unavailable"
+        return report
+
+    errors = []
+    for text in corpus:
+        truth = exact.count_text(text)
+        if truth:
+            errors.append((heuristic.count_text(text) - truth) / truth)
+    abs_errors = [abs(e) for e in errors]
+
+    uncached = tc.TokenizerCounter(exact._encode, name=exact.name, cache_size=1)
+    cold_us = _timed_us(lambda text: (uncached._cache.clear(), uncached.count_text(text)), corpus, rounds)
+    full_recount_us = _timed_us(
+        lambda payload: (uncached._cache.clear(), sum(uncached.count_text(m["content"]) for m in payload["messages"])),
+        payloads,
+        rounds,
+    )
+    incremental = tc.TokenizerCounter(exact._encode, name=exact.name)
+    incremental_us = _timed_us(incremental.count_payload, payloads, rounds)
+    report.update(
+        {
+            "tokenizer": exact.name,
+            "heuristic_mean_abs_rel_error": round(statistics.fmean(abs_errors), 4) if abs_errors else None,
+            "heuristic_max_abs_rel_error": round(max(abs_errors), 4) if abs_errors else None,
+            "heuristic_mean_signed_rel_error": round(statistics.fmean(errors), 4) if errors else None,
+            "tokenizer_us_per_prompt_uncached": round(cold_us, 2),
+            "tokenizer_us_per_turn_full_recount": round(full_recount_us, 2),
+            "tokenizer_us_per_turn_incremental": round(incremental_us, 2),
+            "incremental_cache": incremental.stats(),
+        }
+    )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="JSONL file with a 'text' field per row")
+    parser.add_argument("--tokenizer", default=None, help="path to a Hugging Face tokenizer.json")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    report = run(load_corpus(Path(args.corpus)), max(1, args.rounds), args.tokenizer)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,7 +6,7 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 SCHEMA_ID = "openclaw.event_envelope.v1"
 FORBIDDEN_KEYS = {
@@ -74,12 +74,21 @@ def make_envelope(
     }
 
 
-def append_envelope(path: Path, envelope: dict[str, Any]) -> dict[str, Any]:
+def append_envelope(
+    path: Path,
+    envelope: dict[str, Any],
+    *,
+    writer: Callable[[Path, str], Any] | None = None,
+) -> dict[str, Any]:
     target = Path(path).expanduser()
+    line = json.dumps(envelope, ensure_ascii=False) + "\n"
     try:
+        if writer is not None:
+            writer(target, line)
+            return {"ok": True, "path": str(target)}
         target.parent.mkdir(parents=True, exist_ok=True)
         with target.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(envelope, ensure_ascii=False) + "\n")
+            handle.write(line)
         return {"ok": True, "path": str(target)}
     except Exception as exc:
         return {"ok": False, "path": str(target), "error": f"{type(exc).__name__}:{exc}"}
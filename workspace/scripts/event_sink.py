@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Shared JSONL event sink with persistent handles, optional batching and rotation.
+
+One sink per target file keeps the handle open instead of opening, appending
+and closing for every line.  Two modes (``OPENCLAW_EVENT_SINK_MODE``):
+
+- ``sync`` (default): each line is written and flushed immediately.
+- ``buffered``: lines go to a bounded in-process queue drained in batches by a
+  background writer thread; when the queue is full new lines are dropped and
+  counted in ``stats()["dropped"]``.
+
+Closed segments are gzipped when rotation is enabled by size
+(``OPENCLAW_EVENT_SINK_MAX_BYTES``) or age (``OPENCLAW_EVENT_SINK_MAX_AGE_SEC``);
+``OPENCLAW_EVENT_SINK_KEEP`` bounds the number of retained segments.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+MODES = {"sync", "buffered"}
+MAX_OPEN_SINKS = 64
+_BATCH_LINES = 512
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(str(os.environ.get(name, "")).strip() or default))
+    except Exception:
+        return default
+
+
+def _env_mode() -> str:
+    mode = str(os.environ.get("OPENCLAW_EVENT_SINK_MODE", "sync")).strip().lower()
+    return mode if mode in MODES else "sync"
+
+
+class JsonlEventSink:
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        mode: str | None = None,
+        max_bytes: int | None = None,
+        max_age_sec: int | None = None,
+        keep: int | None = None,
+        queue_size: int | None = None,
+        flush_interval_sec: float | None = None,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.mode = mode if mode in MODES else _env_mode()
+        self.max_bytes = _env_int("OPENCLAW_EVENT_SINK_MAX_BYTES", 0) if max_bytes is None else int(max_bytes)
+        self.max_age_sec = _env_int("OPENCLAW_EVENT_SINK_MAX_AGE_SEC", 0) if max_age_sec is None else int(max_age_sec)
+        self.keep = _env_int("OPENCLAW_EVENT_SINK_KEEP", 10) if keep is None else int(keep)
+        self.flush_interval_sec = (
+            _env_int("OPENCLAW_EVENT_SINK_FLUSH_MS", 200) / 1000.0 if flush_interval_sec is None else float(flush_interval_sec)
+        )
+        self._queue: queue.Queue[str] = queue.Queue(
+            maxsize=_env_int("OPENCLAW_EVENT_SINK_QUEUE", 10000) if queue_size is None else int(queue_size)
+        )
+        self._lock = threading.Lock()
+        self._aux_lock = threading.Lock()
+        self._handle = None
+        self._inode = None
+        self._opened_at = 0.0
+        self._size = 0
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._written = 0
+        self._dropped = 0
+        self._rotations = 0
+        self._errors = 0
+
+    # -- public API -----------------------------------------------------
+
+    def write(self, row: dict[str, Any]) -> bool:
+        return self.write_line(json.dumps(row, ensure_ascii=False))
+
+    def write_line(self, line: str) -> bool:
+        line = line.rstrip("\n") + "\n"
+        if self.mode == "sync" or self._closed:
+            with self._lock:
+                return self._write_batch([line])
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._aux_lock:
+                self._dropped += 1
+            return False
+        self._ensure_writer()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+        with self._lock:
+            if self._handle is not None:
+                try:
+                    self._handle.flush()
+                except Exception:
+                    self._errors += 1
+
+    def close(self) -> None:
+        self.flush()
+        self._closed = True
+        with self._lock:
+            self._close_handle()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "mode": self.mode,
+            "written": self._written,
+            "dropped": self._dropped,
+            "rotations": self._rotations,
+            "errors": self._errors,
+            "queued": self._queue.qsize(),
+        }
+
+    # -- internals ------------------------------------------------------
+
+    def _ensure_writer(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._aux_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"event-sink:{self.path.name}", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=max(0.05, self.flush_interval_sec))
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            batch = [first]
+            while len(batch) < _BATCH_LINES:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _open_locked(self) -> None:
+        try:
+            st = os.stat(self.path)
+            current = (st.st_dev, st.st_ino)
+        except OSError:
+            current = None
+        if self._handle is not None and current == self._inode:
+            return
+        self._close_handle()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, "a", encoding="utf-8")
+        st = os.fstat(self._handle.fileno())
+        self._inode = (st.st_dev, st.st_ino)
+        self._size = st.st_size
+        self._opened_at = time.time()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except Exception:
+                self._errors += 1
+        self._handle = None
+        self._inode = None
+
+    def _write_batch(self, lines: list[str]) -> bool:
+        try:
+            self._open_locked()
+            payload = "".join(lines)
+            self._handle.write(payload)
+            self._handle.flush()
+            self._size += len(payload.encode("utf-8"))
+            self._written += len(lines)
+            self._maybe_rotate_locked()
+            return True
+        except Exception:
+            self._errors += 1
+            self._close_handle()
+            return False
+
+    def _maybe_rotate_locked(self) -> None:
+        too_big = self.max_bytes > 0 and self._size >= self.max_bytes
+        too_old = self.max_age_sec > 0 and self._size > 0 and time.time() - self._opened_at >= self.max_age_sec
+        if not (too_big or too_old):
+            return
+        self._close_handle()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        segment = self.path.with_name(f"{self.path.name}.{stamp}")
+        n = 1
+        while segment.exists() or segment.with_name(segment.name + ".gz").exists():
+            segment = self.path.with_name(f"{self.path.name}.{stamp}{n:03d}")
+            n += 1
+        os.replace(self.path, segment)
+        self._rotations += 1
+        with open(segment, "rb") as src, gzip.open(str(segment) + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        segment.unlink()
+        self._prune_segments()
+
+    def _prune_segments(self) -> None:
+        if self.keep <= 0:
+            return
+        segments = sorted(self.path.parent.glob(f"{self.path.name}.*.gz"))
+        for old in segments[: max(0, len(segments) - self.keep)]:
+            try:
+                old.unlink()
+            except OSError:
+                self._errors += 1
+
+
+_SINKS: "OrderedDict[str, JsonlEventSink]" = OrderedDict()
+_SINKS_LOCK = threading.Lock()
+
+
+def get_sink(path: Path | str) -> JsonlEventSink:
+    key = os.path.abspath(os.path.expanduser(str(path)))
+    evicted = []
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            sink = JsonlEventSink(key)
+            _SINKS[key] = sink
+        _SINKS.move_to_end(key)
+        while len(_SINKS) > MAX_OPEN_SINKS:
+            evicted.append(_SINKS.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return sink
+
+
+def append_line(path: Path | str, line: str) -> bool:
+    """Writer hook for producers that serialize their own rows (see ``tacti.events.emit``)."""
+    return get_sink(path).write_line(line)
+
+
+def append_row(path: Path | str, row: dict[str, Any]) -> bool:
+    return get_sink(path).write(row)
+
+
+def flush_all(timeout: float = 5.0) -> None:
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+    for sink in sinks:
+        sink.flush(timeout)
+
+
+def sink_stats() -> list[dict[str, Any]]:
+    with _SINKS_LOCK:
+        return [sink.stats() for sink in _SINKS.values()]
+
+
+atexit.register(flush_all)
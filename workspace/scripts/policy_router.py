@@ -4,14 +4,27 @@ Policy Router
 - Centralized routing, budgeting, and circuit-breaking for all LLM calls.
 """
 
+import asyncio
+import atexit
+import hashlib
 import json
 import os
 import re
 import sys
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    fcntl = None
 
 try:
     import requests
@@ -29,6 +42,16 @@ except Exception:  # pragma: no cover - optional integration
     append_envelope = None
     make_envelope = None
 
+try:
+    from event_sink import append_line as sink_append_line
+except Exception:  # pragma: no cover - optional integration
+    sink_append_line = None
+
+try:
+    from token_counter import counter_for as token_counter_for
+except Exception:  # pragma: no cover - optional integration
+    token_counter_for = None
+
 try:
     from vllm_deferred_queue import enqueue_router_request, should_defer_local_vllm
 except Exception:  # pragma: no cover - optional integration
@@ -482,9 +505,20 @@ def load_budget_state(path=BUDGET_FILE):
     }
 
 
-def save_budget_state(state, path=BUDGET_FILE):
+def _write_json_atomic(path, state, fsync=False):
+    path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(state, indent=2) + "\n")
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save_budget_state(state, path=BUDGET_FILE):
+    _write_json_atomic(path, state)
 
 
 def load_circuit_state(path=CIRCUIT_FILE):
@@ -497,8 +531,244 @@ def load_circuit_state(path=CIRCUIT_FILE):
 
 
 def save_circuit_state(state, path=CIRCUIT_FILE):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    _write_json_atomic(path, state)
+
+
+def _state_flush_interval_sec():
+    raw = os.environ.get("OPENCLAW_ROUTER_STATE_FLUSH_MS")
+    try:
+        return max(0.0, float(raw) / 1000.0) if raw not in (None, "") else 0.5
+    except Exception:
+        return 0.5
+
+
+class RouterStateStore:
+    """In-memory budget or circuit state with write-behind persistence.
+
+    Mutations only touch memory and are coalesced by a flusher thread into
+    one atomic rewrite per flush interval (``OPENCLAW_ROUTER_STATE_FLUSH_MS``,
+    0 = write-through). Each flush holds an exclusive ``<file>.lock`` and
+    merges with what other router processes wrote: budget usage is merged as
+    counter deltas, circuit entries last-writer-wins per provider key.
+    """
+
+    def __init__(self, path, kind, flush_interval_sec=None):
+        self.path = Path(path)
+        self.kind = kind
+        self.flush_interval_sec = _state_flush_interval_sec() if flush_interval_sec is None else float(flush_interval_sec)
+        self._deltas = {}
+        self._dirty_keys = set()
+        self._needs_fsync = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty = threading.Condition(self._lock)
+        self._flusher = None
+        self._file_sig = None
+        self.state = self._load()
+
+    def _signature(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self):
+        self._file_sig = self._signature()
+        if self.kind == "budget":
+            return load_budget_state(self.path)
+        return load_circuit_state(self.path)
+
+    def refresh_if_changed(self):
+        """Reload from disk when another process rewrote the file and nothing is pending here."""
+        with self._lock:
+            if self._has_pending_locked() or self._signature() == self._file_sig:
+                return False
+            self.state = self._load()
+            return True
+
+    def current_state(self):
+        if self.kind == "budget":
+            self._roll_day()
+        return self.state
+
+    def _roll_day(self):
+        """Start a new budget day, first flushing usage still pending for the old one into its file."""
+        if self.state.get("date") == _today_key():
+            return
+        with self._flush_lock:
+            if self.state.get("date") == _today_key():
+                return
+            try:
+                self._flush_pending(fsync=False)
+            except Exception:
+                log_event("router_state_flush_fail", {"path": str(self.path), "kind": self.kind})
+            with self._lock:
+                # Whatever could not be written stays pending and is charged to the new day.
+                self.state = {"version": 1, "date": _today_key(), "intents": {}, "tiers": {}}
+                for section, entries in self._deltas.items():
+                    for key, delta in entries.items():
+                        self.state.setdefault(section, {})[key] = dict(delta)
+
+    def add_usage(self, intent, tier, tokens):
+        self._roll_day()
+        with self._lock:
+            for section, key in (("intents", intent), ("tiers", tier)):
+                entry = self.state.setdefault(section, {}).setdefault(key, {"calls": 0, "tokens": 0})
+                entry["calls"] += 1
+                entry["tokens"] += tokens
+                delta = self._deltas.setdefault(section, {}).setdefault(key, {"calls": 0, "tokens": 0})
+                delta["calls"] += 1
+                delta["tokens"] += tokens
+            self._mark_dirty_locked()
+        self._maybe_write_through()
+
+    def set_provider(self, name, entry):
+        with self._lock:
+            self.state.setdefault("providers", {})[name] = dict(entry)
+            self._dirty_keys.add(name)
+            self._mark_dirty_locked()
+        self._maybe_write_through()
+
+    def _mark_dirty_locked(self):
+        self._dirty.notify()
+        if self.flush_interval_sec > 0 and (self._flusher is None or not self._flusher.is_alive()):
+            self._flusher = threading.Thread(target=self._run, name=f"policy-router-{self.kind}-flush", daemon=True)
+            self._flusher.start()
+
+    def _maybe_write_through(self):
+        if self.flush_interval_sec <= 0:
+            self.flush()
+
+    def _has_pending_locked(self):
+        return bool(self._deltas or self._dirty_keys)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._has_pending_locked():
+                    self._dirty.wait()
+            time.sleep(self.flush_interval_sec)
+            try:
+                self.flush()
+            except Exception:
+                log_event("router_state_flush_fail", {"path": str(self.path), "kind": self.kind})
+
+    def _read_disk(self):
+        """The file as last written. Unlike ``_load`` this keeps a budget from an earlier day."""
+        if self.kind != "budget":
+            return load_circuit_state(self.path)
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            log_event("budget_load_fail", {"path": str(self.path)})
+            return {}
+
+    def _merge(self, disk, deltas, dirty):
+        if self.kind == "budget":
+            day = self.state.get("date") or _today_key()
+            # A file another process already rolled to a later day keeps it; late usage is charged there.
+            if str(disk.get("date") or "") < day:
+                disk = {"version": 1, "date": day, "intents": {}, "tiers": {}}
+            for section, entries in deltas.items():
+                for key, delta in entries.items():
+                    entry = disk.setdefault(section, {}).setdefault(key, {"calls": 0, "tokens": 0})
+                    entry["calls"] = int(entry.get("calls", 0)) + delta["calls"]
+                    entry["tokens"] = int(entry.get("tokens", 0)) + delta["tokens"]
+            return disk
+        providers = disk.setdefault("providers", {})
+        for key, entry in dirty.items():
+            providers[key] = entry
+        return disk
+
+    def flush(self, fsync=False):
+        with self._flush_lock:
+            return self._flush_pending(fsync)
+
+    def _flush_pending(self, fsync):
+        """Write pending deltas and dirty circuit entries; the caller holds ``_flush_lock``."""
+        with self._lock:
+            if not self._has_pending_locked():
+                if fsync and self._needs_fsync:
+                    self._fsync_file()
+                return False
+            deltas, self._deltas = self._deltas, {}
+            dirty = {key: dict(self.state.get("providers", {}).get(key, {})) for key in self._dirty_keys}
+            self._dirty_keys = set()
+        lock_fd = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if fcntl is not None:
+                lock_fd = os.open(str(self.path) + ".lock", os.O_CREAT | os.O_RDWR, 0o644)
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            merged = self._merge(self._read_disk(), deltas, dirty)
+            _write_json_atomic(self.path, merged, fsync=fsync)
+            self._file_sig = self._signature()
+            self._needs_fsync = not fsync
+        except Exception:
+            with self._lock:
+                self._restore_locked(deltas, dirty)
+            raise
+        finally:
+            if lock_fd is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
+                os.close(lock_fd)
+        with self._lock:
+            # Re-apply anything recorded while the file was being written.
+            self.state = self._merge(merged, self._deltas, {
+                key: self.state.get("providers", {}).get(key, {}) for key in self._dirty_keys
+            })
+        return True
+
+    def _restore_locked(self, deltas, dirty):
+        for section, entries in deltas.items():
+            for key, delta in entries.items():
+                pending = self._deltas.setdefault(section, {}).setdefault(key, {"calls": 0, "tokens": 0})
+                pending["calls"] += delta["calls"]
+                pending["tokens"] += delta["tokens"]
+        self._dirty_keys.update(dirty)
+
+    def _fsync_file(self):
+        try:
+            fd = os.open(str(self.path), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+            self._needs_fsync = False
+        finally:
+            os.close(fd)
+
+
+_STATE_STORES = {}
+_STATE_STORES_LOCK = threading.Lock()
+
+
+def _state_store(path, kind):
+    key = (kind, os.path.abspath(str(path)))
+    with _STATE_STORES_LOCK:
+        store = _STATE_STORES.get(key)
+        if store is None:
+            store = RouterStateStore(path, kind)
+            _STATE_STORES[key] = store
+            return store
+    store.refresh_if_changed()
+    return store
+
+
+def flush_router_state(fsync=True):
+    with _STATE_STORES_LOCK:
+        stores = list(_STATE_STORES.values())
+    for store in stores:
+        try:
+            store.flush(fsync=fsync)
+        except Exception:
+            pass
+
+
+atexit.register(flush_router_state)
 
 
 def log_event(event_type, detail=None, path=EVENT_LOG):
@@ -520,9 +790,13 @@ def log_event(event_type, detail=None, path=EVENT_LOG):
     }
     if detail:
         entry["detail"] = _redact_detail(detail)
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
     try:
+        if callable(sink_append_line):
+            sink_append_line(path, line)
+            return
         with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.write(line)
     except Exception:
         pass
 
@@ -530,7 +804,11 @@ def log_event(event_type, detail=None, path=EVENT_LOG):
 def _tacti_event(event_type, detail):
     if callable(tacti_emit):
         try:
-            tacti_emit(str(event_type), detail if isinstance(detail, dict) else {"detail": detail})
+            tacti_emit(
+                str(event_type),
+                detail if isinstance(detail, dict) else {"detail": detail},
+                writer=sink_append_line if callable(sink_append_line) else None,
+            )
             return
         except Exception:
             pass
@@ -762,7 +1040,11 @@ def _emit_envelope_event(event: str, severity: str, corr_id: str, details: dict)
             corr_id=str(corr_id or ""),
             details=dict(details or {}),
         )
-        return append_envelope(_event_envelope_path(), envelope)
+        return append_envelope(
+            _event_envelope_path(),
+            envelope,
+            writer=sink_append_line if callable(sink_append_line) else None,
+        )
     except Exception as exc:  # pragma: no cover - defensive
         return {"ok": False, "reason": f"{type(exc).__name__}:{exc}"}
 
@@ -784,14 +1066,17 @@ def _looks_like_constraint_line(line: str) -> bool:
     return False
 
 
-def _compress_text_preserving_structure(text: str, target_tokens: int):
+def _compress_text_preserving_structure(text: str, target_tokens: int, counter=None):
     src = str(text or "")
     if not src.strip():
         return src, {"before_chars": len(src), "after_chars": len(src), "before_tokens": 0, "after_tokens": 0}
 
+    count = counter.count_text if counter is not None else estimate_tokens
     before_chars = len(src)
-    before_tokens = estimate_tokens(src)
-    target_chars = max(512, int(target_tokens) * 4)
+    before_tokens = count(src)
+    # Exact counters know the real chars/token ratio (code and CJK run well under 4).
+    chars_per_token = counter.chars_per_token(src) if getattr(counter, "exact", False) else 4
+    target_chars = max(512, int(int(target_tokens) * chars_per_token))
     if before_chars <= target_chars:
         return src, {
             "before_chars": before_chars,
@@ -865,7 +1150,7 @@ def _compress_text_preserving_structure(text: str, target_tokens: int):
         compressed = compressed[:keep].rstrip() + marker
 
     after_chars = len(compressed)
-    after_tokens = estimate_tokens(compressed)
+    after_tokens = count(compressed)
     info = {
         "before_chars": before_chars,
         "after_chars": after_chars,
@@ -984,44 +1269,79 @@ _TASK_RESEARCH_CUES = re.compile(r"\b(research|browse|web|search|news|sources?|c
 _TASK_CODE_CUES = re.compile(r"\b(code|diff|patch|refactor|module|function|class|repo|file|tests?)\b", re.IGNORECASE)
 
 
-def classify_intent(text: str) -> str:
-    """Ordered classifier: negative guards, strong mechanical, contextual mechanical, planning cues, then planning."""
-    normalized = re.sub(r"\s+", " ", str(text or "")).strip()
-    if not normalized:
-        return "planning_synthesis"
+def _compile_tier(patterns):
+    """Merge one classifier tier into a single alternation so it is scanned once."""
+    return re.compile("|".join(f"(?:{rx.pattern})" for rx in patterns), re.IGNORECASE)
 
-    has_action_word = _INTENT_ACTION_WORD.search(normalized) is not None
 
-    if any(rx.search(normalized) for rx in _INTENT_NEGATIVE_GUARDS) and not has_action_word:
-        return "planning_synthesis"
+_INTENT_NEGATIVE_GUARDS_RX = _compile_tier(_INTENT_NEGATIVE_GUARDS)
+_INTENT_MECHANICAL_RX = _compile_tier(_INTENT_MECHANICAL_STRONG + _INTENT_CONTEXTUAL_MECHANICAL)
+_INTENT_PLANNING_CUES_RX = _compile_tier(_INTENT_PLANNING_CUES)
+_TEXT_FEATURE_CACHE_SIZE = 4096
+_TEXT_FEATURE_CACHE = OrderedDict()
+_TEXT_FEATURE_CACHE_LOCK = threading.Lock()
 
-    if any(rx.search(normalized) for rx in _INTENT_MECHANICAL_STRONG):
-        return "mechanical_execution"
 
-    if any(rx.search(normalized) for rx in _INTENT_CONTEXTUAL_MECHANICAL):
-        return "mechanical_execution"
+def _normalize_whitespace(text):
+    return " ".join(str(text or "").split())
 
-    if any(rx.search(normalized) for rx in _INTENT_PLANNING_CUES):
-        return "planning_synthesis"
 
-    return "planning_synthesis"
+def _text_features(normalized):
+    """Memoized classifier features for already-normalized text.
+
+    Returns ``(intent, research_cue, code_cue, planning_signal)``; keyed by a
+    digest of the text so large prompts are not retained as cache keys.
+    """
+    key = hashlib.blake2b(normalized.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _TEXT_FEATURE_CACHE_LOCK:
+        hit = _TEXT_FEATURE_CACHE.get(key)
+        if hit is not None:
+            _TEXT_FEATURE_CACHE.move_to_end(key)
+            return hit
+
+    if not normalized:
+        features = ("planning_synthesis", False, False, False)
+    else:
+        guarded = _INTENT_NEGATIVE_GUARDS_RX.search(normalized) is not None
+        guarded = guarded and _INTENT_ACTION_WORD.search(normalized) is None
+        if not guarded and _INTENT_MECHANICAL_RX.search(normalized) is not None:
+            intent = "mechanical_execution"
+        else:
+            intent = "planning_synthesis"
+        features = (
+            intent,
+            _TASK_RESEARCH_CUES.search(normalized) is not None,
+            _TASK_CODE_CUES.search(normalized) is not None,
+            guarded or _INTENT_PLANNING_CUES_RX.search(normalized) is not None,
+        )
+
+    with _TEXT_FEATURE_CACHE_LOCK:
+        _TEXT_FEATURE_CACHE[key] = features
+        while len(_TEXT_FEATURE_CACHE) > _TEXT_FEATURE_CACHE_SIZE:
+            _TEXT_FEATURE_CACHE.popitem(last=False)
+    return features
+
+
+def classify_intent(text: str) -> str:
+    """Ordered classifier: negative guards, strong mechanical, contextual mechanical, planning cues, then planning."""
+    return _text_features(_normalize_whitespace(text))[0]
 
 
 def classify_task_class(text: str, context_metadata: dict | None = None) -> str:
     context_metadata = context_metadata or {}
-    normalized = re.sub(r"\s+", " ", str(text or "")).strip()
     declared = str(context_metadata.get("task_class", "")).strip().lower()
     if declared in {"mechanical_execution", "planning_synthesis", "research_browse", "code_generation_large"}:
         return declared
 
-    intent = classify_intent(normalized)
+    normalized = _normalize_whitespace(text)
+    intent, research_cue, code_cue, _planning = _text_features(normalized)
     expected_loc = _coerce_positive_int(context_metadata.get("expected_loc"), 0)
     expected_change_size = str(context_metadata.get("expected_change_size", "")).strip().lower()
 
-    if _TASK_RESEARCH_CUES.search(normalized):
+    if research_cue:
         return "research_browse"
 
-    if _TASK_CODE_CUES.search(normalized):
+    if code_cue:
         if expected_change_size in {"large", "xl", "huge"} or expected_loc >= 250 or estimate_tokens(normalized) > 18000:
             return "code_generation_large"
 
@@ -1031,15 +1351,7 @@ def classify_task_class(text: str, context_metadata: dict | None = None) -> str:
 
 
 def _has_strong_planning_signal(text: str) -> bool:
-    normalized = re.sub(r"\s+", " ", str(text or "")).strip()
-    if not normalized:
-        return False
-    if any(rx.search(normalized) for rx in _INTENT_PLANNING_CUES):
-        return True
-    has_action_word = _INTENT_ACTION_WORD.search(normalized) is not None
-    if any(rx.search(normalized) for rx in _INTENT_NEGATIVE_GUARDS) and not has_action_word:
-        return True
-    return False
+    return _text_features(_normalize_whitespace(text))[3]
 
 
 def build_chat_payload(prompt, temperature=0.0, max_tokens=256):
@@ -1118,6 +1430,65 @@ def _curiosity_route_on_failure(**_kwargs):
     return {"triggered": False, "leads": []}
 
 
+_HTTP_SESSIONS = {}
+_HTTP_SESSIONS_LOCK = threading.Lock()
+_DISPATCH_EXECUTOR = None
+_DISPATCH_EXECUTOR_LOCK = threading.Lock()
+
+
+def _http_pool_size():
+    return _coerce_positive_int(os.environ.get("OPENCLAW_ROUTER_HTTP_POOL_SIZE"), 8)
+
+
+def _http_pool_key(base_url):
+    parts = urlsplit(str(base_url or "").strip())
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _http_client(base_url):
+    """Return a keep-alive session shared by every call to the same scheme://host:port.
+
+    Falls back to the bare ``requests`` module when sessions are unavailable
+    (e.g. a stub module injected by tests).
+    """
+    session_cls = getattr(requests, "Session", None)
+    if session_cls is None:
+        return requests
+    key = (id(requests), _http_pool_key(base_url))
+    with _HTTP_SESSIONS_LOCK:
+        session = _HTTP_SESSIONS.get(key)
+        if session is None:
+            session = session_cls()
+            adapter_cls = getattr(getattr(requests, "adapters", None), "HTTPAdapter", None)
+            if adapter_cls is not None:
+                size = _http_pool_size()
+                adapter = adapter_cls(pool_connections=1, pool_maxsize=size, pool_block=False)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+            _HTTP_SESSIONS[key] = session
+    return session
+
+
+def close_http_sessions():
+    with _HTTP_SESSIONS_LOCK:
+        sessions = list(_HTTP_SESSIONS.values())
+        _HTTP_SESSIONS.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+def _dispatch_executor():
+    global _DISPATCH_EXECUTOR
+    with _DISPATCH_EXECUTOR_LOCK:
+        if _DISPATCH_EXECUTOR is None:
+            workers = _coerce_positive_int(os.environ.get("OPENCLAW_ROUTER_ASYNC_WORKERS"), _http_pool_size() * 2)
+            _DISPATCH_EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="policy-router-io")
+        return _DISPATCH_EXECUTOR
+
+
 def _call_openai_compatible(base_url, api_key, model_id, payload, timeout=15, provider_caps=None):
     if requests is None:
         return {"ok": False, "reason_code": "no_requests_lib"}
@@ -1136,7 +1507,7 @@ def _call_openai_compatible(base_url, api_key, model_id, payload, timeout=15, pr
         headers["Authorization"] = f"Bearer {api_key}"
     request_payload, tool_fields_stripped = _sanitize_openai_payload_for_capabilities(payload, provider_caps=provider_caps)
     try:
-        resp = requests.post(url, json={"model": model_id, **request_payload}, headers=headers, timeout=timeout)
+        resp = _http_client(base_url).post(url, json={"model": model_id, **request_payload}, headers=headers, timeout=timeout)
         if resp.status_code == 429:
             return {"ok": False, "reason_code": "request_http_429"}
         if resp.status_code == 404:
@@ -1177,7 +1548,7 @@ def _call_anthropic(base_url, api_key, model_id, payload, timeout=15):
         "messages": payload.get("messages", []),
     }
     try:
-        resp = requests.post(url, json=body, headers=headers, timeout=timeout)
+        resp = _http_client(base_url).post(url, json=body, headers=headers, timeout=timeout)
         if resp.status_code == 429:
             return {"ok": False, "reason_code": "request_http_429"}
         if resp.status_code == 404:
@@ -1213,7 +1584,7 @@ def _call_ollama(base_url, model_id, payload, timeout=10):
         "options": {"temperature": payload.get("temperature", 0.0), "num_predict": payload.get("max_tokens", 256)},
     }
     try:
-        resp = requests.post(url, json=body, timeout=timeout)
+        resp = _http_client(base_url).post(url, json=body, timeout=timeout)
         if resp.status_code == 404:
             return {"ok": False, "reason_code": "request_http_404"}
         if resp.status_code != 200:
@@ -1232,7 +1603,7 @@ def _ollama_reachable(base_url):
     if requests is None:
         return False
     try:
-        resp = requests.get(base_url.rstrip("/") + "/api/tags", timeout=3)
+        resp = _http_client(base_url).get(base_url.rstrip("/") + "/api/tags", timeout=3)
         return resp.status_code == 200
     except Exception:
         return False
@@ -1242,12 +1613,259 @@ def _openai_compatible_reachable(base_url):
     if requests is None:
         return False
     try:
-        resp = requests.get(base_url.rstrip("/") + "/models", timeout=3)
+        resp = _http_client(base_url).get(base_url.rstrip("/") + "/models", timeout=3)
         return resp.status_code == 200
     except Exception:
         return False
 
 
+_HEALTH_PROBES = {
+    "ollama": "_ollama_reachable",
+    "openai_compatible": "_openai_compatible_reachable",
+}
+
+
+class ProviderHealthCache:
+    """TTL cache of provider reachability, optionally refreshed by a background prober.
+
+    The routing hot path only reads memory. A missing or stale entry is
+    answered with the last known value (``True`` for a target never seen)
+    and refreshed by a single background probe per target; dispatch
+    outcomes correct the entry passively through ``mark()``.
+    """
+
+    def __init__(self, ttl_sec=None, interval_sec=None):
+        self.ttl_sec = float(ttl_sec or _coerce_positive_int(os.environ.get("OPENCLAW_ROUTER_HEALTH_TTL_SEC"), 30))
+        self.interval_sec = float(interval_sec or max(1.0, self.ttl_sec / 2.0))
+        self._entries = {}
+        self._targets = set()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _probe(self, kind, base_url):
+        probe = globals().get(_HEALTH_PROBES.get(kind, ""))
+        started = time.perf_counter()
+        ok = bool(probe(base_url)) if callable(probe) else False
+        return self.mark(kind, base_url, ok, source="probe", probe_ms=int((time.perf_counter() - started) * 1000))
+
+    def mark(self, kind, base_url, reachable, source="passive", probe_ms=None):
+        entry = {
+            "reachable": bool(reachable),
+            "checked_at": time.time(),
+            "source": source,
+        }
+        if probe_ms is not None:
+            entry["probe_ms"] = int(probe_ms)
+        with self._lock:
+            self._entries[(kind, str(base_url or ""))] = entry
+        return entry
+
+    def _probe_in_background(self, kind, base_url):
+        try:
+            self._probe(kind, base_url)
+        except Exception:
+            self.mark(kind, base_url, False, source="probe_error")
+        finally:
+            with self._lock:
+                self._inflight.pop((kind, str(base_url or "")), None)
+
+    def reachable(self, kind, base_url):
+        key = (kind, str(base_url or ""))
+        with self._lock:
+            entry = self._entries.get(key)
+            stale = entry is None or time.time() - entry["checked_at"] > self.ttl_sec
+            # A running prober refreshes known entries itself; only unseen targets need a one-off probe.
+            schedule = stale and key not in self._inflight and (entry is None or not self.prober_running())
+            if schedule:
+                thread = threading.Thread(
+                    target=self._probe_in_background,
+                    args=(kind, base_url),
+                    name="policy-router-health-probe",
+                    daemon=True,
+                )
+                self._inflight[key] = thread
+                thread.start()
+        return True if entry is None else entry["reachable"]
+
+    def wait_for_probes(self, timeout=None):
+        """Join the one-off probes scheduled by ``reachable``; returns True when none are left."""
+        deadline = None if timeout is None else time.monotonic() + float(timeout)
+        while True:
+            with self._lock:
+                threads = list(self._inflight.values())
+            if not threads:
+                return True
+            for thread in threads:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                thread.join(remaining)
+            if deadline is not None and time.monotonic() >= deadline:
+                with self._lock:
+                    return not self._inflight
+
+    def snapshot(self, kind, base_url):
+        with self._lock:
+            entry = self._entries.get((kind, str(base_url or "")))
+        if entry is None:
+            return {"kind": kind, "base_url": base_url, "reachable": None, "age_sec": None, "stale": True}
+        age = max(0.0, time.time() - entry["checked_at"])
+        out = dict(entry)
+        out.update({"kind": kind, "base_url": base_url, "age_sec": round(age, 3), "stale": age > self.ttl_sec})
+        return out
+
+    def register(self, kind, base_url):
+        with self._lock:
+            self._targets.add((kind, str(base_url or "")))
+
+    def refresh_all(self):
+        with self._lock:
+            targets = sorted(self._targets | set(self._entries))
+        for kind, base_url in targets:
+            if self._stop.is_set():
+                break
+            try:
+                self._probe(kind, base_url)
+            except Exception:
+                self.mark(kind, base_url, False, source="probe_error")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.interval_sec)
+
+    def prober_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.prober_running():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="policy-router-health", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+
+PROVIDER_HEALTH = ProviderHealthCache()
+
+
+def _provider_health_target(provider):
+    ptype = provider.get("type")
+    if ptype == "ollama":
+        return "ollama", provider.get("baseUrl", "http://localhost:11434")
+    if ptype == "openai_compatible" and str(provider.get("provider_id", "")).strip().lower() == "local_vllm":
+        return "openai_compatible", provider.get("baseUrl", "")
+    return None
+
+
+class ResponseCache:
+    """TTL + LRU cache of successful routed responses with single-flight coalescing.
+
+    Keys come from ``response_cache_key``.  The first request for a key becomes
+    the leader and calls the provider; identical requests arriving while it is
+    in flight wait on the leader's ``Future`` instead of making their own call.
+    """
+
+    def __init__(self, ttl_sec=None, max_entries=None, wait_timeout_sec=None):
+        self.ttl_sec = float(ttl_sec or _coerce_positive_int(os.environ.get("OPENCLAW_ROUTER_CACHE_TTL_SEC"), 300))
+        self.max_entries = int(
+            max_entries or _coerce_positive_int(os.environ.get("OPENCLAW_ROUTER_CACHE_MAX_ENTRIES"), 512)
+        )
+        self.wait_timeout_sec = float(
+            wait_timeout_sec or _coerce_positive_int(os.environ.get("OPENCLAW_ROUTER_CACHE_WAIT_SEC"), 120)
+        )
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["stored_at"] > self.ttl_sec:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def begin(self, key):
+        """Return ``(is_leader, future)``; followers wait on ``future`` for the leader's entry."""
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return False, flight
+            flight = Future()
+            self._inflight[key] = flight
+            return True, flight
+
+    def complete(self, key, result=None):
+        """Store ``result`` (if any) and release followers; call exactly once per leader."""
+        entry = None
+        with self._lock:
+            if result is not None:
+                entry = {"result": dict(result), "stored_at": time.time()}
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            flight = self._inflight.pop(key, None)
+        if flight is not None and not flight.done():
+            flight.set_result(entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "inflight": len(self._inflight),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "ttl_sec": self.ttl_sec,
+                "max_entries": self.max_entries,
+            }
+
+
+RESPONSE_CACHE = None
+
+
+def _shared_response_cache():
+    global RESPONSE_CACHE
+    if RESPONSE_CACHE is None:
+        RESPONSE_CACHE = ResponseCache()
+    return RESPONSE_CACHE
+
+
+def response_cache_key(intent, provider, model_id, payload):
+    """(intent, provider, model, normalised payload hash, temperature) as a hashable key."""
+    body = dict(payload) if isinstance(payload, dict) else {"payload": payload}
+    temperature = body.pop("temperature", None)
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+    return (str(intent), str(provider), str(model_id or ""), digest, temperature)
+
+
 def _resolve_order(intent_cfg, policy):
     order = []
     for entry in intent_cfg.get("order", []):
@@ -1287,18 +1905,39 @@ class PolicyRouter:
         circuit_path=CIRCUIT_FILE,
         event_log=EVENT_LOG,
         handlers=None,
+        health=None,
+        response_cache=None,
     ):
         self.policy_path = policy_path
         self.budget_path = budget_path
         self.circuit_path = circuit_path
         self.event_log = event_log
         self.policy = load_policy(policy_path)
-        self.budget_state = load_budget_state(budget_path)
-        self.circuit_state = load_circuit_state(circuit_path)
+        self._budget_store = _state_store(budget_path, "budget")
+        self._circuit_store = _state_store(circuit_path, "circuit")
         self.handlers = handlers or {}
+        self.health = health or PROVIDER_HEALTH
         self.run_counts = {}
+        self._token_counters = {}
+        if response_cache is None and _flag_enabled("OPENCLAW_ROUTER_RESPONSE_CACHE"):
+            response_cache = _shared_response_cache()
+        self.response_cache = response_cache or None
+        if _flag_enabled("OPENCLAW_ROUTER_HEALTH_PROBER"):
+            self.start_health_prober()
         self._proprio_sampler = ProprioceptiveSampler() if _flag_enabled("OPENCLAW_ROUTER_PROPRIOCEPTION") and ProprioceptiveSampler else None
 
+    @property
+    def budget_state(self):
+        return self._budget_store.current_state()
+
+    @property
+    def circuit_state(self):
+        return self._circuit_store.current_state()
+
+    def flush_state(self, fsync=True):
+        self._budget_store.flush(fsync=fsync)
+        self._circuit_store.flush(fsync=fsync)
+
     def _intent_cfg(self, intent):
         intent = canonical_intent(intent)
         intents = self.policy.get("routing", {}).get("intents", {})
@@ -1365,6 +2004,17 @@ class PolicyRouter:
             return int(models[0].get("maxInputChars", 0))
         return 0
 
+    def _token_counter(self, name, model_id):
+        """Per-(provider, model) counter: exact tokenizer when configured, heuristic otherwise."""
+        if not callable(token_counter_for):
+            return None
+        key = (name, model_id)
+        counter = self._token_counters.get(key)
+        if counter is None:
+            counter = token_counter_for(self._provider_cfg(name), model_id)
+            self._token_counters[key] = counter
+        return counter
+
     def _provider_context_window_tokens(self, name):
         provider = self._provider_cfg(name)
         capabilities = provider.get("capabilities", {}) if isinstance(provider, dict) else {}
@@ -1441,12 +2091,12 @@ class PolicyRouter:
             return True, "remote_allowed_task_class"
         return False, "remote_task_class_disallowed"
 
-    def _apply_local_context_guard(self, *, payload, text, provider_name, request_id):
+    def _apply_local_context_guard(self, *, payload, text, provider_name, request_id, counter=None):
         limits = self._local_context_limits_for_provider(provider_name)
         hard = limits["hard_limit_tokens"]
         soft = limits["soft_limit_tokens"]
         overflow_policy = limits["overflow_policy"]
-        original_tokens = estimate_tokens(text)
+        original_tokens = counter.count_payload(payload) if counter is not None else estimate_tokens(text)
         original_chars = len(text)
         compression_margin_tokens = int(round(hard * 1.2))
         if original_tokens <= soft:
@@ -1498,7 +2148,7 @@ class PolicyRouter:
                 },
             }
 
-        compressed_text, info = _compress_text_preserving_structure(text, soft)
+        compressed_text, info = _compress_text_preserving_structure(text, soft, counter=counter)
         compressed_payload = _rewrite_payload_text(payload, compressed_text)
         _emit_envelope_event(
             "context.compressed",
@@ -1516,7 +2166,9 @@ class PolicyRouter:
             },
         )
 
-        compressed_tokens = estimate_tokens(compressed_text)
+        compressed_tokens = (
+            counter.count_payload(compressed_payload) if counter is not None else estimate_tokens(compressed_text)
+        )
         if compressed_tokens <= hard:
             return {
                 "ok": True,
@@ -1748,18 +2400,29 @@ class PolicyRouter:
             if not api_key:
                 return False, "missing_api_key"
 
-        if ptype == "ollama":
-            base = provider.get("baseUrl", "http://localhost:11434")
-            if not _ollama_reachable(base):
-                return False, "ollama_unreachable"
-
-        if ptype == "openai_compatible" and str(provider.get("provider_id", "")).strip().lower() == "local_vllm":
-            base = provider.get("baseUrl", "")
-            if not _openai_compatible_reachable(base):
-                return False, "local_vllm_unreachable"
+        target = _provider_health_target(provider)
+        if target is not None and not self.health.reachable(*target):
+            return False, "ollama_unreachable" if target[0] == "ollama" else "local_vllm_unreachable"
 
         return True, None
 
+    def _health_targets(self, names=None):
+        providers = self.policy.get("providers", {})
+        targets = {}
+        for name in names if names is not None else list(providers):
+            target = _provider_health_target(self._provider_cfg(name))
+            if target is not None:
+                targets[name] = target
+        return targets
+
+    def start_health_prober(self):
+        for kind, base_url in self._health_targets().values():
+            self.health.register(kind, base_url)
+        return self.health.start()
+
+    def provider_health(self, names=None):
+        return {name: self.health.snapshot(*target) for name, target in self._health_targets(names).items()}
+
     def _circuit_open(self, name, now):
         providers = self.circuit_state.get("providers", {})
         entry = providers.get(name, {})
@@ -1772,32 +2435,29 @@ class PolicyRouter:
         window = int(cfg.get("windowSec", 600))
         now = int(time.time())
 
-        providers = self.circuit_state.setdefault("providers", {})
-        entry = providers.setdefault(name, {"failures": 0, "firstFailureAt": now, "openUntil": 0})
+        providers = self.circuit_state.get("providers", {})
+        entry = dict(providers.get(name) or {"failures": 0, "firstFailureAt": now, "openUntil": 0})
         if now - entry.get("firstFailureAt", now) > window:
             entry["failures"] = 0
             entry["firstFailureAt"] = now
         entry["failures"] = entry.get("failures", 0) + 1
         if entry["failures"] >= threshold:
             entry["openUntil"] = now + cooldown
-        providers[name] = entry
-        save_circuit_state(self.circuit_state, self.circuit_path)
+        self._circuit_store.set_provider(name, entry)
 
     def _record_success(self, name):
-        providers = self.circuit_state.setdefault("providers", {})
-        if name in providers:
-            providers[name]["failures"] = 0
-            providers[name]["openUntil"] = 0
-            providers[name]["firstFailureAt"] = int(time.time())
-        save_circuit_state(self.circuit_state, self.circuit_path)
+        entry = self.circuit_state.get("providers", {}).get(name)
+        if not entry or (not entry.get("failures") and not entry.get("openUntil")):
+            return
+        self._circuit_store.set_provider(name, {**entry, "failures": 0, "openUntil": 0, "firstFailureAt": int(time.time())})
 
     def _budget_allows(self, intent, tier, est_tokens):
         budgets = self.policy.get("budgets", {})
         intent_budget = budgets.get("intents", {}).get(intent, {})
         tier_budget = budgets.get("tiers", {}).get(tier, {})
 
-        intent_state = self.budget_state.setdefault("intents", {}).setdefault(intent, {"calls": 0, "tokens": 0})
-        tier_state = self.budget_state.setdefault("tiers", {}).setdefault(tier, {"calls": 0, "tokens": 0})
+        intent_state = self.budget_state.get("intents", {}).get(intent) or {"calls": 0, "tokens": 0}
+        tier_state = self.budget_state.get("tiers", {}).get(tier) or {"calls": 0, "tokens": 0}
 
         if _budget_exhausted(int(intent_budget.get("dailyCallBudget", 0)), intent_state["calls"]):
             return False, "intent_call_budget_exhausted"
@@ -1879,13 +2539,7 @@ class PolicyRouter:
         return controls
 
     def _budget_consume(self, intent, tier, est_tokens):
-        intent_state = self.budget_state.setdefault("intents", {}).setdefault(intent, {"calls": 0, "tokens": 0})
-        tier_state = self.budget_state.setdefault("tiers", {}).setdefault(tier, {"calls": 0, "tokens": 0})
-        intent_state["calls"] += 1
-        intent_state["tokens"] += est_tokens
-        tier_state["calls"] += 1
-        tier_state["tokens"] += est_tokens
-        save_budget_state(self.budget_state, self.budget_path)
+        self._budget_store.add_usage(intent, tier, est_tokens)
 
     def select_model(self, intent, context_metadata=None):
         intent_cfg = self._intent_cfg(intent)
@@ -1979,9 +2633,140 @@ class PolicyRouter:
             "remote_routing_enabled": self._remote_routing_enabled(),
             "remote_allowlist_task_classes": self._remote_allowlist_task_classes(),
             "pipeline_stage": self._pipeline_stage_for_provider(chosen.get("provider") if chosen else None),
+            "provider_health": self.provider_health(order),
+            "health_prober_running": self.health.prober_running(),
         }
 
+    def _dispatch_provider(self, name, provider, model_id, payload, runtime_context):
+        try:
+            handler = self.handlers.get(name)
+            if handler:
+                result = handler(payload, model_id, runtime_context)
+            else:
+                ptype = provider.get("type")
+                if ptype == "openai_compatible":
+                    api_key = None
+                    if provider.get("auth") == "qwen_oauth":
+                        api_key, _ = get_qwen_token()
+                    else:
+                        api_key_env = _provider_api_key_env(provider)
+                        if api_key_env:
+                            api_key = read_env_or_secrets(api_key_env)
+                    provider_caps = resolve_tool_call_capability(provider, model_id)
+                    result = _call_openai_compatible(
+                        provider.get("baseUrl", ""),
+                        api_key,
+                        model_id,
+                        payload,
+                        provider_caps=provider_caps,
+                    )
+                elif ptype == "anthropic":
+                    api_key = read_env_or_secrets(provider.get("apiKeyEnv", ""))
+                    result = _call_anthropic(provider.get("baseUrl", ""), api_key, model_id, payload)
+                elif ptype == "ollama":
+                    base = provider.get("baseUrl", "http://localhost:11434")
+                    result = _call_ollama(base, model_id, payload)
+                elif ptype == "openai_auth" or ptype == "anthropic_auth":
+                    result = {"ok": False, "reason_code": "auth_login_required"}
+                else:
+                    result = {"ok": False, "reason_code": "provider_unhandled"}
+        except Exception as exc:
+            result = {"ok": False, "reason_code": f"provider_exception_{type(exc).__name__}", "error": str(exc)}
+        return result
+
+    async def _dispatch_provider_async(self, name, provider, model_id, payload, runtime_context):
+        handler = self.handlers.get(name)
+        if handler and asyncio.iscoroutinefunction(handler):
+            try:
+                return await handler(payload, model_id, runtime_context)
+            except Exception as exc:
+                return {"ok": False, "reason_code": f"provider_exception_{type(exc).__name__}", "error": str(exc)}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _dispatch_executor(),
+            self._dispatch_provider,
+            name,
+            provider,
+            model_id,
+            payload,
+            runtime_context,
+        )
+
+    def _await_flight(self, flight):
+        try:
+            return flight.result(timeout=self.response_cache.wait_timeout_sec)
+        except FutureTimeoutError:
+            return None
+
+    async def _await_flight_async(self, flight):
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(flight), self.response_cache.wait_timeout_sec)
+        except asyncio.TimeoutError:
+            return None
+
     def execute_with_escalation(self, intent, payload, context_metadata=None, validate_fn=None):
+        steps = self._escalation_steps(intent, payload, context_metadata, validate_fn)
+        try:
+            call = next(steps)
+            while True:
+                if isinstance(call, Future):
+                    call = steps.send(self._await_flight(call))
+                else:
+                    call = steps.send(self._dispatch_provider(*call))
+        except StopIteration as stop:
+            return stop.value
+
+    async def execute_with_escalation_async(self, intent, payload, context_metadata=None, validate_fn=None):
+        """Asyncio variant of ``execute_with_escalation``.
+
+        Routing gates run on the event loop; provider calls go to coroutine
+        handlers directly or to the shared bounded I/O pool, so many routed
+        requests can be in flight without a thread per request. The gates
+        never do network I/O: reachability comes from ``ProviderHealthCache``
+        memory, and any probe it needs runs on its own thread.
+        """
+        steps = self._escalation_steps(intent, payload, context_metadata, validate_fn)
+        try:
+            call = next(steps)
+            while True:
+                if isinstance(call, Future):
+                    call = steps.send(await self._await_flight_async(call))
+                else:
+                    call = steps.send(await self._dispatch_provider_async(*call))
+        except StopIteration as stop:
+            return stop.value
+
+    def _escalation_steps(self, intent, payload, context_metadata=None, validate_fn=None):
+        """Escalation loop as a generator: yields provider calls, receives their results.
+
+        With a response cache, a step may instead yield the ``Future`` of an
+        identical in-flight request and receive its cache entry (or ``None``).
+        """
+        flights = set()
+        try:
+            return (yield from self._escalation_loop(intent, payload, context_metadata, validate_fn, flights))
+        finally:
+            self._release_flights(flights)
+
+    def _release_flights(self, flights):
+        while flights:
+            self.response_cache.complete(flights.pop())
+
+    def _cached_response(self, entry, validate_fn):
+        text_out = str((entry or {}).get("result", {}).get("text", "") or "")
+        if not text_out.strip():
+            return None
+        parsed = None
+        if validate_fn:
+            try:
+                parsed = validate_fn(text_out)
+            except Exception:
+                parsed = None
+            if not parsed:
+                return None
+        return text_out, parsed
+
+    def _escalation_loop(self, intent, payload, context_metadata, validate_fn, flights):
         intent_cfg = self._intent_cfg(intent)
         attempts = 0
         last_reason = None
@@ -2041,6 +2826,7 @@ class PolicyRouter:
         context_guard_snapshot = None
 
         for name in order:
+            self._release_flights(flights)
             provider_start = time.perf_counter()
             if max_per_run and self.run_counts[budget_intent] >= max_per_run:
                 last_reason = "max_calls_per_run_exhausted"
@@ -2159,12 +2945,14 @@ class PolicyRouter:
                 _emit("router_skip", {"intent": intent, "provider": name, "reason_code": last_reason})
                 continue
 
+            counter = self._token_counter(name, model_id)
             if is_local_provider:
                 guard = self._apply_local_context_guard(
                     payload=candidate_payload,
                     text=text,
                     provider_name=name,
                     request_id=request_id,
+                    counter=counter,
                 )
                 if not guard.get("ok"):
                     context_needs_remote = bool(guard.get("requires_remote"))
@@ -2177,7 +2965,48 @@ class PolicyRouter:
                 text = guard.get("text", text)
                 context_guard_snapshot = guard.get("context", {})
 
-            est_tokens = estimate_tokens(text)
+            est_tokens = counter.count_payload(candidate_payload) if counter is not None else estimate_tokens(text)
+            cache_key = None
+            if self.response_cache is not None and runtime_context.get("cache", True) is not False:
+                cache_key = response_cache_key(intent, name, model_id, candidate_payload)
+                entry = self.response_cache.get(cache_key)
+                coalesced = False
+                if entry is None:
+                    leader, flight = self.response_cache.begin(cache_key)
+                    if leader:
+                        flights.add(cache_key)
+                    else:
+                        entry = yield flight
+                        coalesced = entry is not None
+                cached = self._cached_response(entry, validate_fn) if entry is not None else None
+                if cached is not None:
+                    text_out, parsed = cached
+                    _emit(
+                        "router_cache_hit",
+                        {
+                            "intent": intent,
+                            "provider": name,
+                            "model": model_id,
+                            "tier": tier,
+                            "coalesced": coalesced,
+                            "age_ms": int((time.time() - entry["stored_at"]) * 1000),
+                            "tokens_saved": est_tokens,
+                        },
+                    )
+                    return {
+                        "ok": True,
+                        "provider": name,
+                        "model": model_id,
+                        "text": text_out,
+                        "parsed": parsed,
+                        "attempts": attempts,
+                        "reason_code": "success",
+                        "request_id": request_id,
+                        "capability_class": capability_class,
+                        "pipeline_stage": self._pipeline_stage_for_provider(name),
+                        "tacti": None,
+                        "cached": True,
+                    }
             max_tokens_req = int(
                 intent_cfg.get(
                     "maxTokensPerRequest",
@@ -2229,43 +3058,15 @@ class PolicyRouter:
 
             started_at = time.perf_counter()
 
-            # handler dispatch
-            try:
-                handler = self.handlers.get(name)
-                if handler:
-                    result = handler(candidate_payload, model_id, runtime_context)
-                else:
-                    ptype = provider.get("type")
-                    if ptype == "openai_compatible":
-                        api_key = None
-                        if provider.get("auth") == "qwen_oauth":
-                            api_key, _ = get_qwen_token()
-                        else:
-                            api_key_env = _provider_api_key_env(provider)
-                            if api_key_env:
-                                api_key = read_env_or_secrets(api_key_env)
-                        provider_caps = resolve_tool_call_capability(provider, model_id)
-                        result = _call_openai_compatible(
-                            provider.get("baseUrl", ""),
-                            api_key,
-                            model_id,
-                            candidate_payload,
-                            provider_caps=provider_caps,
-                        )
-                    elif ptype == "anthropic":
-                        api_key = read_env_or_secrets(provider.get("apiKeyEnv", ""))
-                        result = _call_anthropic(provider.get("baseUrl", ""), api_key, model_id, candidate_payload)
-                    elif ptype == "ollama":
-                        base = provider.get("baseUrl", "http://localhost:11434")
-                        result = _call_ollama(base, model_id, candidate_payload)
-                    elif ptype == "openai_auth" or ptype == "anthropic_auth":
-                        result = {"ok": False, "reason_code": "auth_login_required"}
-                    else:
-                        result = {"ok": False, "reason_code": "provider_unhandled"}
-            except Exception as exc:
-                result = {"ok": False, "reason_code": f"provider_exception_{type(exc).__name__}", "error": str(exc)}
+            result = yield name, provider, model_id, candidate_payload, runtime_context
 
             latency_ms = int((time.perf_counter() - started_at) * 1000)
+            health_target = _provider_health_target(provider)
+            if health_target is not None:
+                if result.get("ok"):
+                    self.health.mark(*health_target, True)
+                elif result.get("reason_code") == "request_conn_error":
+                    self.health.mark(*health_target, False)
 
             if not result.get("ok"):
                 reason_code = result.get("reason_code", "provider_error")
@@ -2394,6 +3195,9 @@ class PolicyRouter:
                     continue
 
             self._record_success(circuit_key)
+            if cache_key in flights:
+                flights.discard(cache_key)
+                self.response_cache.complete(cache_key, {"text": text_out})
             _emit(
                 "router_success",
                 {
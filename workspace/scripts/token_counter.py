@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Token counting for router budgets and local context guards.
+
+``HeuristicCounter`` keeps the historical ``(chars + 200) // 4`` estimate and is
+always available.  ``TokenizerCounter`` wraps a Hugging Face ``tokenizer.json``
+(via the optional ``tokenizers`` package) and counts each prompt/message chunk
+once: counts are memoized by content digest, so a multi-turn payload that grows
+by one message only tokenizes the new turn.
+
+Tokenizers are resolved per provider model, first match wins:
+
+1. ``models[].tokenizer`` on the model entry (path to ``tokenizer.json``)
+2. ``capabilities.tokenizer_env`` (env var holding a path) / ``capabilities.tokenizer``
+3. ``$OPENCLAW_TOKENIZER_DIR/<model_id>/tokenizer.json`` (``/`` and ``:`` in the
+   model id map to ``__``)
+
+Anything missing or unloadable falls back to the heuristic counter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    from tokenizers import Tokenizer
+except Exception:  # pragma: no cover - optional dependency
+    Tokenizer = None
+
+CHUNK_CACHE_SIZE = 8192
+# Chat templates add role/separator tokens around every turn; 4 per message plus
+# 3 for the assistant primer is the usual accounting for ChatML-style models.
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMER_TOKENS = 3
+
+
+def heuristic_tokens(text: str) -> int:
+    return max(1, (len(text) + 200) // 4)
+
+
+def _payload_chunks(payload: Any) -> tuple[list[str], bool]:
+    """Return (text chunks, is_chat) in the same order ``_extract_text_from_payload`` reads them."""
+    if not isinstance(payload, dict):
+        return [], False
+    if isinstance(payload.get("prompt"), str):
+        return [payload["prompt"]], False
+    messages = payload.get("messages")
+    if isinstance(messages, list):
+        chunks = []
+        for msg in messages:
+            content = msg.get("content") if isinstance(msg, dict) else None
+            if isinstance(content, str):
+                chunks.append(content)
+        return chunks, True
+    return [], False
+
+
+class HeuristicCounter:
+    name = "heuristic"
+    exact = False
+
+    def count_text(self, text: str) -> int:
+        return heuristic_tokens(str(text or ""))
+
+    def count_payload(self, payload: Any) -> int:
+        chunks, _ = _payload_chunks(payload)
+        return heuristic_tokens("\n".join(chunks))
+
+    def chars_per_token(self, text: str) -> float:
+        return 4.0
+
+    def stats(self) -> dict[str, Any]:
+        return {"name": self.name, "exact": self.exact}
+
+
+class TokenizerCounter:
+    """Exact counts from an ``encode(text) -> int`` callable, memoized per chunk."""
+
+    exact = True
+
+    def __init__(
+        self,
+        encode: Callable[[str], int],
+        *,
+        name: str,
+        cache_size: int = CHUNK_CACHE_SIZE,
+        message_overhead: int = MESSAGE_OVERHEAD_TOKENS,
+        reply_primer: int = REPLY_PRIMER_TOKENS,
+    ) -> None:
+        self._encode = encode
+        self.name = name
+        self.cache_size = max(1, int(cache_size))
+        self.message_overhead = max(0, int(message_overhead))
+        self.reply_primer = max(0, int(reply_primer))
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def count_text(self, text: str) -> int:
+        text = str(text or "")
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        count = int(self._encode(text))
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = count
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def count_payload(self, payload: Any) -> int:
+        chunks, is_chat = _payload_chunks(payload)
+        total = sum(self.count_text(chunk) for chunk in chunks)
+        if is_chat and chunks:
+            total += self.message_overhead * len(chunks) + self.reply_primer
+        return max(1, total)
+
+    def chars_per_token(self, text: str) -> float:
+        text = str(text or "")
+        tokens = self.count_text(text)
+        return len(text) / tokens if tokens else 4.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "exact": self.exact,
+            "cached_chunks": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+HEURISTIC = HeuristicCounter()
+_LOADED: dict[str, Any] = {}
+_LOADED_LOCK = threading.Lock()
+
+
+def load_tokenizer_counter(path: Path | str) -> TokenizerCounter | None:
+    """Load (once per path) a ``tokenizer.json``; ``None`` when unavailable."""
+    key = os.path.abspath(os.path.expanduser(str(path)))
+    with _LOADED_LOCK:
+        if key in _LOADED:
+            return _LOADED[key]
+    counter = None
+    if Tokenizer is not None and os.path.isfile(key):
+        try:
+            tokenizer = Tokenizer.from_file(key)
+            counter = TokenizerCounter(
+                lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids),
+                name=f"tokenizers:{Path(key).parent.name or Path(key).name}",
+            )
+        except Exception:
+            counter = None
+    with _LOADED_LOCK:
+        _LOADED.setdefault(key, counter)
+        return _LOADED[key]
+
+
+def _model_dir_name(model_id: str) -> str:
+    return str(model_id).replace("/", "__").replace(":", "__")
+
+
+def tokenizer_path_for(provider: dict | None, model_id: str | None) -> Path | None:
+    provider = provider if isinstance(provider, dict) else {}
+    for model in provider.get("models", []) or []:
+        if isinstance(model, dict) and model.get("id") == model_id and model.get("tokenizer"):
+            return Path(str(model["tokenizer"])).expanduser()
+    capabilities = provider.get("capabilities", {})
+    capabilities = capabilities if isinstance(capabilities, dict) else {}
+    env_key = capabilities.get("tokenizer_env")
+    if env_key and os.environ.get(str(env_key)):
+        return Path(os.environ[str(env_key)]).expanduser()
+    if capabilities.get("tokenizer"):
+        return Path(str(capabilities["tokenizer"])).expanduser()
+    root = os.environ.get("OPENCLAW_TOKENIZER_DIR")
+    if root and model_id:
+        candidate = Path(root).expanduser() / _model_dir_name(model_id) / "tokenizer.json"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def counter_for(provider: dict | None, model_id: str | None):
+    path = tokenizer_path_for(provider, model_id)
+    if path is None:
+        return HEURISTIC
+    return load_tokenizer_counter(path) or HEURISTIC
@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .jsonl_tail import iter_lines_reversed
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
 KB_DATA_DIR = REPO_ROOT / "workspace" / "knowledge_base" / "data"
 DISCORD_MEMORY_PATH = KB_DATA_DIR / "discord_messages.jsonl"
@@ -180,16 +182,11 @@ def build_discord_memory_context(
 ) -> list[str]:
     if not DISCORD_MEMORY_PATH.exists():
         return []
-    try:
-        rows = DISCORD_MEMORY_PATH.read_text(encoding="utf-8").splitlines()
-    except Exception:
-        return []
-
     target_author = str(author_name or "").strip().lower()
     target_channel_id = int(channel_id)
     selected: list[str] = []
     seen: set[str] = set()
-    for raw in reversed(rows):
+    for raw in iter_lines_reversed(DISCORD_MEMORY_PATH):
         raw = raw.strip()
         if not raw:
             continue
@@ -0,0 +1,235 @@
+"""Change-detection cache for values derived from files on disk.
+
+Every cached value is keyed on the ``(st_mtime_ns, st_size)`` of its input
+paths, so it is recomputed only when one of those inputs changes.  The
+process shares one ``FileSignalCache``.  Each call stats the inputs, which
+costs the same whatever the file size.  With ``OPENCLAW_SOURCE_UI_INOTIFY=1``
+and the optional ``inotify_simple`` package, a watcher thread marks paths
+dirty instead and clean paths are not even stat'ed.
+
+``text(path)`` returns a ``TextProbe``: ``needle in probe`` answers substring
+checks from a per-file memo and reads the file only for needles not seen since
+its last change.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except Exception:  # pragma: no cover - optional dependency
+    INotify = None
+    inotify_flags = None
+
+_MISSING = object()
+
+
+def stat_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class TextProbe:
+    """Substring membership over a file's text, memoized per needle."""
+
+    __slots__ = ("path", "signature", "_text", "_hits", "_lock")
+
+    def __init__(self, path: Path, signature: tuple[int, int] | None) -> None:
+        self.path = path
+        self.signature = signature
+        self._text: str | None = None
+        self._hits: dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, needle: str) -> bool:
+        hit = self._hits.get(needle)
+        if hit is None:
+            with self._lock:
+                if self._text is None:
+                    self._text = _read_text(self.path)
+                hit = needle in self._text
+                self._hits[needle] = hit
+        return hit
+
+    def release(self) -> None:
+        """Drop the file text; memoized answers stay valid until the file changes."""
+        self._text = None
+
+
+def _read_text(path: Path) -> str:
+    try:
+        return Path(path).read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return ""
+
+
+class _Watcher(threading.Thread):
+    def __init__(self, cache: "FileSignalCache") -> None:
+        super().__init__(name="source-ui-file-signals", daemon=True)
+        self.cache = cache
+        self.inotify = INotify()
+        self.mask = (
+            inotify_flags.MODIFY
+            | inotify_flags.CLOSE_WRITE
+            | inotify_flags.ATTRIB
+            | inotify_flags.CREATE
+            | inotify_flags.DELETE
+            | inotify_flags.MOVED_FROM
+            | inotify_flags.MOVED_TO
+        )
+        self._dirs: dict[int, Path] = {}
+        self._watched: set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def watch(self, path: Path) -> bool:
+        directory = Path(path).parent
+        key = str(directory)
+        with self._lock:
+            if key in self._watched:
+                return True
+            try:
+                wd = self.inotify.add_watch(key, self.mask)
+            except OSError:
+                return False
+            self._dirs[wd] = directory
+            self._watched.add(key)
+        return True
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                events = self.inotify.read(timeout=500)
+            except Exception:
+                self.cache.invalidate_all()
+                return
+            for event in events:
+                directory = self._dirs.get(event.wd)
+                if directory is not None:
+                    self.cache.invalidate(directory / event.name if event.name else directory)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class FileSignalCache:
+    def __init__(self) -> None:
+        self._signatures: dict[str, Any] = {}
+        self._values: dict[str, tuple[tuple, Any]] = {}
+        self._probes: dict[str, TextProbe] = {}
+        self._lock = threading.Lock()
+        self._watcher: _Watcher | None = None
+        self.recomputes = 0
+        self.hits = 0
+
+    # -- invalidation ----------------------------------------------------
+
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def start_watcher(self) -> bool:
+        """Start inotify invalidation; False when ``inotify_simple`` is unavailable."""
+        if INotify is None:
+            return False
+        if self.watching():
+            return True
+        try:
+            watcher = _Watcher(self)
+        except OSError:
+            return False
+        self.invalidate_all()
+        self._watcher = watcher
+        watcher.start()
+        return True
+
+    def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher.join(2.0)
+        self._watcher = None
+        self.invalidate_all()
+
+    def invalidate(self, path: Path) -> None:
+        key = str(path)
+        with self._lock:
+            self._signatures.pop(key, None)
+            # A directory event also covers signatures taken of the directory itself.
+            self._signatures.pop(str(Path(path).parent), None)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._signatures.clear()
+
+    # -- lookups ---------------------------------------------------------
+
+    def signature(self, path: Path) -> tuple[int, int] | None:
+        key = str(path)
+        watcher = self._watcher
+        if watcher is not None and watcher.is_alive():
+            with self._lock:
+                cached = self._signatures.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+            if not watcher.watch(Path(path)):
+                return stat_signature(Path(path))
+            sig = stat_signature(Path(path))
+            with self._lock:
+                self._signatures[key] = sig
+            return sig
+        return stat_signature(Path(path))
+
+    def derive(self, key: str, inputs: Iterable[Path], compute: Callable[[], Any]) -> Any:
+        """Return ``compute()``, re-running it only when an input path changed."""
+        sig = tuple((str(path), self.signature(path)) for path in inputs)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                return entry[1]
+        value = compute()
+        with self._lock:
+            self._values[key] = (sig, value)
+            self.recomputes += 1
+        return value
+
+    def text(self, path: Path) -> TextProbe:
+        key = str(path)
+        sig = self.signature(path)
+        with self._lock:
+            probe = self._probes.get(key)
+            if probe is None or probe.signature != sig:
+                probe = TextProbe(Path(path), sig)
+                self._probes[key] = probe
+                self.recomputes += 1
+            else:
+                self.hits += 1
+        return probe
+
+    def clear(self) -> None:
+        with self._lock:
+            self._signatures.clear()
+            self._values.clear()
+            self._probes.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "values": len(self._values),
+                "texts": len(self._probes),
+                "hits": self.hits,
+                "recomputes": self.recomputes,
+                "watching": self.watching(),
+            }
+
+
+FILE_SIGNALS = FileSignalCache()
+
+if str(os.environ.get("OPENCLAW_SOURCE_UI_INOTIFY", "")).strip().lower() in {"1", "true", "yes", "on"}:
+    FILE_SIGNALS.start_watcher()
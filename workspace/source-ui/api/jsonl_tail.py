@@ -0,0 +1,272 @@
+"""Tail readers for append-only JSONL logs.
+
+The last N lines are found by seeking backward from EOF in blocks, so the
+cost depends on N and not on the file size.  ``TailCache`` remembers the byte
+offset it has read up to, together with the lines and parsed rows it kept.
+A repeated poll of the same file therefore reads and parses only the bytes
+appended since the previous call.  The cache starts over when the file is
+replaced, truncated or rewritten in place.
+
+Lines are split on ``\\n`` only (``\\r\\n`` is accepted).  Blank lines still count
+towards ``limit``, the same as ``splitlines()[-limit:]``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Iterator
+
+BLOCK_SIZE = 64 * 1024
+TAIL_CACHE_MAX_LINES = 20000
+TAIL_CACHE_MAX_FILES = 64
+_CHECK_BYTES = 256
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore").rstrip("\r")
+
+
+def _parse(line: str) -> dict[str, Any] | None:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        payload = json.loads(line)
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _iter_raw_reversed(fh, end: int) -> Iterator[bytes]:
+    """Yield the newline-separated records in ``fh[:end]``, last first."""
+    pos = end
+    carry = b""
+    while pos > 0:
+        step = min(BLOCK_SIZE, pos)
+        pos -= step
+        fh.seek(pos)
+        block = fh.read(step) + carry
+        parts = block.split(b"\n")
+        carry = parts[0]
+        for raw in reversed(parts[1:]):
+            yield raw
+    yield carry
+
+
+def _complete_end(fh, size: int) -> int:
+    """Offset just past the last ``\\n`` (0 when the file has none)."""
+    pos = size
+    while pos > 0:
+        step = min(BLOCK_SIZE, pos)
+        pos -= step
+        fh.seek(pos)
+        index = fh.read(step).rfind(b"\n")
+        if index >= 0:
+            return pos + index + 1
+    return 0
+
+
+def iter_lines_reversed(path: Path) -> Iterator[str]:
+    """Lines of ``path`` from the last one backwards, read lazily from EOF."""
+    try:
+        fh = open(path, "rb")
+    except OSError:
+        return
+    with fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size <= 0:
+            return
+        records = _iter_raw_reversed(fh, size)
+        first = True
+        for raw in records:
+            if first:
+                first = False
+                if not raw:  # a trailing newline does not start another line
+                    continue
+            yield _decode(raw)
+
+
+def iter_jsonl_reversed(path: Path) -> Iterator[dict[str, Any]]:
+    """JSON object rows of ``path``, newest first; blank and invalid lines are skipped."""
+    for line in iter_lines_reversed(path):
+        row = _parse(line)
+        if row is not None:
+            yield row
+
+
+class _Tail:
+    __slots__ = ("ident", "offset", "check", "lines", "rows", "complete")
+
+    def __init__(self, ident: tuple[int, int], capacity: int) -> None:
+        self.ident = ident
+        self.offset = 0
+        self.check = b""
+        self.lines: deque[str] = deque(maxlen=capacity)
+        self.rows: deque[dict[str, Any] | None] = deque(maxlen=capacity)
+        # True when ``lines`` holds every complete line of the file.
+        self.complete = False
+
+    @property
+    def capacity(self) -> int:
+        return int(self.lines.maxlen or 0)
+
+    def push(self, line: str) -> None:
+        self.lines.append(line)
+        self.rows.append(_parse(line))
+        if len(self.lines) == self.lines.maxlen:
+            self.complete = False
+
+
+class TailCache:
+    def __init__(self, *, max_files: int = TAIL_CACHE_MAX_FILES, max_lines: int = TAIL_CACHE_MAX_LINES) -> None:
+        self.max_files = max_files
+        self.max_lines = max_lines
+        self._tails: OrderedDict[str, _Tail] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.rebuilds = 0
+        self.appended_bytes = 0
+
+    def _refresh(self, path: Path, limit: int) -> tuple[_Tail, str | None] | None:
+        """Bring the cached tail of ``path`` up to date.
+
+        Returns the entry plus the text after the last newline (a line that
+        is still being written), or None when the file cannot be read.
+        """
+        try:
+            fh = open(path, "rb")
+        except OSError:
+            return None
+        with fh:
+            st = os.fstat(fh.fileno())
+            ident = (st.st_dev, st.st_ino)
+            key = str(path)
+            end = _complete_end(fh, st.st_size)
+            entry = self._tails.get(key)
+            if entry is not None and not self._still_valid(fh, entry, ident, end, limit):
+                entry = None
+            if entry is None:
+                entry = self._rebuild(fh, ident, end, max(limit, 1))
+                self._tails[key] = entry
+                self.rebuilds += 1
+            else:
+                if end > entry.offset:
+                    fh.seek(entry.offset)
+                    data = fh.read(end - entry.offset)
+                    self.appended_bytes += len(data)
+                    for raw in data.split(b"\n")[:-1]:
+                        entry.push(_decode(raw))
+                    entry.offset = end
+                    entry.check = (entry.check[-_CHECK_BYTES:] + data[-_CHECK_BYTES:])[-_CHECK_BYTES:]
+                self.hits += 1
+            self._tails.move_to_end(key)
+            while len(self._tails) > self.max_files:
+                self._tails.popitem(last=False)
+            partial = None
+            if st.st_size > end:
+                fh.seek(end)
+                partial = _decode(fh.read(st.st_size - end))
+        return entry, partial
+
+    @staticmethod
+    def _still_valid(fh, entry: _Tail, ident: tuple[int, int], end: int, limit: int) -> bool:
+        if entry.ident != ident or end < entry.offset:
+            return False
+        if not entry.complete and entry.capacity < limit:
+            return False
+        if entry.check:
+            fh.seek(entry.offset - len(entry.check))
+            if fh.read(len(entry.check)) != entry.check:
+                return False
+        return True
+
+    def _rebuild(self, fh, ident: tuple[int, int], end: int, limit: int) -> _Tail:
+        entry = _Tail(ident, min(max(limit, 1), self.max_lines))
+        taken: list[str] = []
+        reached_start = True
+        if end > 0:
+            records = _iter_raw_reversed(fh, end)
+            next(records)  # the empty record after the final newline
+            for raw in records:
+                if len(taken) >= entry.capacity:
+                    reached_start = False
+                    break
+                taken.append(_decode(raw))
+        for line in reversed(taken):
+            entry.push(line)
+        entry.complete = reached_start
+        entry.offset = end
+        if end > 0:
+            fh.seek(max(0, end - _CHECK_BYTES))
+            entry.check = fh.read(end - max(0, end - _CHECK_BYTES))
+        return entry
+
+    def lines(self, path: Path, limit: int) -> list[str]:
+        limit = max(1, int(limit))
+        if limit > self.max_lines:
+            return _uncached_tail(path, limit)
+        with self._lock:
+            result = self._refresh(Path(path), limit)
+            if result is None:
+                return []
+            entry, partial = result
+            lines = list(entry.lines)
+        if partial is not None:
+            lines.append(partial)
+        return lines[-limit:]
+
+    def rows(self, path: Path, limit: int) -> list[dict[str, Any]]:
+        """Rows parsed from the last ``limit`` lines, oldest first (shallow copies)."""
+        limit = max(1, int(limit))
+        if limit > self.max_lines:
+            return [row for row in (_parse(line) for line in _uncached_tail(path, limit)) if row is not None]
+        with self._lock:
+            result = self._refresh(Path(path), limit)
+            if result is None:
+                return []
+            entry, partial = result
+            rows = list(entry.rows)
+        if partial is not None:
+            rows.append(_parse(partial))
+        return [dict(row) for row in rows[-limit:] if row is not None]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tails.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._tails),
+                "lines": sum(len(entry.lines) for entry in self._tails.values()),
+                "hits": self.hits,
+                "rebuilds": self.rebuilds,
+                "appended_bytes": self.appended_bytes,
+            }
+
+
+def _uncached_tail(path: Path, limit: int) -> list[str]:
+    lines: list[str] = []
+    for line in iter_lines_reversed(path):
+        lines.append(line)
+        if len(lines) >= limit:
+            break
+    lines.reverse()
+    return lines
+
+
+TAIL_CACHE = TailCache()
+
+
+def tail_lines(path: Path, limit: int = 80) -> list[str]:
+    """Last ``limit`` lines of ``path`` (oldest first); ``[]`` when it is missing."""
+    return TAIL_CACHE.lines(path, limit)
+
+
+def tail_jsonl(path: Path, limit: int = 200) -> list[dict[str, Any]]:
+    """JSON object rows among the last ``limit`` lines of ``path`` (oldest first)."""
+    return TAIL_CACHE.rows(path, limit)
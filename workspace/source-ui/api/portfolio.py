@@ -26,6 +26,7 @@ from .boundary_state import (
 )
 from .deliberation_store import load_deliberation_summary
 from .discord_bridge import bridge_payload as discord_bridge_payload
+from .jsonl_tail import tail_jsonl, tail_lines
 from .research_promotions import list_research_items
 from .sim_review import load_or_build_sim_strategy_review
 from .task_store import load_all_tasks, load_runtime_source_health
@@ -124,26 +125,11 @@ def _read_text(path: Path) -> str | None:
 
 
 def _read_jsonl(path: Path, limit: int = 50) -> list[dict[str, Any]]:
-    if not path.exists() or not path.is_file():
-        return []
-    rows: list[dict[str, Any]] = []
-    for raw in path.read_text(encoding="utf-8", errors="ignore").splitlines()[-max(1, int(limit)) :]:
-        raw = raw.strip()
-        if not raw:
-            continue
-        try:
-            payload = json.loads(raw)
-        except Exception:
-            continue
-        if isinstance(payload, dict):
-            rows.append(payload)
-    return rows
+    return tail_jsonl(path, limit)
 
 
 def _tail_lines(path: Path, limit: int = 80) -> list[str]:
-    if not path.exists() or not path.is_file():
-        return []
-    return path.read_text(encoding="utf-8", errors="ignore").splitlines()[-max(1, int(limit)) :]
+    return tail_lines(path, limit)
 
 
 def _format_ts(path: Path | None) -> str | None:
@@ -8,6 +8,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .jsonl_tail import iter_lines_reversed
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
 PAUSE_CHECK_LOG_PATH = REPO_ROOT / "workspace" / "state" / "pause_check_log.jsonl"
 PHI_METRICS_PATH = REPO_ROOT / "workspace" / "governance" / "phi_metrics.md"
@@ -43,11 +45,16 @@ def _read_pause_check(limit: int) -> list[dict[str, Any]]:
     if not PAUSE_CHECK_LOG_PATH.exists():
         return []
     rows: list[dict[str, Any]] = []
+    lines: list[str] = []
     try:
-        lines = [line for line in PAUSE_CHECK_LOG_PATH.read_text(encoding="utf-8", errors="ignore").splitlines() if line.strip()]
+        for line in iter_lines_reversed(PAUSE_CHECK_LOG_PATH):
+            if line.strip():
+                lines.append(line)
+                if len(lines) >= max(1, int(limit)):
+                    break
     except Exception as exc:
         return [{"error": str(exc)}]
-    for line in lines[-max(1, int(limit)) :]:
+    for line in reversed(lines):
         try:
             row = json.loads(line)
         except Exception:
@@ -15,6 +15,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .jsonl_tail import tail_jsonl
+
 REPO_ROOT = Path(__file__).resolve().parents[3]
 WORKSPACE_ROOT = REPO_ROOT / "workspace"
 REPORTS_ROOT = REPO_ROOT / "reports"
@@ -93,20 +95,7 @@ def _read_json(path: Path) -> Any | None:
 
 
 def _read_jsonl(path: Path, limit: int = 20) -> list[dict[str, Any]]:
-    if not path.exists() or not path.is_file():
-        return []
-    rows: list[dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines()[-max(1, int(limit)) :]:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            payload = json.loads(line)
-        except Exception:
-            continue
-        if isinstance(payload, dict):
-            rows.append(payload)
-    return rows
+    return tail_jsonl(path, limit)
 
 
 def _safe_ratio(numerator: float, denominator: float) -> float:
@@ -504,11 +493,12 @@ def get_trails_status(limit: int = 20) -> dict[str, Any]:
 
     store = TrailStore()
     snapshot = store.snapshot()
-    trails_path = Path(str(snapshot.get("path", "")))
-    rows = _read_jsonl(trails_path, limit=max(200, int(limit) * 5))
+    # Reinforcements live in the deltas file and decay is applied at read time,
+    # so strengths come from the store rather than the raw trails file.
+    rows = store.recent(max(200, int(limit) * 5))
     recent = rows[-max(1, int(limit)) :]
 
-    strengths = [float(row.get("strength", 0.0)) for row in rows] if rows else []
+    strengths = [float(row.get("effective_strength", 0.0)) for row in rows] if rows else []
     if strengths:
         strength_summary = {
             "min": round(min(strengths), 6),
@@ -526,7 +516,7 @@ def get_trails_status(limit: int = 20) -> dict[str, Any]:
                 "trail_id": str(row.get("trail_id", "")),
                 "text": text[:180],
                 "tags": [str(x) for x in row.get("tags", []) if str(x)][:8],
-                "strength": float(row.get("strength", 0.0)),
+                "strength": round(float(row.get("effective_strength", 0.0)), 6),
                 "updated_at": str(row.get("updated_at") or row.get("created_at") or ""),
             }
         )
@@ -0,0 +1,334 @@
+"""SQLite (WAL) backing store for Source UI tasks.
+
+Active and archived tasks live in one ``tasks`` table.  Each row stores the
+task JSON plus indexed columns (status, assignee, project, archived) so that
+filters and pages are answered by SQLite instead of parsing every task.
+``sync_active`` writes only rows whose JSON or position changed, and ids come
+from a stored sequence rather than a scan of the task lists.  On first open
+the database imports ``tasks.json`` and ``archived_tasks.json`` once.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+SCHEMA_VERSION = 1
+FIRST_TASK_ID = 1001
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT '',
+    assignee TEXT NOT NULL DEFAULT '',
+    assignee_key TEXT NOT NULL DEFAULT '',
+    project TEXT NOT NULL DEFAULT '',
+    archived INTEGER NOT NULL DEFAULT 0,
+    archived_at TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_active_position ON tasks(archived, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(archived, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(archived, assignee_key);
+CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(archived, project);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _task_key(task: dict[str, Any]) -> str:
+    return str(task.get("id") or "")
+
+
+def _numeric_id(value: Any) -> int | None:
+    text = str(value or "")
+    return int(text) if text.isdigit() else None
+
+
+def _encode(task: dict[str, Any]) -> str:
+    return json.dumps(task, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class TaskDB:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # -- transactions / meta ---------------------------------------------
+
+    def _begin(self) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else str(row["value"])
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._conn.execute(
+            "INSERT INTO meta(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- migration -------------------------------------------------------
+
+    def migrate_from_json(
+        self,
+        tasks_path: Path,
+        archive_path: Path,
+        default_active: list[dict[str, Any]] | None = None,
+    ) -> bool:
+        """Import the JSON task files once; returns True when an import ran."""
+        with self._lock:
+            if self._meta("schema_version") is not None:
+                return False
+            if Path(tasks_path).exists():
+                active = _read_json_rows(tasks_path)
+            else:
+                active = [dict(task) for task in default_active or []]
+            archived = _read_json_rows(archive_path)
+            self._begin()
+            try:
+                for position, task in enumerate(active):
+                    self._upsert(task, position=position, archived=False)
+                for position, task in enumerate(archived):
+                    if _task_key(task) and self._conn.execute(
+                        "SELECT 1 FROM tasks WHERE id = ?", (_task_key(task),)
+                    ).fetchone() is None:
+                        self._upsert(task, position=position, archived=True)
+                ids = [n for n in (_numeric_id(_task_key(t)) for t in [*active, *archived]) if n is not None]
+                self._set_meta("next_task_id", max([FIRST_TASK_ID - 1, *ids]) + 1)
+                self._set_meta("schema_version", SCHEMA_VERSION)
+                self._set_meta("migrated_from", str(tasks_path))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return True
+
+    # -- reads -----------------------------------------------------------
+
+    def active_rows(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM tasks WHERE archived = 0 ORDER BY position, rowid").fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def archived_rows(self) -> list[dict[str, Any]]:
+        """Archived tasks, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM tasks WHERE archived = 1 ORDER BY archived_at DESC, position, rowid"
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def archived_by_id(self) -> dict[str, dict[str, Any]]:
+        return {_task_key(task): task for task in self.archived_rows()}
+
+    def get(self, task_id: Any, *, archived: bool | None = False) -> dict[str, Any] | None:
+        sql = "SELECT data FROM tasks WHERE id = ?"
+        params: list[Any] = [str(task_id)]
+        if archived is not None:
+            sql += " AND archived = ?"
+            params.append(int(archived))
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return None if row is None else json.loads(row["data"])
+
+    def rows_for_assignees(self, assignees: Iterable[str]) -> list[dict[str, Any]]:
+        keys = sorted({str(a or "").strip().lower() for a in assignees if str(a or "").strip()})
+        if not keys:
+            return []
+        marks = ",".join("?" for _ in keys)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM tasks WHERE archived = 0 AND assignee_key IN ({marks}) ORDER BY position, rowid",
+                keys,
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def query(
+        self,
+        *,
+        status: str | None = None,
+        assignee: str | None = None,
+        project: str | None = None,
+        archived: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        where = ["archived = ?"]
+        params: list[Any] = [int(archived)]
+        if status:
+            where.append("status = ?")
+            params.append(str(status))
+        if assignee:
+            where.append("assignee_key = ?")
+            params.append(str(assignee).strip().lower())
+        if project:
+            where.append("project = ?")
+            params.append(str(project))
+        clause = " AND ".join(where)
+        order = "archived_at DESC, position, rowid" if archived else "position, rowid"
+        with self._lock:
+            total = int(self._conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {clause}", params).fetchone()[0])
+            sql = f"SELECT data FROM tasks WHERE {clause} ORDER BY {order}"
+            page_params = list(params)
+            if limit is not None:
+                sql += " LIMIT ? OFFSET ?"
+                page_params.extend([max(0, int(limit)), max(0, int(offset))])
+            elif offset:
+                sql += " LIMIT -1 OFFSET ?"
+                page_params.append(max(0, int(offset)))
+            rows = self._conn.execute(sql, page_params).fetchall()
+        return [json.loads(row["data"]) for row in rows], total
+
+    # -- writes ----------------------------------------------------------
+
+    def _upsert(self, task: dict[str, Any], *, position: int, archived: bool) -> None:
+        assignee = str(task.get("assignee") or "")
+        self._conn.execute(
+            """
+            INSERT INTO tasks(id, status, assignee, assignee_key, project, archived, archived_at, position, data)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                status = excluded.status,
+                assignee = excluded.assignee,
+                assignee_key = excluded.assignee_key,
+                project = excluded.project,
+                archived = excluded.archived,
+                archived_at = excluded.archived_at,
+                position = excluded.position,
+                data = excluded.data
+            """,
+            (
+                _task_key(task),
+                str(task.get("status") or ""),
+                assignee,
+                assignee.strip().lower(),
+                str(task.get("project") or ""),
+                int(archived),
+                str(task.get("archived_at") or "") if archived else None,
+                int(position),
+                _encode(task),
+            ),
+        )
+
+    def allocate_id(self) -> int:
+        """Next numeric task id; never reuses active, archived or previously issued ids."""
+        with self._lock:
+            self._begin()
+            try:
+                task_id = int(self._meta("next_task_id") or FIRST_TASK_ID)
+                self._set_meta("next_task_id", task_id + 1)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return task_id
+
+    def sync_active(self, tasks: list[dict[str, Any]], *, complete: bool = True) -> int:
+        """Persist ``tasks`` as the active list, writing only changed rows.
+
+        With ``complete=False`` the list is a subset (e.g. one assignee's rows):
+        rows are upserted but nothing missing from it is removed, and new rows
+        are appended after the current last position.
+        """
+        written = 0
+        with self._lock:
+            # Read the current rows inside the write transaction so another process cannot change them in between.
+            self._begin()
+            try:
+                current = {
+                    row["id"]: (row["data"], row["position"])
+                    for row in self._conn.execute("SELECT id, data, position FROM tasks WHERE archived = 0")
+                }
+                tail = max([-1, *(pos for _, pos in current.values())]) + 1
+                keep: set[str] = set()
+                for index, task in enumerate(tasks):
+                    key = _task_key(task)
+                    if not key:
+                        continue
+                    keep.add(key)
+                    previous = current.get(key)
+                    if complete:
+                        position = index
+                    elif previous is not None:
+                        position = previous[1]
+                    else:
+                        position, tail = tail, tail + 1
+                    if previous is not None and previous == (_encode(task), position):
+                        continue
+                    self._upsert(task, position=position, archived=False)
+                    written += 1
+                if complete:
+                    stale = [key for key in current if key not in keep]
+                    for key in stale:
+                        self._conn.execute("DELETE FROM tasks WHERE id = ? AND archived = 0", (key,))
+                    written += len(stale)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return written
+
+    def delete(self, task_id: Any) -> bool:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM tasks WHERE id = ? AND archived = 0", (str(task_id),))
+        return cur.rowcount > 0
+
+    def archive(self, tasks: Iterable[dict[str, Any]]) -> None:
+        """Store archived rows (``archived_at`` already set), replacing any earlier copy."""
+        with self._lock:
+            self._begin()
+            try:
+                for task in tasks:
+                    self._upsert(task, position=0, archived=True)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+def _read_json_rows(path: Path) -> list[dict[str, Any]]:
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return []
+    return [row for row in payload if isinstance(row, dict)] if isinstance(payload, list) else []
+
+
+_DBS: dict[str, TaskDB] = {}
+_DBS_LOCK = threading.Lock()
+
+
+def open_task_db(
+    db_path: Path,
+    *,
+    tasks_path: Path,
+    archive_path: Path,
+    default_active: list[dict[str, Any]] | None = None,
+) -> TaskDB:
+    """Shared handle per database file; imports the JSON files on first open."""
+    key = str(Path(db_path).resolve())
+    with _DBS_LOCK:
+        db = _DBS.get(key)
+        if db is None:
+            db = TaskDB(Path(db_path))
+            db.migrate_from_json(tasks_path, archive_path, default_active)
+            _DBS[key] = db
+    return db
@@ -14,6 +14,10 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .file_signals import FILE_SIGNALS
+from .jsonl_tail import tail_jsonl, tail_lines
+from .task_db import TaskDB, open_task_db
+
 SOURCE_UI_ROOT = Path(__file__).resolve().parents[1]
 REPO_ROOT = SOURCE_UI_ROOT.parents[1]
 TASKS_PATH = SOURCE_UI_ROOT / "state" / "tasks.json"
@@ -62,6 +66,8 @@ ORCHESTRATOR_CHANNEL_ID = 1480814946479636574
 AIN_PHI_URL = "http://127.0.0.1:18991/api/ain/phi"
 AUTO_REVIEW_SETTLE_SECONDS = 8.0
 SOURCE_MISSION_INGEST_LEASE_SECONDS = 20 * 60
+SOURCE_MISSION_CLAIMS_TTL_S = 10.0
+TEAMCHAT_COUNT_TTL_S = 30.0
 
 DEFAULT_TASKS: list[dict[str, Any]] = [
     {
@@ -128,20 +134,7 @@ def _read_json(path: Path) -> Any | None:
 
 
 def _read_jsonl(path: Path, limit: int = 200) -> list[dict[str, Any]]:
-    if not path.exists() or not path.is_file():
-        return []
-    rows: list[dict[str, Any]] = []
-    for raw in path.read_text(encoding="utf-8", errors="ignore").splitlines()[-max(1, int(limit)) :]:
-        raw = raw.strip()
-        if not raw:
-            continue
-        try:
-            payload = json.loads(raw)
-        except Exception:
-            continue
-        if isinstance(payload, dict):
-            rows.append(payload)
-    return rows
+    return tail_jsonl(path, limit)
 
 
 def _read_text(path: Path) -> str:
@@ -350,7 +343,7 @@ def _session_tail_hint(session_log: Path) -> tuple[str | None, str | None, bool]
     if not session_log.exists() or not session_log.is_file():
         return None, None, False
     try:
-        lines = session_log.read_text(encoding="utf-8", errors="ignore").splitlines()[-40:]
+        lines = tail_lines(session_log, 40)
     except Exception:
         return None, None, False
 
@@ -1168,7 +1161,7 @@ def _session_recent_texts(session_log: Path, *, limit: int = 12) -> list[str]:
         return []
     texts: list[str] = []
     try:
-        lines = session_log.read_text(encoding="utf-8", errors="ignore").splitlines()[-120:]
+        lines = tail_lines(session_log, 120)
     except Exception:
         return []
     for raw in lines:
@@ -1397,47 +1390,72 @@ def _source_mission_outcome_override(
     return status, reason, outcome_meta
 
 
-def _source_mission_signals() -> dict[str, Any]:
-    task_store_text = _read_text(Path(__file__))
-    portfolio_text = _read_text(PORTFOLIO_API_PATH)
-    app_text = _read_text(APP_PY_PATH)
-    deliberation_api_text = _read_text(DELIBERATION_API_PATH)
-    weekly_evolution_api_text = _read_text(WEEKLY_EVOLUTION_API_PATH)
-    static_js_text = _read_text(STATIC_APP_JS_PATH)
-    components_text = _read_text(STATIC_COMPONENTS_JS_PATH)
-    static_index_text = _read_text(STATIC_INDEX_PATH)
-    static_css_text = _read_text(STATIC_CSS_PATH)
-    discord_bot_text = _read_text(DISCORD_BOT_SUPPORT_PATH)
-    discord_bridge_text = _read_text(DISCORD_BRIDGE_API_PATH)
-    boundary_text = _read_text(BOUNDARY_STATE_API_PATH)
-    discord_bot_script_text = _read_text(DISCORD_BOT_SCRIPT_PATH)
-    harness_text = _read_text(MODEL_PROMPT_HARNESSES_PATH)
-    user_inference_text = _read_text(USER_INFERENCE_API_PATH)
-    agent_integration_text = _read_text(AGENT_INTEGRATION_DOC_PATH)
-    phi_metrics_text = _read_text(PHI_METRICS_PATH)
-
-    command_history = _read_json(COMMAND_HISTORY_PATH)
-    command_receipts = _read_json(COMMAND_RECEIPTS_PATH)
+def _active_inference_signals() -> dict[str, Any]:
     active_inferences = [
         row
         for row in _read_jsonl(USER_INFERENCES_PATH, limit=400)
         if str(row.get("status") or "active").strip().lower() == "active"
     ]
+    return {
+        "inference_count": len(active_inferences),
+        "has_inference_evidence": any(bool(row.get("evidence_refs")) for row in active_inferences),
+        "has_inference_confidence": any(row.get("confidence") is not None for row in active_inferences),
+        "has_inference_review_state": any(str(row.get("review_state") or "").strip() for row in active_inferences),
+        "all_inferences_have_evidence": bool(active_inferences) and all(bool(row.get("evidence_refs")) for row in active_inferences),
+        "all_inferences_have_confidence": bool(active_inferences) and all(row.get("confidence") is not None for row in active_inferences),
+        "all_inferences_have_review_state": bool(active_inferences) and all(str(row.get("review_state") or "").strip() for row in active_inferences),
+        "all_inferences_have_contradiction_state": bool(active_inferences) and all(str(row.get("contradiction_state") or "").strip() for row in active_inferences),
+        "all_inferences_have_operator_actions": bool(active_inferences) and all(bool(row.get("operator_actions")) for row in active_inferences),
+    }
+
+
+def _json_list_count(path: Path) -> int:
+    payload = _read_json(path)
+    return len(payload) if isinstance(payload, list) else 0
+
+
+def _preference_profile_section_count() -> int:
     preference_profile = _read_json(PREFERENCE_PROFILE_PATH)
-    research_rows = _read_jsonl(DISCORD_RESEARCH_PATH, limit=200)
-    pause_rows = _read_jsonl(PAUSE_CHECK_LOG_PATH, limit=20)
+    if not isinstance(preference_profile, dict):
+        return 0
+    return len([key for key in preference_profile.keys() if key not in {"schema_version", "subject", "updated_at"}])
+
+
+def _source_mission_signals() -> dict[str, Any]:
+    """Status signals for the source mission rows.
 
-    profile_sections = []
-    if isinstance(preference_profile, dict):
-        profile_sections = [
-            key
-            for key in preference_profile.keys()
-            if key not in {"schema_version", "subject", "updated_at"}
-        ]
+    File-derived values come from ``FILE_SIGNALS`` and are recomputed only when
+    an input's (mtime_ns, size) changes; directory globs and runtime session
+    claims are held for a short TTL.
+    """
+    task_store_text = FILE_SIGNALS.text(Path(__file__))
+    portfolio_text = FILE_SIGNALS.text(PORTFOLIO_API_PATH)
+    app_text = FILE_SIGNALS.text(APP_PY_PATH)
+    deliberation_api_text = FILE_SIGNALS.text(DELIBERATION_API_PATH)
+    weekly_evolution_api_text = FILE_SIGNALS.text(WEEKLY_EVOLUTION_API_PATH)
+    static_js_text = FILE_SIGNALS.text(STATIC_APP_JS_PATH)
+    components_text = FILE_SIGNALS.text(STATIC_COMPONENTS_JS_PATH)
+    static_index_text = FILE_SIGNALS.text(STATIC_INDEX_PATH)
+    static_css_text = FILE_SIGNALS.text(STATIC_CSS_PATH)
+    discord_bot_text = FILE_SIGNALS.text(DISCORD_BOT_SUPPORT_PATH)
+    discord_bridge_text = FILE_SIGNALS.text(DISCORD_BRIDGE_API_PATH)
+    boundary_text = FILE_SIGNALS.text(BOUNDARY_STATE_API_PATH)
+    discord_bot_script_text = FILE_SIGNALS.text(DISCORD_BOT_SCRIPT_PATH)
+    harness_text = FILE_SIGNALS.text(MODEL_PROMPT_HARNESSES_PATH)
+    user_inference_text = FILE_SIGNALS.text(USER_INFERENCE_API_PATH)
+    agent_integration_text = FILE_SIGNALS.text(AGENT_INTEGRATION_DOC_PATH)
+    phi_metrics_text = FILE_SIGNALS.text(PHI_METRICS_PATH)
+    inference_signals = FILE_SIGNALS.derive(
+        f"active_inferences:{USER_INFERENCES_PATH}", [USER_INFERENCES_PATH], _active_inference_signals
+    )
 
     return {
-        "command_history_count": len(command_history) if isinstance(command_history, list) else 0,
-        "command_receipt_count": len(command_receipts) if isinstance(command_receipts, list) else 0,
+        "command_history_count": FILE_SIGNALS.derive(
+            f"count:{COMMAND_HISTORY_PATH}", [COMMAND_HISTORY_PATH], lambda: _json_list_count(COMMAND_HISTORY_PATH)
+        ),
+        "command_receipt_count": FILE_SIGNALS.derive(
+            f"count:{COMMAND_RECEIPTS_PATH}", [COMMAND_RECEIPTS_PATH], lambda: _json_list_count(COMMAND_RECEIPTS_PATH)
+        ),
         "has_portfolio_packet": 'payload["source_mission"]' in portfolio_text and 'payload["operator_timeline"]' in portfolio_text,
         "has_portfolio_ui": "const sourceMission = portfolio.source_mission" in static_js_text
         and "const operatorTimeline = portfolio.operator_timeline" in static_js_text,
@@ -1464,35 +1482,39 @@ def _source_mission_signals() -> dict[str, Any]:
         "has_operator_timeline_ui": "_build_operator_timeline" in portfolio_text
         and "operator-timeline-list" in static_index_text
         and "function renderOperatorTimeline" in static_js_text,
-        "inference_count": len(active_inferences),
-        "has_inference_evidence": any(bool(row.get("evidence_refs")) for row in active_inferences),
-        "has_inference_confidence": any(row.get("confidence") is not None for row in active_inferences),
-        "has_inference_review_state": any(str(row.get("review_state") or "").strip() for row in active_inferences),
-        "all_inferences_have_evidence": bool(active_inferences) and all(bool(row.get("evidence_refs")) for row in active_inferences),
-        "all_inferences_have_confidence": bool(active_inferences) and all(row.get("confidence") is not None for row in active_inferences),
-        "all_inferences_have_review_state": bool(active_inferences) and all(str(row.get("review_state") or "").strip() for row in active_inferences),
-        "all_inferences_have_contradiction_state": bool(active_inferences) and all(str(row.get("contradiction_state") or "").strip() for row in active_inferences),
-        "all_inferences_have_operator_actions": bool(active_inferences) and all(bool(row.get("operator_actions")) for row in active_inferences),
+        **inference_signals,
         "has_inference_review_api": "update_user_inference" in user_inference_text
         and "/api/user-inferences/" in app_text,
         "has_inference_review_ui": "data-inference-review" in static_js_text
         and "api.updateUserInference" in static_js_text,
-        "profile_section_count": len(profile_sections),
-        "research_count": len(research_rows),
+        "profile_section_count": FILE_SIGNALS.derive(
+            f"profile_sections:{PREFERENCE_PROFILE_PATH}", [PREFERENCE_PROFILE_PATH], _preference_profile_section_count
+        ),
+        "research_count": FILE_SIGNALS.derive(
+            f"jsonl_count:{DISCORD_RESEARCH_PATH}",
+            [DISCORD_RESEARCH_PATH],
+            lambda: len(_read_jsonl(DISCORD_RESEARCH_PATH, limit=200)),
+        ),
         "has_research_promotion_api": "def promote_research_item" in task_store_text
         and "/api/research/promote" in app_text,
         "has_research_promotion_ui": "openResearchPromotionModal" in static_js_text
         and "api.promoteResearchItem" in static_js_text,
         "has_research_source_links": "source_links" in task_store_text
         and "task-source-link" in components_text,
-        "teamchat_count": _limited_glob_count(TEAMCHAT_ROOT, "*.json"),
+        "teamchat_count": _cached_probe(
+            f"teamchat_count:{TEAMCHAT_ROOT}", TEAMCHAT_COUNT_TTL_S, lambda: _limited_glob_count(TEAMCHAT_ROOT, "*.json")
+        ),
         "has_relational_endpoint": "source/relational" in app_text,
         "has_relational_ui": "ci-relational-card" in static_index_text
         and "fetch('/api/source/relational')" in static_js_text,
         "has_relational_harness_adaptation": "build_relational_prompt_lines" in discord_bot_text
         and "relational_heading" in discord_bot_text
         and '"relational_modes"' in harness_text,
-        "pause_check_count": len(pause_rows),
+        "pause_check_count": FILE_SIGNALS.derive(
+            f"jsonl_count:{PAUSE_CHECK_LOG_PATH}",
+            [PAUSE_CHECK_LOG_PATH],
+            lambda: len(_read_jsonl(PAUSE_CHECK_LOG_PATH, limit=20)),
+        ),
         "has_diversity_metric": "author_silhouette" in phi_metrics_text,
         "has_approval_flow": "pending_approval" in app_text and "approvalButton" in static_js_text,
         "has_boundary_payload": "def build_memory_source_boundary" in boundary_text
@@ -1502,7 +1524,10 @@ def _source_mission_signals() -> dict[str, Any]:
         "has_boundary_ui": "function renderBoundaryState" in static_js_text
         and "boundary-state" in static_css_text
         and "memory-sources-list" in static_index_text,
-        "has_runtime_mirror": bool(_runtime_source_entries()) or "GET /api/runtime-tasks" in agent_integration_text,
+        "has_runtime_mirror": FILE_SIGNALS.derive(
+            f"runtime_sources:{RUNTIME_SOURCES_PATH}", [RUNTIME_SOURCES_PATH], lambda: bool(_runtime_source_entries())
+        )
+        or "GET /api/runtime-tasks" in agent_integration_text,
         "has_task_create_flow": "task_create_text" in discord_bot_text and "create_task(" in discord_bot_text,
         "has_task_state": TASKS_PATH.exists(),
         "has_deliberation_module": (TEAMCHAT_ROOT / "deliberation.py").exists(),
@@ -1511,8 +1536,12 @@ def _source_mission_signals() -> dict[str, Any]:
         "has_deliberation_ui": "deliberation-list" in static_index_text
         and "renderDeliberations" in static_js_text
         and "launchDeliberationCell" in static_js_text,
-        "has_weekly_evolution_report": EVOLUTION_PATH.exists()
-        and any(path.name != "weekly-template.md" for path in EVOLUTION_PATH.glob("*.md")),
+        "has_weekly_evolution_report": FILE_SIGNALS.derive(
+            f"weekly_reports:{EVOLUTION_PATH}",
+            [EVOLUTION_PATH],
+            lambda: EVOLUTION_PATH.exists()
+            and any(path.name != "weekly-template.md" for path in EVOLUTION_PATH.glob("*.md")),
+        ),
         "has_weekly_evolution_scheduler": WEEKLY_EVOLUTION_SERVICE_PATH.exists()
         and WEEKLY_EVOLUTION_TIMER_PATH.exists()
         and WEEKLY_EVOLUTION_GENERATOR_PATH.exists(),
@@ -1520,7 +1549,9 @@ def _source_mission_signals() -> dict[str, Any]:
         and "renderWeeklyEvolution" in static_js_text
         and "generateWeeklyEvolutionNow" in static_js_text
         and "load_weekly_evolution_summary" in weekly_evolution_api_text,
-        "runtime_claims": _source_mission_runtime_claim_signals(),
+        "runtime_claims": _cached_probe(
+            f"runtime_claims:{AGENTS_ROOT}", SOURCE_MISSION_CLAIMS_TTL_S, _source_mission_runtime_claim_signals
+        ),
     }
 
 
@@ -1752,7 +1783,9 @@ def _source_mission_task_row(
     return row
 
 
-def _merge_source_mission_tasks(tasks: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], bool]:
+def _merge_source_mission_tasks(
+    tasks: list[dict[str, Any]], db: TaskDB | None = None
+) -> tuple[list[dict[str, Any]], bool]:
     payload = _read_json(SOURCE_MISSION_CONFIG_PATH)
     raw_tasks = payload.get("tasks") if isinstance(payload, dict) else None
     if not isinstance(raw_tasks, list):
@@ -1764,7 +1797,7 @@ def _merge_source_mission_tasks(tasks: list[dict[str, Any]]) -> tuple[list[dict[
         if isinstance(task, dict)
     }
     
-    archived_tasks = _read_json(ARCHIVED_TASKS_PATH) or []
+    archived_tasks = db.archived_rows() if db is not None else _read_json(ARCHIVED_TASKS_PATH) or []
     archived_by_id = {
         str(task.get("id") or ""): task
         for task in archived_tasks
@@ -1905,7 +1938,7 @@ def _reconcile_done_to_review(tasks: list[dict[str, Any]]) -> bool:
     return changed
 
 
-def _reconcile_done_to_archive(tasks: list[dict[str, Any]]) -> bool:
+def _reconcile_done_to_archive(tasks: list[dict[str, Any]], db: TaskDB | None = None) -> bool:
     """Archive tasks that have been in done status for more than 1 hour."""
     changed = False
     now_dt = _now_utc()
@@ -1927,7 +1960,16 @@ def _reconcile_done_to_archive(tasks: list[dict[str, Any]]) -> bool:
         except Exception:
             continue
 
-    if to_archive:
+    if to_archive and db is not None:
+        archived_at = _now_iso()
+        db.archive(
+            {**task, "archived_at": archived_at, "status": "archived"}
+            for task in tasks
+            if str(task.get("id") or "") in to_archive
+        )
+        tasks[:] = [t for t in tasks if str(t.get("id") or "") not in to_archive]
+        changed = True
+    elif to_archive:
         archived_tasks = _read_json(ARCHIVED_TASKS_PATH) or []
         archived_by_id = {
             str(task.get("id") or ""): index
@@ -2026,7 +2068,9 @@ def _reconcile_auto_review_gate_tasks(tasks: list[dict[str, Any]]) -> bool:
     return changed
 
 
-def _reconcile_local_tasks(tasks: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], bool]:
+def _reconcile_local_tasks(
+    tasks: list[dict[str, Any]], db: TaskDB | None = None
+) -> tuple[list[dict[str, Any]], bool]:
     normalized: list[dict[str, Any]] = []
     changed = False
 
@@ -2047,7 +2091,7 @@ def _reconcile_local_tasks(tasks: list[dict[str, Any]]) -> tuple[list[dict[str,
     if _reconcile_done_to_review(normalized):
         changed = True
 
-    if _reconcile_done_to_archive(normalized):
+    if _reconcile_done_to_archive(normalized, db=db):
         changed = True
 
     active_assignees = {
@@ -2081,8 +2125,26 @@ def _reconcile_local_tasks(tasks: list[dict[str, Any]]) -> tuple[list[dict[str,
     return normalized, changed
 
 
+def _task_db(path: Path) -> TaskDB | None:
+    """SQLite store next to ``path`` when ``OPENCLAW_TASK_STORE=sqlite``; None keeps the JSON files."""
+    if str(os.environ.get("OPENCLAW_TASK_STORE", "json")).strip().lower() != "sqlite":
+        return None
+    return open_task_db(
+        Path(path).with_suffix(".sqlite3"),
+        tasks_path=Path(path),
+        archive_path=ARCHIVED_TASKS_PATH,
+        default_active=DEFAULT_TASKS,
+    )
+
+
+_LAST_RECONCILE: dict[str, float] = {}
+
+
 def load_tasks(path: Path = TASKS_PATH) -> list[dict[str, Any]]:
-    if not path.exists():
+    db = _task_db(path)
+    if db is not None:
+        tasks = db.active_rows()
+    elif not path.exists():
         _write_json_atomic(path, DEFAULT_TASKS)
         tasks = [dict(task) for task in DEFAULT_TASKS]
     else:
@@ -2092,17 +2154,81 @@ def load_tasks(path: Path = TASKS_PATH) -> list[dict[str, Any]]:
             tasks = [dict(task) for task in DEFAULT_TASKS]
         else:
             tasks = [task for task in payload if isinstance(task, dict)] if isinstance(payload, list) else [dict(task) for task in DEFAULT_TASKS]
-    tasks, source_changed = _merge_source_mission_tasks(tasks)
-    reconciled, changed = _reconcile_local_tasks(tasks)
+    tasks, source_changed = _merge_source_mission_tasks(tasks, db=db)
+    reconciled, changed = _reconcile_local_tasks(tasks, db=db)
     if changed or source_changed:
         save_tasks(reconciled, path)
+    _LAST_RECONCILE[str(path)] = time.monotonic()
     return reconciled
 
 
 def save_tasks(tasks: list[dict[str, Any]], path: Path = TASKS_PATH) -> None:
+    db = _task_db(path)
+    if db is not None:
+        db.sync_active(tasks)
+        return
     _write_json_atomic(path, tasks)
 
 
+def _task_matches(
+    task: dict[str, Any],
+    *,
+    status: str | None,
+    assignee: str | None,
+    project: str | None,
+) -> bool:
+    if status and str(task.get("status") or "") != status:
+        return False
+    if assignee and str(task.get("assignee") or "").strip().lower() != assignee.strip().lower():
+        return False
+    if project and str(task.get("project") or "") != project:
+        return False
+    return True
+
+
+def query_tasks(
+    path: Path = TASKS_PATH,
+    *,
+    status: str | None = None,
+    assignee: str | None = None,
+    project: str | None = None,
+    archived: bool = False,
+    limit: int | None = None,
+    offset: int = 0,
+) -> dict[str, Any]:
+    """Filtered, paginated local tasks: ``{"tasks", "total", "limit", "offset"}``.
+
+    The SQLite store answers from its indexes and re-runs the full
+    ``load_tasks`` reconciliation at most every ``OPENCLAW_TASK_RECONCILE_SEC``
+    seconds (default 5); the JSON store filters the reconciled list.
+    """
+    status = _normalize_task_status(status) if status and not archived else (status or None)
+    offset = max(0, int(offset or 0))
+    limit = None if limit is None else max(0, int(limit))
+    db = _task_db(path)
+    if db is not None:
+        try:
+            interval = float(os.environ.get("OPENCLAW_TASK_RECONCILE_SEC", "5"))
+        except ValueError:
+            interval = 5.0
+        if not archived and time.monotonic() - _LAST_RECONCILE.get(str(path), float("-inf")) >= interval:
+            load_tasks(path)
+        rows, total = db.query(
+            status=status,
+            assignee=assignee,
+            project=project,
+            archived=archived,
+            limit=limit,
+            offset=offset,
+        )
+    else:
+        source = load_archived_tasks(ARCHIVED_TASKS_PATH, path) if archived else load_tasks(path)
+        matched = [task for task in source if _task_matches(task, status=status, assignee=assignee, project=project)]
+        total = len(matched)
+        rows = matched[offset : None if limit is None else offset + limit]
+    return {"tasks": rows, "total": total, "limit": limit, "offset": offset}
+
+
 def load_all_tasks(
     path: Path = TASKS_PATH,
     *,
@@ -2129,10 +2255,11 @@ def next_task_id(tasks: list[dict[str, Any]]) -> int:
 
 
 def create_task(data: dict[str, Any], path: Path = TASKS_PATH) -> dict[str, Any]:
-    tasks = load_tasks(path)
+    db = _task_db(path)
+    tasks = load_tasks(path) if db is None else []
     timestamp = _now_iso()
     task = {
-        "id": next_task_id(tasks),
+        "id": next_task_id(tasks) if db is None else db.allocate_id(),
         "title": str(data.get("title", "")).strip(),
         "description": str(data.get("description", "")).strip(),
         "status": str(data.get("status", "backlog")).strip() or "backlog",
@@ -2169,13 +2296,27 @@ def create_task(data: dict[str, Any], path: Path = TASKS_PATH) -> dict[str, Any]
 
     _apply_impact_fields(task, data)
 
-    reconciled, _ = _reconcile_local_tasks([*tasks, task])
-    save_tasks(reconciled, path)
+    if db is not None:
+        # Only the new row and its assignee's queue can change; write just those.
+        reconciled, _ = _reconcile_local_tasks([*db.rows_for_assignees([task["assignee"]]), task], db=db)
+        db.sync_active(reconciled, complete=False)
+    else:
+        reconciled, _ = _reconcile_local_tasks([*tasks, task])
+        save_tasks(reconciled, path)
     return next((row for row in reconciled if str(row.get("id")) == str(task["id"])), task)
 
 
 def update_task(task_id: str, updates: dict[str, Any], path: Path = TASKS_PATH) -> dict[str, Any] | None:
-    tasks = load_tasks(path)
+    db = _task_db(path)
+    if db is not None:
+        current = db.get(task_id)
+        if current is None:
+            return None
+        tasks = db.rows_for_assignees([current.get("assignee"), updates.get("assignee")])
+        if not any(str(task.get("id")) == str(task_id) for task in tasks):
+            tasks.append(current)
+    else:
+        tasks = load_tasks(path)
     for task in tasks:
         if str(task.get("id")) != str(task_id):
             continue
@@ -2200,13 +2341,19 @@ def update_task(task_id: str, updates: dict[str, Any], path: Path = TASKS_PATH)
         else:
             task.pop("review_requested_at", None)
         task["updated_at"] = _now_iso()
-        reconciled, _ = _reconcile_local_tasks(tasks)
-        save_tasks(reconciled, path)
+        reconciled, _ = _reconcile_local_tasks(tasks, db=db)
+        if db is not None:
+            db.sync_active(reconciled, complete=False)
+        else:
+            save_tasks(reconciled, path)
         return next((row for row in reconciled if str(row.get("id")) == str(task_id)), task)
     return None
 
 
 def delete_task(task_id: str, path: Path = TASKS_PATH) -> bool:
+    db = _task_db(path)
+    if db is not None:
+        return db.delete(task_id)
     tasks = load_tasks(path)
     next_tasks = [task for task in tasks if str(task.get("id")) != str(task_id)]
     if len(next_tasks) == len(tasks):
@@ -2237,8 +2384,11 @@ def _dedupe_task_rows(tasks: list[dict[str, Any]]) -> tuple[list[dict[str, Any]]
     return deduped, changed
 
 
-def load_archived_tasks(path: Path = ARCHIVED_TASKS_PATH) -> list[dict[str, Any]]:
+def load_archived_tasks(path: Path = ARCHIVED_TASKS_PATH, tasks_path: Path = TASKS_PATH) -> list[dict[str, Any]]:
     """Return all archived tasks (newest first)."""
+    db = _task_db(tasks_path)
+    if db is not None:
+        return db.archived_rows()
     payload = _read_json(path)
     if not isinstance(payload, list):
         return []
@@ -2254,6 +2404,15 @@ def archive_task(task_id: str, path: Path = TASKS_PATH, archive_path: Path = ARC
 
     Returns the archived task dict or None if task_id not found.
     """
+    db = _task_db(path)
+    if db is not None:
+        target = db.get(task_id)
+        if target is None:
+            return None
+        target["archived_at"] = _now_iso()
+        target["status"] = "archived"
+        db.archive([target])
+        return target
     tasks = load_tasks(path)
     target = next((t for t in tasks if str(t.get("id")) == str(task_id)), None)
     if target is None:
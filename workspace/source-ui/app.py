@@ -16,7 +16,7 @@ from pathlib import Path
 from typing import Any, Optional
 from dataclasses import dataclass
 from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 import socketserver
 
 try:
@@ -38,6 +38,7 @@ try:
         load_archived_tasks as task_store_load_archived_tasks,
         load_runtime_tasks as task_store_load_runtime_tasks,
         load_tasks as task_store_load_tasks,
+        query_tasks as task_store_query_tasks,
         update_task as task_store_update_task,
     )
 except Exception:  # pragma: no cover
@@ -48,6 +49,7 @@ except Exception:  # pragma: no cover
     task_store_load_archived_tasks = None
     task_store_load_runtime_tasks = None
     task_store_load_tasks = None
+    task_store_query_tasks = None
     task_store_update_task = None
 
 try:
@@ -113,6 +115,11 @@ try:
 except Exception:  # pragma: no cover
     build_command_receipt_boundary = None
 
+try:
+    from api.jsonl_tail import iter_jsonl_reversed
+except Exception:  # pragma: no cover
+    iter_jsonl_reversed = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -515,6 +522,8 @@ class SourceUIHandler(SimpleHTTPRequestHandler):
         elif path.startswith('agents/'):
             agent_id = path.split('/')[-1]
             data = next((row for row in self._load_agents() if str(row.get('id')) == agent_id), {'error': 'Not found'})
+        elif path == 'tasks' and parsed.query and task_store_query_tasks is not None:
+            data = self._query_tasks(parse_qs(parsed.query))
         elif path == 'tasks':
             data = self._load_tasks()
         elif path == 'runtime-tasks':
@@ -1226,6 +1235,26 @@ class SourceUIHandler(SimpleHTTPRequestHandler):
         self.state.tasks = tasks
         return tasks
 
+    def _query_tasks(self, params):
+        """Local tasks filtered by status/assignee/project with limit/offset paging."""
+        def first(key):
+            values = params.get(key) or ['']
+            return values[0].strip() or None
+
+        try:
+            limit = int(first('limit')) if first('limit') else None
+            offset = int(first('offset') or 0)
+        except ValueError:
+            return {'error': 'invalid_pagination'}
+        return task_store_query_tasks(
+            status=first('status'),
+            assignee=first('assignee'),
+            project=first('project'),
+            archived=first('archived') in {'1', 'true', 'yes'},
+            limit=limit,
+            offset=offset,
+        )
+
     def _load_runtime_tasks(self):
         if task_store_load_runtime_tasks is None:
             return []
@@ -1325,14 +1354,11 @@ class SourceUIHandler(SimpleHTTPRequestHandler):
         mem_path = repo_root / "workspace" / "knowledge_base" / "data" / "discord_messages.jsonl"
         ORCHESTRATOR_CHANNEL = 1480814946479636574
         messages = []
-        if mem_path.exists():
+        if mem_path.exists() and iter_jsonl_reversed is not None:
             try:
-                lines = mem_path.read_text(encoding="utf-8").splitlines()
-                for line in lines:
-                    if not line.strip():
-                        continue
+                # Newest first from EOF; stop once the channel has `limit` messages.
+                for row in iter_jsonl_reversed(mem_path):
                     try:
-                        row = json.loads(line)
                         if int(row.get("channel_id", 0)) == ORCHESTRATOR_CHANNEL:
                             messages.append({
                                 "author": row.get("author_name", "unknown"),
@@ -1341,11 +1367,14 @@ class SourceUIHandler(SimpleHTTPRequestHandler):
                                 "ts": row.get("created_at", "") or row.get("ingested_at", ""),
                                 "agent_id": row.get("agent_id", None),
                             })
-                    except (json.JSONDecodeError, ValueError):
+                    except (TypeError, ValueError):
                         continue
+                    if len(messages) >= limit:
+                        break
             except Exception as exc:
                 return {"messages": [], "ok": False, "error": str(exc)}
-        return {"messages": messages[-limit:], "ok": True, "channel": "open-communication"}
+        messages.reverse()
+        return {"messages": messages, "ok": True, "channel": "open-communication"}
 
     def _source_relational_data(self) -> dict:
         """Relational state shared between the UI card and prompt harnesses."""
@@ -7,7 +7,7 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 DEFAULT_PATH = Path("workspace/state/tacti_cr/events.jsonl")
 QUIESCE_ENV = "OPENCLAW_QUIESCE"
@@ -63,7 +63,14 @@ def _log_quiesce_skip_once(path: Path) -> None:
     print(f'QUIESCE_SKIP_WRITE file="{path}"', file=sys.stderr)
 
 
-def emit(event_type: str, payload: dict, *, now: datetime | None = None, session_id: str | None = None) -> None:
+def emit(
+    event_type: str,
+    payload: dict,
+    *,
+    now: datetime | None = None,
+    session_id: str | None = None,
+    writer: Callable[[Path, str], Any] | None = None,
+) -> None:
     path = _resolve()
     if _is_quiesced() and _is_protected_target(path):
         _log_quiesce_skip_once(path)
@@ -83,9 +90,13 @@ def emit(event_type: str, payload: dict, *, now: datetime | None = None, session
     }
     if session_id:
         row["session_id"] = str(session_id)
+    line = json.dumps(row, ensure_ascii=True) + "\n"
     try:
+        if writer is not None:
+            writer(path, line)
+            return
         with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(row, ensure_ascii=True) + "\n")
+            handle.write(line)
     except Exception as exc:
         print(f"warning: tacti_cr.events emit failed: {exc}", file=sys.stderr)
 